@@ -0,0 +1,61 @@
+"""분산 수집 코디네이터 HTTP API (워커가 다른 호스트에서 접속)
+
+실행: python -m app.cli coordinate --from 20250101 --to 20251231 --listen 0.0.0.0:8765
+"""
+from typing import Any, Dict, Optional
+
+from fastapi import Body, FastAPI, HTTPException, Query
+
+from app.services.shard_coordinator import ShardCoordinator
+from app.utils.fast_json import FastJSONResponse
+
+
+def create_app(coordinator: ShardCoordinator, run_id: Optional[str] = None) -> FastAPI:
+    """코디네이터 API (run_id를 지정하면 그 실행만 배정/보고 가능)"""
+    app = FastAPI(title="분산 수집 코디네이터", default_response_class=FastJSONResponse)
+    served_run = run_id
+
+    def check_run(run_id: str):
+        if served_run is not None and run_id != served_run:
+            raise HTTPException(status_code=404, detail=f"이 코디네이터의 실행이 아닙니다: {run_id}")
+
+    @app.post("/workers/{worker_id}/heartbeat")
+    def heartbeat(worker_id: str, host: Optional[str] = Query(None, description="워커 호스트 이름")):
+        """워커 생존 기록, 이 워커에 배정된 샤드 목록 반환"""
+        return coordinator.heartbeat(worker_id, host, served_run)
+
+    @app.post("/runs/{run_id}/shards/{shard_id}/start")
+    def start_shard(run_id: str, shard_id: str, worker_id: str = Query(...)):
+        """샤드 실행 시작 (샤드 정의 반환, 다른 워커에 배정됐으면 409)"""
+        check_run(run_id)
+        spec = coordinator.start(run_id, shard_id, worker_id)
+        if spec is None:
+            raise HTTPException(status_code=409, detail=f"이 워커에 배정된 샤드가 아닙니다: {shard_id}")
+        return spec
+
+    @app.post("/runs/{run_id}/shards/{shard_id}/complete")
+    def complete_shard(run_id: str, shard_id: str, worker_id: str = Query(...),
+                       result: Dict[str, Any] = Body(...)):
+        """샤드 완료 보고 (파티션 경로, 행 수, 체크섬), 재배정된 샤드면 409"""
+        check_run(run_id)
+        if not coordinator.complete(run_id, shard_id, worker_id, result):
+            raise HTTPException(status_code=409, detail=f"재배정된 샤드입니다: {shard_id}")
+        return {"status": "accepted"}
+
+    @app.post("/runs/{run_id}/shards/{shard_id}/fail")
+    def fail_shard(run_id: str, shard_id: str, worker_id: str = Query(...), error: str = Query(...)):
+        """샤드 실패 보고 (최대 시도 횟수 전이면 다시 배정)"""
+        check_run(run_id)
+        if not coordinator.fail(run_id, shard_id, worker_id, error):
+            raise HTTPException(status_code=409, detail=f"재배정된 샤드입니다: {shard_id}")
+        return {"status": "accepted"}
+
+    @app.get("/runs/{run_id}")
+    def run_status(run_id: str):
+        """실행 상태 (샤드 상태별 수, 워커, 매니페스트 경로)"""
+        status = coordinator.status(run_id)
+        if status is None:
+            raise HTTPException(status_code=404, detail=f"실행을 찾을 수 없습니다: {run_id}")
+        return status
+
+    return app
@@ -1,93 +1,308 @@
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse, FileResponse
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
+from urllib.parse import urlparse
 import logging
+import time
 
-from app.services.data_collector import DataCollector
+import pytz
+
+from app.core.config import TIMEZONE
 from app.services.scheduler import StockDataScheduler
-from app.utils.stock_symbols import update_stock_symbols, get_stock_symbols, get_all_stock_symbols
+from app.services.job_queue import job_queue
+from app.services.job_events import job_events, format_sse
+from app.services.pipeline import PIPELINES
+from app.utils.http_cache import conditional_response
+from app.utils.fast_json import FastJSONResponse, dumps
+from app.utils.profiling import PROFILE_MODES, ARTIFACT_TYPES, artifact_path, list_artifacts
+
+# pandas/numpy, 종목 마스터, 일봉 저장소는 첫 요청에서 불러옵니다 (API 프로세스 시작 시간 단축).
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 scheduler = StockDataScheduler()
+bar_query = None
+bar_exporter = None
+minute_store = None
+realtime_snapshot = None
+
+async def get_bar_query():
+    global bar_query
+    if bar_query is None:
+        from app.services.bar_query import BarQueryService
+        bar_query = BarQueryService()
+    return bar_query
+
+async def get_bar_exporter():
+    global bar_exporter
+    if bar_exporter is None:
+        from app.services.bar_export import BarExporter
+        bar_exporter = BarExporter((await get_bar_query()).store)
+    return bar_exporter
+
+async def get_minute_store():
+    global minute_store
+    if minute_store is None:
+        from app.services.minute_bar_store import MinuteBarStore
+        minute_store = MinuteBarStore()
+    return minute_store
 
-async def get_data_collector():
-    return DataCollector()
+async def get_realtime_snapshot():
+    global realtime_snapshot
+    if realtime_snapshot is None:
+        from app.services.realtime_bars import SnapshotReader
+        realtime_snapshot = SnapshotReader()
+    return realtime_snapshot
 
-@router.post("/collect/today", response_model=Dict[str, Any])
-async def collect_today_data(
-    background_tasks: BackgroundTasks,
-    collector: DataCollector = Depends(get_data_collector)
+async def get_diagnostics(
+    trace: bool = False,
+    profile: Optional[str] = None,
+    memory: bool = False
 ):
-    """오늘의 주식 데이터 수집"""
+    """작업 진단 옵션 (trace=구간 추적 파일, profile=cprofile/sampling, memory=tracemalloc)"""
+    if profile and profile not in PROFILE_MODES:
+        raise HTTPException(status_code=400, detail=f"profile은 {', '.join(PROFILE_MODES)} 중 하나여야 합니다.")
+    if not (trace or profile or memory):
+        return None
+    return {"trace": trace, "profile": profile, "memory": memory}
+
+async def get_callback(callback_url: Optional[str] = None, callback_event: Optional[str] = None):
+    """작업 완료 콜백 (작업이 끝나면 결과와 통계를 callback_url로 POST, callback_event는 이벤트 이름)"""
+    if not callback_url:
+        if callback_event:
+            raise HTTPException(status_code=400, detail="callback_event는 callback_url과 함께 지정해야 합니다.")
+        return None
+    if urlparse(callback_url).scheme not in ("http", "https") or not urlparse(callback_url).netloc:
+        raise HTTPException(status_code=400, detail="callback_url은 http(s) 주소여야 합니다.")
+    return {"url": callback_url, "event": callback_event}
+
+def _job_params(
+    params: Optional[Dict[str, Any]],
+    diagnostics: Optional[Dict[str, Any]],
+    callback: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    params = dict(params or {})
+    if diagnostics:
+        params["diagnostics"] = diagnostics
+    if callback:
+        params["callback"] = callback
+    return params
+
+@router.post("/collect/today")
+async def collect_today_data(diagnostics = Depends(get_diagnostics), callback = Depends(get_callback)):
+    """오늘의 주식 데이터 수집 (작업 큐에 등록, 수집 워커가 실행)"""
     try:
-        background_tasks.add_task(collector.collect_today_data)
-        return {"status": "success", "message": "오늘의 주식 데이터 수집 작업이 시작되었습니다."}
+        job = job_queue.enqueue("collect_today", _job_params(None, diagnostics, callback))
+        return {
+            "status": "success",
+            "message": "오늘의 주식 데이터 수집 작업이 등록되었습니다.",
+            "job_id": job["id"]
+        }
     except Exception as e:
         logger.error(f"데이터 수집 API 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=f"데이터 수집 중 오류가 발생했습니다: {str(e)}")
 
-@router.post("/collect/historical", response_model=Dict[str, Any])
+@router.post("/collect/historical")
 async def collect_historical_data(
     from_date: str,
     to_date: Optional[str] = None,
-    background_tasks: BackgroundTasks = None,
-    collector: DataCollector = Depends(get_data_collector)
+    diagnostics = Depends(get_diagnostics),
+    callback = Depends(get_callback)
 ):
-    """과거 주식 데이터 수집"""
+    """과거 주식 데이터 수집 (작업 큐에 등록, 수집 워커가 실행)"""
     try:
         # 날짜 형식 검증 (YYYYMMDD)
         datetime.strptime(from_date, "%Y%m%d")
         if to_date:
             datetime.strptime(to_date, "%Y%m%d")
             
-        if background_tasks:
-            background_tasks.add_task(collector.collect_historical_data, from_date, to_date)
-            return {
-                "status": "success", 
-                "message": f"과거 주식 데이터 수집 작업이 시작되었습니다. (기간: {from_date} ~ {to_date or '현재'})"
-            }
-        else:
-            results = await collector.collect_historical_data(from_date, to_date)
-            return {
-                "status": "success", 
-                "message": "과거 주식 데이터 수집이 완료되었습니다.",
-                "results": results
-            }
+        job = job_queue.enqueue("collect_historical", _job_params({"from_date": from_date, "to_date": to_date}, diagnostics, callback))
+        return {
+            "status": "success", 
+            "message": f"과거 주식 데이터 수집 작업이 등록되었습니다. (기간: {from_date} ~ {to_date or '현재'})",
+            "job_id": job["id"]
+        }
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"날짜 형식이 잘못되었습니다. YYYYMMDD 형식을 사용하세요.")
     except Exception as e:
         logger.error(f"데이터 수집 API 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=f"데이터 수집 중 오류가 발생했습니다: {str(e)}")
 
-@router.post("/merge", response_model=Dict[str, Any])
+@router.post("/collect/intraday")
+async def collect_intraday_data(
+    codes: Optional[str] = None,
+    diagnostics = Depends(get_diagnostics),
+    callback = Depends(get_callback)
+):
+    """당일 분봉 수집 (작업 큐에 등록, codes는 쉼표 구분 종목코드이며 없으면 INTRADAY_SYMBOLS)"""
+    try:
+        stock_codes = [code.strip().zfill(6) for code in codes.split(",") if code.strip()] if codes else None
+        job = job_queue.enqueue("collect_intraday", _job_params({"stock_codes": stock_codes}, diagnostics, callback), max_attempts=1)
+        return {
+            "status": "success",
+            "message": "분봉 수집 작업이 등록되었습니다.",
+            "job_id": job["id"]
+        }
+    except Exception as e:
+        logger.error(f"분봉 수집 API 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"분봉 수집 중 오류가 발생했습니다: {str(e)}")
+
+@router.post("/merge")
 async def merge_data(
     pattern: Optional[str] = None,
-    background_tasks: BackgroundTasks = None,
-    collector: DataCollector = Depends(get_data_collector)
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    diagnostics = Depends(get_diagnostics),
+    callback = Depends(get_callback)
 ):
-    """수집된 데이터 병합"""
+    """수집된 데이터 병합 (작업 큐에 등록, 수집 워커가 실행, 기간을 주지 않으면 저장된 전체 기간)"""
     try:
-        if background_tasks:
-            background_tasks.add_task(collector.merge_collected_data, pattern)
-            return {
-                "status": "success", 
-                "message": "데이터 병합 작업이 시작되었습니다."
-            }
-        else:
-            result = await collector.merge_collected_data(pattern)
-            return {
-                "status": "success" if result else "warning", 
-                "message": "데이터 병합이 완료되었습니다." if result else "병합할 데이터가 없습니다.",
-                "file_path": str(result) if result else None
-            }
+        for date in (from_date, to_date):
+            if date:
+                datetime.strptime(date, "%Y%m%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="날짜 형식이 잘못되었습니다. YYYYMMDD 형식을 사용하세요.")
+        
+    try:
+        params = {"pattern": pattern, "from_date": from_date, "to_date": to_date}
+        job = job_queue.enqueue("merge", _job_params(params, diagnostics, callback))
+        return {
+            "status": "success", 
+            "message": "데이터 병합 작업이 등록되었습니다.",
+            "job_id": job["id"]
+        }
     except Exception as e:
         logger.error(f"데이터 병합 API 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=f"데이터 병합 중 오류가 발생했습니다: {str(e)}")
 
+# 파이프라인 API 추가
+@router.get("/pipelines")
+async def list_pipelines():
+    """실행할 수 있는 파이프라인 목록"""
+    return {
+        "status": "success",
+        "pipelines": [{"name": name, "stages": stages} for name, stages in PIPELINES.items()]
+    }
+
+@router.post("/pipelines/{name}")
+async def run_pipeline(name: str, diagnostics = Depends(get_diagnostics), callback = Depends(get_callback)):
+    """파이프라인 실행 (단계 전체를 작업 하나로 등록, 수집 워커가 단계 DAG를 실행)"""
+    if name not in PIPELINES:
+        raise HTTPException(status_code=404, detail=f"알 수 없는 파이프라인: {name}")
+    try:
+        job = job_queue.enqueue("pipeline", _job_params({"pipeline": name}, diagnostics, callback))
+        return {
+            "status": "success",
+            "message": f"{name} 파이프라인 작업이 등록되었습니다.",
+            "job_id": job["id"]
+        }
+    except Exception as e:
+        logger.error(f"파이프라인 실행 API 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"파이프라인 실행 중 오류가 발생했습니다: {str(e)}")
+
+@router.get("/pipelines/runs/{job_id}")
+async def get_pipeline_run(job_id: str):
+    """파이프라인 단계별 상태 조회 (실행 중이면 진행 상황, 끝났으면 결과 기준)"""
+    job = job_queue.get(job_id)
+    if not job or job["kind"] != "pipeline":
+        raise HTTPException(status_code=404, detail=f"파이프라인 작업을 찾을 수 없습니다: {job_id}")
+    stages = (job["result"] or {}).get("stages") or (job["progress"] or {}).get("stages") or {}
+    return {
+        "status": "success",
+        "job_id": job_id,
+        "pipeline": job["params"].get("pipeline"),
+        "job_status": job["status"],
+        "error": job["error"],
+        "stages": stages
+    }
+
+# 작업 API 추가
+@router.get("/jobs")
+async def list_jobs(limit: int = Query(20, ge=1, le=500), status: Optional[str] = None):
+    """최근 작업 목록 조회 (상태별 작업 수 포함)"""
+    jobs = job_queue.list(limit, status)
+    return {
+        "status": "success",
+        "count": len(jobs),
+        "queue": job_queue.stats(),
+        "jobs": jobs
+    }
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """작업 상태 및 결과 조회 (수집 작업은 시장별 품질 보고서 포함)"""
+    job = job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다: {job_id}")
+    return {
+        "status": "success",
+        "job": job,
+        "webhooks": job_queue.list_webhooks(job_id)
+    }
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, request: Request):
+    """작업 진행 상황 스트림 (Server-Sent Events: status, progress, done 이벤트)"""
+    if not job_queue.get(job_id):
+        raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다: {job_id}")
+
+    async def stream():
+        event_id = 0
+        async for event in job_events(job_queue, job_id):
+            if await request.is_disconnected():
+                return
+            event_id += 1
+            yield format_sse(event, event_id)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.websocket("/jobs/{job_id}/ws")
+async def job_events_websocket(websocket: WebSocket, job_id: str):
+    """작업 진행 상황 WebSocket (SSE와 같은 이벤트를 JSON 메시지로 전송)"""
+    await websocket.accept()
+    if not job_queue.get(job_id):
+        await websocket.close(code=4404, reason="job not found")
+        return
+    try:
+        async for event in job_events(job_queue, job_id):
+            if event is None:
+                event = {"event": "keep-alive", "data": None}
+            await websocket.send_text(dumps(event).decode())
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.debug(f"작업 진행 WebSocket 연결 종료 (작업: {job_id})")
+
+@router.get("/jobs/{job_id}/artifacts")
+async def get_job_artifacts(job_id: str):
+    """작업 추적/프로파일링 결과 파일 목록"""
+    if not job_queue.get(job_id):
+        raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다: {job_id}")
+    artifacts = list_artifacts(job_id)
+    return {
+        "status": "success",
+        "job_id": job_id,
+        "count": len(artifacts),
+        "artifacts": artifacts
+    }
+
+@router.get("/jobs/{job_id}/artifacts/{name}")
+async def download_job_artifact(job_id: str, name: str):
+    """작업 추적/프로파일링 결과 파일 내려받기 (trace.json, profile.pstats, profile.folded, memory.txt 등)"""
+    if not job_queue.get(job_id):
+        raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다: {job_id}")
+    path = artifact_path(job_id, name)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"결과 파일을 찾을 수 없습니다: {name}")
+    return FileResponse(path, media_type=ARTIFACT_TYPES[name], filename=f"{job_id}_{name}")
+
 # 스케줄러 API 추가
-@router.post("/scheduler/start", response_model=Dict[str, Any])
+@router.post("/scheduler/start")
 async def start_scheduler():
     """스케줄러 시작"""
     try:
@@ -108,7 +323,7 @@ async def start_scheduler():
         logger.error(f"스케줄러 시작 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=f"스케줄러 시작 중 오류가 발생했습니다: {str(e)}")
 
-@router.post("/scheduler/stop", response_model=Dict[str, Any])
+@router.post("/scheduler/stop")
 async def stop_scheduler():
     """스케줄러 중지"""
     try:
@@ -127,69 +342,412 @@ async def stop_scheduler():
         logger.error(f"스케줄러 중지 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=f"스케줄러 중지 중 오류가 발생했습니다: {str(e)}")
 
-@router.get("/scheduler/status", response_model=Dict[str, Any])
+@router.get("/scheduler/status")
 async def get_scheduler_status():
-    """스케줄러 상태 확인"""
+    """스케줄러 상태 확인 (리더 프로세스 정보 포함)"""
     try:
         is_running = scheduler.is_running
         next_run = scheduler.get_next_run_time() if is_running else None
+        last_run = scheduler.get_last_run_time()
         
         return {
             "status": "success",
             "is_running": is_running,
-            "next_run": next_run.strftime("%Y-%m-%d %H:%M:%S") if next_run else None
+            "next_run": next_run.strftime("%Y-%m-%d %H:%M:%S") if next_run else None,
+            "last_run": last_run.strftime("%Y-%m-%d %H:%M:%S") if last_run else None,
+            "cron": scheduler.cron.expression,
+            "leader": scheduler.get_leader(),
+            "is_leader": scheduler.is_leader,
+            "instance": scheduler.election.owner
         }
     except Exception as e:
         logger.error(f"스케줄러 상태 확인 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=f"스케줄러 상태 확인 중 오류가 발생했습니다: {str(e)}")
 
 # 종목 코드 API 추가
-@router.post("/symbols/update", response_model=Dict[str, Any])
-async def update_symbols():
-    """종목 코드 목록 업데이트"""
+@router.post("/symbols/update")
+async def update_symbols(backfill_days: int = 0, callback = Depends(get_callback)):
+    """종목 코드 목록 업데이트 (변경된 종목만 캐시 무효화, 선택적으로 신규 상장 종목 백필)"""
+    from app.utils.stock_symbols import update_stock_symbols
+    from app.utils.symbol_master import symbol_master
+    from app.services.series_cache import series_cache
+    
     try:
         results = update_stock_symbols()
-        return {
+        symbol_master.reload()
+        
+        diff = results.pop("diff")
+        for item in diff["delisted"] + diff["market_moved"]:
+            series_cache.invalidate_symbol(item["stock_code"])
+            
+        response = {
             "status": "success",
             "message": "종목 코드 목록이 업데이트되었습니다.",
             "results": results
         }
+        
+        # 신규 상장 종목만 최근 backfill_days일 데이터 수집
+        listed_codes = [item["stock_code"] for item in diff["listed"]]
+        if backfill_days > 0 and listed_codes:
+            params = {
+                "stock_codes": listed_codes,
+                "from_date": (datetime.now() - timedelta(days=backfill_days)).strftime("%Y%m%d"),
+                "to_date": None
+            }
+            job = job_queue.enqueue("backfill_symbols", _job_params(params, None, callback))
+            response["backfill_job_id"] = job["id"]
+            
+        return response
     except Exception as e:
         logger.error(f"종목 코드 업데이트 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=f"종목 코드 업데이트 중 오류가 발생했습니다: {str(e)}")
 
-@router.get("/symbols/{market}", response_model=Dict[str, Any])
-async def get_symbols(market: str):
-    """특정 시장의 종목 코드 목록 조회"""
+@router.get("/symbols/changes")
+async def get_symbol_changes(since: Optional[str] = None):
+    """종목 목록 변경 내역 조회 (신규 상장, 상장 폐지, 종목명 변경, 시장 이동)"""
+    from app.utils.symbol_snapshots import get_changes_since, latest_version
+    
     try:
-        if market.upper() not in ["KOSPI", "KOSDAQ"]:
-            raise HTTPException(status_code=400, detail=f"유효하지 않은 시장입니다. KOSPI 또는 KOSDAQ를 사용하세요.")
+        if since and (not since.isdigit() or len(since) not in (8, 14)):
+            raise HTTPException(status_code=400, detail="since는 버전(YYYYMMDDHHMMSS) 또는 날짜(YYYYMMDD) 형식이어야 합니다.")
             
-        df = get_stock_symbols(market.upper())
+        changes = get_changes_since(since)
         
         return {
             "status": "success",
-            "market": market.upper(),
-            "count": len(df),
-            "symbols": df.to_dict('records')
+            "since": since,
+            "latest_version": latest_version(),
+            "count": len(changes),
+            "changes": changes
         }
     except HTTPException:
         raise
+    except Exception as e:
+        logger.error(f"종목 변경 내역 조회 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"종목 변경 내역 조회 중 오류가 발생했습니다: {str(e)}")
+
+@router.get("/symbols/search")
+async def search_symbols(
+    q: str,
+    limit: int = Query(10, ge=1, le=50),
+    market: Optional[str] = None
+):
+    """종목 검색 (코드/종목명 앞부분, 한글 초성 일치)"""
+    from app.utils.symbol_search import get_search_index
+    
+    try:
+        if market and market.upper() not in ["KOSPI", "KOSDAQ"]:
+            raise HTTPException(status_code=400, detail=f"유효하지 않은 시장입니다. KOSPI 또는 KOSDAQ를 사용하세요.")
+            
+        results = get_search_index().search(q, limit=limit, market=market.upper() if market else None)
+        
+        return FastJSONResponse({
+            "status": "success",
+            "query": q,
+            "count": len(results),
+            "results": results
+        })
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"종목 검색 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"종목 검색 중 오류가 발생했습니다: {str(e)}")
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """콤마로 구분된 필드 목록 파싱"""
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(",") if field.strip()] or None
+
+def _symbol_list_response(request: Request, market: Optional[str], **params):
+    """종목 목록 응답 (조회 조건이 없으면 미리 직렬화된 본문 사용)"""
+    from app.utils.symbol_master import symbol_master
+    
+    snapshot = symbol_master.snapshot()
+    
+    if not any(value is not None for value in params.values()):
+        body = snapshot.payloads[market]
+    else:
+        try:
+            page = snapshot.query(market=market, **params)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        response = {"status": "success"}
+        if market:
+            response["market"] = market
+        response.update({
+            "count": len(page["records"]),
+            "total": page["total"],
+            "next_cursor": page["next_cursor"],
+            "symbols": page["records"]
+        })
+        body = dumps(response)
+    
+    return conditional_response(
+        request,
+        body,
+        snapshot.etag,
+        snapshot.last_modified,
+        snapshot.modified_at
+    )
+
+@router.get("/symbols/{market}")
+async def get_symbols(
+    market: str,
+    request: Request,
+    fields: Optional[str] = None,
+    market_detail: Optional[str] = None,
+    code_prefix: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=5000)
+):
+    """특정 시장의 종목 코드 목록 조회 (ETag/Last-Modified 조건부 요청, 필드 선택/필터/커서 페이지 지원)"""
+    try:
+        if market.upper() not in ["KOSPI", "KOSDAQ"]:
+            raise HTTPException(status_code=400, detail=f"유효하지 않은 시장입니다. KOSPI 또는 KOSDAQ를 사용하세요.")
+            
+        return _symbol_list_response(
+            request,
+            market.upper(),
+            fields=_parse_fields(fields),
+            market_detail=market_detail,
+            code_prefix=code_prefix,
+            cursor=cursor,
+            limit=limit
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"종목 코드 조회 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=f"종목 코드 조회 중 오류가 발생했습니다: {str(e)}")
 
-@router.get("/symbols", response_model=Dict[str, Any])
-async def get_all_symbols():
-    """모든 시장의 종목 코드 목록 조회"""
+@router.get("/symbols")
+async def get_all_symbols(
+    request: Request,
+    market: Optional[str] = None,
+    fields: Optional[str] = None,
+    market_detail: Optional[str] = None,
+    code_prefix: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=5000)
+):
+    """모든 시장의 종목 코드 목록 조회 (ETag/Last-Modified 조건부 요청, 필드 선택/필터/커서 페이지 지원)"""
     try:
-        df = get_all_stock_symbols()
+        if market and market.upper() not in ["KOSPI", "KOSDAQ"]:
+            raise HTTPException(status_code=400, detail=f"유효하지 않은 시장입니다. KOSPI 또는 KOSDAQ를 사용하세요.")
+            
+        return _symbol_list_response(
+            request,
+            market.upper() if market else None,
+            fields=_parse_fields(fields),
+            market_detail=market_detail,
+            code_prefix=code_prefix,
+            cursor=cursor,
+            limit=limit
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"종목 코드 조회 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"종목 코드 조회 중 오류가 발생했습니다: {str(e)}")
+
+# 일봉 조회 API 추가
+@router.get("/bars/date/{trade_date}")
+def get_cross_section(
+    trade_date: str,
+    fields: Optional[str] = None,
+    code_prefix: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=5000),
+    query = Depends(get_bar_query)
+):
+    """특정 거래일의 전 종목 일봉 조회 (종목코드 오름차순, cursor는 직전 페이지 마지막 종목코드)
+    
+    캐시에 없으면 전 종목 파일을 읽으므로 이벤트 루프 대신 스레드 풀에서 실행되도록 일반 함수로 둡니다.
+    """
+    import numpy as np
+    from app.services.bar_query import bars_to_records, paginate_bars
+    
+    try:
+        datetime.strptime(trade_date, "%Y%m%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="날짜 형식이 잘못되었습니다. YYYYMMDD 형식을 사용하세요.")
         
-        return {
+    try:
+        bars = query.get_cross_section(trade_date)
+        mask = np.char.startswith(bars["stock_code"], code_prefix) if code_prefix else None
+        page = paginate_bars(bars, "stock_code", cursor, limit, mask)
+        
+        return FastJSONResponse({
             "status": "success",
-            "count": len(df),
-            "symbols": df.to_dict('records')
-        }
+            "date": trade_date,
+            "count": len(page["bars"]),
+            "total": page["total"],
+            "next_cursor": page["next_cursor"],
+            "bars": bars_to_records(page["bars"], _parse_fields(fields))
+        })
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"종목 코드 조회 오류: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"종목 코드 조회 중 오류가 발생했습니다: {str(e)}") 
\ No newline at end of file
+        logger.error(f"일자별 일봉 조회 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"일봉 조회 중 오류가 발생했습니다: {str(e)}")
+
+@router.get("/bars/{stock_code}")
+def get_bars(
+    stock_code: str,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    fields: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=5000),
+    query = Depends(get_bar_query)
+):
+    """종목 일봉 기간 조회 (거래일 오름차순, cursor는 직전 페이지 마지막 거래일, 스레드 풀에서 실행)"""
+    from app.services.bar_query import bars_to_records, paginate_bars
+    
+    try:
+        for date in (from_date, to_date, cursor):
+            if date:
+                datetime.strptime(date, "%Y%m%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="날짜 형식이 잘못되었습니다. YYYYMMDD 형식을 사용하세요.")
+        
+    try:
+        bars = query.get_series(stock_code, from_date, to_date)
+        page = paginate_bars(bars, "date", cursor, limit)
+        
+        return FastJSONResponse({
+            "status": "success",
+            "stock_code": stock_code,
+            "count": len(page["bars"]),
+            "total": page["total"],
+            "next_cursor": page["next_cursor"],
+            "bars": bars_to_records(page["bars"], _parse_fields(fields))
+        })
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"종목 일봉 조회 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"일봉 조회 중 오류가 발생했습니다: {str(e)}")
+
+@router.get("/bars/{stock_code}/minutes")
+async def get_minute_bars(
+    stock_code: str,
+    date: Optional[str] = None,
+    from_time: Optional[str] = None,
+    to_time: Optional[str] = None,
+    fields: Optional[str] = None,
+    store = Depends(get_minute_store)
+):
+    """종목 분봉 조회 (date는 YYYYMMDD이며 기본값은 오늘, from_time/to_time은 HHMM)"""
+    from app.services.bar_query import bars_to_records
+    from app.services.minute_bar_store import minute_key
+    
+    trade_date = date or datetime.now(pytz.timezone(TIMEZONE)).strftime("%Y%m%d")
+    try:
+        datetime.strptime(trade_date, "%Y%m%d")
+        for hour in (from_time, to_time):
+            if hour:
+                datetime.strptime(hour, "%H%M")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="날짜/시각 형식이 잘못되었습니다. date는 YYYYMMDD, from_time/to_time은 HHMM 형식을 사용하세요.")
+        
+    try:
+        bars = store.read(
+            stock_code,
+            [trade_date],
+            minute_key(trade_date, from_time) if from_time else None,
+            minute_key(trade_date, to_time) if to_time else None
+        )
+        return FastJSONResponse({
+            "status": "success",
+            "stock_code": stock_code,
+            "date": trade_date,
+            "count": len(bars),
+            "bars": bars_to_records(bars, _parse_fields(fields))
+        })
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"종목 분봉 조회 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"분봉 조회 중 오류가 발생했습니다: {str(e)}")
+
+@router.get("/realtime/{stock_code}")
+async def get_realtime_bars(stock_code: str, reader = Depends(get_realtime_snapshot)):
+    """실시간 구독 종목의 진행 중 1분봉과 당일 일봉 (실시간 워커가 기록한 스냅숏)"""
+    try:
+        snapshot = reader.load()
+    except Exception as e:
+        logger.error(f"실시간 스냅숏 조회 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"실시간 바 조회 중 오류가 발생했습니다: {str(e)}")
+    if snapshot is None:
+        raise HTTPException(status_code=503, detail="실시간 워커가 실행 중이 아닙니다.")
+        
+    bars = snapshot["symbols"].get(stock_code.zfill(6))
+    if bars is None:
+        raise HTTPException(status_code=404, detail=f"실시간 구독 종목이 아닙니다: {stock_code}")
+    return {
+        "status": "success",
+        "stock_code": stock_code.zfill(6),
+        "minute": bars["minute"],
+        "daily": bars["daily"],
+        "updated_at": snapshot["updated_at"],
+        "snapshot_age_seconds": round(max(time.time() - snapshot["written_at"], 0), 3)
+    }
+
+@router.get("/cache/stats")
+async def get_cache_stats(query = Depends(get_bar_query)):
+    """조회 캐시 통계 (적중률, 제거 횟수)"""
+    return {
+        "status": "success",
+        "cache": query.cache.stats()
+    }
+
+@router.get("/export")
+async def export_bars(
+    market: Optional[str] = None,
+    codes: Optional[str] = None,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    export_format: str = Query("csv", alias="format"),
+    compression: Optional[str] = None,
+    exporter = Depends(get_bar_exporter)
+):
+    """일봉 대량 내보내기 (CSV/NDJSON/Arrow 스트리밍, gzip/zstd 압축 선택)"""
+    from app.services.bar_export import ExportError
+    
+    try:
+        if market and market.upper() not in ["KOSPI", "KOSDAQ"]:
+            raise HTTPException(status_code=400, detail=f"유효하지 않은 시장입니다. KOSPI 또는 KOSDAQ를 사용하세요.")
+        for date in (from_date, to_date):
+            if date:
+                datetime.strptime(date, "%Y%m%d")
+                
+        export_format = export_format.lower()
+        compression = compression.lower() if compression else None
+        exporter.validate(export_format, compression)
+        
+        code_list = [code.strip() for code in codes.split(",") if code.strip()] if codes else None
+        stream = exporter.stream(
+            export_format=export_format,
+            compression=compression,
+            market=market.upper() if market else None,
+            codes=code_list,
+            from_date=from_date,
+            to_date=to_date
+        )
+        
+        return StreamingResponse(
+            stream,
+            media_type=exporter.media_type(export_format, compression),
+            headers={"Content-Disposition": f'attachment; filename="{exporter.file_name(export_format, compression)}"'}
+        )
+    except HTTPException:
+        raise
+    except ExportError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="날짜 형식이 잘못되었습니다. YYYYMMDD 형식을 사용하세요.")
+    except Exception as e:
+        logger.error(f"일봉 내보내기 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"일봉 내보내기 중 오류가 발생했습니다: {str(e)}")
\ No newline at end of file
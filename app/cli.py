@@ -0,0 +1,590 @@
+"""명령줄 수집 도구
+
+API 서버 없이 수집/백필/병합/종목 코드 갱신/처리량 측정을 실행합니다. 수집 워커와 같은 `DataCollector`와
+바 저장소를 사용하므로 결과는 API로 수집한 것과 같고, cron/systemd에서 대량 백필을 돌릴 때 사용합니다.
+로그는 표준 오류와 로그 파일에, 실행 결과 요약은 표준 출력에 JSON으로 씁니다.
+
+실행:
+    python -m app.cli collect --date 20261019
+    python -m app.cli backfill --from 20250101 --to 20251231 --processes 4 --rate 15 --resume
+    python -m app.cli collect --date 20261019 --format arrow --compression zstd
+    python -m app.cli merge --format arrow --compression zstd --output merged.arrow.zst
+    python -m app.cli symbols --update
+    python -m app.cli benchmark --limit 50 --concurrency 8
+    python -m app.cli coordinate --from 20250101 --to 20251231 --listen 0.0.0.0:8765 --local-workers 2
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import pytz
+from dotenv import load_dotenv
+
+from app.core.config import (
+    MARKETS, TIMEZONE, DATA_STORAGE_PATH, KIS_RATE_LIMIT_PER_SECOND, CLI_CHECKPOINT_PATH, CLI_CHECKPOINT_SYMBOLS,
+    SHARD_DB_PATH, SHARD_OUTPUT_PATH, SHARD_WINDOW_DAYS, SHARD_SYMBOL_BUCKETS, SHARD_WORKER_TIMEOUT_SECONDS,
+    SHARD_POLL_SECONDS,
+)
+from app.services.bar_export import EXPORT_COMPRESSIONS, EXPORT_FORMATS, BarExporter, ExportError
+from app.services.data_collector import DataCollector
+from app.services.korea_investment_api import set_rate_limit
+from app.services.telegram_service import dispatcher as notifications
+from app.utils.logging_config import setup_logging
+from app.utils.progress import track_progress
+
+logger = logging.getLogger("app.cli")
+
+# 종목 조회 동시 스레드 수 기본값 (DataCollector.fetch_workers와 같음)
+DEFAULT_CONCURRENCY = 3
+
+
+class Checkpoint:
+    """백필 재개용 완료 종목 기록
+
+    프로세스(샤드)마다 `{이름}.{샤드}.json` 파일에 기록하고, 재개할 때는 같은 이름의 파일을 모두 합치므로
+    프로세스 수를 바꿔 다시 실행해도 됩니다. 종목 묶음(`CLI_CHECKPOINT_SYMBOLS`)이 바 저장소에 반영될 때마다 기록합니다.
+    """
+
+    def __init__(self, name: str, shard: int, root: Path = CLI_CHECKPOINT_PATH):
+        self.root = Path(root)
+        self.path = self.root / f"{name}.{shard}.json"
+        self.done: Set[str] = set(_read_checkpoint(self.path))
+
+    @staticmethod
+    def completed(name: str, root: Path = CLI_CHECKPOINT_PATH) -> Set[str]:
+        """같은 이름의 모든 샤드에서 완료한 종목"""
+        done: Set[str] = set()
+        for path in Path(root).glob(f"{name}.*.json"):
+            done.update(_read_checkpoint(path))
+        return done
+
+    @staticmethod
+    def clear(name: str, root: Path = CLI_CHECKPOINT_PATH):
+        for path in Path(root).glob(f"{name}.*.json"):
+            path.unlink()
+
+    def add(self, codes: Iterable[str]):
+        self.done.update(codes)
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({
+            "done": sorted(self.done),
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+        }))
+        os.replace(tmp_path, self.path)
+
+
+def _read_checkpoint(path: Path) -> List[str]:
+    try:
+        return json.loads(path.read_text())["done"]
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"체크포인트 파일을 읽을 수 없습니다: {path} ({str(e)})")
+        return []
+
+
+def _today() -> str:
+    return datetime.now(pytz.timezone(TIMEZONE)).strftime("%Y%m%d")
+
+
+def _split(value: Optional[str]) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()] if value else []
+
+
+def _print(result: Any):
+    print(json.dumps(result, ensure_ascii=False, indent=2, default=str))
+
+
+async def _load_items(collector: DataCollector, markets: List[str], codes: List[str]) -> List[tuple]:
+    """수집할 (시장, 종목) 목록 (종목 마스터 기준, codes가 있으면 그 종목만)"""
+    wanted = {code.zfill(6) for code in codes}
+    items = []
+    for market in markets:
+        for item in await collector.korea_api.get_stock_item_list(market):
+            if not wanted or str(item["stock_code"]).zfill(6) in wanted:
+                items.append((market, item))
+    if wanted:
+        missing = wanted - {str(item["stock_code"]).zfill(6) for _, item in items}
+        if missing:
+            logger.warning(f"종목 마스터에 없는 종목은 건너뜁니다: {', '.join(sorted(missing))}")
+    return items
+
+
+def _init_process(log_level: int):
+    """수집 프로세스 초기화 (spawn으로 시작한 프로세스)"""
+    load_dotenv()
+    setup_logging(log_level, console_stream="ext://sys.stderr")
+
+
+def _run_shard(shard: int, items: Dict[str, List[dict]], from_date: str, to_date: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """프로세스 하나의 수집 (프로세스 진입점)"""
+    set_rate_limit(options["rate"])
+    try:
+        return asyncio.run(_collect_shard(shard, items, from_date, to_date, options))
+    finally:
+        notifications.stop()
+
+
+async def _collect_shard(shard: int, items: Dict[str, List[dict]], from_date: str, to_date: str,
+                         options: Dict[str, Any]) -> Dict[str, Any]:
+    """종목 묶음 단위로 조회 → 품질 검사 → 바 저장소 반영, 묶음마다 성공한 종목만 체크포인트에 기록"""
+    collector = DataCollector()
+    collector.fetch_workers = options["concurrency"]
+    checkpoint = Checkpoint(options["checkpoint"], shard, options["checkpoint_root"])
+    summary = {"shard": shard, "symbols": 0, "rows": 0, "stored": 0, "calls": 0, "errors": 0, "failed_symbols": 0}
+
+    with track_progress() as progress:
+        for market, market_items in items.items():
+            for start in range(0, len(market_items), CLI_CHECKPOINT_SYMBOLS):
+                chunk = market_items[start:start + CLI_CHECKPOINT_SYMBOLS]
+                try:
+                    rows, stored, failed = await collector.collect_into_store(market, chunk, from_date, to_date)
+                except Exception as e:
+                    logger.error(f"{market} 종목 묶음 수집 실패 (샤드 {shard}, {len(chunk)}종목): {str(e)}")
+                    summary["failed_symbols"] += len(chunk)
+                    continue
+                succeeded = [code for code in (str(item["stock_code"]).zfill(6) for item in chunk) if code not in failed]
+                summary["symbols"] += len(succeeded)
+                summary["failed_symbols"] += len(failed)
+                summary["rows"] += rows
+                summary["stored"] += stored
+                # 실패한 종목은 --resume 때 다시 수집
+                checkpoint.add(succeeded)
+        snapshot = progress.snapshot()
+
+    summary["calls"] = snapshot["calls"]
+    summary["errors"] = snapshot["errors"]
+    return summary
+
+
+def _collect(args, from_date: str, to_date: str) -> int:
+    """기간 수집 (collect, backfill 공통): 종목을 프로세스 수만큼 나눠 동시에 수집
+
+    --format을 주면 수집을 마친 뒤 수집 기간·종목의 일봉을 바 저장소에서 그 형식의 파일로 내보냅니다.
+    """
+    started = time.perf_counter()
+    markets = _split(args.markets) or MARKETS
+    exporter = None
+    if args.format:
+        if args.output == "-":
+            logger.error("수집 결과 요약을 표준 출력에 쓰므로 --output -는 merge 명령에서만 사용할 수 있습니다.")
+            return 2
+        exporter = BarExporter(DataCollector().bar_store)
+        try:
+            exporter.validate(args.format, args.compression)
+        except ExportError as e:
+            logger.error(str(e))
+            return 2
+    items = asyncio.run(_load_items(DataCollector(), markets, _split(args.codes)))
+
+    name = f"daily_{from_date}_{to_date}"
+    if args.resume:
+        done = Checkpoint.completed(name, args.checkpoint_dir)
+    else:
+        Checkpoint.clear(name, args.checkpoint_dir)
+        done = set()
+    pending = [(market, item) for market, item in items if str(item["stock_code"]).zfill(6) not in done]
+    logger.info(f"수집 시작: {from_date} ~ {to_date}, {len(pending)}종목 (완료 {len(items) - len(pending)}종목 건너뜀)")
+
+    processes = max(1, min(args.processes, len(pending)))
+    shards: List[Dict[str, List[dict]]] = [{} for _ in range(processes)]
+    for index, (market, item) in enumerate(pending):
+        shards[index % processes].setdefault(market, []).append(item)
+    options = {
+        "concurrency": args.concurrency,
+        "rate": args.rate / processes,
+        "checkpoint": name,
+        "checkpoint_root": str(args.checkpoint_dir),
+    }
+
+    if processes == 1:
+        summaries = [_run_shard(0, shards[0], from_date, to_date, options)]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_process,
+            initargs=(args.log_level,),
+        ) as pool:
+            futures = [
+                pool.submit(_run_shard, shard, shard_items, from_date, to_date, options)
+                for shard, shard_items in enumerate(shards)
+            ]
+            summaries = [future.result() for future in futures]
+
+    result = {"from_date": from_date, "to_date": to_date, "processes": processes, "skipped": len(items) - len(pending)}
+    for key in ("symbols", "rows", "stored", "calls", "errors", "failed_symbols"):
+        result[key] = sum(summary[key] for summary in summaries)
+    if exporter is not None:
+        chunks = exporter.stream(
+            args.format, args.compression, markets[0] if len(markets) == 1 else None, _split(args.codes) or None,
+            from_date, to_date,
+        )
+        result.update(_write_chunks(chunks, _export_path(args, f"daily_{from_date}_{to_date}")))
+    result["seconds"] = round(time.perf_counter() - started, 2)
+    _print(result)
+    return 1 if result["failed_symbols"] else 0
+
+
+def cmd_collect(args) -> int:
+    """하루치 수집 (기본값 오늘)"""
+    date = args.date or _today()
+    return _collect(args, date, date)
+
+
+def cmd_backfill(args) -> int:
+    """기간 백필"""
+    return _collect(args, args.from_date, args.to_date or _today())
+
+
+def cmd_merge(args) -> int:
+    """바 저장소 일봉을 파일 하나로 내보내기 (--pattern이면 수집 CSV 병합)"""
+    collector = DataCollector()
+    if args.pattern:
+        file_path = asyncio.run(collector.merge_collected_data(args.pattern))
+        _print({"file_path": str(file_path) if file_path else None})
+        return 0 if file_path else 1
+
+    exporter = BarExporter(collector.bar_store)
+    try:
+        exporter.validate(args.format, args.compression)
+    except ExportError as e:
+        logger.error(str(e))
+        return 2
+
+    chunks = exporter.stream(
+        args.format, args.compression, args.market, _split(args.codes) or None, args.from_date, args.to_date
+    )
+    if args.output == "-":
+        for chunk in chunks:
+            sys.stdout.buffer.write(chunk)
+        sys.stdout.buffer.flush()
+        return 0
+
+    _print(_write_chunks(chunks, _export_path(args, f"merged_stock_data_{_today()}")))
+    return 0
+
+
+def _export_path(args, default_name: str) -> Path:
+    """내보낼 파일 경로 (--output이 없으면 DATA_STORAGE_PATH/{default_name}.{형식}[.압축])"""
+    suffix = EXPORT_COMPRESSIONS[args.compression][1] if args.compression else ""
+    return Path(args.output or Path(DATA_STORAGE_PATH) / f"{default_name}.{args.format}{suffix}")
+
+
+def _write_chunks(chunks: Iterable[bytes], output: Path) -> Dict[str, Any]:
+    """내보내기 청크를 임시 파일에 쓴 뒤 교체, 경로와 크기 반환"""
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_name(output.name + ".tmp")
+    total = 0
+    with open(tmp_path, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+            total += len(chunk)
+    os.replace(tmp_path, output)
+    return {"file_path": str(output), "bytes": total}
+
+
+def cmd_symbols(args) -> int:
+    """종목 코드 목록 갱신(--update) 또는 출력"""
+    if args.update:
+        from app.utils.stock_symbols import update_stock_symbols
+        results = update_stock_symbols()
+        diff = results.pop("diff")
+        results.update({key: len(value) for key, value in diff.items()})
+        _print(results)
+        return 0
+
+    from app.utils.symbol_master import symbol_master
+    df = symbol_master.get(args.market)
+    if args.format == "json":
+        _print(df.to_dict("records"))
+    elif args.format == "csv":
+        df.to_csv(sys.stdout, index=False)
+    else:
+        print(df.to_string(index=False))
+    return 0
+
+
+def cmd_benchmark(args) -> int:
+    """일봉 조회 처리량 측정 (저장하지 않음): 동시 스레드 수와 호출 한도에 따른 종목/호출 처리 속도"""
+    collector = DataCollector()
+    collector.fetch_workers = args.concurrency
+    set_rate_limit(args.rate)
+    date = args.date or _today()
+    items = [item for _, item in asyncio.run(_load_items(collector, [args.market], _split(args.codes)))][:args.limit]
+
+    started = time.perf_counter()
+    with track_progress() as progress:
+        df = asyncio.run(collector.fetch_market_frame(args.market, items, date, date))
+        snapshot = progress.snapshot()
+    elapsed = time.perf_counter() - started
+
+    _print({
+        "market": args.market,
+        "date": date,
+        "symbols": len(items),
+        "rows": len(df),
+        "calls": snapshot["calls"],
+        "errors": snapshot["errors"],
+        "concurrency": args.concurrency,
+        "rate": args.rate,
+        "seconds": round(elapsed, 2),
+        "symbols_per_sec": round(len(items) / elapsed, 2) if elapsed > 0 else None,
+        "calls_per_sec": round(snapshot["calls"] / elapsed, 2) if elapsed > 0 else None,
+    })
+    return 0
+
+
+def _serve(app, listen: str):
+    """코디네이터 HTTP 서버를 백그라운드 스레드로 시작 (포트 0이면 빈 포트), (서버, 주소) 반환"""
+    import uvicorn
+
+    host, _, port = listen.rpartition(":")
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host or "127.0.0.1", int(port)))
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning", access_log=False))
+    threading.Thread(target=server.run, kwargs={"sockets": [sock]}, name="coordinator-http", daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    bound_host, bound_port = sock.getsockname()[:2]
+    if bound_host == "0.0.0.0":
+        bound_host = socket.gethostname()
+    return server, f"http://{bound_host}:{bound_port}"
+
+
+class IngestError(RuntimeError):
+    """매니페스트의 파티션을 이 호스트에서 읽을 수 없거나 체크섬이 맞지 않음"""
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _verify_partitions(manifest: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """반영할 파티션 확인 (행이 있는 파티션이 모두 이 호스트에 있고 체크섬이 맞아야 함)
+
+    Raises:
+        IngestError: 없는 파티션이나 체크섬이 다른 파티션이 있는 경우 (하나도 반영하지 않음)
+    """
+    partitions = [partition for partition in manifest["partitions"] if partition["rows"]]
+    problems = []
+    for partition in partitions:
+        path = Path(partition["path"])
+        if not path.exists():
+            problems.append(f"파티션 파일이 이 호스트에 없습니다: {path} (워커 호스트: {partition.get('host')})")
+        elif _sha256(path) != partition.get("sha256"):
+            problems.append(f"파티션 체크섬이 매니페스트와 다릅니다: {path}")
+    if problems:
+        for problem in problems:
+            logger.error(problem)
+        raise IngestError(f"반영할 수 없는 파티션 {len(problems)}개: {problems[0]}")
+    return partitions
+
+
+def _ingest(collector: DataCollector, manifest: Dict[str, Any]) -> int:
+    """매니페스트의 파티션을 이 호스트의 바 저장소에 반영, 바뀐 행 수 반환
+
+    모든 파티션을 먼저 확인하므로 하나라도 없거나 체크섬이 다르면 아무것도 반영하지 않고 IngestError를 냅니다.
+    """
+    import pandas as pd
+
+    stored = 0
+    for partition in _verify_partitions(manifest):
+        path = Path(partition["path"])
+        df = pd.read_csv(path, dtype={"거래일": str, "종목코드": str}, encoding="utf-8-sig")
+        for market, market_df in df.groupby("시장구분"):
+            stored += collector.store_frame(market_df.reset_index(drop=True), market)
+    return stored
+
+
+def cmd_coordinate(args) -> int:
+    """분산 수집 코디네이터: 작업 공간을 샤드로 나눠 워커에 배정하고, 모두 끝나면 매니페스트 기록"""
+    from app.api.coordinator import create_app
+    from app.services.shard_coordinator import COMMITTED, FAILED, ShardCoordinator, partition_work
+
+    started = time.perf_counter()
+    collector = DataCollector()
+    coordinator = ShardCoordinator(args.db, args.output, args.worker_timeout)
+    if args.run_id:
+        run_id = args.run_id
+        if coordinator.status(run_id) is None:
+            logger.error(f"실행을 찾을 수 없습니다: {run_id}")
+            return 2
+    elif not args.from_date:
+        logger.error("--from 또는 --run-id를 지정해야 합니다.")
+        return 2
+    else:
+        to_date = args.to_date or _today()
+        grouped: Dict[str, List[dict]] = {}
+        for market, item in asyncio.run(_load_items(collector, _split(args.markets) or MARKETS, _split(args.codes))):
+            grouped.setdefault(market, []).append(item)
+        shards = partition_work(grouped, args.from_date, to_date, args.window_days, args.buckets)
+        run_id = coordinator.create_run(shards, {
+            "from_date": args.from_date, "to_date": to_date, "window_days": args.window_days, "buckets": args.buckets,
+            "symbols": sum(len(items) for items in grouped.values()),
+        })
+
+    server, url = _serve(create_app(coordinator, run_id), args.listen)
+    logger.info(f"코디네이터 시작: {url} (실행: {run_id})")
+    workers = []
+    for index in range(args.local_workers):
+        workers.append(subprocess.Popen([
+            sys.executable, "-m", "app.workers.shard_worker", "--coordinator", url,
+            "--worker-id", f"{socket.gethostname()}:local-{index}", "--output", str(args.output),
+            "--rate", str(args.rate / args.local_workers), "--concurrency", str(args.concurrency), "--exit-when-done",
+        ]))
+
+    reported = None
+    try:
+        while True:
+            # 워커 요청이 없어도 응답 없는 워커의 샤드를 되돌리도록 주기적으로 확인
+            coordinator.reap()
+            status = coordinator.status(run_id)
+            if status["counts"] != reported:
+                reported = status["counts"]
+                logger.info(f"분산 수집 진행: {run_id} {reported}")
+            if status["status"] in (COMMITTED, FAILED):
+                break
+            time.sleep(args.poll)
+    finally:
+        # 로컬 워커가 실행 종료를 확인하고 끝날 때까지 서버 유지
+        for process in workers:
+            try:
+                process.wait(timeout=args.worker_timeout + args.poll * 5)
+            except subprocess.TimeoutExpired:
+                process.terminate()
+        server.should_exit = True
+
+    result = {
+        "run_id": run_id,
+        "status": status["status"],
+        "manifest_path": status["manifest_path"],
+        "counts": status["counts"],
+        "failed": status["failed"],
+        "workers": [worker["id"] for worker in status["workers"]],
+    }
+    if status["status"] == COMMITTED:
+        manifest = json.loads(Path(status["manifest_path"]).read_text(encoding="utf-8"))
+        result["rows"] = manifest["rows"]
+        if args.ingest:
+            try:
+                result["stored"] = _ingest(collector, manifest)
+            except IngestError as e:
+                result["ingest_error"] = str(e)
+    result["seconds"] = round(time.perf_counter() - started, 2)
+    _print(result)
+    return 0 if status["status"] == COMMITTED and "ingest_error" not in result else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    engine = argparse.ArgumentParser(add_help=False)
+    engine.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="프로세스당 종목 조회 동시 스레드 수")
+    engine.add_argument("--rate", type=float, default=KIS_RATE_LIMIT_PER_SECOND,
+                        help="초당 API 호출 한도 (모든 프로세스 합계, 기본값 KIS_RATE_LIMIT_PER_SECOND)")
+
+    collect = argparse.ArgumentParser(add_help=False, parents=[engine])
+    collect.add_argument("--markets", default=None, help="수집 시장 (쉼표 구분, 기본값 전체)")
+    collect.add_argument("--codes", default=None, help="수집 종목 (쉼표 구분, 기본값 전체)")
+    collect.add_argument("--processes", type=int, default=1, help="수집 프로세스 수 (종목을 나눠 동시에 수집)")
+    collect.add_argument("--resume", action="store_true", help="같은 기간의 이전 실행에서 완료한 종목은 건너뜀")
+    collect.add_argument("--checkpoint-dir", type=Path, default=CLI_CHECKPOINT_PATH, help="재개용 체크포인트 경로")
+    collect.add_argument("--format", choices=sorted(EXPORT_FORMATS), default=None,
+                         help="수집 후 수집 기간 일봉을 이 형식의 파일로 내보내기 (기본값 바 저장소에만 반영)")
+    collect.add_argument("--compression", choices=sorted(EXPORT_COMPRESSIONS), default=None, help="내보낼 파일 압축 방식")
+    collect.add_argument("--output", default=None,
+                         help="내보낼 파일 (기본값 DATA_STORAGE_PATH/daily_{시작일}_{종료일}.{형식})")
+
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="주식 데이터 명령줄 수집 도구")
+    parser.add_argument("--log-level", default="INFO", help="로그 레벨 (DEBUG, INFO, WARNING, ERROR)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("collect", parents=[collect], help="하루치 일봉 수집")
+    command.add_argument("--date", default=None, help="수집일 (YYYYMMDD, 기본값 오늘)")
+    command.set_defaults(func=cmd_collect)
+
+    command = commands.add_parser("backfill", parents=[collect], help="기간 일봉 백필")
+    command.add_argument("--from", dest="from_date", required=True, help="시작일 (YYYYMMDD)")
+    command.add_argument("--to", dest="to_date", default=None, help="종료일 (YYYYMMDD, 기본값 오늘)")
+    command.set_defaults(func=cmd_backfill)
+
+    command = commands.add_parser("merge", help="바 저장소 일봉을 파일 하나로 내보내기")
+    command.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="csv", help="출력 형식")
+    command.add_argument("--compression", choices=sorted(EXPORT_COMPRESSIONS), default=None, help="압축 방식")
+    command.add_argument("--market", choices=MARKETS, default=None, help="시장")
+    command.add_argument("--codes", default=None, help="종목 (쉼표 구분)")
+    command.add_argument("--from", dest="from_date", default=None, help="시작일 (YYYYMMDD)")
+    command.add_argument("--to", dest="to_date", default=None, help="종료일 (YYYYMMDD)")
+    command.add_argument("--output", default=None, help="출력 파일 (-는 표준 출력, 기본값 DATA_STORAGE_PATH/merged_stock_data_{오늘})")
+    command.add_argument("--pattern", default=None, help="바 저장소 대신 이 패턴의 수집 CSV를 병합")
+    command.set_defaults(func=cmd_merge)
+
+    command = commands.add_parser("symbols", help="종목 코드 목록 갱신/출력")
+    command.add_argument("--update", action="store_true", help="종목 코드 목록 갱신 후 변경 요약 출력")
+    command.add_argument("--market", choices=MARKETS, default=None, help="출력할 시장")
+    command.add_argument("--format", choices=["table", "csv", "json"], default="table", help="출력 형식")
+    command.set_defaults(func=cmd_symbols)
+
+    command = commands.add_parser("benchmark", parents=[engine], help="일봉 조회 처리량 측정 (저장하지 않음)")
+    command.add_argument("--market", choices=MARKETS, default=MARKETS[0], help="시장")
+    command.add_argument("--codes", default=None, help="측정 종목 (쉼표 구분)")
+    command.add_argument("--limit", type=int, default=20, help="측정 종목 수")
+    command.add_argument("--date", default=None, help="조회일 (YYYYMMDD, 기본값 오늘)")
+    command.set_defaults(func=cmd_benchmark)
+
+    command = commands.add_parser("coordinate", parents=[engine], help="분산 수집 코디네이터 실행")
+    command.add_argument("--from", dest="from_date", default=None, help="시작일 (YYYYMMDD, --run-id가 없으면 필수)")
+    command.add_argument("--to", dest="to_date", default=None, help="종료일 (YYYYMMDD, 기본값 오늘)")
+    command.add_argument("--markets", default=None, help="수집 시장 (쉼표 구분, 기본값 전체)")
+    command.add_argument("--codes", default=None, help="수집 종목 (쉼표 구분, 기본값 전체)")
+    command.add_argument("--window-days", type=int, default=SHARD_WINDOW_DAYS, help="샤드 기간 구간 (일)")
+    command.add_argument("--buckets", type=int, default=SHARD_SYMBOL_BUCKETS, help="샤드 종목 버킷 수")
+    command.add_argument("--listen", default="127.0.0.1:8765", help="워커 접속 주소 (호스트:포트, 포트 0이면 빈 포트)")
+    command.add_argument("--local-workers", type=int, default=0,
+                         help="이 호스트에서 함께 실행할 워커 프로세스 수 (--rate를 나눠 적용)")
+    command.add_argument("--worker-timeout", type=float, default=SHARD_WORKER_TIMEOUT_SECONDS,
+                         help="이 시간(초) 동안 하트비트가 없는 워커의 샤드는 재배정")
+    command.add_argument("--poll", type=float, default=SHARD_POLL_SECONDS, help="진행 상황 확인 간격 (초)")
+    command.add_argument("--db", type=Path, default=SHARD_DB_PATH, help="코디네이터 상태 DB")
+    command.add_argument("--output", type=Path, default=SHARD_OUTPUT_PATH, help="파티션/매니페스트 경로")
+    command.add_argument("--run-id", default=None, help="새로 나누지 않고 이 실행을 이어서 진행 (코디네이터 재시작)")
+    command.add_argument("--ingest", action="store_true", help="완료 후 파티션을 이 호스트의 바 저장소에 반영")
+    command.set_defaults(func=cmd_coordinate)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    args.log_level = logging.getLevelName(args.log_level.upper())
+    if not isinstance(args.log_level, int):
+        args.log_level = logging.INFO
+
+    load_dotenv()
+    setup_logging(args.log_level, console_stream="ext://sys.stderr")
+    try:
+        return args.func(args)
+    finally:
+        notifications.stop()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
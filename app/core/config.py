@@ -10,23 +10,169 @@ KOREA_INV_APPKEY = os.getenv("KOREA_INV_APPKEY")
 KOREA_INV_APPSECRET = os.getenv("KOREA_INV_APPSECRET")
 KOREA_INV_ACCOUNT = os.getenv("KOREA_INV_ACCOUNT")
 
+# 한국투자증권 API 주소 (모의투자 서버나 테스트용 서버로 바꿀 때)
+KIS_BASE_URL = os.getenv("KIS_BASE_URL", "https://openapi.koreainvestment.com:9443").rstrip("/")
+
+# 한국투자증권 API 접근 토큰 캐시 파일 (같은 호스트의 프로세스가 공유)
+KIS_TOKEN_CACHE_PATH = Path(os.getenv(
+    "KIS_TOKEN_CACHE_PATH", str(Path(__file__).resolve().parent.parent / "services" / "token_cache.json")
+))
+
+# 한국투자증권 API 초당 호출 한도 (모든 수집 워커 합계, 일봉/분봉 수집이 함께 사용)
+KIS_RATE_LIMIT_PER_SECOND = float(os.getenv("KIS_RATE_LIMIT_PER_SECOND", 15))
+
 # 텔레그램 봇 설정
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 
+# 텔레그램 알림 묶음 구간 (초, 첫 알림부터 이 시간 동안 들어온 알림을 메시지 하나로), 메시지 간 최소 간격 (초),
+# 전송 재시도 횟수, 전송 대기 알림 최대 수
+TELEGRAM_COALESCE_SECONDS = float(os.getenv("TELEGRAM_COALESCE_SECONDS", 10))
+TELEGRAM_MIN_INTERVAL_SECONDS = float(os.getenv("TELEGRAM_MIN_INTERVAL_SECONDS", 3))
+TELEGRAM_MAX_RETRIES = int(os.getenv("TELEGRAM_MAX_RETRIES", 3))
+TELEGRAM_MAX_PENDING = int(os.getenv("TELEGRAM_MAX_PENDING", 1000))
+
 # 데이터 저장 경로
 DATA_STORAGE_PATH = Path(os.getenv("DATA_STORAGE_PATH", "./data/stock_data"))
 
+# 종목별 바이너리 일봉 저장소 경로
+BAR_STORE_PATH = Path(os.getenv("BAR_STORE_PATH", str(DATA_STORAGE_PATH / "bars")))
+
+# 바 저장소가 memmap으로 열어 두는 최대 종목 수 (초과 시 오래 안 쓴 종목부터 닫음)
+BAR_STORE_MAX_OPEN_SYMBOLS = int(os.getenv("BAR_STORE_MAX_OPEN_SYMBOLS", 256))
+
+# 분봉 저장소 경로 (거래일별 하위 디렉터리)
+MINUTE_BAR_STORE_PATH = Path(os.getenv("MINUTE_BAR_STORE_PATH", str(DATA_STORAGE_PATH / "minute_bars")))
+
+# 분봉 저장소가 열어 두는 지난 거래일 파티션 수 (가장 최근 거래일 파티션은 항상 유지)
+MINUTE_BAR_MAX_OPEN_PARTITIONS = int(os.getenv("MINUTE_BAR_MAX_OPEN_PARTITIONS", 4))
+
+# 장중 분봉 수집 종목 (쉼표 구분, 비어 있으면 장중 수집 안 함), 수집 주기 (초), 수집 시간대 (HHMM, TIMEZONE 기준 평일)
+INTRADAY_SYMBOLS = [code.strip().zfill(6) for code in os.getenv("INTRADAY_SYMBOLS", "").split(",") if code.strip()]
+INTRADAY_INTERVAL_SECONDS = float(os.getenv("INTRADAY_INTERVAL_SECONDS", 60))
+INTRADAY_START = os.getenv("INTRADAY_START", "0900")
+INTRADAY_END = os.getenv("INTRADAY_END", "1535")
+
+# 실시간 체결 수신 (웹소켓) 주소, 구독 종목 (기본값은 INTRADAY_SYMBOLS), 연결당 최대 구독 수
+KIS_WS_URL = os.getenv("KIS_WS_URL", "ws://ops.koreainvestment.com:21000")
+REALTIME_SYMBOLS = [code.strip().zfill(6) for code in os.getenv("REALTIME_SYMBOLS", "").split(",") if code.strip()] or INTRADAY_SYMBOLS
+REALTIME_MAX_SUBSCRIPTIONS = int(os.getenv("REALTIME_MAX_SUBSCRIPTIONS", 41))
+
+# 실시간 집계: 완료 분봉 대기 버퍼 크기 (분봉 수), 저장 주기 (초), 진행 중 바 스냅숏 기록 주기 (초), 재연결 최대 대기 (초)
+REALTIME_RING_SIZE = int(os.getenv("REALTIME_RING_SIZE", 4096))
+REALTIME_FLUSH_SECONDS = float(os.getenv("REALTIME_FLUSH_SECONDS", 10))
+REALTIME_SNAPSHOT_SECONDS = float(os.getenv("REALTIME_SNAPSHOT_SECONDS", 1))
+REALTIME_RECONNECT_MAX_SECONDS = float(os.getenv("REALTIME_RECONNECT_MAX_SECONDS", 30))
+
+# 실시간 당일 일봉 확정 시각 (HHMM): 장 마감(INTRADAY_END) 때 잠정 일봉을 쓰고, 시간외 거래가 끝난 이 시각에 다시 써서 확정
+REALTIME_DAILY_CLOSE = os.getenv("REALTIME_DAILY_CLOSE", "1805")
+
+# 진행 중 바 스냅숏 파일 (실시간 워커가 기록, API가 조회)
+REALTIME_SNAPSHOT_PATH = Path(os.getenv("REALTIME_SNAPSHOT_PATH", str(DATA_STORAGE_PATH / "realtime_bars.json")))
+
+# 조회 캐시 최대 용량 (바이트, 기본 256MB)
+SERIES_CACHE_MAX_BYTES = int(os.getenv("SERIES_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# 품질 검사 격리 데이터 저장 경로
+QUARANTINE_PATH = Path(os.getenv("QUARANTINE_PATH", str(DATA_STORAGE_PATH / "quarantine")))
+
+# 품질 검사: 전일 종가 대비 급변 판정 배수
+QUALITY_PRICE_JUMP_RATIO = float(os.getenv("QUALITY_PRICE_JUMP_RATIO", 10.0))
+
+# 스트리밍 내보내기 청크 크기 (행 수)
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", 50000))
+
+# 응답 압축 최소 크기 (바이트, 이보다 작은 응답은 압축하지 않음)
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", 1024))
+
+# 압축 결과 캐시 크기 (강한 ETag가 있는 응답의 압축 본문을 경로/쿼리/ETag/압축 방식별로 재사용, 0이면 사용 안 함)
+COMPRESSION_CACHE_ENTRIES = int(os.getenv("COMPRESSION_CACHE_ENTRIES", 32))
+
+# 작업 큐 (SQLite) 경로
+JOB_QUEUE_PATH = Path(os.getenv("JOB_QUEUE_PATH", str(DATA_STORAGE_PATH / "jobs.db")))
+
+# 작업 임대 시간 (초, 워커는 이 시간의 1/3마다 하트비트로 연장)
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", 60))
+
+# 작업 최대 시도 횟수와 재시도 기본 지연 (초, 시도마다 2배)
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+JOB_RETRY_DELAY_SECONDS = float(os.getenv("JOB_RETRY_DELAY_SECONDS", 30))
+
+# 작업 완료 웹훅: 서명 비밀키 (비어 있으면 서명 헤더 없이 전송), 최대 시도 횟수, 재시도 기본 지연 (초, 시도마다 2배),
+# 요청 제한 시간 (초), 재시도 대기 건 확인 주기 (초)
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")
+WEBHOOK_MAX_ATTEMPTS = int(os.getenv("WEBHOOK_MAX_ATTEMPTS", 5))
+WEBHOOK_RETRY_DELAY_SECONDS = float(os.getenv("WEBHOOK_RETRY_DELAY_SECONDS", 5))
+WEBHOOK_TIMEOUT_SECONDS = float(os.getenv("WEBHOOK_TIMEOUT_SECONDS", 10))
+WEBHOOK_POLL_SECONDS = float(os.getenv("WEBHOOK_POLL_SECONDS", 2))
+
+# 수집 워커 프로세스 수
+COLLECTOR_WORKERS = int(os.getenv("COLLECTOR_WORKERS", 1))
+
+# 명령줄 수집 도구 (python -m app.cli): 백필 재개용 체크포인트 경로, 체크포인트 기록 단위 (종목 수)
+CLI_CHECKPOINT_PATH = Path(os.getenv("CLI_CHECKPOINT_PATH", str(DATA_STORAGE_PATH / "checkpoints")))
+CLI_CHECKPOINT_SYMBOLS = int(os.getenv("CLI_CHECKPOINT_SYMBOLS", 50))
+
+# 분산 수집 (python -m app.cli coordinate / app.workers.shard_worker): 코디네이터 상태 DB, 워커 파티션 파일 경로,
+# 작업 공간 분할 단위 (기간 일수, 종목 버킷 수), 해시 링의 워커당 가상 노드 수
+SHARD_DB_PATH = Path(os.getenv("SHARD_DB_PATH", str(DATA_STORAGE_PATH / "shards.db")))
+SHARD_OUTPUT_PATH = Path(os.getenv("SHARD_OUTPUT_PATH", str(DATA_STORAGE_PATH / "shards")))
+SHARD_WINDOW_DAYS = int(os.getenv("SHARD_WINDOW_DAYS", 30))
+SHARD_SYMBOL_BUCKETS = int(os.getenv("SHARD_SYMBOL_BUCKETS", 16))
+SHARD_RING_REPLICAS = int(os.getenv("SHARD_RING_REPLICAS", 64))
+
+# 분산 수집: 이 시간(초) 동안 하트비트가 없는 워커는 죽은 것으로 보고 샤드를 재배정, 워커의 하트비트/대기 간격 (초),
+# 샤드 최대 시도 횟수
+SHARD_WORKER_TIMEOUT_SECONDS = float(os.getenv("SHARD_WORKER_TIMEOUT_SECONDS", 30))
+SHARD_POLL_SECONDS = float(os.getenv("SHARD_POLL_SECONDS", 2))
+SHARD_MAX_ATTEMPTS = int(os.getenv("SHARD_MAX_ATTEMPTS", 3))
+
+# 스케줄러 리더 임대 시간 (초, 리더가 죽으면 이 시간 안에 다른 프로세스가 이어받음)
+LEADER_LEASE_SECONDS = float(os.getenv("LEADER_LEASE_SECONDS", 30))
+
+# 스케줄러 상태 파일 (활성화 여부, 마지막 실행 시각, 모든 프로세스가 공유)
+SCHEDULER_STATE_PATH = Path(os.getenv("SCHEDULER_STATE_PATH", str(DATA_STORAGE_PATH / "scheduler_state.json")))
+
+# 지표 스냅숏 디렉터리 (프로세스별 파일, /metrics가 합산) 와 기록 주기 (초)
+METRICS_PATH = Path(os.getenv("METRICS_PATH", str(DATA_STORAGE_PATH / "metrics")))
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", 5))
+
+# 작업 추적/프로파일링 결과 디렉터리 (작업별 하위 디렉터리)
+PROFILE_PATH = Path(os.getenv("PROFILE_PATH", str(DATA_STORAGE_PATH / "profiles")))
+
+# 추적 파일에 기록할 최대 구간 수, 샘플링 프로파일러 간격 (밀리초), tracemalloc 스택 깊이
+TRACE_MAX_SPANS = int(os.getenv("TRACE_MAX_SPANS", 200000))
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", 5))
+TRACEMALLOC_FRAMES = int(os.getenv("TRACEMALLOC_FRAMES", 10))
+
+# 작업 진행 상황 기록 주기 (초, 바뀐 경우만), 진행 이벤트 스트림의 작업 큐 확인 간격과 연결 유지 간격 (초)
+PROGRESS_PUBLISH_SECONDS = float(os.getenv("PROGRESS_PUBLISH_SECONDS", 1))
+JOB_EVENTS_POLL_SECONDS = float(os.getenv("JOB_EVENTS_POLL_SECONDS", 0.5))
+JOB_EVENTS_KEEPALIVE_SECONDS = float(os.getenv("JOB_EVENTS_KEEPALIVE_SECONDS", 15))
+
+# 같은 위치(파일:줄)에서 반복되는 로그 제한: 구간(초)마다 최대 기록 수 (0이면 제한 없음)
+LOG_SAMPLE_WINDOW_SECONDS = float(os.getenv("LOG_SAMPLE_WINDOW_SECONDS", 60))
+LOG_SAMPLE_BURST = int(os.getenv("LOG_SAMPLE_BURST", 20))
+
 # API 설정
 API_HOST = os.getenv("API_HOST", "0.0.0.0")
 API_PORT = int(os.getenv("API_PORT", 8000))
 
 # 타임존 설정
-TIMEZONE = "Asia/Seoul"
+TIMEZONE = os.getenv("TIMEZONE", "Asia/Seoul")
 
 # 스케줄링 설정 (평일 오후 6시)
 SCHEDULE_TIME = "18:00"
 
+# 수집 실행 일정 (cron: 분 시 일 월 요일, TIMEZONE 기준, 기본값은 평일 SCHEDULE_TIME)
+SCHEDULE_CRON = os.getenv(
+    "SCHEDULE_CRON",
+    f"{int(SCHEDULE_TIME.split(':')[1])} {int(SCHEDULE_TIME.split(':')[0])} * * MON-FRI"
+)
+
+# 서버 중단 중 놓친 실행을 보충할 최대 기간 (일)
+SCHEDULE_CATCHUP_DAYS = int(os.getenv("SCHEDULE_CATCHUP_DAYS", 7))
+
 # 마켓 정보
 MARKETS = ["KOSPI", "KOSDAQ"]
 
@@ -1,12 +1,16 @@
 from fastapi import FastAPI
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
-import uvicorn
 import os
 import logging
 from dotenv import load_dotenv
 
-from app.api.routes import router as api_router
+from app.api.routes import router as api_router, scheduler
 from app.utils.logging_config import setup_logging
+from app.utils.compression import CompressionMiddleware
+from app.utils.fast_json import FastJSONResponse
+from app.utils import metrics
+from app.services.job_queue import job_queue
 
 # 환경 변수 로드
 load_dotenv()
@@ -17,7 +21,8 @@ logger = setup_logging()
 app = FastAPI(
     title="한국 주식시장 OHLCV 데이터 수집 API",
     description="한국투자증권 API를 이용한 KOSPI, KOSDAQ 주식 데이터 수집 서비스",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # CORS 설정
@@ -29,6 +34,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 응답 압축 (gzip/zstd, COMPRESSION_MIN_BYTES 이상)
+app.add_middleware(CompressionMiddleware)
+
+# 요청 수/응답 시간 지표 (라우트 템플릿별, 압축 시간 포함)
+app.add_middleware(metrics.MetricsMiddleware)
+
 # 라우터 등록
 app.include_router(api_router, prefix="/api")
 
@@ -37,18 +48,34 @@ async def root():
     logger.info("메인 페이지 접속")
     return {"message": "한국 주식시장 OHLCV 데이터 수집 API"}
 
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Prometheus 지표 (모든 API/수집 워커 프로세스 합산)"""
+    for status, count in job_queue.stats().items():
+        metrics.JOB_QUEUE_JOBS.labels(status).set(count)
+    last_run = scheduler.get_last_run_time()
+    if last_run:
+        metrics.SCHEDULER_LAST_RUN.set(last_run.timestamp())
+    return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
 @app.on_event("startup")
 async def startup_event():
     """애플리케이션 시작 시 이벤트"""
     logger.info("애플리케이션 시작됨")
+    metrics.registry.start()
+    # 모든 워커 프로세스가 앱 이벤트 루프에서 스케줄러 리더 선출에 참여 (리더가 죽으면 다른 프로세스가 이어받음)
+    scheduler.ensure_loop()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """애플리케이션 종료 시 이벤트"""
+    await scheduler.shutdown()
+    metrics.registry.stop()
     logger.info("애플리케이션 종료됨")
 
 if __name__ == "__main__":
     host = os.getenv("API_HOST", "0.0.0.0")
     port = int(os.getenv("API_PORT", 8000))
     logger.info(f"서버 시작: {host}:{port}")
+    import uvicorn
     uvicorn.run("app.main:app", host=host, port=port, reload=True) 
\ No newline at end of file
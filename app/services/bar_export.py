@@ -0,0 +1,221 @@
+import io
+import logging
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import MARKETS, EXPORT_CHUNK_ROWS
+from app.services.bar_store import BarStore, FRAME_COLUMNS
+from app.utils.symbol_master import symbol_master
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# 내보내기 형식별 Content-Type
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+# 압축 방식별 Content-Type 및 파일 확장자
+EXPORT_COMPRESSIONS = {
+    "gzip": ("application/gzip", ".gz"),
+    "zstd": ("application/zstd", ".zst"),
+}
+
+# 내보내기 컬럼 순서 (수집 CSV와 동일)
+EXPORT_COLUMNS = ["거래일", "종목코드", "종목명", "시장구분", "시가", "고가", "저가", "종가", "거래량"]
+
+# 정수 컬럼 (나머지는 문자열, 거래일은 수집 CSV처럼 YYYYMMDD 문자열)
+INTEGER_COLUMNS = ["시가", "고가", "저가", "종가", "거래량"]
+
+
+class ExportError(ValueError):
+    """내보내기 요청 오류 (지원하지 않는 형식/압축 등)"""
+    pass
+
+
+class BarExporter:
+    """바 저장소 일봉을 청크 단위로 직렬화하는 스트리밍 내보내기"""
+
+    def __init__(self, store: Optional[BarStore] = None, chunk_rows: int = EXPORT_CHUNK_ROWS):
+        self.store = store or BarStore()
+        self.chunk_rows = chunk_rows
+
+    def validate(self, export_format: str, compression: Optional[str] = None):
+        """형식/압축 방식 검증 (스트림 시작 전에 오류를 돌려주기 위함)"""
+        if export_format not in EXPORT_FORMATS:
+            raise ExportError(f"지원하지 않는 형식입니다: {export_format} (csv, ndjson, arrow 중 선택)")
+        if export_format == "arrow" and pa is None:
+            raise ExportError("arrow 형식을 사용하려면 pyarrow 패키지가 필요합니다.")
+        if compression:
+            if compression not in EXPORT_COMPRESSIONS:
+                raise ExportError(f"지원하지 않는 압축 방식입니다: {compression} (gzip, zstd 중 선택)")
+            if compression == "zstd" and zstandard is None:
+                raise ExportError("zstd 압축을 사용하려면 zstandard 패키지가 필요합니다.")
+
+    def media_type(self, export_format: str, compression: Optional[str] = None) -> str:
+        if compression:
+            return EXPORT_COMPRESSIONS[compression][0]
+        return EXPORT_FORMATS[export_format]
+
+    def file_name(self, export_format: str, compression: Optional[str] = None) -> str:
+        name = f"ohlcv_export.{export_format}"
+        if compression:
+            name += EXPORT_COMPRESSIONS[compression][1]
+        return name
+
+    def resolve_symbols(self, market: Optional[str] = None, codes: Optional[List[str]] = None) -> List[Dict[str, str]]:
+        """필터 조건에 맞는 (종목코드, 종목명, 시장) 목록"""
+        markets = [market] if market else MARKETS
+        known = {}
+        for m in markets:
+            for item in symbol_master.get(m).to_dict('records'):
+                known[str(item["stock_code"]).zfill(6)] = {"stock_name": item["stock_name"], "market": m}
+
+        stored = set(self.store.list_symbols())
+        if codes:
+            selected = [code.zfill(6) for code in codes if code.zfill(6) in stored]
+            if market:
+                selected = [code for code in selected if code in known]
+        elif market:
+            selected = sorted(code for code in known if code in stored)
+        else:
+            selected = sorted(stored)
+
+        return [
+            {"stock_code": code, **known.get(code, {"stock_name": "", "market": ""})}
+            for code in selected
+        ]
+
+    def iter_frames(
+        self, symbols: List[Dict[str, str]], from_date=None, to_date=None, descending: bool = False
+    ) -> Iterator[pd.DataFrame]:
+        """종목별 기간 구간을 모아 최대 chunk_rows 행의 데이터프레임으로 반환 (종목 매핑은 열어 두지 않음)
+
+        descending이면 종목마다 최근 거래일부터 내보냅니다 (종목 순서는 그대로).
+        """
+        pending = []
+        pending_rows = 0
+
+        for symbol in symbols:
+            bars = self.store.scan(symbol["stock_code"], from_date, to_date)
+            if len(bars) == 0:
+                continue
+            if descending:
+                bars = bars[::-1]
+            pending.append((symbol, bars))
+            pending_rows += len(bars)
+
+            if pending_rows >= self.chunk_rows:
+                yield self._build_frame(pending)
+                pending = []
+                pending_rows = 0
+
+        if pending:
+            yield self._build_frame(pending)
+
+    def _build_frame(self, pending) -> pd.DataFrame:
+        counts = [len(bars) for _, bars in pending]
+        columns = {
+            column: np.concatenate([bars[field] for _, bars in pending])
+            for column, field in FRAME_COLUMNS.items()
+        }
+        columns["종목코드"] = np.repeat([symbol["stock_code"] for symbol, _ in pending], counts)
+        columns["종목명"] = np.repeat([symbol["stock_name"] for symbol, _ in pending], counts)
+        columns["시장구분"] = np.repeat([symbol["market"] for symbol, _ in pending], counts)
+
+        df = pd.DataFrame(columns)[EXPORT_COLUMNS]
+        df["거래일"] = df["거래일"].astype(str)
+        return df
+
+    def stream(
+        self,
+        export_format: str = "csv",
+        compression: Optional[str] = None,
+        market: Optional[str] = None,
+        codes: Optional[List[str]] = None,
+        from_date=None,
+        to_date=None,
+        descending: bool = False,
+    ) -> Iterator[bytes]:
+        """필터 조건의 일봉을 직렬화된 바이트 청크로 반환 (동기 제너레이터)"""
+        self.validate(export_format, compression)
+
+        symbols = self.resolve_symbols(market, codes)
+        logger.info(f"일봉 내보내기 시작: {len(symbols)}개 종목, 형식 {export_format}, 압축 {compression or '없음'}")
+
+        encoder = {
+            "csv": self._encode_csv,
+            "ndjson": self._encode_ndjson,
+            "arrow": self._encode_arrow,
+        }[export_format]
+
+        chunks = encoder(self.iter_frames(symbols, from_date, to_date, descending))
+        if compression:
+            chunks = _compress(chunks, compression)
+
+        total = 0
+        for chunk in chunks:
+            if chunk:
+                total += len(chunk)
+                yield chunk
+
+        logger.info(f"일봉 내보내기 완료: {total:,}바이트")
+
+    def _encode_csv(self, frames: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+        # BOM 추가 - 수집 CSV와 동일하게 엑셀에서 한글 깨짐 방지
+        yield ("\ufeff" + ",".join(EXPORT_COLUMNS) + "\n").encode("utf-8")
+        for df in frames:
+            yield df.to_csv(index=False, header=False).encode("utf-8")
+
+    def _encode_ndjson(self, frames: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+        for df in frames:
+            text = df.to_json(orient="records", lines=True, force_ascii=False)
+            if not text.endswith("\n"):
+                text += "\n"
+            yield text.encode("utf-8")
+
+    def _encode_arrow(self, frames: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+        schema = pa.schema([(column, pa.int64() if column in INTEGER_COLUMNS else pa.string()) for column in EXPORT_COLUMNS])
+        sink = io.BytesIO()
+        # 결과가 없어도 스키마가 같은 유효한 스트림이 되도록 스키마를 먼저 기록
+        writer = pa.ipc.new_stream(sink, schema)
+        for df in frames:
+            writer.write_batch(pa.RecordBatch.from_pandas(df, schema=schema, preserve_index=False))
+            yield _drain(sink)
+        writer.close()
+        yield _drain(sink)
+
+
+def _drain(sink: io.BytesIO) -> bytes:
+    data = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return data
+
+
+def _compress(chunks: Iterable[bytes], compression: str) -> Iterator[bytes]:
+    """청크마다 flush하는 스트리밍 압축 (첫 바이트가 바로 전송되도록)"""
+    if compression == "gzip":
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+    else:
+        compressor = zstandard.ZstdCompressor(level=3).compressobj()
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        yield compressor.flush()
@@ -0,0 +1,97 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.services.bar_store import BarStore, BAR_DTYPE
+from app.services.series_cache import SeriesCache, series_cache, SERIES, CROSS_SECTION
+
+logger = logging.getLogger(__name__)
+
+# 일자별 단면 레코드 레이아웃 (종목코드 + 일봉 필드)
+CROSS_SECTION_DTYPE = np.dtype([("stock_code", "U6")] + BAR_DTYPE.descr)
+
+
+def bars_to_records(bars: np.ndarray, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """구조화 배열을 JSON 직렬화 가능한 레코드 목록으로 변환 (fields 지정 시 해당 필드만)"""
+    names = list(fields) if fields else list(bars.dtype.names)
+    if fields:
+        unknown = [field for field in fields if field not in bars.dtype.names]
+        if unknown:
+            raise ValueError(f"알 수 없는 필드입니다: {', '.join(unknown)} (사용 가능: {', '.join(bars.dtype.names)})")
+        if len(names) == 1:
+            return [{names[0]: value} for value in bars[names[0]].tolist()]
+        bars = bars[names]
+    return [dict(zip(names, row)) for row in bars.tolist()]
+
+
+def paginate_bars(
+    bars: np.ndarray,
+    key_field: str,
+    cursor=None,
+    limit: Optional[int] = None,
+    mask: Optional[np.ndarray] = None,
+) -> Dict[str, Any]:
+    """키 오름차순 구조화 배열의 커서 페이지 (cursor는 직전 페이지의 마지막 키)"""
+    keys = bars[key_field]
+    if mask is None:
+        mask = np.ones(len(bars), dtype=bool)
+
+    total = int(mask.sum())
+    if not len(keys):
+        return {"total": total, "next_cursor": None, "bars": bars}
+    if cursor is not None:
+        cursor = type(keys[0].item())(cursor)
+    start = int(np.searchsorted(keys, cursor, side="right")) if cursor is not None else 0
+    selected = np.flatnonzero(mask[start:]) + start
+    page = selected[:limit] if limit else selected
+
+    next_cursor = keys[page[-1]].item() if limit and len(selected) > limit else None
+    return {"total": total, "next_cursor": next_cursor, "bars": bars[page]}
+
+
+class BarQueryService:
+    """바 저장소 조회 서비스 (LRU 캐시 경유)"""
+
+    def __init__(self, store: Optional[BarStore] = None, cache: Optional[SeriesCache] = None):
+        self.store = store or BarStore()
+        self.cache = cache or series_cache
+
+    def get_series(self, stock_code: str, from_date=None, to_date=None) -> np.ndarray:
+        """종목 일봉 기간 조회 (종목 전체 시계열을 캐시한 뒤 슬라이스)"""
+        series = self.cache.get_or_load(
+            (SERIES, stock_code),
+            lambda: self.store.scan(stock_code),
+            version=lambda: self.store.signature(stock_code),
+        )
+
+        dates = series["date"]
+        lo = 0 if from_date is None else int(np.searchsorted(dates, int(from_date), side="left"))
+        hi = len(dates) if to_date is None else int(np.searchsorted(dates, int(to_date), side="right"))
+        return series[lo:hi]
+
+    def get_cross_section(self, trade_date) -> np.ndarray:
+        """특정 거래일의 전 종목 일봉 조회 (다른 거래일에 대한 쓰기로는 캐시가 무효화되지 않음)"""
+        trade_date = int(trade_date)
+        return self.cache.get_or_load(
+            (CROSS_SECTION, trade_date),
+            lambda: self._load_cross_section(trade_date),
+            version=lambda: self.store.date_generation(trade_date),
+        )
+
+    def _load_cross_section(self, trade_date: int) -> np.ndarray:
+        codes = []
+        rows = []
+        for stock_code in self.store.list_symbols():
+            bars = self.store.scan(stock_code, trade_date, trade_date)
+            if len(bars):
+                codes.append(stock_code)
+                rows.append(bars[0])
+
+        result = np.empty(len(rows), dtype=CROSS_SECTION_DTYPE)
+        if rows:
+            result["stock_code"] = codes
+            stacked = np.array(rows, dtype=BAR_DTYPE)
+            for field in BAR_DTYPE.names:
+                result[field] = stacked[field]
+        return result
@@ -0,0 +1,463 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import BAR_STORE_PATH, BAR_STORE_MAX_OPEN_SYMBOLS
+from app.services.series_cache import series_cache
+
+try:
+    import fcntl
+except ImportError:  # Windows 환경에서는 프로세스 간 파일 잠금 미지원
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# 일봉 레코드 레이아웃 (고정폭 44바이트, little-endian, 패딩 없음)
+BAR_DTYPE = np.dtype([
+    ("date", "<i4"),
+    ("open", "<i8"),
+    ("high", "<i8"),
+    ("low", "<i8"),
+    ("close", "<i8"),
+    ("volume", "<i8"),
+])
+
+# 날짜 인덱스 레이아웃 (레코드와 같은 순서의 연속된 int32 배열)
+INDEX_DTYPE = np.dtype("<i4")
+
+# 수집 데이터 컬럼 ↔ 레코드 필드 매핑
+FRAME_COLUMNS = {
+    "거래일": "date",
+    "시가": "open",
+    "고가": "high",
+    "저가": "low",
+    "종가": "close",
+    "거래량": "volume",
+}
+
+
+class BarStore:
+    """종목별 고정폭 바이너리 일봉 저장소
+
+    종목마다 `{code}.bar`(레코드)와 `{code}.idx`(날짜 인덱스) 두 파일을 두고,
+    레코드는 NumPy memmap으로 열어 둡니다. 레코드는 날짜 오름차순으로 유지되므로
+    기간 조회는 인덱스에 대한 이진 탐색 두 번과 memmap 슬라이스(복사 없음)로 끝납니다.
+
+    열어 두는 매핑은 최근 사용 순으로 max_open개까지만 유지합니다(매핑마다 파일 디스크립터
+    하나를 점유). 전 종목을 한 번씩 훑는 작업은 매핑 없이 `scan`으로 필요한 구간만 읽습니다.
+    """
+
+    RECORD_DTYPE = BAR_DTYPE
+    INDEX_DTYPE = INDEX_DTYPE
+    KEY_FIELD = "date"
+    DATA_SUFFIX = ".bar"
+    INDEX_SUFFIX = ".idx"
+    GENERATION_FILE = ".generation"
+    DATE_GENERATIONS_FILE = ".date_generations"
+
+    def __init__(self, root: Optional[Path] = None, max_open: Optional[int] = None):
+        self.root = Path(root) if root else Path(BAR_STORE_PATH)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_open = max(1, max_open or BAR_STORE_MAX_OPEN_SYMBOLS)
+        # 종목코드 -> (파일 식별자, 레코드 memmap, 날짜 인덱스), 최근 사용 순
+        self._maps: "OrderedDict[str, Tuple[tuple, np.ndarray, np.ndarray]]" = OrderedDict()
+        self._maps_lock = threading.Lock()
+        self._write_locks: Dict[str, threading.Lock] = {}
+
+    def _data_path(self, stock_code: str) -> Path:
+        return self.root / f"{stock_code}{self.DATA_SUFFIX}"
+
+    def _index_path(self, stock_code: str) -> Path:
+        return self.root / f"{stock_code}{self.INDEX_SUFFIX}"
+
+    def _write_lock(self, stock_code: str) -> threading.Lock:
+        with self._maps_lock:
+            lock = self._write_locks.get(stock_code)
+            if lock is None:
+                lock = self._write_locks[stock_code] = threading.Lock()
+            return lock
+
+    def _empty(self) -> np.ndarray:
+        return np.empty(0, dtype=self.RECORD_DTYPE)
+
+    def _open(self, stock_code: str) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """종목 파일을 memmap으로 열기 (파일이 바뀌지 않았으면 기존 매핑 재사용)"""
+        data_path = self._data_path(stock_code)
+        try:
+            stat = os.stat(data_path)
+        except FileNotFoundError:
+            self._drop(stock_code)
+            return None, None
+
+        size = stat.st_size
+        signature = (stat.st_ino, size, stat.st_mtime_ns)
+        with self._maps_lock:
+            cached = self._maps.get(stock_code)
+            if cached is not None and cached[0] == signature:
+                self._maps.move_to_end(stock_code)
+                return cached[1], cached[2]
+
+        itemsize = self.RECORD_DTYPE.itemsize
+        count = size // itemsize
+        if count == 0:
+            return None, None
+        if size % itemsize:
+            # 쓰기 도중 중단된 마지막 레코드는 무시
+            logger.warning(f"바 파일 끝에 불완전한 레코드가 있습니다: {data_path} ({size % itemsize}바이트)")
+
+        bars = np.memmap(data_path, dtype=self.RECORD_DTYPE, mode="r", shape=(count,))
+        index = self._open_index(stock_code, bars)
+
+        with self._maps_lock:
+            self._maps[stock_code] = (signature, bars, index)
+            self._maps.move_to_end(stock_code)
+            while len(self._maps) > self.max_open:
+                # 호출자에게 넘긴 뷰가 없으면 참조가 사라지는 즉시 매핑과 디스크립터가 닫힘
+                # (mmap.close()를 직접 부르면 아직 쓰이는 뷰가 잘못된 메모리를 가리키게 됨)
+                self._maps.popitem(last=False)
+        return bars, index
+
+    def _drop(self, stock_code: str):
+        """종목 매핑 닫기 (파일이 바뀌었거나 삭제된 경우)"""
+        with self._maps_lock:
+            self._maps.pop(stock_code, None)
+
+    def open_count(self) -> int:
+        """현재 열어 둔 종목 매핑 수"""
+        with self._maps_lock:
+            return len(self._maps)
+
+    def _open_index(self, stock_code: str, bars: np.ndarray) -> np.ndarray:
+        """날짜 인덱스 읽기 (레코드 수와 맞지 않으면 재생성)
+
+        인덱스는 레코드의 1/11 크기라 메모리로 읽어 두고, 매핑당 디스크립터는 레코드 파일 하나만 씁니다.
+        """
+        index_path = self._index_path(stock_code)
+        expected_size = len(bars) * self.INDEX_DTYPE.itemsize
+
+        if not index_path.exists() or os.stat(index_path).st_size != expected_size:
+            logger.warning(f"날짜 인덱스 재생성: {index_path}")
+            keys = np.ascontiguousarray(bars[self.KEY_FIELD], dtype=self.INDEX_DTYPE)
+            tmp_path = index_path.with_suffix(index_path.suffix + ".tmp")
+            keys.tofile(tmp_path)
+            os.replace(tmp_path, index_path)
+            return keys
+
+        return np.fromfile(index_path, dtype=self.INDEX_DTYPE)
+
+    def read(self, stock_code: str, from_date=None, to_date=None) -> np.ndarray:
+        """종목의 일봉 조회
+
+        Args:
+            stock_code: 종목 코드
+            from_date: 조회 시작일(YYYYMMDD), 없으면 처음부터
+            to_date: 조회 종료일(YYYYMMDD), 없으면 끝까지
+
+        Returns:
+            np.ndarray: BAR_DTYPE 구조화 배열 (memmap 뷰, 읽기 전용)
+        """
+        bars, index = self._open(stock_code)
+        if bars is None:
+            return self._empty()
+
+        lo = 0 if from_date is None else int(np.searchsorted(index, int(from_date), side="left"))
+        hi = len(index) if to_date is None else int(np.searchsorted(index, int(to_date), side="right"))
+        return bars[lo:hi]
+
+    def scan(self, stock_code: str, from_date=None, to_date=None, tail: Optional[int] = None) -> np.ndarray:
+        """종목의 일봉 조회 (매핑을 열어 두지 않는 일회성 읽기)
+
+        전 종목 내보내기/단면 조회처럼 종목마다 한 번씩만 읽는 경우에 씁니다. 날짜 인덱스로
+        구간을 찾은 뒤 레코드 파일에서 그 구간만 읽어 오므로 디스크립터를 남기지 않습니다.
+        tail을 주면 구간의 마지막 tail개만 읽습니다 (직전 종가 조회 등).
+
+        Returns:
+            np.ndarray: BAR_DTYPE 구조화 배열 (메모리 복사본)
+        """
+        data_path = self._data_path(stock_code)
+        try:
+            with open(data_path, "rb") as f:
+                count = os.fstat(f.fileno()).st_size // self.RECORD_DTYPE.itemsize
+                try:
+                    index = np.fromfile(self._index_path(stock_code), dtype=self.INDEX_DTYPE)
+                except FileNotFoundError:
+                    index = None
+                if index is None or len(index) != count:
+                    # 인덱스가 어긋난 경우(쓰기 도중 중단)는 레코드를 전부 읽어 키로 탐색
+                    bars = np.fromfile(f, dtype=self.RECORD_DTYPE, count=count)
+                    index = bars[self.KEY_FIELD]
+                else:
+                    bars = None
+
+                lo = 0 if from_date is None else int(np.searchsorted(index, int(from_date), side="left"))
+                hi = count if to_date is None else int(np.searchsorted(index, int(to_date), side="right"))
+                if tail is not None:
+                    lo = max(lo, hi - tail)
+                if bars is not None:
+                    return bars[lo:hi]
+                if hi <= lo:
+                    return self._empty()
+                f.seek(lo * self.RECORD_DTYPE.itemsize)
+                return np.fromfile(f, dtype=self.RECORD_DTYPE, count=hi - lo)
+        except FileNotFoundError:
+            return self._empty()
+
+    def last_key(self, stock_code: str) -> Optional[int]:
+        """마지막으로 저장된 키(거래일) 조회"""
+        _, index = self._open(stock_code)
+        if index is None or len(index) == 0:
+            return None
+        return int(index[-1])
+
+    def signature(self, stock_code: str) -> Optional[tuple]:
+        """종목 파일 식별자 (다른 프로세스의 쓰기 감지용, 파일이 없으면 None)"""
+        try:
+            stat = os.stat(self._data_path(stock_code))
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def generation(self) -> int:
+        """저장소 세대 번호 (어느 종목이든 쓰기가 있으면 증가, 프로세스 간 공유)"""
+        try:
+            return os.stat(self.root / self.GENERATION_FILE).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def date_generation(self, trade_date) -> int:
+        """거래일 세대 번호 (어느 종목이든 그 거래일 레코드가 바뀌면 증가, 프로세스 간 공유)
+
+        일자별 단면 캐시의 버전으로 씁니다. 다른 거래일에 대한 쓰기로는 바뀌지 않습니다.
+        """
+        try:
+            fd = os.open(self.root / self.DATE_GENERATIONS_FILE, os.O_RDONLY)
+        except FileNotFoundError:
+            return 0
+        try:
+            data = os.pread(fd, 8, int(_date_slot(int(trade_date))) * 8)
+        finally:
+            os.close(fd)
+        return int.from_bytes(data, "little") if len(data) == 8 else 0
+
+    def _bump_generation(self, keys: Optional[np.ndarray] = None):
+        """세대 번호 증가 (수정 시각을 이전 값보다 크게 설정, keys가 있으면 해당 거래일 세대 번호도 증가)"""
+        path = self.root / self.GENERATION_FILE
+        path.touch(exist_ok=True)
+        now = max(time.time_ns(), os.stat(path).st_mtime_ns + 1)
+        os.utime(path, ns=(now, now))
+        if keys is not None and len(keys):
+            self._bump_date_generations(keys)
+
+    def _bump_date_generations(self, keys: np.ndarray):
+        """거래일별 세대 번호 파일(거래일마다 int64 칸 하나)에서 바뀐 거래일 칸만 증가"""
+        slots = np.unique(_date_slot(np.asarray(keys, dtype=np.int64)))
+        lo, hi = int(slots[0]), int(slots[-1]) + 1
+        path = self.root / self.DATE_GENERATIONS_FILE
+        with _FileLock(self.root / f"{self.DATE_GENERATIONS_FILE}.lock"):
+            fd = os.open(path, os.O_CREAT | os.O_RDWR, 0o644)
+            try:
+                raw = os.pread(fd, (hi - lo) * 8, lo * 8)
+                counters = np.zeros(hi - lo, dtype="<i8")
+                counters[:len(raw) // 8] = np.frombuffer(raw, dtype="<i8", count=len(raw) // 8)
+                counters[slots - lo] += 1
+                os.pwrite(fd, counters.tobytes(), lo * 8)
+            finally:
+                os.close(fd)
+
+    def list_symbols(self) -> List[str]:
+        """저장된 종목 코드 목록"""
+        return sorted(path.stem for path in self.root.glob(f"*{self.DATA_SUFFIX}"))
+
+    def upsert(self, stock_code: str, bars: np.ndarray) -> Dict[str, Any]:
+        """종목 일봉 저장 (같은 거래일은 덮어쓰기)
+
+        날짜 인덱스로 (종목, 거래일) 위치를 찾아 이미 있는 레코드는 값이 달라진
+        경우에만 제자리에서 덮어쓰고, 마지막 날짜 이후의 새 레코드는 파일 끝에
+        이어 씁니다. 중간 날짜가 새로 들어오는 경우에만 파일을 병합해 교체합니다.
+
+        Returns:
+            dict: inserted/updated/unchanged 건수와 실제로 바뀐 키 배열(changed_keys)
+        """
+        result = {
+            "inserted": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "changed_keys": np.empty(0, dtype=self.INDEX_DTYPE),
+        }
+        if len(bars) == 0:
+            return result
+
+        bars = self._normalize(bars)
+        keys = bars[self.KEY_FIELD]
+
+        with self._write_lock(stock_code), self._file_lock(stock_code):
+            existing, index = self._open(stock_code)
+
+            if existing is None:
+                self._append_tail(stock_code, bars)
+                result["inserted"] = len(bars)
+                changed = np.ones(len(bars), dtype=bool)
+            else:
+                pos = np.searchsorted(index, keys)
+                found = pos < len(index)
+                found[found] = index[pos[found]] == keys[found]
+
+                changed = ~found
+                changed[found] = existing[pos[found]] != bars[found]
+                new_bars = bars[~found]
+
+                if len(new_bars) and new_bars[self.KEY_FIELD][0] <= index[-1]:
+                    # 중간 날짜 삽입: 기존 레코드와 병합 후 교체 (새 값 우선)
+                    merged = self._normalize(np.concatenate([np.asarray(existing), bars]))
+                    self._rewrite(stock_code, merged)
+                else:
+                    update_mask = changed & found
+                    if update_mask.any():
+                        self._write_rows(stock_code, pos[update_mask], bars[update_mask])
+                    if len(new_bars):
+                        self._append_tail(stock_code, new_bars)
+
+                result["inserted"] = int((~found).sum())
+                result["updated"] = int((changed & found).sum())
+                result["unchanged"] = int(len(bars) - changed.sum())
+
+            self._drop(stock_code)
+
+        result["changed_keys"] = np.asarray(keys[changed], dtype=self.INDEX_DTYPE)
+        if len(result["changed_keys"]):
+            self._on_write(stock_code, result["changed_keys"])
+        return result
+
+    def upsert_frame(self, df: pd.DataFrame) -> pd.Series:
+        """수집 데이터프레임(거래일/종목코드/시가/...)을 종목별로 나눠 저장
+
+        Returns:
+            pd.Series: 새로 추가되거나 값이 바뀐 행 마스크 (df와 같은 인덱스)
+        """
+        if df is None or df.empty:
+            return pd.Series(False, index=getattr(df, "index", None), dtype=bool)
+
+        codes = df["종목코드"].astype(str).str.zfill(6)
+        dates = pd.to_numeric(df["거래일"], errors="coerce").fillna(0).astype("int64")
+        changed = pd.Series(False, index=df.index, dtype=bool)
+        totals = {"inserted": 0, "updated": 0, "unchanged": 0}
+
+        for stock_code, group in df.groupby(codes, sort=False):
+            result = self.upsert(stock_code, frame_to_bars(group, self.RECORD_DTYPE))
+            for key in totals:
+                totals[key] += result[key]
+            if len(result["changed_keys"]):
+                changed[group.index] = dates[group.index].isin(result["changed_keys"]).to_numpy()
+
+        logger.info(
+            f"바 저장소 업데이트: {codes.nunique()}개 종목, "
+            f"추가 {totals['inserted']}개, 갱신 {totals['updated']}개, 변경 없음 {totals['unchanged']}개"
+        )
+        return changed
+
+    def _on_write(self, stock_code: str, keys: np.ndarray):
+        """쓰기 후 처리: 변경된 종목/거래일의 조회 캐시 무효화 (다른 프로세스는 파일 식별자/거래일 세대 번호로 감지)"""
+        self._bump_generation(keys)
+        series_cache.invalidate_symbol(stock_code)
+        series_cache.invalidate_dates(keys)
+
+    def _normalize(self, bars: np.ndarray) -> np.ndarray:
+        """키 기준 정렬 및 중복 제거 (같은 키는 마지막 값 유지)"""
+        bars = np.asarray(bars, dtype=self.RECORD_DTYPE)
+        keys = bars[self.KEY_FIELD]
+        if len(bars) > 1 and not np.all(keys[1:] > keys[:-1]):
+            bars = bars[np.argsort(keys, kind="stable")]
+            keys = bars[self.KEY_FIELD]
+            keep = np.append(keys[1:] != keys[:-1], True)
+            bars = bars[keep]
+        return bars
+
+    def _append_tail(self, stock_code: str, bars: np.ndarray):
+        data_path = self._data_path(stock_code)
+        index_path = self._index_path(stock_code)
+
+        # 불완전한 마지막 레코드가 있으면 잘라낸 뒤 이어 쓰기
+        if data_path.exists():
+            size = os.stat(data_path).st_size
+            remainder = size % self.RECORD_DTYPE.itemsize
+            if remainder:
+                os.truncate(data_path, size - remainder)
+
+        with open(data_path, "ab") as f:
+            f.write(bars.tobytes())
+        with open(index_path, "ab") as f:
+            f.write(np.ascontiguousarray(bars[self.KEY_FIELD], dtype=self.INDEX_DTYPE).tobytes())
+
+    def _write_rows(self, stock_code: str, positions: np.ndarray, bars: np.ndarray):
+        """기존 레코드 제자리 덮어쓰기 (날짜 인덱스는 그대로)"""
+        itemsize = self.RECORD_DTYPE.itemsize
+        with open(self._data_path(stock_code), "r+b") as f:
+            fd = f.fileno()
+            for position, record in zip(positions.tolist(), bars):
+                os.pwrite(fd, record.tobytes(), position * itemsize)
+
+    def _rewrite(self, stock_code: str, bars: np.ndarray):
+        data_path = self._data_path(stock_code)
+        index_path = self._index_path(stock_code)
+
+        for path, payload in (
+            (data_path, bars),
+            (index_path, np.ascontiguousarray(bars[self.KEY_FIELD], dtype=self.INDEX_DTYPE)),
+        ):
+            tmp_path = path.with_suffix(path.suffix + ".tmp")
+            payload.tofile(tmp_path)
+            os.replace(tmp_path, path)
+
+    def _file_lock(self, stock_code: str):
+        return _FileLock(self.root / f"{stock_code}.lock")
+
+
+class _FileLock:
+    """프로세스 간 쓰기 잠금 (fcntl 미지원 환경에서는 아무 동작도 하지 않음)"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._fd = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self._fd = os.open(self.path, os.O_CREAT | os.O_RDWR, 0o644)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+def _date_slot(date):
+    """거래일(YYYYMMDD) -> 거래일 세대 번호 파일의 칸 번호 (1900년부터 달마다 31칸, 배열도 가능)"""
+    year, rest = np.divmod(date, 10000)
+    month, day = np.divmod(rest, 100)
+    return np.maximum((year - 1900) * 372 + (month - 1) * 31 + (day - 1), 0)
+
+
+def frame_to_bars(df: pd.DataFrame, dtype: np.dtype = BAR_DTYPE) -> np.ndarray:
+    """수집 데이터프레임을 구조화 배열로 변환"""
+    bars = np.empty(len(df), dtype=dtype)
+    for column, field in FRAME_COLUMNS.items():
+        bars[field] = pd.to_numeric(df[column], errors="coerce").fillna(0).to_numpy()
+    return bars
+
+
+def bars_to_frame(bars: np.ndarray, stock_code: Optional[str] = None) -> pd.DataFrame:
+    """구조화 배열을 수집 데이터와 같은 컬럼의 데이터프레임으로 변환 (복사 발생)"""
+    df = pd.DataFrame({column: np.asarray(bars[field]) for column, field in FRAME_COLUMNS.items()})
+    df["거래일"] = df["거래일"].astype(str)
+    if stock_code is not None:
+        df.insert(1, "종목코드", stock_code)
+    return df
@@ -10,36 +10,49 @@ from functools import partial
 
 from app.services.korea_investment_api import KoreaInvestmentAPI
 from app.services.telegram_service import TelegramService
-from app.core.config import TIMEZONE, MARKETS, DATA_STORAGE_PATH, MAX_STOCK_ITEMS
+from app.services.bar_store import BarStore
+from app.services.minute_bar_store import MinuteBarStore, minute_rows_to_bars
+from app.services.bar_export import BarExporter
+from app.services.data_validator import DataValidator, REFERENCE_PRICE_COLUMN
+from app.services.job_queue import FAILED
+from app.services.pipeline import Pipeline, Stage, StageFailure
+from app.utils.metrics import COLLECTOR_ROWS, COLLECTOR_MERGE_SECONDS
+from app.utils.tracing import span, in_context
+from app.utils.progress import JobCancelled, current_progress, raise_if_cancelled
+from app.core.config import TIMEZONE, MARKETS, DATA_STORAGE_PATH, MAX_STOCK_ITEMS, INTRADAY_SYMBOLS
 
 logger = logging.getLogger(__name__)
 
+# 요약 로그에 나열할 종목 수
+LOG_SAMPLE_CODES = 10
+
+
+def _code_sample(codes: List[str]) -> str:
+    """요약 로그용 종목 코드 나열 (앞의 일부만)"""
+    sample = ", ".join(codes[:LOG_SAMPLE_CODES])
+    return f"{sample} 외 {len(codes) - LOG_SAMPLE_CODES}개" if len(codes) > LOG_SAMPLE_CODES else sample
+
 class DataCollector:
     """주식 데이터 수집 서비스"""
     
     def __init__(self):
         self.korea_api = KoreaInvestmentAPI()
         self.telegram = TelegramService()
+        self.bar_store = BarStore()
+        self._minute_store = None
+        self.validator = DataValidator(bar_store=self.bar_store)
+        self.quality_reports = {}  # 최근 수집 실행의 시장별 품질 보고서
         self.timezone = pytz.timezone(TIMEZONE)
         self.max_concurrent_workers = 5  # 동시 처리 워커 수
+        self.fetch_workers = 3  # 종목 조회 동시 스레드 수 (토큰 요청 부하 최소화, 명령줄 도구에서 조정)
         
     async def collect_today_data(self):
         """오늘의 데이터 수집"""
         logger.info("오늘의 주식 데이터 수집 시작")
-        
-        # 현재 연도 확인
-        current_year = datetime.now().year
-        today_raw = datetime.now(self.timezone).strftime("%Y%m%d")
-        
-        # 잘못된 연도 수정 (시스템 연도가 잘못 설정된 경우)
-        if int(today_raw[:4]) > current_year:
-            today = today_raw.replace(today_raw[:4], str(current_year), 1)
-            logger.warning(f"잘못된 연도 감지: {today_raw} → {today}로 수정")
-        else:
-            today = today_raw
-            
+        today = self._today()
         logger.info(f"오늘 날짜: {today}, 이 날짜의 데이터만 수집합니다.")
         results = {}
+        self.quality_reports = {}
         
         try:
             tasks = []
@@ -52,30 +65,47 @@ class DataCollector:
             market_results = await asyncio.gather(*tasks, return_exceptions=True)
             
             for i, market in enumerate(MARKETS):
+                if isinstance(market_results[i], JobCancelled):
+                    raise market_results[i]
                 if isinstance(market_results[i], Exception):
                     logger.error(f"{market} 시장 데이터 수집 실패: {str(market_results[i])}")
-                    await self.telegram.send_error_notification(f"{market} 시장 데이터 수집 실패: {str(market_results[i])}")
+                    self.telegram.notify_error(f"{market} 시장 데이터 수집 실패: {str(market_results[i])}")
                 else:
                     df, file_path = market_results[i]
                     if not df.empty:
                         count = len(df)
                         results[market] = count
                         
-                        # 텔레그램 알림 전송
-                        await self.telegram.send_data_collection_notification(
+                        # 텔레그램 알림 (전송 스레드가 묶어서 전송, 수집은 기다리지 않음)
+                        self.telegram.notify_collection(
                             market=market,
                             data_count=count,
-                            file_path=str(file_path)
+                            file_path=str(file_path) if file_path else None
                         )
                     
             return results
             
+        except JobCancelled:
+            raise
         except Exception as e:
             error_msg = f"오늘의 데이터 수집 중 오류 발생: {str(e)}"
             logger.error(error_msg, exc_info=True)
-            await self.telegram.send_error_notification(error_msg)
+            self.telegram.notify_error(error_msg)
             raise
     
+    def _today(self):
+        """오늘 날짜(YYYYMMDD)"""
+        # 현재 연도 확인
+        current_year = datetime.now().year
+        today_raw = datetime.now(self.timezone).strftime("%Y%m%d")
+        
+        # 잘못된 연도 수정 (시스템 연도가 잘못 설정된 경우)
+        if int(today_raw[:4]) > current_year:
+            today = today_raw.replace(today_raw[:4], str(current_year), 1)
+            logger.warning(f"잘못된 연도 감지: {today_raw} → {today}로 수정")
+            return today
+        return today_raw
+        
     async def collect_historical_data(self, from_date, to_date=None):
         """과거 데이터 수집"""
         logger.info(f"과거 주식 데이터 수집 시작 (기간: {from_date} ~ {to_date or '현재'})")
@@ -108,10 +138,11 @@ class DataCollector:
         except ValueError as e:
             error_msg = f"잘못된 날짜 형식: {str(e)}"
             logger.error(error_msg)
-            await self.telegram.send_error_notification(error_msg)
+            self.telegram.notify_error(error_msg)
             raise ValueError(error_msg)
             
         results = {}
+        self.quality_reports = {}
         
         try:
             tasks = []
@@ -123,36 +154,153 @@ class DataCollector:
             market_results = await asyncio.gather(*tasks, return_exceptions=True)
             
             for i, market in enumerate(MARKETS):
+                if isinstance(market_results[i], JobCancelled):
+                    raise market_results[i]
                 if isinstance(market_results[i], Exception):
                     logger.error(f"{market} 시장 데이터 수집 실패: {str(market_results[i])}")
-                    await self.telegram.send_error_notification(f"{market} 시장 데이터 수집 실패: {str(market_results[i])}")
+                    self.telegram.notify_error(f"{market} 시장 데이터 수집 실패: {str(market_results[i])}")
                 else:
                     df, file_path = market_results[i]
                     if not df.empty:
                         count = len(df)
                         results[market] = count
                         
-                        # 텔레그램 알림 전송
-                        await self.telegram.send_data_collection_notification(
+                        # 텔레그램 알림 (전송 스레드가 묶어서 전송, 수집은 기다리지 않음)
+                        self.telegram.notify_collection(
                             market=market,
                             data_count=count,
-                            file_path=str(file_path)
+                            file_path=str(file_path) if file_path else None
                         )
                     
             return results
             
+        except JobCancelled:
+            raise
         except Exception as e:
             error_msg = f"과거 데이터 수집 중 오류 발생: {str(e)}"
             logger.error(error_msg, exc_info=True)
-            await self.telegram.send_error_notification(error_msg)
+            self.telegram.notify_error(error_msg)
             raise
             
-    async def _collect_market_data(self, market, from_date, to_date):
-        """특정 시장의 데이터 수집"""
+    @property
+    def minute_store(self):
+        """분봉 저장소 (장중 수집을 처음 실행할 때 생성)"""
+        if self._minute_store is None:
+            self._minute_store = MinuteBarStore()
+        return self._minute_store
+        
+    async def collect_intraday_data(self, stock_codes=None, until=None):
+        """당일 분봉 수집 (종목별로 마지막 저장 분봉 이후만 조회해 분봉 저장소에 추가)
+        
+        Args:
+            stock_codes: 수집 종목, 없으면 INTRADAY_SYMBOLS
+            until: 조회 기준 시각(HHMMSS), 없으면 현재 시각
+        """
+        codes = [str(code).zfill(6) for code in (stock_codes or INTRADAY_SYMBOLS)]
+        if not codes:
+            logger.warning("장중 분봉 수집 종목이 없습니다. (INTRADAY_SYMBOLS)")
+            return {"symbols": 0, "inserted": 0, "updated": 0, "failed": 0}
+            
+        trade_date = datetime.now(self.timezone).strftime("%Y%m%d")
+        progress = current_progress()
+        if progress is not None:
+            progress.add_total(len(codes))
+            
+        loop = asyncio.get_event_loop()
+        collect_func = partial(self._collect_symbol_minutes, trade_date=trade_date, until=until)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(3, self.max_concurrent_workers)) as executor:
+            results = await asyncio.gather(
+                *[loop.run_in_executor(executor, in_context(collect_func), code) for code in codes],
+                return_exceptions=True
+            )
+            
+        totals = {"symbols": len(codes), "inserted": 0, "updated": 0, "failed": 0}
+        failures = []
+        for code, result in zip(codes, results):
+            if isinstance(result, Exception):
+                failures.append((code, str(result)))
+                continue
+            totals["inserted"] += result["inserted"]
+            totals["updated"] += result["updated"]
+        totals["failed"] = len(failures)
+        
+        if failures:
+            logger.error(f"분봉 수집 실패 {len(failures)}개: {_code_sample([code for code, _ in failures])} (첫 오류: {failures[0][1]})")
+        logger.info(f"장중 분봉 수집 완료: {len(codes)}개 종목, 추가 {totals['inserted']}개, 갱신 {totals['updated']}개")
+        return totals
+        
+    def _collect_symbol_minutes(self, stock_code, trade_date, until=None):
+        """단일 종목 당일 분봉 수집 (ThreadPoolExecutor에서 실행)"""
+        raise_if_cancelled()
+        since = self.minute_store.last_time(stock_code, trade_date)
+        rows = self.korea_api.get_minute_bars(stock_code, since=since, until=until)
+        with span("rows.convert"):
+            bars = minute_rows_to_bars(rows)
+        with span("store.upsert"):
+            result = self.minute_store.upsert(stock_code, bars)
+        COLLECTOR_ROWS.labels("INTRADAY", "stored").inc(result["inserted"] + result["updated"])
+        
+        progress = current_progress()
+        if progress is not None:
+            progress.add_done(1, len(bars))
+        return result
+        
+    async def collect_symbols_data(self, stock_codes, from_date, to_date=None):
+        """지정한 종목만 수집 (신규 상장 종목 백필 등)"""
+        to_date = to_date or datetime.now(self.timezone).strftime("%Y%m%d")
+        codes = {str(code).zfill(6) for code in stock_codes}
+        logger.info(f"종목 지정 데이터 수집 시작: {len(codes)}개 종목 (기간: {from_date} ~ {to_date})")
+        
+        results = {}
+        self.quality_reports = {}
+        for market in MARKETS:
+            stock_items = [
+                item for item in await self.korea_api.get_stock_item_list(market)
+                if str(item["stock_code"]).zfill(6) in codes
+            ]
+            if not stock_items:
+                continue
+            df, _ = await self._collect_market_data(market, from_date, to_date, stock_items=stock_items, label="backfill")
+            results[market] = len(df)
+            
+        return results
+        
+    async def _collect_market_data(self, market, from_date, to_date, stock_items=None, label=None):
+        """특정 시장의 데이터 수집 (조회 → 품질 검사 → 바 저장소 반영 → 신규/변경분 CSV 저장)"""
+        df = await self._fetch_market_frame(market, from_date, to_date, stock_items)
+        if df.empty:
+            return df, None
+        raise_if_cancelled()
+        date_str = from_date if from_date == to_date else f"{from_date}_to_{to_date}"
+        
+        df = await asyncio.to_thread(self._validate_market_frame, df, market, date_str)
+        run_df = await asyncio.to_thread(self._store_market_frame, df, market)
+        if run_df.empty:
+            logger.info(f"{market} 시장 새로 추가되거나 바뀐 데이터가 없습니다. (수집 {len(df)}개 레코드)")
+            return df, None
+        
+        # 파일 저장
+        file_name = f"{market}_OHLCV_{date_str}_{label}.csv" if label else f"{market}_OHLCV_{date_str}.csv"
+        file_path = Path(DATA_STORAGE_PATH) / file_name
+        
+        # 디렉토리 생성
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # 파일 저장 (BOM 추가 - 한글 깨짐 방지)
+        with span("csv.write"):
+            await asyncio.to_thread(run_df.to_csv, file_path, index=False, encoding='utf-8-sig')
+        logger.info(f"{market} 시장 데이터 저장 완료: {file_path} (수집 {len(df)}개 중 신규/변경 {len(run_df)}개 레코드)")
+        
+        return df, file_path
+        
+    async def _fetch_market_frame(self, market, from_date, to_date, stock_items=None, failed=None):
+        """특정 시장의 일봉 조회 (종목 배치 단위, 결과는 메모리의 데이터프레임, 실패 종목은 failed에 기록)"""
         logger.info(f"{market} 시장 데이터 수집 시작 (기간: {from_date} ~ {to_date})")
         
         # 종목 리스트 가져오기
-        stock_items = await self.korea_api.get_stock_item_list(market)
+        if stock_items is None:
+            with span("symbols.load"):
+                stock_items = await self.korea_api.get_stock_item_list(market)
         
         if MAX_STOCK_ITEMS > 0 and len(stock_items) > MAX_STOCK_ITEMS:
             logger.info(f"종목 수 제한 적용: {len(stock_items)} -> {MAX_STOCK_ITEMS}")
@@ -162,13 +310,16 @@ class DataCollector:
         batch_size = 50  # 배치 크기 조절 가능
         batches = [stock_items[i:i+batch_size] for i in range(0, len(stock_items), batch_size)]
         logger.info(f"{market} 시장 종목 {len(stock_items)}개를 {len(batches)}개 배치로 처리")
+        progress = current_progress()
+        if progress is not None:
+            progress.add_total(len(stock_items))
         
         # 각 배치별로 데이터 수집
         all_data = []
         for batch_idx, batch in enumerate(batches):
-            progress = f"[{'=' * (batch_idx + 1)}{' ' * (len(batches) - batch_idx - 1)}] {batch_idx+1}/{len(batches)} ({(batch_idx+1)/len(batches)*100:.1f}%)"
-            logger.info(f"{market} 시장 배치 진행: {progress}")
-            batch_data = await self._collect_stock_data_batch(batch, from_date, to_date)
+            raise_if_cancelled()
+            logger.info(f"{market} 시장 배치 진행: {batch_idx+1}/{len(batches)} ({(batch_idx+1)/len(batches)*100:.1f}%)")
+            batch_data = await self._collect_stock_data_batch(batch, from_date, to_date, failed)
             all_data.extend(batch_data)
             
             # 프로그레스 업데이트: 10%마다 요약 정보 출력
@@ -177,38 +328,78 @@ class DataCollector:
             
             # 배치 간 딜레이
             if batch_idx < len(batches) - 1:
-                await asyncio.sleep(1)
+                with span("rate_limit.wait"):
+                    await asyncio.sleep(1)
                 
         # 데이터프레임 변환
         if not all_data:
             logger.warning(f"{market} 시장 데이터가 없습니다.")
-            return pd.DataFrame(), None
+            return pd.DataFrame()
             
-        df = pd.DataFrame(all_data)
-        
-        # 파일 저장
+        with span("frame.build"):
+            return pd.DataFrame(all_data)
+        
+    def _validate_market_frame(self, df, market, date_str):
+        """품질 검사 (격리 대상 행은 제외한 데이터프레임 반환, 보고서는 quality_reports에 기록)"""
+        with span("validate"):
+            df, self.quality_reports[market] = self.validator.validate(df, market, date_str)
+        COLLECTOR_ROWS.labels(market, "collected").inc(self.quality_reports[market]["rows"])
+        COLLECTOR_ROWS.labels(market, "quarantined").inc(self.quality_reports[market]["quarantined"])
+        return df
+        
+    async def fetch_market_frame(self, market, stock_items, from_date, to_date):
+        """종목 목록의 일봉 조회만 (품질 검사/저장 없음, 처리량 측정용)"""
+        return await self._fetch_market_frame(market, from_date, to_date, stock_items)
+        
+    async def collect_frame(self, market, stock_items, from_date, to_date, failed=None):
+        """종목 목록의 일봉을 조회해 품질 검사를 통과한 행만 반환 (저장 없음, 분산 수집 워커용)
+        
+        조회에 실패한 종목은 failed(dict)에 종목코드 -> 오류로 기록됩니다 (데이터가 없는 종목은 실패가 아님).
+        """
+        df = await self._fetch_market_frame(market, from_date, to_date, stock_items, failed)
+        if df.empty:
+            return df
         date_str = from_date if from_date == to_date else f"{from_date}_to_{to_date}"
-        file_name = f"{market}_OHLCV_{date_str}.csv"
-        file_path = Path(DATA_STORAGE_PATH) / file_name
-        
-        # 디렉토리 생성
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # 파일 저장 (BOM 추가 - 한글 깨짐 방지)
-        df.to_csv(file_path, index=False, encoding='utf-8-sig')
-        logger.info(f"{market} 시장 데이터 저장 완료: {file_path} (총 {len(df)}개 레코드)")
-        
-        return df, file_path
-        
-    async def _collect_stock_data_batch(self, stock_items: List[Dict[str, Any]], from_date: str, to_date: str) -> List[Dict[str, Any]]:
-        """종목 배치에 대한 데이터 수집"""
+        return await asyncio.to_thread(self._validate_market_frame, df, market, date_str)
+        
+    async def collect_into_store(self, market, stock_items, from_date, to_date):
+        """종목 목록의 일봉을 조회해 품질 검사 후 바 저장소에만 반영 (중간 CSV 없음, 명령줄 백필용)
+        
+        Returns:
+            tuple: (수집 행 수, 새로 추가되거나 바뀐 행 수, 조회 실패 종목 dict(종목코드 -> 오류))
+        """
+        failed = {}
+        df = await self.collect_frame(market, stock_items, from_date, to_date, failed)
+        if df.empty:
+            return 0, 0, failed
+        raise_if_cancelled()
+        return len(df), await asyncio.to_thread(self.store_frame, df, market), failed
+        
+    def store_frame(self, df, market):
+        """품질 검사를 마친 일봉을 바 저장소에 반영 (실패하면 예외), 새로 추가되거나 바뀐 행 수 반환
+        
+        분산 수집 파티션처럼 다른 곳에서 검사한 데이터를 반영할 때 사용합니다.
+        """
+        return len(self._store_market_frame(df, market))
+        
+    def _store_market_frame(self, df, market):
+        """바 저장소 반영 (같은 종목/거래일은 덮어쓰기, 실패하면 예외), 새로 추가되거나 바뀐 행 반환"""
+        with span("store.upsert"):
+            changed = self.bar_store.upsert_frame(df)
+        run_df = df[changed].drop_duplicates(subset=["거래일", "종목코드"], keep="last")
+        COLLECTOR_ROWS.labels(market, "stored").inc(len(run_df))
+        return run_df
+        
+    async def _collect_stock_data_batch(self, stock_items: List[Dict[str, Any]], from_date: str, to_date: str,
+                                        failed: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """종목 배치에 대한 데이터 수집 (조회에 실패한 종목은 failed에 종목코드 -> 오류로 기록)"""
         loop = asyncio.get_event_loop()
         
         # 병렬 처리를 위한 함수
         collect_func = partial(self._collect_single_stock_data, from_date=from_date, to_date=to_date)
         
         # 워커 수 제한으로 토큰 요청 부하 최소화
-        max_workers = min(3, self.max_concurrent_workers)  # 최대 3개의 워커로 제한
+        max_workers = self.fetch_workers
         
         # 배치 크기 축소로 동시 발생하는 토큰 요청 수 제한
         batch_size = 10  # 각 배치당 최대 10개 종목으로 제한
@@ -217,17 +408,20 @@ class DataCollector:
         
         all_data = []
         processed_count = 0
+        progress = current_progress()
+        empty_codes = []
+        failures = []
         
         # 각 작은 배치에 대해 순차적으로 처리
         for batch_idx, batch in enumerate(batches):
-            progress = f"[{'=' * (batch_idx + 1)}{' ' * (len(batches) - batch_idx - 1)}] {batch_idx+1}/{len(batches)}"
-            logger.info(f"소규모 배치 진행: {progress} (총 {processed_count}/{len(stock_items)} 종목)")
+            raise_if_cancelled()
+            logger.debug("소규모 배치 진행: %d/%d (총 %d/%d 종목)", batch_idx + 1, len(batches), processed_count, len(stock_items))
             
             # ThreadPoolExecutor를 사용한 병렬 처리
             with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
                 # 비동기로 실행할 함수 목록
                 tasks = [
-                    loop.run_in_executor(executor, collect_func, stock_item)
+                    loop.run_in_executor(executor, in_context(collect_func), stock_item)
                     for stock_item in batch
                 ]
                 
@@ -235,20 +429,34 @@ class DataCollector:
                 results = await asyncio.gather(*tasks, return_exceptions=True)
                 
                 # 결과 처리
+                rows = 0
                 for i, result in enumerate(results):
                     if isinstance(result, Exception):
-                        logger.error(f"종목 데이터 수집 실패 (종목: {batch[i]['stock_code']}): {str(result)}")
+                        failures.append((batch[i]["stock_code"], str(result)))
                     elif result:
                         all_data.extend(result)
+                        rows += len(result)
+                    else:
+                        empty_codes.append(batch[i]["stock_code"])
                         
                 processed_count += len(batch)
+                if progress is not None:
+                    progress.add_done(len(batch), rows)
             
             # 배치 간 딜레이 추가 (API 호출 제한 방지)
             if batch_idx < len(batches) - 1:
                 delay_time = 2  # 2초 딜레이
                 logger.debug(f"배치간 {delay_time}초 대기")
-                await asyncio.sleep(delay_time)
+                with span("rate_limit.wait"):
+                    await asyncio.sleep(delay_time)
                 
+        # 종목별 경고는 배치 단위 요약으로 기록 (휴장일에는 모든 종목이 데이터 없음)
+        if empty_codes:
+            logger.warning(f"데이터 없는 종목 {len(empty_codes)}개: {_code_sample(empty_codes)}")
+        if failures:
+            logger.error(f"종목 데이터 수집 실패 {len(failures)}개: {_code_sample([code for code, _ in failures])} (첫 오류: {failures[0][1]})")
+            if failed is not None:
+                failed.update((str(code).zfill(6), error) for code, error in failures)
         logger.info(f"배치 처리 완료: 총 {len(all_data)}개 데이터 수집")
         return all_data
         
@@ -259,66 +467,210 @@ class DataCollector:
         market = stock_item["market"]
         
         try:
-            # 동기 API 호출 (스레드 풀에서 실행되므로 동기 호출 가능)
-            data = self.korea_api.get_stock_ohlcv(stock_code, from_date, to_date)
+            # 동기 API 호출 (스레드 풀에서 실행되므로 동기 호출 가능), 조회 실패는 데이터 없음과 구분
+            data = self.korea_api.get_stock_ohlcv(stock_code, from_date, to_date, raise_errors=True)
             
             if not data:
-                logger.warning(f"종목 데이터 없음: {stock_code} ({stock_name})")
+                # 배치 단위로 요약해서 기록 (_collect_stock_data_batch)
                 return []
                 
             # 데이터 형식 변환
             formatted_data = []
-            for item in data:
-                try:
-                    # 응답 필드 이름이 API 버전에 따라 다를 수 있음
-                    # FHKST01010400 트랜잭션용 필드
-                    if "stck_bsop_date" in item:
-                        date_field = "stck_bsop_date"
-                        open_field = "stck_oprc"
-                        high_field = "stck_hgpr"
-                        low_field = "stck_lwpr"
-                        close_field = "stck_clpr"
-                        volume_field = "acml_vol"
-                    # FHKST03010100 트랜잭션용 필드 또는 다른 API 필드
-                    elif "bass_dt" in item:
-                        date_field = "bass_dt"
-                        open_field = "mksc_opnprc" 
-                        high_field = "mksc_hgprc"
-                        low_field = "mksc_lwprc"
-                        close_field = "mksc_clsprc"
-                        volume_field = "acml_trqu"
-                    else:
-                        logger.warning(f"알 수 없는 API 응답 형식 (종목: {stock_code}): {item}")
-                        continue
+            with span("rows.convert"):
+                for item in data:
+                    try:
+                        # 응답 필드 이름이 API 버전에 따라 다를 수 있음
+                        # FHKST01010400 트랜잭션용 필드
+                        if "stck_bsop_date" in item:
+                            date_field = "stck_bsop_date"
+                            open_field = "stck_oprc"
+                            high_field = "stck_hgpr"
+                            low_field = "stck_lwpr"
+                            close_field = "stck_clpr"
+                            volume_field = "acml_vol"
+                        # FHKST03010100 트랜잭션용 필드 또는 다른 API 필드
+                        elif "bass_dt" in item:
+                            date_field = "bass_dt"
+                            open_field = "mksc_opnprc" 
+                            high_field = "mksc_hgprc"
+                            low_field = "mksc_lwprc"
+                            close_field = "mksc_clsprc"
+                            volume_field = "acml_trqu"
+                        else:
+                            logger.warning(f"알 수 없는 API 응답 형식 (종목: {stock_code}): {item}")
+                            continue
                         
-                    row_data = {
-                        "거래일": item[date_field],
-                        "종목코드": stock_code,
-                        "종목명": stock_name,
-                        "시장구분": market,
-                        "시가": int(item[open_field]),
-                        "고가": int(item[high_field]),
-                        "저가": int(item[low_field]),
-                        "종가": int(item[close_field]),
-                        "거래량": int(item[volume_field])
-                    }
-                    formatted_data.append(row_data)
-                except (KeyError, ValueError) as e:
-                    logger.error(f"데이터 변환 오류 (종목: {stock_code}): {str(e)}, 데이터: {item}")
-                    continue
+                        row_data = {
+                            "거래일": item[date_field],
+                            "종목코드": stock_code,
+                            "종목명": stock_name,
+                            "시장구분": market,
+                            "시가": int(item[open_field]),
+                            "고가": int(item[high_field]),
+                            "저가": int(item[low_field]),
+                            "종가": int(item[close_field]),
+                            "거래량": int(item[volume_field])
+                        }
+                        if item.get("prdy_vrss") not in (None, ""):
+                            # 전일 대비는 거래소 기준가(분할/권리락 반영) 기준이므로 종가에서 빼면 기준가
+                            change = int(item["prdy_vrss"])
+                            if item.get("prdy_vrss_sign") in ("4", "5"):  # 하한/하락
+                                change = -abs(change)
+                            row_data[REFERENCE_PRICE_COLUMN] = row_data["종가"] - change
+                        formatted_data.append(row_data)
+                    except (KeyError, ValueError) as e:
+                        logger.error(f"데이터 변환 오류 (종목: {stock_code}): {str(e)}, 데이터: {item}")
+                        continue
                 
-            logger.debug(f"종목 데이터 수집 완료: {stock_code} ({stock_name}), {len(formatted_data)}개 레코드")
+            logger.debug("종목 데이터 수집 완료: %s (%s), %d개 레코드", stock_code, stock_name, len(formatted_data))
             return formatted_data
             
         except Exception as e:
-            logger.error(f"종목 데이터 수집 중 오류: {stock_code} ({stock_name}) - {str(e)}")
-            return []
+            # 실패 종목은 배치 단위로 요약해서 기록 (_collect_stock_data_batch)
+            logger.debug("종목 데이터 수집 중 오류: %s (%s) - %s", stock_code, stock_name, str(e))
+            raise
+            
+    async def run_job(self, kind, params=None):
+        """작업 종류별 실행 (작업 API에서 호출, 결과에 품질 보고서 포함)"""
+        params = params or {}
+        
+        if kind == "collect_today":
+            results = await self.collect_today_data()
+        elif kind == "collect_historical":
+            results = await self.collect_historical_data(params["from_date"], params.get("to_date"))
+        elif kind == "backfill_symbols":
+            results = await self.collect_symbols_data(params["stock_codes"], params["from_date"], params.get("to_date"))
+        elif kind == "collect_intraday":
+            return {"results": await self.collect_intraday_data(params.get("stock_codes"), params.get("until"))}
+        elif kind == "merge":
+            file_path = await self.merge_collected_data(params.get("pattern"), params.get("from_date"), params.get("to_date"))
+            return {"file_path": str(file_path) if file_path else None}
+        elif kind == "pipeline":
+            return await self.run_pipeline(params.get("pipeline", "daily"))
+        else:
+            raise ValueError(f"알 수 없는 작업 종류: {kind}")
+            
+        return {"results": results, "quality": self.quality_reports}
+        
+    def build_pipeline(self, name):
+        """이름별 파이프라인 구성 (이름 목록은 app.services.pipeline.PIPELINES)"""
+        if name == "daily":
+            return self.daily_pipeline()
+        raise ValueError(f"알 수 없는 파이프라인: {name}")
+        
+    async def run_pipeline(self, name="daily"):
+        """파이프라인 실행 (결과에 단계별 상태, 시장별 저장 건수, 품질 보고서, 병합 파일 포함)"""
+        pipeline = self.build_pipeline(name)
+        self.quality_reports = {}
+        run = await pipeline.run()
+        outputs = run["outputs"]
+        merged = outputs.get("merge")
+        return {
+            "pipeline": name,
+            "stages": run["stages"],
+            "results": {market: outputs[f"index.{market}"] for market in MARKETS if f"index.{market}" in outputs},
+            "quality": self.quality_reports,
+            "file_path": str(merged) if merged else None,
+        }
+        
+    def daily_pipeline(self):
+        """일일 파이프라인: 종목 코드 갱신 → 시장별 수집 → 품질 검사 → 바 저장소 반영 → 병합 → 알림
+        
+        시장별 수집/검사/반영은 시장마다 독립 분기로 동시에 실행하고, 수집한 데이터프레임은 메모리로 다음 단계에 넘깁니다
+        (시장별 중간 CSV 없음). 병합은 바 저장소에서 바로 내보냅니다. 종목 코드 갱신이 실패해도 기존 종목 마스터로
+        수집하고, 실패한 단계가 있으면 마지막에 오류 알림(notify_error)을 보냅니다.
+        """
+        today = self._today()
+        stages = [Stage("symbols", self._stage_symbols, summary=lambda result: result)]
+        for market in MARKETS:
+            stages += [
+                Stage(f"collect.{market}", partial(self._stage_collect, market, today), ("symbols",), summary=len,
+                      soft=("symbols",)),
+                Stage(f"validate.{market}", partial(self._stage_validate, market, today), (f"collect.{market}",), summary=len),
+                Stage(f"index.{market}", partial(self._stage_index, market), (f"validate.{market}",), summary=lambda count: count),
+            ]
+        stages += [
+            Stage("merge", self._stage_merge, tuple(f"index.{market}" for market in MARKETS),
+                  summary=lambda path: str(path) if path else None),
+            Stage("notify", self._stage_notify, ("merge",) + tuple(f"validate.{market}" for market in MARKETS)),
+        ]
+        stages.append(Stage("notify_error", self._stage_notify_error, tuple(stage.name for stage in stages),
+                            summary=lambda count: count, always=True))
+        return Pipeline("daily", stages)
+        
+    async def _stage_symbols(self, inputs):
+        """종목 코드 목록 갱신 후 종목 마스터 다시 읽기 (수집 단계는 메모리의 종목 마스터 사용)"""
+        from app.utils.stock_symbols import update_stock_symbols
+        from app.utils.symbol_master import symbol_master
+        
+        results = await asyncio.to_thread(update_stock_symbols)
+        diff = results.pop("diff")
+        symbol_master.reload()
+        results["listed"] = len(diff["listed"])
+        results["delisted"] = len(diff["delisted"])
+        return results
+        
+    async def _stage_collect(self, market, today, inputs):
+        if isinstance(inputs["symbols"], StageFailure):
+            logger.warning(f"종목 코드 갱신 실패로 기존 종목 마스터로 수집합니다: {market} ({inputs['symbols'].error})")
+        return await self._fetch_market_frame(market, today, today)
+        
+    async def _stage_validate(self, market, today, inputs):
+        df = inputs[f"collect.{market}"]
+        if df.empty:
+            return df
+        return await asyncio.to_thread(self._validate_market_frame, df, market, today)
+        
+    async def _stage_index(self, market, inputs):
+        """바 저장소 반영 (종목별 날짜 인덱스 갱신, 조회 캐시 무효화), 새로 추가되거나 바뀐 행 수 반환"""
+        df = inputs[f"validate.{market}"]
+        if df.empty:
+            return 0
+        return await asyncio.to_thread(self.store_frame, df, market)
+        
+    async def _stage_merge(self, inputs):
+        return await self.merge_collected_data()
+        
+    async def _stage_notify(self, inputs):
+        """시장별 수집 완료 알림 (전송 스레드가 묶어서 전송)"""
+        file_path = str(inputs["merge"]) if inputs["merge"] else None
+        for market in MARKETS:
+            count = len(inputs[f"validate.{market}"])
+            if count:
+                self.telegram.notify_collection(market=market, data_count=count, file_path=file_path)
+        
+    async def _stage_notify_error(self, inputs):
+        """실패한 단계가 있으면 오류 알림 (다른 단계의 성공 여부와 상관없이 항상 실행), 실패 단계 수 반환"""
+        failures = [
+            f"{failure.name}: {failure.error}" for failure in inputs.values()
+            if isinstance(failure, StageFailure) and failure.status == FAILED
+        ]
+        if failures:
+            self.telegram.notify_error("일일 파이프라인 단계 실패\n" + "\n".join(failures))
+        return len(failures)
+        
+    def read_bars(self, stock_code, from_date=None, to_date=None):
+        """종목별 바이너리 저장소에서 일봉 조회 (memmap 뷰, 복사 없음)"""
+        return self.bar_store.read(stock_code, from_date, to_date)
+        
+    async def merge_collected_data(self, pattern=None, from_date=None, to_date=None):
+        """수집된 데이터를 하나의 파일로 병합 (종목코드 오름차순, 거래일 내림차순)
+        
+        바 저장소에서 병합할 때는 from_date/to_date 구간(YYYYMMDD, 양 끝 포함)만 기록하고,
+        구간을 주지 않으면 저장된 전체 기간을 기록합니다. 패턴을 주면 해당 CSV 파일 전체를 병합합니다.
+        """
+        with COLLECTOR_MERGE_SECONDS.time(), span("merge"):
+            return await self._merge_collected_data(pattern, from_date, to_date)
             
-    async def merge_collected_data(self, pattern=None):
-        """수집된 데이터를 하나의 파일로 병합"""
+    async def _merge_collected_data(self, pattern=None, from_date=None, to_date=None):
         logger.info("수집된 데이터 병합 시작")
         
         data_path = Path(DATA_STORAGE_PATH)
+        
+        # 패턴 지정이 없으면 바 저장소(종목/거래일별 유일 레코드)에서 바로 병합
+        if not pattern and self.bar_store.list_symbols():
+            return await self._merge_from_bar_store(data_path, from_date, to_date)
+            
         if not pattern:
             pattern = "*.csv"
             
@@ -362,6 +714,28 @@ class DataCollector:
         
         return merged_file_path
         
+    async def _merge_from_bar_store(self, data_path, from_date=None, to_date=None):
+        """바 저장소의 일봉을 병합 파일로 저장 (청크 단위 스트리밍, 중복 제거 불필요)"""
+        today_str = datetime.now(self.timezone).strftime("%Y%m%d")
+        merged_file_path = data_path / f"merged_stock_data_{today_str}.csv"
+        data_path.mkdir(parents=True, exist_ok=True)
+        
+        loop = asyncio.get_event_loop()
+        total_bytes = await loop.run_in_executor(None, self._write_merged_from_store, merged_file_path, from_date, to_date)
+        
+        logger.info(f"데이터 병합 완료 (바 저장소): {merged_file_path} ({total_bytes:,}바이트)")
+        return merged_file_path
+        
+    def _write_merged_from_store(self, merged_file_path, from_date=None, to_date=None):
+        """바 저장소 내보내기를 파일로 기록 (ThreadPoolExecutor에서 실행, CSV 병합과 같은 정렬)"""
+        exporter = BarExporter(self.bar_store)
+        total_bytes = 0
+        with open(merged_file_path, "wb") as f:
+            for chunk in exporter.stream("csv", from_date=from_date, to_date=to_date, descending=True):
+                f.write(chunk)
+                total_bytes += len(chunk)
+        return total_bytes
+        
     async def _load_csv_files_parallel(self, csv_files):
         """CSV 파일을 병렬로 로드"""
         loop = asyncio.get_event_loop()
@@ -0,0 +1,211 @@
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import QUARANTINE_PATH, QUALITY_PRICE_JUMP_RATIO
+
+logger = logging.getLogger(__name__)
+
+# 품질 검사 규칙 (비트 플래그)
+RULE_NON_POSITIVE_PRICE = 1 << 0   # 0 이하 가격
+RULE_HIGH_BELOW_LOW = 1 << 1       # 고가 < 저가
+RULE_CLOSE_OUT_OF_RANGE = 1 << 2   # 종가가 [저가, 고가] 범위 밖
+RULE_OPEN_OUT_OF_RANGE = 1 << 3    # 시가가 [저가, 고가] 범위 밖
+RULE_ZERO_VOLUME = 1 << 4          # 거래량 0 (거래정지 등)
+RULE_PRICE_JUMP = 1 << 5           # 기준가(전일 종가) 대비 급변 (수정주가 미반영 의심)
+
+QUALITY_RULES = {
+    "non_positive_price": RULE_NON_POSITIVE_PRICE,
+    "high_below_low": RULE_HIGH_BELOW_LOW,
+    "close_out_of_range": RULE_CLOSE_OUT_OF_RANGE,
+    "open_out_of_range": RULE_OPEN_OUT_OF_RANGE,
+    "zero_volume": RULE_ZERO_VOLUME,
+    "price_jump": RULE_PRICE_JUMP,
+}
+
+# 격리 대상 규칙 (나머지는 보고서에만 표시하고 저장)
+QUARANTINE_RULES = (
+    RULE_NON_POSITIVE_PRICE | RULE_HIGH_BELOW_LOW | RULE_CLOSE_OUT_OF_RANGE
+    | RULE_OPEN_OUT_OF_RANGE | RULE_PRICE_JUMP
+)
+
+# 거래소 기준가 컬럼 (액면분할/권리락 등을 반영한 전일 종가, 있으면 급변 판정에서 직전 종가 대신 사용)
+REFERENCE_PRICE_COLUMN = "기준가"
+
+# 보고서에 포함할 샘플 행 수
+MAX_SAMPLES = 10
+
+
+def describe_flags(flags: int) -> str:
+    """비트 플래그를 규칙 이름 목록 문자열로 변환"""
+    return ",".join(name for name, bit in QUALITY_RULES.items() if flags & bit)
+
+
+class DataValidator:
+    """수집 일봉 데이터 품질 검사 (시장 배치 단위 벡터 연산)"""
+
+    def __init__(
+        self,
+        jump_ratio: float = QUALITY_PRICE_JUMP_RATIO,
+        quarantine_path: Optional[Path] = None,
+        bar_store=None,
+    ):
+        self.jump_ratio = jump_ratio
+        self.quarantine_path = Path(quarantine_path) if quarantine_path else Path(QUARANTINE_PATH)
+        self.bar_store = bar_store
+
+    def check(self, df: pd.DataFrame) -> np.ndarray:
+        """행별 위반 규칙 비트 플래그 계산"""
+        n = len(df)
+        flags = np.zeros(n, dtype=np.uint8)
+        if n == 0:
+            return flags
+
+        o = df["시가"].to_numpy(dtype=np.int64)
+        h = df["고가"].to_numpy(dtype=np.int64)
+        l = df["저가"].to_numpy(dtype=np.int64)
+        c = df["종가"].to_numpy(dtype=np.int64)
+        v = df["거래량"].to_numpy(dtype=np.int64)
+
+        flags[(o <= 0) | (h <= 0) | (l <= 0) | (c <= 0)] |= RULE_NON_POSITIVE_PRICE
+        flags[h < l] |= RULE_HIGH_BELOW_LOW
+        flags[(c < l) | (c > h)] |= RULE_CLOSE_OUT_OF_RANGE
+        flags[(o < l) | (o > h)] |= RULE_OPEN_OUT_OF_RANGE
+        flags[v == 0] |= RULE_ZERO_VOLUME
+        flags[self._price_jumps(df, c)] |= RULE_PRICE_JUMP
+
+        return flags
+
+    def _price_jumps(self, df: pd.DataFrame, close: np.ndarray) -> np.ndarray:
+        """종목별 기준가 대비 jump_ratio배 이상 변동한 행
+
+        기준가가 없는 행은 직전 종가(종목의 첫 행은 저장소의 직전 종가)와 비교합니다. 직전 행이 급변으로
+        걸렸더라도 그 전 종가와 맞는 행은 하루짜리 오류가 복구된 것으로 보고 통과시킵니다.
+        """
+        code_ids, uniques = pd.factorize(df["종목코드"].astype(str).str.zfill(6))
+        dates = pd.to_numeric(df["거래일"], errors="coerce").fillna(0).to_numpy(dtype=np.int64)
+        if REFERENCE_PRICE_COLUMN in df.columns:
+            base = pd.to_numeric(df[REFERENCE_PRICE_COLUMN], errors="coerce").to_numpy(dtype=np.float64)
+        else:
+            base = np.full(len(df), np.nan)
+
+        order = np.lexsort((dates, code_ids))
+        frame = pd.DataFrame({
+            "code": code_ids[order],
+            "date": dates[order],
+            "close": close[order].astype(np.float64),
+            "base": base[order],
+        })
+        by_code = frame.groupby("code", sort=False)
+
+        has_base = frame["base"] > 0
+        ref = frame["base"].where(has_base, by_code["close"].shift(1))
+        missing = ref.isna()
+        if missing.any():
+            ref[missing] = self._stored_prev_close(uniques[frame["code"][missing]], frame["date"][missing].to_numpy())
+
+        jumps = self._is_jump(frame["close"], ref)
+        # 직전 행이 급변으로 걸렸으면 그 행이 비교한 종가(직전 정상 종가)와도 비교
+        prev_jump = jumps.groupby(frame["code"], sort=False).shift(1, fill_value=False).astype(bool)
+        prev_ref = ref.groupby(frame["code"], sort=False).shift(1)
+        recovered = prev_jump & ~has_base & prev_ref.notna() & ~self._is_jump(frame["close"], prev_ref)
+
+        result = np.zeros(len(df), dtype=bool)
+        result[order] = (jumps & ~recovered).to_numpy()
+        return result
+
+    def _is_jump(self, close: pd.Series, ref: pd.Series) -> pd.Series:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = close / ref
+        return (ref > 0) & (close > 0) & ((ratio >= self.jump_ratio) | (ratio <= 1.0 / self.jump_ratio))
+
+    def _stored_prev_close(self, codes: np.ndarray, dates: np.ndarray) -> np.ndarray:
+        """종목별 거래일 이전 마지막 저장 종가 (없으면 NaN)
+
+        행마다 읽지 않고 종목별로 묶어, 가장 이른 거래일 직전 레코드 하나(거래일이 여러 개면 그 사이 구간까지)만
+        읽은 뒤 searchsorted로 각 거래일의 직전 종가를 찾습니다.
+        """
+        prev = np.full(len(codes), np.nan)
+        if self.bar_store is None or len(codes) == 0:
+            return prev
+        dates = np.asarray(dates, dtype=np.int64)
+        for code, positions in pd.Series(codes).groupby(np.asarray(codes), sort=False).indices.items():
+            code_dates = dates[positions]
+            first, last = int(code_dates.min()), int(code_dates.max())
+            history = self.bar_store.scan(code, to_date=first - 1, tail=1)
+            if last > first:
+                history = np.concatenate([history, self.bar_store.scan(code, first, last - 1)])
+            if len(history) == 0:
+                continue
+            idx = np.searchsorted(history["date"], code_dates, side="left") - 1
+            found = idx >= 0
+            prev[positions[found]] = history["close"][idx[found]]
+        return prev
+
+    def validate(self, df: pd.DataFrame, market: str = "", run_label: str = "") -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """시장 배치 검사 후 격리 대상 행을 분리
+
+        Returns:
+            (pd.DataFrame, dict): 저장할 행, 품질 보고서
+        """
+        started = time.perf_counter()
+        flags = self.check(df)
+
+        quarantine_mask = (flags & QUARANTINE_RULES) != 0
+        tagged_mask = (flags != 0) & ~quarantine_mask
+
+        report = {
+            "market": market,
+            "rows": int(len(df)),
+            "passed": int((flags == 0).sum()),
+            "tagged": int(tagged_mask.sum()),
+            "quarantined": int(quarantine_mask.sum()),
+            "rules": {name: int(((flags & bit) != 0).sum()) for name, bit in QUALITY_RULES.items()},
+            "quarantine_file": None,
+            "samples": [],
+        }
+
+        if flags.any():
+            flagged = np.flatnonzero(flags)[:MAX_SAMPLES]
+            report["samples"] = [
+                {
+                    "stock_code": str(df["종목코드"].iloc[i]),
+                    "date": str(df["거래일"].iloc[i]),
+                    "rules": describe_flags(int(flags[i])),
+                    "quarantined": bool(quarantine_mask[i]),
+                }
+                for i in flagged
+            ]
+
+        if quarantine_mask.any():
+            report["quarantine_file"] = str(self._quarantine(df[quarantine_mask], flags[quarantine_mask], market, run_label))
+
+        elapsed = time.perf_counter() - started
+        report["elapsed_ms"] = round(elapsed * 1000, 3)
+        report["rows_per_sec"] = int(len(df) / elapsed) if elapsed > 0 else None
+
+        if report["quarantined"] or report["tagged"]:
+            logger.warning(
+                f"{market} 품질 검사: {report['rows']}개 중 격리 {report['quarantined']}개, "
+                f"표시 {report['tagged']}개 ({report['rules']})"
+            )
+        else:
+            logger.info(f"{market} 품질 검사 통과: {report['rows']}개 ({report['elapsed_ms']}ms)")
+
+        return df.loc[~quarantine_mask, [column for column in df.columns if column != REFERENCE_PRICE_COLUMN]], report
+
+    def _quarantine(self, bad_df: pd.DataFrame, flags: np.ndarray, market: str, run_label: str) -> Path:
+        """격리 행을 위반 규칙과 함께 별도 CSV로 저장"""
+        self.quarantine_path.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        file_path = self.quarantine_path / f"{market}_{run_label or 'run'}_{timestamp}.csv"
+
+        out = bad_df.copy()
+        out["품질검사"] = [describe_flags(int(f)) for f in flags]
+        out.to_csv(file_path, index=False, encoding='utf-8-sig')
+        return file_path
@@ -0,0 +1,71 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+
+from app.core.config import JOB_EVENTS_POLL_SECONDS, JOB_EVENTS_KEEPALIVE_SECONDS
+from app.services.job_queue import JobQueue, SUCCEEDED, FAILED
+from app.utils.fast_json import dumps
+
+TERMINAL_STATUSES = (SUCCEEDED, FAILED)
+
+
+async def job_events(
+    queue: JobQueue,
+    job_id: str,
+    interval: float = JOB_EVENTS_POLL_SECONDS,
+    keepalive: float = JOB_EVENTS_KEEPALIVE_SECONDS,
+) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """작업 상태/진행 이벤트 (바뀐 값만, 작업이 끝나면 done 후 종료)
+
+    수집 워커가 작업 큐에 기록한 진행 상황을 `interval`마다 확인합니다. 보낼 이벤트 없이
+    `keepalive`초가 지나면 연결 유지용으로 None을 돌려줍니다.
+    """
+    last_status = None
+    last_progress = None
+    last_sent = time.monotonic()
+
+    while True:
+        job = await asyncio.to_thread(queue.get, job_id)
+        if job is None:
+            yield {"event": "error", "data": {"detail": f"작업을 찾을 수 없습니다: {job_id}"}}
+            return
+
+        sent = False
+        if job["status"] != last_status:
+            last_status = job["status"]
+            sent = True
+            yield {"event": "status", "data": {
+                "status": job["status"],
+                "attempts": job["attempts"],
+                "started_at": job["started_at"],
+                "error": job["error"],
+            }}
+
+        if job["progress"] and job["progress"] != last_progress:
+            last_progress = job["progress"]
+            sent = True
+            yield {"event": "progress", "data": job["progress"]}
+
+        if job["status"] in TERMINAL_STATUSES:
+            yield {"event": "done", "data": {
+                "status": job["status"],
+                "finished_at": job["finished_at"],
+                "error": job["error"],
+            }}
+            return
+
+        now = time.monotonic()
+        if sent:
+            last_sent = now
+        elif now - last_sent >= keepalive:
+            last_sent = now
+            yield None
+
+        await asyncio.sleep(interval)
+
+
+def format_sse(event: Optional[Dict[str, Any]], event_id: int) -> bytes:
+    """Server-Sent Events 메시지 (None이면 연결 유지용 주석)"""
+    if event is None:
+        return b": keep-alive\n\n"
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (event_id, event["event"].encode(), dumps(event["data"]))
@@ -0,0 +1,424 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.core.config import (
+    JOB_QUEUE_PATH,
+    JOB_LEASE_SECONDS,
+    JOB_MAX_ATTEMPTS,
+    JOB_RETRY_DELAY_SECONDS,
+    WEBHOOK_MAX_ATTEMPTS,
+    WEBHOOK_RETRY_DELAY_SECONDS,
+    WEBHOOK_TIMEOUT_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# 작업 상태
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# 웹훅 전송 상태 (pending, failed는 작업과 같음)
+SENDING = "sending"
+DELIVERED = "delivered"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    heartbeat_at TEXT,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    result TEXT,
+    error TEXT,
+    progress TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, available_at);
+CREATE INDEX IF NOT EXISTS jobs_created ON jobs (created_at);
+CREATE TABLE IF NOT EXISTS webhooks (
+    id TEXT PRIMARY KEY,
+    job_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    event TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    lease_expires_at REAL,
+    created_at TEXT NOT NULL,
+    delivered_at TEXT,
+    last_status_code INTEGER,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS webhooks_claim ON webhooks (status, available_at);
+CREATE INDEX IF NOT EXISTS webhooks_job ON webhooks (job_id);
+"""
+
+# 조회 응답에 포함하는 컬럼 (내부 시각 값 제외)
+JOB_FIELDS = [
+    "id", "kind", "params", "status", "attempts", "max_attempts", "lease_owner",
+    "heartbeat_at", "created_at", "started_at", "finished_at", "result", "error", "progress",
+]
+
+# 웹훅 조회 응답에 포함하는 컬럼 (본문 제외)
+WEBHOOK_FIELDS = [
+    "id", "job_id", "url", "event", "status", "attempts", "created_at", "delivered_at", "last_status_code", "error",
+]
+
+# 이전 버전 DB에 추가할 컬럼
+MIGRATIONS = {
+    "progress": "ALTER TABLE jobs ADD COLUMN progress TEXT",
+}
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class JobQueue:
+    """SQLite 기반 영속 작업 큐 (별도 브로커 없음)
+
+    API는 작업을 등록만 하고, 수집 워커 프로세스가 임대(lease)를 잡아 실행합니다.
+    워커는 주기적으로 하트비트로 임대를 연장하며, 워커가 죽어 임대가 만료된 작업은
+    다른 워커가 다시 가져갑니다. 실패한 작업은 최대 시도 횟수까지 지수 백오프로 재시도합니다.
+
+    작업 파라미터에 `callback`(url, event)이 있으면 작업이 끝나는 트랜잭션 안에서 웹훅 전송 건을 함께 기록하고
+    (outbox), 수집 워커의 웹훅 전송 스레드가 같은 임대/재시도 방식으로 전송합니다.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        lease_seconds: float = JOB_LEASE_SECONDS,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        retry_delay: float = JOB_RETRY_DELAY_SECONDS,
+    ):
+        self.db_path = Path(db_path) if db_path else Path(JOB_QUEUE_PATH)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._local = threading.local()
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """스레드별 연결 (프로세스가 fork된 경우 새로 연결)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    conn.executescript(SCHEMA)
+                    columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+                    for column, statement in MIGRATIONS.items():
+                        if column not in columns:
+                            conn.execute(statement)
+                    self._initialized = True
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """쓰기 트랜잭션 (BEGIN IMMEDIATE로 프로세스 간 임대 경합 방지)"""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = {field: row[field] for field in JOB_FIELDS}
+        job["params"] = json.loads(row["params"]) if row["params"] else {}
+        job["result"] = json.loads(row["result"]) if row["result"] else None
+        job["progress"] = json.loads(row["progress"]) if row["progress"] else None
+        return job
+
+    def enqueue(self, kind: str, params: Optional[Dict[str, Any]] = None, max_attempts: Optional[int] = None) -> Dict[str, Any]:
+        """작업 등록"""
+        job_id = uuid.uuid4().hex
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, params, status, max_attempts, available_at, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    kind,
+                    json.dumps(params or {}, ensure_ascii=False),
+                    PENDING,
+                    max_attempts or self.max_attempts,
+                    time.time(),
+                    _now(),
+                ),
+            )
+        logger.info(f"작업 등록: {kind} (작업: {job_id})")
+        return self.get(job_id)
+
+    def claim(self, worker_id: str, kinds: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        """실행할 작업 하나를 임대 (대기 작업 또는 임대가 만료된 실행 중 작업)"""
+        now = time.time()
+        kinds = list(kinds) if kinds else None
+
+        with self._transaction() as conn:
+            self._fail_exhausted(conn, now)
+
+            query = (
+                "SELECT * FROM jobs WHERE "
+                "((status = ? AND available_at <= ?) OR (status = ? AND lease_expires_at < ?))"
+            )
+            args: List[Any] = [PENDING, now, RUNNING, now]
+            if kinds:
+                query += f" AND kind IN ({','.join('?' * len(kinds))})"
+                args.extend(kinds)
+            query += " ORDER BY available_at, created_at LIMIT 1"
+
+            row = conn.execute(query, args).fetchone()
+            if row is None:
+                return None
+
+            if row["status"] == RUNNING:
+                logger.warning(f"임대 만료 작업 회수: {row['kind']} (작업: {row['id']}, 이전 워커: {row['lease_owner']})")
+
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, lease_owner = ?, lease_expires_at = ?, "
+                "heartbeat_at = ?, started_at = ?, finished_at = NULL, error = NULL, progress = NULL WHERE id = ?",
+                (RUNNING, worker_id, now + self.lease_seconds, _now(), _now(), row["id"]),
+            )
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+
+        return self._to_dict(row)
+
+    def _fail_exhausted(self, conn: sqlite3.Connection, now: float):
+        """시도 횟수를 모두 쓴 채 임대가 만료된 작업은 실패 처리"""
+        rows = conn.execute(
+            "SELECT id FROM jobs WHERE status = ? AND lease_expires_at < ? AND attempts >= max_attempts",
+            (RUNNING, now),
+        ).fetchall()
+        for row in rows:
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, lease_owner = NULL, "
+                "error = COALESCE(error, '워커 응답 없음 (임대 만료)') WHERE id = ?",
+                (FAILED, _now(), row["id"]),
+            )
+            self._add_webhook(conn, row["id"])
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """임대 연장 (다른 워커가 가져간 경우 False)"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires_at = ?, heartbeat_at = ? "
+                "WHERE id = ? AND lease_owner = ? AND status = ?",
+                (time.time() + self.lease_seconds, _now(), job_id, worker_id, RUNNING),
+            )
+            return cursor.rowcount == 1
+
+    def update_progress(self, job_id: str, worker_id: str, progress: Dict[str, Any]) -> bool:
+        """실행 중 작업의 진행 상황 기록 (임대를 가진 워커만)"""
+        cursor = self._connection().execute(
+            "UPDATE jobs SET progress = ? WHERE id = ? AND lease_owner = ? AND status = ?",
+            (json.dumps(progress, ensure_ascii=False), job_id, worker_id, RUNNING),
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result: Any = None) -> bool:
+        """작업 성공 기록"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, finished_at = ?, lease_owner = NULL, lease_expires_at = NULL "
+                "WHERE id = ? AND lease_owner = ? AND status = ?",
+                (SUCCEEDED, json.dumps(result, ensure_ascii=False, default=str), _now(), job_id, worker_id, RUNNING),
+            )
+            if cursor.rowcount != 1:
+                return False
+            self._add_webhook(conn, job_id)
+            return True
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> Optional[str]:
+        """작업 실패 기록 (시도 횟수가 남았으면 지연 후 재시도)
+
+        Returns:
+            str: 변경된 상태 (pending=재시도 예정, failed=최종 실패), 임대를 잃었으면 None
+        """
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND lease_owner = ? AND status = ?",
+                (job_id, worker_id, RUNNING),
+            ).fetchone()
+            if row is None:
+                return None
+
+            if row["attempts"] < row["max_attempts"]:
+                delay = self.retry_delay * (2 ** (row["attempts"] - 1))
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, available_at = ?, lease_owner = NULL, lease_expires_at = NULL "
+                    "WHERE id = ?",
+                    (PENDING, error, time.time() + delay, job_id),
+                )
+                logger.warning(f"작업 재시도 예정: {delay:.0f}초 후 ({row['attempts']}/{row['max_attempts']}, 작업: {job_id})")
+                return PENDING
+
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_owner = NULL, lease_expires_at = NULL "
+                "WHERE id = ?",
+                (FAILED, error, _now(), job_id),
+            )
+            self._add_webhook(conn, job_id)
+            return FAILED
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def list(self, limit: int = 20, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """최근 작업 목록 (최신순)"""
+        query = "SELECT * FROM jobs"
+        args: List[Any] = []
+        if status:
+            query += " WHERE status = ?"
+            args.append(status)
+        query += " ORDER BY created_at DESC, rowid DESC LIMIT ?"
+        args.append(limit)
+        return [self._to_dict(row) for row in self._connection().execute(query, args).fetchall()]
+
+    def has_active(self, kind: str) -> bool:
+        """대기 중이거나 임대가 살아 있는 실행 중 작업이 있는지 (주기 작업 중복 등록 방지)"""
+        row = self._connection().execute(
+            "SELECT 1 FROM jobs WHERE kind = ? AND (status = ? OR (status = ? AND lease_expires_at > ?)) LIMIT 1",
+            (kind, PENDING, RUNNING, time.time()),
+        ).fetchone()
+        return row is not None
+
+    def _add_webhook(self, conn: sqlite3.Connection, job_id: str):
+        """끝난 작업에 콜백이 지정되어 있으면 웹훅 전송 건 기록 (작업 상태 변경과 같은 트랜잭션)"""
+        job = self._to_dict(conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+        callback = job["params"].get("callback")
+        if not callback or not callback.get("url"):
+            return
+        event = callback.get("event") or f"job.{job['status']}"
+        payload = {
+            "event": event,
+            "job_id": job["id"],
+            "kind": job["kind"],
+            "status": job["status"],
+            "attempts": job["attempts"],
+            "params": {key: value for key, value in job["params"].items() if key not in ("callback", "diagnostics")},
+            "result": job["result"],
+            "error": job["error"],
+            "stats": job["progress"],
+            "created_at": job["created_at"],
+            "started_at": job["started_at"],
+            "finished_at": job["finished_at"],
+        }
+        conn.execute(
+            "INSERT INTO webhooks (id, job_id, url, event, payload, status, available_at, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                uuid.uuid4().hex, job_id, callback["url"], event,
+                json.dumps(payload, ensure_ascii=False, default=str), PENDING, time.time(), _now(),
+            ),
+        )
+
+    def claim_webhook(self) -> Optional[Dict[str, Any]]:
+        """전송할 웹훅 하나를 임대 (대기 중이거나 전송하던 프로세스가 죽어 임대가 만료된 건)"""
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT * FROM webhooks WHERE (status = ? AND available_at <= ?) OR (status = ? AND lease_expires_at < ?) "
+                "ORDER BY available_at LIMIT 1",
+                (PENDING, now, SENDING, now),
+            ).fetchone()
+            if row is None:
+                return None
+            # 전송 제한 시간의 두 배 동안 임대 (그 안에 결과를 기록하지 못하면 다른 프로세스가 다시 전송)
+            conn.execute(
+                "UPDATE webhooks SET status = ?, attempts = attempts + 1, lease_expires_at = ? WHERE id = ?",
+                (SENDING, now + WEBHOOK_TIMEOUT_SECONDS * 2, row["id"]),
+            )
+            row = conn.execute("SELECT * FROM webhooks WHERE id = ?", (row["id"],)).fetchone()
+        webhook = dict(row)
+        webhook["payload"] = row["payload"].encode()
+        return webhook
+
+    def finish_webhook(
+        self,
+        webhook_id: str,
+        status_code: Optional[int] = None,
+        error: Optional[str] = None,
+        retry: bool = True,
+        retry_after: Optional[float] = None,
+    ) -> str:
+        """웹훅 전송 결과 기록 (error가 없으면 전송 완료, 있으면 시도 횟수가 남은 경우 지연 후 재시도)
+
+        Returns:
+            str: 변경된 상태 (delivered, pending=재시도 예정, failed=최종 실패)
+        """
+        with self._transaction() as conn:
+            if error is None:
+                conn.execute(
+                    "UPDATE webhooks SET status = ?, delivered_at = ?, last_status_code = ?, error = NULL, "
+                    "lease_expires_at = NULL WHERE id = ?",
+                    (DELIVERED, _now(), status_code, webhook_id),
+                )
+                return DELIVERED
+
+            row = conn.execute("SELECT attempts FROM webhooks WHERE id = ?", (webhook_id,)).fetchone()
+            if retry and row is not None and row["attempts"] < WEBHOOK_MAX_ATTEMPTS:
+                delay = max(WEBHOOK_RETRY_DELAY_SECONDS * (2 ** (row["attempts"] - 1)), retry_after or 0)
+                conn.execute(
+                    "UPDATE webhooks SET status = ?, available_at = ?, last_status_code = ?, error = ?, "
+                    "lease_expires_at = NULL WHERE id = ?",
+                    (PENDING, time.time() + delay, status_code, error, webhook_id),
+                )
+                return PENDING
+
+            conn.execute(
+                "UPDATE webhooks SET status = ?, last_status_code = ?, error = ?, lease_expires_at = NULL WHERE id = ?",
+                (FAILED, status_code, error, webhook_id),
+            )
+            return FAILED
+
+    def list_webhooks(self, job_id: str) -> List[Dict[str, Any]]:
+        """작업의 웹훅 전송 상태"""
+        rows = self._connection().execute(
+            f"SELECT {', '.join(WEBHOOK_FIELDS)} FROM webhooks WHERE job_id = ? ORDER BY created_at", (job_id,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def stats(self) -> Dict[str, int]:
+        """상태별 작업 수"""
+        rows = self._connection().execute("SELECT status, COUNT(*) AS count FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in (PENDING, RUNNING, SUCCEEDED, FAILED)}
+        counts.update({row["status"]: row["count"] for row in rows})
+        return counts
+
+
+# 프로세스 전역 작업 큐
+job_queue = JobQueue()
@@ -19,16 +19,43 @@ from app.core.config import (
     KOREA_INV_APPKEY,
     KOREA_INV_APPSECRET,
     KOREA_INV_ACCOUNT,
+    KIS_BASE_URL,
+    KIS_TOKEN_CACHE_PATH,
+    KIS_RATE_LIMIT_PER_SECOND,
+    COLLECTOR_WORKERS,
+    INTRADAY_START,
     TIMEZONE,
     DATA_STORAGE_PATH,
     MAX_STOCK_ITEMS
 )
 
 # 종목 코드 유틸리티 import
-from app.utils.stock_symbols import get_stock_symbols
+from app.utils.symbol_master import symbol_master
+from app.services.bar_store import BarStore
+from app.utils.metrics import KIS_REQUESTS, KIS_REQUEST_SECONDS, KIS_RATE_LIMITED, KIS_TOKEN_REFRESHES
+from app.utils.tracing import span
+from app.utils.progress import current_progress
+from app.utils.rate_limiter import TokenBucket
 
 logger = logging.getLogger(__name__)
 
+# 초당 거래건수 초과 응답 코드
+RATE_LIMIT_MSG_CD = "EGW00201"
+
+# 당일 분봉 조회 한 번에 받는 분봉 수와 종목당 최대 조회 횟수 (정규장 390분)
+MINUTE_BARS_PER_CALL = 30
+MINUTE_MAX_PAGES = 15
+
+# 시세 조회 호출 제한 (프로세스별, 전체 한도를 수집 워커 수로 나눔)
+rate_limiter = TokenBucket(KIS_RATE_LIMIT_PER_SECOND / max(COLLECTOR_WORKERS, 1))
+
+
+def set_rate_limit(calls_per_second: float):
+    """이 프로세스의 초당 호출 한도 변경 (명령줄 도구가 프로세스 수에 맞춰 나눌 때)"""
+    global rate_limiter
+    rate_limiter = TokenBucket(calls_per_second)
+
+
 # API 관련 예외 클래스 정의
 class KoreaInvestmentAPIError(Exception):
     """한국투자증권 API 관련 에러 기본 클래스"""
@@ -49,14 +76,16 @@ class APIResponseError(KoreaInvestmentAPIError):
 class KoreaInvestmentAPI:
     """한국투자증권 API 클라이언트"""
     
-    BASE_URL = "https://openapi.koreainvestment.com:9443"
+    BASE_URL = KIS_BASE_URL
     
     # 싱글톤 패턴 및 토큰 관리용 클래스 변수
     _instance = None
     _access_token = None
     _token_expired_at = None
     _token_lock = threading.Lock()
-    _token_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "token_cache.json")
+    _token_file = str(KIS_TOKEN_CACHE_PATH)
+    _approval_key = None
+    _approval_key_expired_at = None
     
     def __new__(cls):
         if cls._instance is None:
@@ -143,10 +172,12 @@ class KoreaInvestmentAPI:
                     "appsecret": self.app_secret
                 }
                 
-                response = requests.post(url, headers=headers, json=body, timeout=10)
+                with KIS_REQUEST_SECONDS.labels("token").time():
+                    response = requests.post(url, headers=headers, json=body, timeout=10)
                     
                 if response.status_code != 200:
                     logger.error(f"토큰 발급 실패: {response.status_code} - {response.text}")
+                    KIS_TOKEN_REFRESHES.labels("failure").inc()
                     return KoreaInvestmentAPI._access_token  # 기존 토큰 반환 (있다면)
             
                 result = response.json()
@@ -157,13 +188,39 @@ class KoreaInvestmentAPI:
                 # 캐시에 저장
                 self._save_token_to_cache()
                 
+                KIS_TOKEN_REFRESHES.labels("success").inc()
                 logger.info(f"새 토큰 발급 성공 (만료 예정: {KoreaInvestmentAPI._token_expired_at.strftime('%Y-%m-%d %H:%M:%S')})")
                 return KoreaInvestmentAPI._access_token
                 
             except Exception as e:
+                KIS_TOKEN_REFRESHES.labels("failure").inc()
                 logger.error(f"토큰 발급 중 오류: {str(e)}")
                 return KoreaInvestmentAPI._access_token  # 기존 토큰 반환 (있다면)
     
+    def get_approval_key(self):
+        """실시간 시세 웹소켓 접속키 발급 (유효 기간 동안 프로세스 안에서 재사용, 실패하면 예외)"""
+        with KoreaInvestmentAPI._token_lock:
+            if KoreaInvestmentAPI._approval_key and datetime.now() < KoreaInvestmentAPI._approval_key_expired_at:
+                return KoreaInvestmentAPI._approval_key
+                
+            logger.info("한국투자증권 웹소켓 접속키 발급 요청")
+            body = {
+                "grant_type": "client_credentials",
+                "appkey": self.app_key,
+                "secretkey": self.app_secret
+            }
+            with KIS_REQUEST_SECONDS.labels("approval").time():
+                response = requests.post(f"{self.BASE_URL}/oauth2/Approval", json=body, timeout=10)
+            if response.status_code != 200:
+                raise APIResponseError(response.status_code, response.text)
+                
+            approval_key = response.json().get("approval_key")
+            if not approval_key:
+                raise APIResponseError(response.status_code, "응답에 approval_key가 없습니다.", response.text)
+            KoreaInvestmentAPI._approval_key = approval_key
+            KoreaInvestmentAPI._approval_key_expired_at = datetime.now() + timedelta(hours=23)
+            return approval_key
+    
     def _format_stock_code(self, code):
         """종목 코드를 6자리 문자열로 변환"""
         digits = ''.join(c for c in str(code) if c.isdigit())
@@ -173,8 +230,8 @@ class KoreaInvestmentAPI:
         """특정 시장(KOSPI, KOSDAQ)의 종목 리스트 조회"""
         logger.info(f"{market} 시장 종목 리스트 조회")
         
-        # FinanceDataReader를 통해 종목 코드 가져오기
-        df = get_stock_symbols(market)
+        # 종목 마스터에서 종목 코드 가져오기 (파일이 오늘 갱신되지 않았으면 FinanceDataReader로 갱신)
+        df = symbol_master.get(market)
         
         if df.empty:
             logger.warning(f"{market} 종목 리스트가 비어있음, 샘플 데이터 사용")
@@ -202,13 +259,14 @@ class KoreaInvestmentAPI:
             })
         return result
     
-    def get_stock_ohlcv(self, stock_code, from_date, to_date=None):
+    def get_stock_ohlcv(self, stock_code, from_date, to_date=None, raise_errors=False):
         """특정 종목의 OHLCV 데이터 조회
         
         Args:
             stock_code: 종목 코드
             from_date: 조회 시작일(YYYYMMDD)
             to_date: 조회 종료일(YYYYMMDD), 없으면 오늘 날짜
+            raise_errors: 조회 실패 시 빈 목록 대신 KoreaInvestmentAPIError (데이터가 없는 날과 구분할 때)
         """
         if not to_date:
             to_date = datetime.now().strftime("%Y%m%d")
@@ -220,21 +278,6 @@ class KoreaInvestmentAPI:
         formatted_code = self._format_stock_code(stock_code)
         
         try:
-            # 1. 토큰 가져오기
-            token = self.get_access_token()
-            if not token:
-                logger.error(f"토큰이 없어 API 호출 불가 (종목: {formatted_code})")
-                return []
-            
-            # 2. API 호출 준비
-            url = f"{self.BASE_URL}/uapi/domestic-stock/v1/quotations/inquire-daily-price"
-            headers = {
-                "content-type": "application/json",
-                "authorization": f"Bearer {token}",
-                "appkey": self.app_key,
-                "appsecret": self.app_secret,
-                "tr_id": "FHKST01010400"
-            }
             params = {
                 "fid_cond_mrkt_div_code": "J",
                 "fid_input_iscd": formatted_code,
@@ -244,53 +287,196 @@ class KoreaInvestmentAPI:
                 "fid_input_date_2": to_date
             }
             
-            logger.debug(f"API 호출: 종목 {formatted_code}, 기간 {from_date}~{to_date}")
-            
-            # 3. API 요청 전송
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-            
-            # 4. 응답 처리
-            if response.status_code != 200:
-                logger.error(f"API 호출 실패 (종목: {formatted_code}): 상태코드 {response.status_code}, 응답: {response.text}")
-                return []
-            
-            data = response.json()
-            
-            # API 응답 오류 확인
-            if data.get("rt_cd") != "0":
-                logger.error(f"API 오류 (종목: {formatted_code}): {data.get('msg1')}")
-                return []
-            
-            # 5. 데이터 추출 (output1 또는 output2에 데이터가 있을 수 있음)
-            output = []
-            if "output1" in data and data["output1"]:
-                output = data["output1"]
-            elif "output2" in data and data["output2"]:
-                output = data["output2"]
-            elif "output" in data and data["output"]:
-                output = data["output"]
-            
-            # 날짜 필터링 (API가 날짜 범위를 정확히 지키지 않는 경우 대비)
-            filtered_output = []
-            for item in output:
-                date_field = "stck_bsop_date" if "stck_bsop_date" in item else "bass_dt"
-                item_date = item.get(date_field, "")
-                if from_date <= item_date <= to_date:
-                    filtered_output.append(item)
-                    
-            output = filtered_output
-            
-            if output:
-                # 로그 레벨을 debug로 변경하여 콘솔 출력을 줄임
-                logger.debug(f"종목 {formatted_code} 데이터 {len(output)}개 수집")
+            logger.debug("API 호출: 종목 %s, 기간 %s~%s", formatted_code, from_date, to_date)
+            data = self._quotation(
+                "daily_price", "/uapi/domestic-stock/v1/quotations/inquire-daily-price", "FHKST01010400",
+                params, formatted_code
+            )
+            if data is None:
+                output = None
             else:
-                logger.warning(f"종목 {formatted_code} 데이터 없음")
-            
-            return output
+                # 데이터 추출 (output1 또는 output2에 데이터가 있을 수 있음)
+                output = []
+                if "output1" in data and data["output1"]:
+                    output = data["output1"]
+                elif "output2" in data and data["output2"]:
+                    output = data["output2"]
+                elif "output" in data and data["output"]:
+                    output = data["output"]
+                
+                # 날짜 필터링 (API가 날짜 범위를 정확히 지키지 않는 경우 대비)
+                filtered_output = []
+                for item in output:
+                    date_field = "stck_bsop_date" if "stck_bsop_date" in item else "bass_dt"
+                    item_date = item.get(date_field, "")
+                    if from_date <= item_date <= to_date:
+                        filtered_output.append(item)
+                        
+                output = filtered_output
             
         except Exception as e:
+            KIS_REQUESTS.labels("daily_price", "exception").inc()
+            self._record_progress(f"{formatted_code}: {str(e)}")
             logger.error(f"데이터 조회 오류 (종목: {formatted_code}): {str(e)}")
+            if raise_errors:
+                raise KoreaInvestmentAPIError(f"데이터 조회 오류 (종목: {formatted_code}): {str(e)}") from e
             return []
+        
+        if output is None:
+            # 토큰 없음/HTTP 오류/API 오류 (_quotation에서 기록)
+            if raise_errors:
+                raise KoreaInvestmentAPIError(f"일봉 조회 실패 (종목: {formatted_code})")
+            return []
+        
+        if output:
+            # 로그 레벨을 debug로 변경하여 콘솔 출력을 줄임
+            logger.debug("종목 %s 데이터 %d개 수집", formatted_code, len(output))
+        else:
+            # 휴장일에는 모든 종목이 해당되므로 수집기가 배치 단위로 요약해서 기록
+            logger.debug("종목 %s 데이터 없음", formatted_code)
+        
+        return output
+    
+    def get_minute_bars(self, stock_code, since=None, until=None):
+        """당일 분봉 조회 (FHKST03010200)
+        
+        API는 기준 시각부터 과거로 분봉 30개씩 돌려주므로, 기준 시각을 당겨 가며 `since` 이전 분봉이
+        나올 때까지 조회합니다. `since`와 같은 분봉도 다시 받습니다 (조회 당시 진행 중이던 분봉).
+        
+        Args:
+            stock_code: 종목 코드
+            since: 이 분봉 키(YYYYMMDDHHMM) 이후만 조회, 없으면 장 시작부터
+            until: 조회 기준 시각(HHMMSS), 없으면 현재 시각
+            
+        Returns:
+            list: 응답 행 (체결 시각 오름차순)
+            
+        Raises:
+            KoreaInvestmentAPIError: 어느 페이지든 조회에 실패한 경우 (받은 최신 페이지만 저장하면 마지막 분봉이
+                앞당겨져 그 이전 분봉을 다시 받지 않으므로, 종목 전체를 실패로 처리해 다음 주기에 다시 조회)
+        """
+        formatted_code = self._format_stock_code(stock_code)
+        now = datetime.now(self.timezone)
+        trade_date = now.strftime("%Y%m%d")
+        hour = until or now.strftime("%H%M%S")
+        
+        rows = {}
+        try:
+            for _ in range(MINUTE_MAX_PAGES):
+                params = {
+                    "fid_etc_cls_code": "",
+                    "fid_cond_mrkt_div_code": "J",
+                    "fid_input_iscd": formatted_code,
+                    "fid_input_hour_1": hour,
+                    "fid_pw_data_incu_yn": "N"
+                }
+                data = self._quotation(
+                    "minute_price", "/uapi/domestic-stock/v1/quotations/inquire-time-itemchartprice", "FHKST03010200",
+                    params, formatted_code
+                )
+                if data is None:
+                    raise KoreaInvestmentAPIError(f"분봉 조회 실패 (종목: {formatted_code}, 기준 시각: {hour})")
+                
+                page = [
+                    item for item in (data.get("output2") or [])
+                    if item.get("stck_bsop_date") == trade_date and item.get("stck_cntg_hour")
+                ]
+                for item in page:
+                    key = int(trade_date + item["stck_cntg_hour"][:4])
+                    if since is None or key >= since:
+                        rows[key] = item
+                        
+                if not page:
+                    break
+                oldest = min(item["stck_cntg_hour"] for item in page)
+                if len(page) < MINUTE_BARS_PER_CALL or oldest[:4] <= INTRADAY_START:
+                    break
+                if since is not None and int(trade_date + oldest[:4]) <= since:
+                    break
+                # 가장 오래된 분봉의 1분 전부터 다시 조회
+                previous = datetime.strptime(oldest[:4], "%H%M") - timedelta(minutes=1)
+                if previous.strftime("%H%M") < oldest[:4]:
+                    hour = previous.strftime("%H%M00")
+                else:
+                    break
+        except KoreaInvestmentAPIError:
+            raise
+        except Exception as e:
+            KIS_REQUESTS.labels("minute_price", "exception").inc()
+            self._record_progress(f"{formatted_code}: {str(e)}")
+            logger.error(f"분봉 조회 오류 (종목: {formatted_code}): {str(e)}")
+            raise KoreaInvestmentAPIError(f"분봉 조회 오류 (종목: {formatted_code}): {str(e)}") from e
+            
+        return [rows[key] for key in sorted(rows)]
+    
+    def _quotation(self, endpoint, path, tr_id, params, formatted_code):
+        """시세 조회 API 호출 (토큰, 호출 제한, 지표 기록 포함, 실패하면 None)"""
+        # 1. 토큰 가져오기
+        with span("kis.token"):
+            token = self.get_access_token()
+        if not token:
+            logger.error(f"토큰이 없어 API 호출 불가 (종목: {formatted_code})")
+            return None
+        
+        # 2. API 호출 준비
+        headers = {
+            "content-type": "application/json",
+            "authorization": f"Bearer {token}",
+            "appkey": self.app_key,
+            "appsecret": self.app_secret,
+            "tr_id": tr_id
+        }
+        
+        # 3. 호출 제한 (일봉/분봉 수집이 같은 한도를 나눠 씀) 후 API 요청 전송
+        with span("rate_limit.wait"):
+            rate_limiter.acquire()
+        started = time.perf_counter()
+        try:
+            with span("kis.request"):
+                response = requests.get(f"{self.BASE_URL}{path}", headers=headers, params=params, timeout=10)
+        finally:
+            KIS_REQUEST_SECONDS.labels(endpoint).observe(time.perf_counter() - started)
+        
+        # 4. 응답 처리
+        if response.status_code != 200:
+            self._count_error("http_error", response, endpoint)
+            self._record_progress(f"{formatted_code}: HTTP {response.status_code}")
+            logger.error(f"API 호출 실패 (종목: {formatted_code}): 상태코드 {response.status_code}, 응답: {response.text}")
+            return None
+        
+        with span("kis.json_decode"):
+            data = response.json()
+        
+        # API 응답 오류 확인
+        if data.get("rt_cd") != "0":
+            self._count_error("api_error", data, endpoint)
+            self._record_progress(f"{formatted_code}: {data.get('msg1')}")
+            logger.error(f"API 오류 (종목: {formatted_code}): {data.get('msg1')}")
+            return None
+        
+        KIS_REQUESTS.labels(endpoint, "ok").inc()
+        self._record_progress()
+        return data
+    
+    @staticmethod
+    def _count_error(result, body=None, endpoint="daily_price"):
+        """오류 응답 지표 기록 (초당 거래건수 초과는 호출 제한으로 따로 집계)"""
+        if isinstance(body, requests.Response):
+            try:
+                body = body.json()
+            except ValueError:
+                body = None
+        if isinstance(body, dict) and body.get("msg_cd") == RATE_LIMIT_MSG_CD:
+            KIS_RATE_LIMITED.labels(endpoint).inc()
+            result = "rate_limited"
+        KIS_REQUESTS.labels(endpoint, result).inc()
+    
+    @staticmethod
+    def _record_progress(error=None):
+        """진행 중인 작업이 있으면 API 호출 한 번 기록"""
+        progress = current_progress()
+        if progress is not None:
+            progress.record_call(error)
     
     async def collect_market_data(self, market, from_date, to_date=None):
         """특정 시장의 전체 종목 OHLCV 데이터 수집"""
@@ -381,6 +567,9 @@ class KoreaInvestmentAPI:
             df.to_csv(file_path, index=False, encoding='utf-8-sig')
             logger.info(f"{market} 시장 데이터 {len(df)}행 저장 완료: {file_path}")
             
+            # 종목별 바이너리 저장소에 추가
+            BarStore().upsert_frame(df)
+            
             return df
             
         except Exception as e:
@@ -0,0 +1,135 @@
+import logging
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.core.config import JOB_QUEUE_PATH, LEADER_LEASE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    hostname TEXT,
+    pid INTEGER,
+    acquired_at REAL NOT NULL,
+    renewed_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp).isoformat(timespec="seconds") if timestamp else None
+
+
+class LeaderElection:
+    """SQLite 임대 기반 리더 선출 (외부 서비스 없음)
+
+    같은 이름의 임대는 한 프로세스만 보유할 수 있습니다. 리더는 임대 시간 안에
+    `try_acquire`를 반복 호출해 임대를 연장하고, 리더 프로세스가 죽어 임대가 만료되면
+    다음으로 `try_acquire`를 호출한 프로세스가 리더가 됩니다.
+    """
+
+    def __init__(self, name: str, db_path: Optional[Path] = None, lease_seconds: float = LEADER_LEASE_SECONDS):
+        self.name = name
+        self.db_path = Path(db_path) if db_path else Path(JOB_QUEUE_PATH)
+        self.lease_seconds = lease_seconds
+        self.hostname = socket.gethostname()
+        self.pid = None
+        self._owner = None
+        self.is_leader = False
+
+    @property
+    def owner(self) -> str:
+        """프로세스 식별자 (fork된 프로세스는 새 식별자 사용)"""
+        if self.pid != os.getpid():
+            self.pid = os.getpid()
+            self._owner = f"{self.hostname}:{self.pid}:{uuid.uuid4().hex[:8]}"
+            self.is_leader = False
+        return self._owner
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        return conn
+
+    def try_acquire(self) -> bool:
+        """임대 획득 또는 연장 (다른 프로세스가 유효한 임대를 보유하면 False)"""
+        owner = self.owner
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT * FROM leases WHERE name = ?", (self.name,)).fetchone()
+
+            if row is not None and row["owner"] != owner and row["expires_at"] >= now:
+                conn.execute("COMMIT")
+                acquired = False
+            else:
+                acquired_at = row["acquired_at"] if row is not None and row["owner"] == owner else now
+                conn.execute(
+                    "INSERT OR REPLACE INTO leases (name, owner, hostname, pid, acquired_at, renewed_at, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (self.name, owner, self.hostname, self.pid, acquired_at, now, now + self.lease_seconds),
+                )
+                conn.execute("COMMIT")
+                acquired = True
+                if row is not None and row["owner"] != owner:
+                    logger.warning(f"리더 임대 인계: {self.name} ({row['owner']} → {owner}, 이전 임대 만료)")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        if acquired and not self.is_leader:
+            logger.info(f"리더 선출됨: {self.name} ({owner})")
+        elif not acquired and self.is_leader:
+            logger.warning(f"리더 임대를 잃었습니다: {self.name} ({owner})")
+        self.is_leader = acquired
+        return acquired
+
+    def release(self) -> bool:
+        """보유 중인 임대 반납 (다른 프로세스가 바로 리더가 될 수 있도록)"""
+        owner = self.owner
+        conn = self._connect()
+        try:
+            cursor = conn.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (self.name, owner))
+            released = cursor.rowcount == 1
+        finally:
+            conn.close()
+
+        if released:
+            logger.info(f"리더 임대 반납: {self.name} ({owner})")
+        self.is_leader = False
+        return released
+
+    def current(self) -> Optional[Dict[str, Any]]:
+        """현재 임대 보유자 (임대가 없거나 만료되었으면 None)"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM leases WHERE name = ?", (self.name,)).fetchone()
+        finally:
+            conn.close()
+
+        if row is None or row["expires_at"] < time.time():
+            return None
+        return {
+            "owner": row["owner"],
+            "hostname": row["hostname"],
+            "pid": row["pid"],
+            "acquired_at": _isoformat(row["acquired_at"]),
+            "renewed_at": _isoformat(row["renewed_at"]),
+            "expires_at": _isoformat(row["expires_at"]),
+            "is_self": row["owner"] == self.owner,
+        }
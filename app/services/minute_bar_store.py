@@ -0,0 +1,135 @@
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.core.config import MINUTE_BAR_STORE_PATH, MINUTE_BAR_MAX_OPEN_PARTITIONS
+from app.services.bar_store import BarStore
+
+logger = logging.getLogger(__name__)
+
+# 분봉 레코드 레이아웃 (time은 YYYYMMDDHHMM 현지 시각, 고정폭 48바이트)
+MINUTE_BAR_DTYPE = np.dtype([
+    ("time", "<i8"),
+    ("open", "<i8"),
+    ("high", "<i8"),
+    ("low", "<i8"),
+    ("close", "<i8"),
+    ("volume", "<i8"),
+])
+
+# 당일 분봉 조회(FHKST03010200) 응답 필드 ↔ 레코드 필드 매핑
+KIS_MINUTE_FIELDS = {
+    "stck_oprc": "open",
+    "stck_hgpr": "high",
+    "stck_lwpr": "low",
+    "stck_prpr": "close",
+    "cntg_vol": "volume",
+}
+
+
+def minute_key(trade_date: str, hour: str) -> int:
+    """거래일(YYYYMMDD)과 체결 시각(HHMMSS 또는 HHMM)을 분봉 키(YYYYMMDDHHMM)로 변환"""
+    return int(f"{trade_date}{hour[:4]}")
+
+
+def minute_rows_to_bars(rows: List[Dict[str, Any]]) -> np.ndarray:
+    """당일 분봉 조회 응답 행을 분봉 레코드 배열로 변환 (잘못된 행은 제외)"""
+    bars = np.zeros(len(rows), dtype=MINUTE_BAR_DTYPE)
+    valid = np.ones(len(rows), dtype=bool)
+    for i, row in enumerate(rows):
+        try:
+            bars["time"][i] = minute_key(row["stck_bsop_date"], row["stck_cntg_hour"])
+            for source, field in KIS_MINUTE_FIELDS.items():
+                bars[field][i] = int(row[source])
+        except (KeyError, ValueError, TypeError):
+            valid[i] = False
+    if not valid.all():
+        logger.warning(f"분봉 변환 실패 행 {int((~valid).sum())}개 제외")
+    return bars[valid]
+
+
+class MinuteBarPartition(BarStore):
+    """거래일 하나의 종목별 분봉 파일 (일봉 저장소와 같은 파일 구성, 키는 int64 YYYYMMDDHHMM)"""
+
+    RECORD_DTYPE = MINUTE_BAR_DTYPE
+    INDEX_DTYPE = np.dtype("<i8")
+    KEY_FIELD = "time"
+
+    def _on_write(self, stock_code: str, keys: np.ndarray):
+        # 일봉 조회 캐시와는 무관하므로 세대 번호만 올림
+        self._bump_generation()
+
+
+class MinuteBarStore:
+    """거래일별로 나눈 분봉 저장소 (`{root}/{YYYYMMDD}/{code}.bar`)
+
+    장중 수집은 당일 파티션 끝에 이어 쓰기만 하고(진행 중인 마지막 분봉은 제자리 갱신),
+    지난 거래일 파티션은 디렉터리 단위로 보관/삭제할 수 있습니다.
+
+    가장 최근 거래일 파티션은 계속 열어 두고, 조회로 연 지난 거래일 파티션은 최근 사용 순으로
+    max_partitions개까지만 유지합니다(닫힌 파티션의 매핑은 참조가 사라지면 함께 닫힘).
+    """
+
+    def __init__(self, root: Optional[Path] = None, max_partitions: int = MINUTE_BAR_MAX_OPEN_PARTITIONS):
+        self.root = Path(root) if root else Path(MINUTE_BAR_STORE_PATH)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_partitions = max(0, max_partitions)
+        self._partitions: "OrderedDict[str, MinuteBarPartition]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def partition(self, trade_date: str) -> MinuteBarPartition:
+        with self._lock:
+            partition = self._partitions.get(trade_date)
+            if partition is None:
+                partition = self._partitions[trade_date] = MinuteBarPartition(self.root / trade_date)
+            self._partitions.move_to_end(trade_date)
+
+            latest = max(self._partitions)
+            past = [date for date in self._partitions if date != latest]
+            for date in past[:max(0, len(past) - self.max_partitions)]:
+                if date != trade_date:
+                    del self._partitions[date]
+            return partition
+
+    def open_dates(self) -> List[str]:
+        """열어 둔 파티션의 거래일 목록"""
+        with self._lock:
+            return sorted(self._partitions)
+
+    def list_dates(self) -> List[str]:
+        """분봉이 있는 거래일 목록"""
+        return sorted(path.name for path in self.root.iterdir() if path.is_dir() and path.name.isdigit())
+
+    def last_time(self, stock_code: str, trade_date: str) -> Optional[int]:
+        """거래일에 마지막으로 저장된 분봉 키 (없으면 None)"""
+        if not (self.root / trade_date).is_dir():
+            return None
+        return self.partition(trade_date).last_key(stock_code)
+
+    def upsert(self, stock_code: str, bars: np.ndarray) -> Dict[str, int]:
+        """분봉 저장 (같은 분은 덮어쓰기, 거래일별 파티션으로 나눔)"""
+        totals = {"inserted": 0, "updated": 0, "unchanged": 0}
+        if len(bars) == 0:
+            return totals
+        dates = bars["time"] // 10000
+        for trade_date in np.unique(dates).tolist():
+            result = self.partition(str(trade_date)).upsert(stock_code, bars[dates == trade_date])
+            for key in totals:
+                totals[key] += result[key]
+        return totals
+
+    def read(self, stock_code: str, trade_dates: Iterable[str], from_time=None, to_time=None) -> np.ndarray:
+        """종목 분봉 조회 (거래일 순서대로 이어 붙임, from_time/to_time은 YYYYMMDDHHMM)"""
+        parts = [
+            self.partition(trade_date).read(stock_code, from_time, to_time)
+            for trade_date in sorted(trade_dates)
+            if (self.root / trade_date).is_dir()
+        ]
+        parts = [part for part in parts if len(part)]
+        if not parts:
+            return np.empty(0, dtype=MINUTE_BAR_DTYPE)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
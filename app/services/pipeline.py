@@ -0,0 +1,190 @@
+"""작업 파이프라인 (단계 DAG)
+
+여러 단계를 작업 하나 안에서 의존 관계 순서로 실행합니다. 선행 단계가 모두 성공한 단계는 바로 시작하므로
+서로 의존하지 않는 분기(시장별 수집 등)는 동시에 실행되고, 단계 결과는 파일을 거치지 않고 다음 단계 함수에
+메모리로 전달됩니다. 단계 상태는 작업 진행 상황(`progress.stages`)에 기록되어 작업 조회/이벤트 스트림으로 볼 수 있습니다.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from app.services.job_queue import PENDING, RUNNING, SUCCEEDED, FAILED
+from app.utils.progress import JobCancelled, current_progress
+from app.utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# 선행 단계가 실패해 실행하지 않은 단계
+SKIPPED = "skipped"
+
+# 실행할 수 있는 파이프라인 (구성은 DataCollector.build_pipeline)
+PIPELINES = {
+    "daily": "종목 코드 갱신 → 시장별 수집 → 품질 검사 → 바 저장소 반영 → 병합 → 알림 (실패 시 오류 알림)",
+}
+
+
+class PipelineError(RuntimeError):
+    """실패한 단계가 있는 파이프라인 (단계별 상태는 stages)"""
+
+    def __init__(self, name: str, stages: Dict[str, Dict[str, Any]]):
+        self.stages = stages
+        failed = ", ".join(f"{stage}: {state['error']}" for stage, state in stages.items() if state["status"] == FAILED)
+        super().__init__(f"파이프라인 단계 실패: {name} ({failed})")
+
+
+@dataclass
+class Stage:
+    """파이프라인 단계
+
+    `run`은 선행 단계(`after`) 결과를 단계 이름별 dict로 받는 코루틴 함수이고, `summary`는 단계 결과를
+    상태 조회에 표시할 값으로 바꾸는 함수입니다 (없으면 표시하지 않음). `soft`에 적은 선행 단계는 끝날 때까지
+    기다리되 실패하거나 건너뛰어도 이 단계를 실행하고, `always`이면 모든 선행 단계를 그렇게 취급합니다
+    (실패 알림 등). 성공하지 못한 선행 단계는 결과 대신 `StageFailure`로 전달됩니다.
+    """
+    name: str
+    run: Callable[[Dict[str, Any]], Awaitable[Any]]
+    after: Sequence[str] = ()
+    summary: Optional[Callable[[Any], Any]] = None
+    soft: Sequence[str] = ()
+    always: bool = False
+
+    def requires(self, dep: str) -> bool:
+        """선행 단계가 성공해야만 실행하는지 여부"""
+        return not self.always and dep not in self.soft
+
+
+@dataclass(frozen=True)
+class StageFailure:
+    """성공하지 못한 선행 단계 (soft/always 단계의 입력, status는 failed 또는 skipped)"""
+    name: str
+    status: str
+    error: Optional[str] = None
+
+
+class Pipeline:
+    """단계 DAG 실행기"""
+
+    def __init__(self, name: str, stages: List[Stage]):
+        self.name = name
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError(f"중복된 단계 이름이 있습니다: {name}")
+        for stage in stages:
+            unknown = [dep for dep in stage.after if dep not in self.stages]
+            if unknown:
+                raise ValueError(f"알 수 없는 선행 단계: {stage.name} <- {', '.join(unknown)}")
+            if not set(stage.soft) <= set(stage.after):
+                raise ValueError(f"soft 선행 단계는 after에도 있어야 합니다: {stage.name}")
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        """의존 순서대로 정렬한 단계 이름 (정의 순서 유지, 순환이 있으면 ValueError)"""
+        order: List[str] = []
+        done = set()
+        while len(order) < len(self.stages):
+            ready = [
+                name for name, stage in self.stages.items()
+                if name not in done and all(dep in done for dep in stage.after)
+            ]
+            if not ready:
+                cycle = ", ".join(name for name in self.stages if name not in done)
+                raise ValueError(f"단계 의존 관계에 순환이 있습니다: {cycle}")
+            order.extend(ready)
+            done.update(ready)
+        return order
+
+    def describe(self) -> List[Dict[str, Any]]:
+        """단계 목록과 선행 단계 (실행 순서)"""
+        return [{"name": name, "after": list(self.stages[name].after)} for name in self.order]
+
+    async def run(self) -> Dict[str, Any]:
+        """모든 단계 실행 (실패한 단계의 후속 단계는 soft/always가 아니면 건너뛰고, 독립 분기는 끝까지 실행)
+
+        Returns:
+            dict: stages(단계별 상태), outputs(단계별 결과)
+
+        Raises:
+            PipelineError: 실패한 단계가 있는 경우
+            JobCancelled: 작업 중단 요청이 있는 경우 (실행 중인 단계를 취소하고 새 단계는 시작하지 않음)
+        """
+        states = {name: {"status": PENDING, "after": list(self.stages[name].after)} for name in self.order}
+        outputs: Dict[str, Any] = {}
+        running: Dict[asyncio.Future, str] = {}
+        progress = current_progress()
+        started = time.perf_counter()
+
+        def publish(name: str):
+            if progress is not None:
+                progress.set_stage(name, states[name])
+
+        for name in self.order:
+            publish(name)
+        logger.info(f"파이프라인 시작: {self.name} ({len(self.order)}단계)")
+
+        while True:
+            if progress is not None and progress.cancelled is not None:
+                for task in running:
+                    task.cancel()
+                await asyncio.gather(*running, return_exceptions=True)
+                logger.warning(f"파이프라인 중단: {self.name} ({progress.cancelled})")
+                raise JobCancelled(progress.cancelled)
+
+            for name in self.order:
+                state = states[name]
+                if state["status"] != PENDING:
+                    continue
+                stage = self.stages[name]
+                deps = {dep: states[dep]["status"] for dep in stage.after}
+                if any(status in (FAILED, SKIPPED) for dep, status in deps.items() if stage.requires(dep)):
+                    state["status"] = SKIPPED
+                    publish(name)
+                elif all(status in (SUCCEEDED, FAILED, SKIPPED) for status in deps.values()):
+                    state.update(status=RUNNING, started_at=datetime.now().isoformat(timespec="seconds"))
+                    publish(name)
+                    inputs = {
+                        dep: outputs[dep] if status == SUCCEEDED else StageFailure(dep, status, states[dep].get("error"))
+                        for dep, status in deps.items()
+                    }
+                    running[asyncio.ensure_future(self._run_stage(stage, inputs))] = name
+
+            if not running:
+                break
+            done, _ = await asyncio.wait(list(running), return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = running.pop(task)
+                state = states[name]
+                seconds, output, error = task.result()
+                state.update(finished_at=datetime.now().isoformat(timespec="seconds"), seconds=round(seconds, 3))
+                if error is None:
+                    outputs[name] = output
+                    state["status"] = SUCCEEDED
+                    summary = self.stages[name].summary
+                    if summary is not None:
+                        state["summary"] = summary(output)
+                    logger.info(f"파이프라인 단계 완료: {self.name}.{name} ({seconds:.2f}s)")
+                else:
+                    state.update(status=FAILED, error=error)
+                    logger.error(f"파이프라인 단계 실패: {self.name}.{name} ({seconds:.2f}s): {error}")
+                publish(name)
+
+        logger.info(f"파이프라인 종료: {self.name} ({time.perf_counter() - started:.2f}s)")
+        if any(state["status"] == FAILED for state in states.values()):
+            raise PipelineError(self.name, states)
+        return {"stages": states, "outputs": outputs}
+
+    async def _run_stage(self, stage: Stage, inputs: Dict[str, Any]):
+        """단계 하나 실행 (예외는 결과로 돌려줘 다른 분기에 영향이 없도록)"""
+        started = time.perf_counter()
+        try:
+            with span(f"pipeline.{stage.name}"):
+                output = await stage.run(inputs)
+            return time.perf_counter() - started, output, None
+        except JobCancelled as e:
+            # 단계 실패가 아니라 작업 중단 (run 루프가 다음 확인 때 중단)
+            return time.perf_counter() - started, None, f"중단: {e}"
+        except Exception as e:
+            logger.debug("파이프라인 단계 예외: %s", stage.name, exc_info=True)
+            return time.perf_counter() - started, None, str(e) or type(e).__name__
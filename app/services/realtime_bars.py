@@ -0,0 +1,236 @@
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import orjson
+
+from app.core.config import REALTIME_RING_SIZE, REALTIME_SNAPSHOT_PATH
+from app.services.bar_store import BAR_DTYPE
+from app.services.minute_bar_store import MINUTE_BAR_DTYPE
+from app.utils.metrics import REALTIME_TICKS, REALTIME_BARS_DROPPED
+
+logger = logging.getLogger(__name__)
+
+# 종목 수가 늘어날 때 종목별 배열을 키우는 단위
+_SLOT_GROWTH = 64
+
+
+def _bar_dict(bars: np.ndarray, slot: int) -> Dict[str, int]:
+    return {name: int(bars[name][slot]) for name in bars.dtype.names}
+
+
+class BarAggregator:
+    """실시간 체결을 1분봉/일봉으로 집계 (NumPy 배열, 스레드 안전)
+
+    종목마다 진행 중인 분봉과 일봉을 한 행씩 두고 체결이 올 때마다 제자리에서 갱신합니다.
+    다음 분의 체결이 오거나 `roll()`로 시각이 지나면 분봉을 닫아 링 버퍼에 넣고, 저장 쪽은 `drain()`으로
+    쌓인 완료 분봉을 한 번에 가져갑니다. 저장이 밀려 링 버퍼가 가득 차면 가장 오래된 분봉부터 버립니다.
+    """
+
+    def __init__(self, ring_size: int = REALTIME_RING_SIZE):
+        self._slots: Dict[str, int] = {}
+        self._codes = np.empty(0, dtype="<U6")
+        self._minute = np.zeros(0, dtype=MINUTE_BAR_DTYPE)  # 종목별 진행 중(또는 마지막) 분봉
+        self._minute_open = np.zeros(0, dtype=bool)  # 분봉이 아직 닫히지 않았는지
+        self._daily = np.zeros(0, dtype=BAR_DTYPE)  # 종목별 당일 일봉 (date 0이면 없음)
+        self._ring = np.zeros(ring_size, dtype=MINUTE_BAR_DTYPE)
+        self._ring_codes = np.empty(ring_size, dtype="<U6")
+        self._head = 0  # 다음에 쓸 위치
+        self._pending = 0  # 저장 대기 중인 완료 분봉 수
+        self.dropped = 0
+        self.updated_at = None
+        self._closed_day = 0  # 일봉을 확정한 마지막 거래일 (이후 도착한 그날 체결은 분봉에만 반영)
+        self._lock = threading.Lock()
+
+    def _slot(self, stock_code: str) -> int:
+        slot = self._slots.get(stock_code)
+        if slot is not None:
+            return slot
+        slot = self._slots[stock_code] = len(self._slots)
+        if slot >= len(self._codes):
+            size = len(self._codes) + _SLOT_GROWTH
+            self._codes = np.resize(self._codes, size)
+            self._minute = np.concatenate([self._minute, np.zeros(_SLOT_GROWTH, dtype=MINUTE_BAR_DTYPE)])
+            self._minute_open = np.concatenate([self._minute_open, np.zeros(_SLOT_GROWTH, dtype=bool)])
+            self._daily = np.concatenate([self._daily, np.zeros(_SLOT_GROWTH, dtype=BAR_DTYPE)])
+        self._codes[slot] = stock_code
+        return slot
+
+    def on_tick(
+        self,
+        stock_code: str,
+        trade_date: int,
+        hour: str,
+        price: int,
+        volume: int,
+        day_open: Optional[int] = None,
+        day_high: Optional[int] = None,
+        day_low: Optional[int] = None,
+        day_volume: Optional[int] = None,
+    ) -> bool:
+        """체결 한 건 반영 (이미 닫힌 분봉의 체결이면 False)
+
+        Args:
+            trade_date: 거래일 (YYYYMMDD 정수)
+            hour: 체결 시각 (HHMMSS)
+            day_open/day_high/day_low/day_volume: 거래소가 보내는 당일 시가/고가/저가/누적 거래량
+                (있으면 일봉에 그대로 사용, 없으면 수신한 체결로 집계)
+        """
+        key = trade_date * 10000 + int(hour[:4])
+        with self._lock:
+            slot = self._slot(stock_code)
+            minute = self._minute
+            current = minute["time"][slot]
+            if key < current or (key == current and not self._minute_open[slot]):
+                REALTIME_TICKS.labels("late").inc()
+                return False
+
+            if key > current:
+                if self._minute_open[slot]:
+                    self._push(slot)
+                minute["time"][slot] = key
+                minute["open"][slot] = minute["high"][slot] = minute["low"][slot] = price
+                minute["volume"][slot] = 0
+                self._minute_open[slot] = True
+            else:
+                minute["high"][slot] = max(minute["high"][slot], price)
+                minute["low"][slot] = min(minute["low"][slot], price)
+            minute["close"][slot] = price
+            minute["volume"][slot] += volume
+
+            if trade_date > self._closed_day:
+                self._update_daily(slot, trade_date, price, volume, day_open, day_high, day_low, day_volume)
+
+            self.updated_at = time.time()
+        REALTIME_TICKS.labels("applied").inc()
+        return True
+
+    def _update_daily(self, slot, trade_date, price, volume, day_open, day_high, day_low, day_volume):
+        daily = self._daily
+        if daily["date"][slot] != trade_date:
+            daily["date"][slot] = trade_date
+            daily["open"][slot] = daily["high"][slot] = daily["low"][slot] = price
+            daily["volume"][slot] = 0
+        else:
+            daily["high"][slot] = max(daily["high"][slot], price)
+            daily["low"][slot] = min(daily["low"][slot], price)
+        daily["close"][slot] = price
+        daily["volume"][slot] += volume
+        if day_open:
+            daily["open"][slot] = day_open
+        if day_high:
+            daily["high"][slot] = max(day_high, price)
+        if day_low:
+            daily["low"][slot] = min(day_low, price)
+        if day_volume:
+            daily["volume"][slot] = day_volume
+
+    def _push(self, slot: int):
+        """분봉을 닫아 링 버퍼에 추가 (가득 차면 가장 오래된 분봉을 덮어씀)"""
+        self._ring[self._head] = self._minute[slot]
+        self._ring_codes[self._head] = self._codes[slot]
+        self._head = (self._head + 1) % len(self._ring)
+        self._minute_open[slot] = False
+        if self._pending == len(self._ring):
+            self.dropped += 1
+            REALTIME_BARS_DROPPED.inc()
+        else:
+            self._pending += 1
+
+    def roll(self, before: int) -> int:
+        """분봉 키(YYYYMMDDHHMM)가 `before`보다 이전인 진행 중 분봉을 닫음 (체결이 끊긴 종목용, 닫은 수 반환)"""
+        with self._lock:
+            slots = np.flatnonzero(self._minute_open & (self._minute["time"] < before))
+            for slot in slots.tolist():
+                self._push(slot)
+            return len(slots)
+
+    def drain(self) -> Dict[str, np.ndarray]:
+        """저장 대기 중인 완료 분봉을 종목별(시각 오름차순)로 꺼냄"""
+        with self._lock:
+            if not self._pending:
+                return {}
+            size = len(self._ring)
+            order = (self._head - self._pending + np.arange(self._pending)) % size
+            bars = self._ring[order]
+            codes = self._ring_codes[order]
+            self._pending = 0
+
+        sort = np.argsort(codes, kind="stable")
+        codes, bars = codes[sort], bars[sort]
+        unique, starts = np.unique(codes, return_index=True)
+        return {
+            code: group
+            for code, group in zip(unique.tolist(), np.split(bars, starts[1:]))
+        }
+
+    def daily_bars(self) -> Dict[str, np.ndarray]:
+        """종목별 당일 일봉 복사본 (장 마감 잠정 일봉용, 집계는 계속)"""
+        with self._lock:
+            return self._daily_bars()
+
+    def _daily_bars(self) -> Dict[str, np.ndarray]:
+        slots = np.flatnonzero(self._daily["date"][:len(self._slots)] > 0)
+        return {str(self._codes[slot]): self._daily[slot:slot + 1].copy() for slot in slots.tolist()}
+
+    def close_day(self) -> Dict[str, np.ndarray]:
+        """일봉 확정: 진행 중 분봉을 모두 닫고, 종목별 당일 일봉을 꺼낸 뒤 초기화
+
+        확정한 거래일에 늦게 도착한 체결은 일봉을 새로 만들지 않습니다 (확정 일봉을 일부 체결로 덮어쓰지 않도록).
+        """
+        with self._lock:
+            for slot in np.flatnonzero(self._minute_open).tolist():
+                self._push(slot)
+            daily = self._daily_bars()
+            if daily:
+                self._closed_day = max(self._closed_day, int(self._daily["date"].max()))
+            self._daily["date"][:] = 0
+            return daily
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def snapshot(self) -> Dict[str, Any]:
+        """종목별 진행 중 분봉과 당일 일봉 (API 응답/스냅숏 파일용)"""
+        with self._lock:
+            symbols = {}
+            for code, slot in self._slots.items():
+                symbols[code] = {
+                    "minute": _bar_dict(self._minute, slot) if self._minute_open[slot] else None,
+                    "daily": _bar_dict(self._daily, slot) if self._daily["date"][slot] else None,
+                }
+            return {"updated_at": self.updated_at, "symbols": symbols}
+
+
+def write_snapshot(snapshot: Dict[str, Any], path: Path = REALTIME_SNAPSHOT_PATH):
+    """진행 중 바 스냅숏 기록 (임시 파일에 쓴 뒤 교체하므로 읽는 쪽은 항상 완전한 파일을 봄)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(orjson.dumps({**snapshot, "written_at": time.time()}))
+    os.replace(tmp_path, path)
+
+
+class SnapshotReader:
+    """실시간 워커가 기록한 진행 중 바 스냅숏 조회 (파일이 바뀐 경우에만 다시 읽음)"""
+
+    def __init__(self, path: Path = REALTIME_SNAPSHOT_PATH):
+        self.path = Path(path)
+        self._signature = None
+        self._snapshot = None
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if signature != self._signature:
+            self._snapshot = orjson.loads(self.path.read_bytes())
+            self._signature = signature
+        return self._snapshot
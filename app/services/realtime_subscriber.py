@@ -0,0 +1,220 @@
+import asyncio
+import json
+import logging
+from typing import Callable, Iterable, List, Optional, Set
+
+from websockets.asyncio.client import connect
+from websockets.exceptions import ConnectionClosed
+
+from app.core.config import KIS_WS_URL, REALTIME_MAX_SUBSCRIPTIONS, REALTIME_RECONNECT_MAX_SECONDS
+from app.services.realtime_bars import BarAggregator
+from app.utils.metrics import REALTIME_RECONNECTS
+
+logger = logging.getLogger(__name__)
+
+# 국내주식 실시간 체결가 (KRX)
+TICK_TR_ID = "H0STCNT0"
+
+# 체결 레코드 한 건의 필드 수와 사용하는 필드 위치 (레코드 여러 건이 '^'로 이어져 옴)
+TICK_FIELD_COUNT = 46
+F_CODE = 0        # 유가증권 단축 종목코드
+F_HOUR = 1        # 주식 체결 시간 (HHMMSS)
+F_PRICE = 2       # 주식 현재가
+F_DAY_OPEN = 7    # 주식 시가
+F_DAY_HIGH = 8    # 주식 최고가
+F_DAY_LOW = 9     # 주식 최저가
+F_VOLUME = 12     # 체결 거래량
+F_DAY_VOLUME = 13 # 누적 거래량
+F_DATE = 33       # 영업 일자 (YYYYMMDD)
+
+
+def parse_tick_frame(message: str) -> List[tuple]:
+    """체결 데이터 메시지(`0|H0STCNT0|건수|필드^필드^...`)를 (종목, 거래일, 시각, 현재가, 거래량,
+    시가, 고가, 저가, 누적 거래량) 목록으로 변환 (체결가가 아닌 메시지나 암호화된 메시지는 빈 목록)"""
+    parts = message.split("|", 3)
+    if len(parts) != 4 or parts[0] != "0" or parts[1] != TICK_TR_ID:
+        return []
+    fields = parts[3].split("^")
+    count = min(int(parts[2]), len(fields) // TICK_FIELD_COUNT)
+    ticks = []
+    for i in range(count):
+        record = fields[i * TICK_FIELD_COUNT:(i + 1) * TICK_FIELD_COUNT]
+        try:
+            ticks.append((
+                record[F_CODE], int(record[F_DATE]), record[F_HOUR], int(record[F_PRICE]), int(record[F_VOLUME]),
+                int(record[F_DAY_OPEN]), int(record[F_DAY_HIGH]), int(record[F_DAY_LOW]), int(record[F_DAY_VOLUME]),
+            ))
+        except ValueError:
+            logger.warning(f"체결 레코드 변환 실패: {'^'.join(record[:3])}")
+    return ticks
+
+
+class RealtimeSubscriber:
+    """한국투자증권 실시간 체결(웹소켓) 구독
+
+    구독 종목 목록을 유지하고, 연결이 끊기면 대기 시간을 두 배씩 늘리며(최대 `max_reconnect_delay`초)
+    다시 연결해 전체 종목을 다시 구독합니다. 받은 체결은 `aggregator`로 집계합니다.
+    """
+
+    def __init__(
+        self,
+        aggregator: BarAggregator,
+        symbols: Iterable[str] = (),
+        url: str = KIS_WS_URL,
+        approval_key: Optional[Callable[[], str]] = None,
+        max_subscriptions: int = REALTIME_MAX_SUBSCRIPTIONS,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = REALTIME_RECONNECT_MAX_SECONDS,
+    ):
+        self.aggregator = aggregator
+        self.url = url
+        self.max_subscriptions = max_subscriptions
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.symbols: Set[str] = set()
+        self.connected = False
+        self.reconnects = 0
+        self._approval_key = approval_key
+        self._key = None
+        self._ws = None
+        self._received = False  # 현재 연결에서 체결을 받았는지
+        self._stopping = asyncio.Event()
+        self.add_symbols(symbols)
+
+    def add_symbols(self, codes: Iterable[str]) -> List[str]:
+        """구독 목록에 추가 (연결당 최대 구독 수를 넘는 종목은 제외, 추가된 종목 반환)"""
+        added = []
+        for code in codes:
+            code = str(code).zfill(6)
+            if code in self.symbols:
+                continue
+            if len(self.symbols) >= self.max_subscriptions:
+                logger.warning(f"실시간 구독은 연결당 {self.max_subscriptions}종목까지입니다. 제외: {code}")
+                continue
+            self.symbols.add(code)
+            added.append(code)
+        return added
+
+    async def subscribe(self, codes: Iterable[str]):
+        """종목 구독 (연결 중이면 바로 구독 요청, 아니면 다음 연결 때 구독)"""
+        for code in self.add_symbols(codes):
+            await self._send_subscription(code, subscribe=True)
+
+    async def unsubscribe(self, codes: Iterable[str]):
+        """종목 구독 해제"""
+        for code in codes:
+            code = str(code).zfill(6)
+            if code in self.symbols:
+                self.symbols.discard(code)
+                await self._send_subscription(code, subscribe=False)
+
+    def _get_approval_key(self) -> str:
+        if self._approval_key is None:
+            from app.services.korea_investment_api import KoreaInvestmentAPI
+            self._approval_key = KoreaInvestmentAPI().get_approval_key
+        return self._approval_key()
+
+    async def _send_subscription(self, code: str, subscribe: bool):
+        if self._ws is None:
+            return
+        message = {
+            "header": {
+                "approval_key": self._key,
+                "custtype": "P",
+                "tr_type": "1" if subscribe else "2",
+                "content-type": "utf-8",
+            },
+            "body": {"input": {"tr_id": TICK_TR_ID, "tr_key": code}},
+        }
+        try:
+            await self._ws.send(json.dumps(message))
+        except ConnectionClosed:
+            pass  # 다시 연결할 때 전체 종목을 구독함
+
+    async def run(self):
+        """종료 요청이 있을 때까지 연결 유지 (끊기면 재연결 후 재구독)"""
+        delay = self.reconnect_delay
+        while not self._stopping.is_set():
+            self._received = False
+            try:
+                self._key = await asyncio.to_thread(self._get_approval_key)
+                async with connect(self.url, ping_interval=None) as ws:
+                    await self._session(ws)
+            except (ConnectionClosed, OSError) as e:
+                logger.warning(f"실시간 시세 연결 끊김: {str(e)}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"실시간 시세 연결 오류: {str(e)}")
+            finally:
+                self._ws = None
+                self.connected = False
+
+            if self._stopping.is_set():
+                break
+            # 체결을 받은 연결이었으면 대기 시간을 처음부터 다시 늘림
+            if self._received:
+                delay = self.reconnect_delay
+            logger.info(f"실시간 시세 재연결 대기: {delay:.1f}초")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            delay = min(delay * 2, self.max_reconnect_delay)
+            self.reconnects += 1
+            REALTIME_RECONNECTS.inc()
+
+    async def _session(self, ws):
+        """연결 하나를 처리 (전체 종목 구독 후 종료 요청이나 연결 끊김까지 메시지 수신)"""
+        self._ws = ws
+        self.connected = True
+        logger.info(f"실시간 시세 연결: {self.url} ({len(self.symbols)}종목 구독)")
+        for code in sorted(self.symbols):
+            await self._send_subscription(code, subscribe=True)
+
+        stop = asyncio.ensure_future(self._stopping.wait())
+        try:
+            while True:
+                recv = asyncio.ensure_future(ws.recv())
+                done, _ = await asyncio.wait({recv, stop}, return_when=asyncio.FIRST_COMPLETED)
+                if stop in done:
+                    recv.cancel()
+                    return
+                message = recv.result()
+                if isinstance(message, bytes):
+                    message = message.decode()
+                if message[:1] in ("0", "1"):
+                    self._handle_ticks(message)
+                else:
+                    await self._handle_control(ws, message)
+        finally:
+            stop.cancel()
+
+    def _handle_ticks(self, message: str):
+        ticks = parse_tick_frame(message)
+        for tick in ticks:
+            self.aggregator.on_tick(*tick)
+        if ticks:
+            self._received = True
+
+    async def _handle_control(self, ws, message: str):
+        """구독 응답과 PINGPONG 처리 (PINGPONG은 받은 그대로 돌려보냄)"""
+        try:
+            data = json.loads(message)
+        except ValueError:
+            logger.warning(f"알 수 없는 실시간 메시지: {message[:100]}")
+            return
+        header = data.get("header", {})
+        if header.get("tr_id") == "PINGPONG":
+            await ws.send(message)
+            return
+        body = data.get("body", {})
+        if body.get("rt_cd") not in (None, "0"):
+            logger.error(f"실시간 구독 오류 (종목: {header.get('tr_key')}): {body.get('msg1')}")
+        else:
+            logger.debug("실시간 구독 응답 (종목: %s): %s", header.get("tr_key"), body.get("msg1"))
+
+    def stop(self):
+        """연결을 닫고 run() 종료"""
+        self._stopping.set()
+
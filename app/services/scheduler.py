@@ -1,117 +1,269 @@
 import logging
 import asyncio
-import schedule
-import time
-import threading
+import json
+import os
 from datetime import datetime, timedelta
+from pathlib import Path
 import pytz
 
-from app.services.data_collector import DataCollector
-from app.core.config import TIMEZONE, SCHEDULE_TIME
+from app.services.job_queue import job_queue
+from app.services.leader_election import LeaderElection
+from app.core.config import (
+    TIMEZONE, SCHEDULE_CRON, SCHEDULE_CATCHUP_DAYS, SCHEDULER_STATE_PATH,
+    INTRADAY_SYMBOLS, INTRADAY_INTERVAL_SECONDS, INTRADAY_START, INTRADAY_END
+)
+from app.utils.cron import CronExpression
+from app.utils.metrics import SCHEDULER_RUNS, SCHEDULER_IS_LEADER
 
 logger = logging.getLogger(__name__)
 
 class StockDataScheduler:
-    """주식 데이터 수집 스케줄러"""
+    """주식 데이터 수집 스케줄러 (애플리케이션 이벤트 루프에서 동작)
     
-    def __init__(self):
-        self.collector = DataCollector()
+    다음 실행 시각까지 정확히 대기했다가 작업을 등록합니다. 실행 시각은 cron 표현식
+    (`SCHEDULE_CRON`, `TIMEZONE` 기준 현지 시각)으로 정합니다.
+    
+    웹 워커마다 스케줄러 인스턴스가 있지만, 리더 임대를 가진 프로세스 하나만 작업을 등록합니다.
+    활성화 여부와 마지막 실행 시각은 상태 파일로 모든 프로세스가 공유하므로, 리더가 되면
+    서버가 내려가 있던 동안 놓친 실행을 한 번에 보충합니다.
+    
+    장중 분봉 수집 종목(`INTRADAY_SYMBOLS`)이 있으면 평일 `INTRADAY_START`~`INTRADAY_END` 동안
+    `INTRADAY_INTERVAL_SECONDS`마다 분봉 수집 작업을 등록합니다 (이전 작업이 남아 있으면 건너뜀).
+    """
+    
+    def __init__(self, state_path=None, election=None, cron=None, intraday_symbols=None):
         self.timezone = pytz.timezone(TIMEZONE)
-        self.is_running = False
-        self.scheduler_thread = None
+        self.state_path = Path(state_path) if state_path else Path(SCHEDULER_STATE_PATH)
+        self.election = election or LeaderElection("scheduler")
+        self.cron = CronExpression(cron or SCHEDULE_CRON)
+        self.renew_interval = self.election.lease_seconds / 3
+        self._task = None
+        self._wake = None
+        self._next_run = None
+        self.intraday_symbols = INTRADAY_SYMBOLS if intraday_symbols is None else intraday_symbols
+        self._next_intraday = None
+        
+    def _now(self):
+        """TIMEZONE 기준 현재 현지 시각 (시간대 정보 없음)"""
+        return datetime.now(self.timezone).replace(tzinfo=None)
+        
+    def _localize(self, local_time):
+        return self.timezone.localize(local_time) if local_time else None
+        
+    def _load_state(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+            
+    def _save_state(self, **fields):
+        state = self._load_state()
+        state.update(fields)
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(self.state_path.suffix + f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.state_path)
+        
+    def _last_run(self):
+        """마지막으로 처리한 예정 실행 시각 (현지 시각)"""
+        last_run = self._load_state().get("last_run")
+        return datetime.fromisoformat(last_run) if last_run else None
+        
+    @property
+    def is_running(self):
+        """스케줄러 활성화 여부 (모든 프로세스 공통)"""
+        return bool(self._load_state().get("enabled", False))
+        
+    @property
+    def is_leader(self):
+        """이 프로세스가 스케줄러 리더인지 여부"""
+        return self.election.is_leader
         
     def start(self):
-        """스케줄러 시작"""
+        """스케줄러 시작 (리더 프로세스에서만 작업 등록)"""
         if self.is_running:
             logger.warning("스케줄러가 이미 실행 중입니다.")
             return False
             
         logger.info("주식 데이터 수집 스케줄러 시작")
+        fields = {"enabled": True}
+        if self._last_run() is None:
+            # 처음 시작하는 경우 지금부터를 보충 실행 기준으로 삼음
+            fields["last_run"] = self._now().isoformat(timespec="seconds")
+        self._save_state(**fields)
+        self._wakeup()
         
-        # 평일 오후 6시에 실행 (월-금)
-        schedule.every().monday.at(SCHEDULE_TIME).do(self._run_collect_job)
-        schedule.every().tuesday.at(SCHEDULE_TIME).do(self._run_collect_job)
-        schedule.every().wednesday.at(SCHEDULE_TIME).do(self._run_collect_job)
-        schedule.every().thursday.at(SCHEDULE_TIME).do(self._run_collect_job)
-        schedule.every().friday.at(SCHEDULE_TIME).do(self._run_collect_job)
-        
-        # 스케줄러 쓰레드 시작
-        self.is_running = True
-        self.scheduler_thread = threading.Thread(target=self._run_scheduler)
-        self.scheduler_thread.daemon = True
-        self.scheduler_thread.start()
-        
-        logger.info(f"스케줄러가 설정되었습니다. 평일 {SCHEDULE_TIME}에 데이터 수집이 실행됩니다.")
+        logger.info(f"스케줄러가 설정되었습니다. 실행 일정: {self.cron.expression} ({TIMEZONE})")
         return True
         
     def stop(self):
-        """스케줄러 중지"""
+        """스케줄러 중지 (모든 프로세스 공통)"""
         if not self.is_running:
             logger.warning("스케줄러가 실행 중이 아닙니다.")
             return False
             
         logger.info("주식 데이터 수집 스케줄러 중지")
-        self.is_running = False
-        schedule.clear()
+        self._save_state(enabled=False)
+        if self.election.is_leader:
+            self.election.release()
+        self._wakeup()
+        return True
+        
+    def ensure_loop(self):
+        """스케줄러 루프를 현재 이벤트 루프에 등록 (애플리케이션 시작 시 모든 프로세스에서 호출)"""
+        if self._task is not None and not self._task.done():
+            return
+        self._wake = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run_scheduler())
         
-        # 스케줄러 쓰레드가 종료될 때까지 대기
-        if self.scheduler_thread and self.scheduler_thread.is_alive():
-            self.scheduler_thread.join(timeout=5)
+    async def shutdown(self):
+        """루프 종료 및 리더 임대 반납 (애플리케이션 종료 시)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.election.is_leader:
+            await asyncio.to_thread(self.election.release)
             
-        return True
+    def _wakeup(self):
+        """대기 중인 루프를 깨워 상태 변경을 바로 반영"""
+        if self._wake is not None:
+            self._wake.set()
+            
+    async def _run_scheduler(self):
+        """스케줄러 실행 루프 (다음 실행 시각 또는 임대 연장 시각까지 대기)"""
+        while True:
+            try:
+                await self._tick()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"스케줄러 루프 오류: {str(e)}")
+                
+            delay = self.renew_interval
+            for next_time in (self._next_run, self._next_intraday):
+                if next_time is not None:
+                    delay = min(delay, max((next_time - self._now()).total_seconds(), 0))
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+                
+    async def _tick(self):
+        """활성화 상태면 리더 임대를 획득/연장하고, 리더일 때만 예정된 작업 등록"""
+        if not self.is_running:
+            self._next_run = None
+            self._next_intraday = None
+            if self.election.is_leader:
+                await asyncio.to_thread(self.election.release)
+            SCHEDULER_IS_LEADER.set(0)
+            return
+            
+        was_leader = self.election.is_leader
+        acquired = await asyncio.to_thread(self.election.try_acquire)
+        SCHEDULER_IS_LEADER.set(1 if acquired else 0)
+        if not acquired:
+            self._next_run = None
+            self._next_intraday = None
+            return
+            
+        now = self._now()
+        if not was_leader:
+            # 리더가 되면 놓친 실행 보충 (이전 리더가 처리한 실행은 상태 파일로 확인)
+            self._catch_up(now)
+        elif self._next_run is not None and now >= self._next_run:
+            self._run_collect_job(self._next_run)
+            
+        self._next_run = self.cron.next_after(now)
+        self._run_intraday_job(now)
         
-    def _run_scheduler(self):
-        """스케줄러 실행 루프"""
-        while self.is_running:
-            schedule.run_pending()
-            time.sleep(60)  # 1분마다 체크
+    def _catch_up(self, now):
+        """마지막 실행 이후 놓친 예정 실행을 작업 하나로 보충"""
+        last_run = self._last_run()
+        if last_run is None:
+            return None
             
-    def _run_collect_job(self):
-        """데이터 수집 작업 실행"""
-        logger.info("스케줄된 데이터 수집 작업 시작")
+        earliest = now - timedelta(days=SCHEDULE_CATCHUP_DAYS)
+        missed = list(self.cron.iter_between(max(last_run, earliest), now))
+        if not missed:
+            return None
+            
+        logger.warning(f"놓친 예정 실행 {len(missed)}건 보충: {missed[0]:%Y-%m-%d %H:%M} ~ {missed[-1]:%Y-%m-%d %H:%M}")
+        return self._run_collect_job(missed[-1], missed[0])
         
-        # 비동기 함수를 이벤트 루프에서 실행
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+    def _run_collect_job(self, scheduled_at, catch_up_from=None):
+        """데이터 수집 작업 등록 (실행은 수집 워커 프로세스가 담당)
         
+        Args:
+            scheduled_at: 처리할 예정 실행 시각 (이미 처리된 시각이면 건너뜀)
+            catch_up_from: 보충 실행이면 놓친 첫 실행 시각 (다른 날이면 기간 수집으로 등록)
+        """
+        last_run = self._last_run()
+        if last_run is not None and scheduled_at <= last_run:
+            # 리더가 바뀐 직후 같은 실행이 다시 등록되지 않도록
+            logger.info(f"이미 처리된 예정 실행입니다: {scheduled_at:%Y-%m-%d %H:%M}")
+            return None
+            
+        first = catch_up_from or scheduled_at
         try:
-            collect_result = loop.run_until_complete(self._collect_today_data())
-            logger.info(f"스케줄된 데이터 수집 완료: {collect_result}")
-            return True
+            if first.date() == self._now().date():
+                job = job_queue.enqueue("collect_today")
+            else:
+                job = job_queue.enqueue("collect_historical", {
+                    "from_date": first.strftime("%Y%m%d"),
+                    "to_date": scheduled_at.strftime("%Y%m%d")
+                })
+            self._save_state(last_run=scheduled_at.isoformat(timespec="seconds"), last_job_id=job["id"])
+            SCHEDULER_RUNS.labels("catch_up" if catch_up_from else "schedule").inc()
+            logger.info(f"스케줄된 데이터 수집 작업 등록 완료: {job['kind']} (예정 시각: {scheduled_at:%Y-%m-%d %H:%M}, 작업: {job['id']})")
+            return job
         except Exception as e:
-            logger.error(f"스케줄된 데이터 수집 실패: {str(e)}")
-            return False
-        finally:
-            loop.close()
+            logger.error(f"스케줄된 데이터 수집 작업 등록 실패: {str(e)}")
+            return None
             
-    async def _collect_today_data(self):
-        """오늘의 데이터 수집 실행"""
-        return await self.collector.collect_today_data()
+    def _in_intraday_session(self, now):
+        """장중 분봉 수집 시간대인지 (평일, TIMEZONE 기준 현지 시각)"""
+        return now.weekday() < 5 and INTRADAY_START <= now.strftime("%H%M") <= INTRADAY_END
+        
+    def _run_intraday_job(self, now):
+        """장중이면 주기마다 분봉 수집 작업 등록 (이전 분봉 작업이 대기/실행 중이면 건너뜀)"""
+        if not self.intraday_symbols or not self._in_intraday_session(now):
+            self._next_intraday = None
+            return None
+        if self._next_intraday is not None and now < self._next_intraday:
+            return None
+            
+        self._next_intraday = now + timedelta(seconds=INTRADAY_INTERVAL_SECONDS)
+        try:
+            if job_queue.has_active("collect_intraday"):
+                logger.info("이전 분봉 수집 작업이 끝나지 않아 이번 주기는 건너뜁니다.")
+                return None
+            # 지난 주기의 분봉은 다음 주기에 이어서 받으므로 재시도하지 않음
+            job = job_queue.enqueue("collect_intraday", max_attempts=1)
+            SCHEDULER_RUNS.labels("intraday").inc()
+            logger.debug(f"분봉 수집 작업 등록: {job['id']}")
+            return job
+        except Exception as e:
+            logger.error(f"분봉 수집 작업 등록 실패: {str(e)}")
+            return None
+            
+    def get_leader(self):
+        """현재 스케줄러 리더 프로세스 정보 (리더가 없으면 None)"""
+        return self.election.current()
+        
+    def get_last_run_time(self):
+        """마지막으로 처리한 예정 실행 시각"""
+        return self._localize(self._last_run())
         
     def get_next_run_time(self):
         """다음 실행 시간 조회"""
         if not self.is_running:
             return None
             
-        now = datetime.now(self.timezone)
-        today_schedule_time = datetime.strptime(SCHEDULE_TIME, "%H:%M").time()
-        today_schedule_datetime = datetime.combine(now.date(), today_schedule_time)
-        
-        # 요일에 따라 다음 실행 날짜 계산
-        weekday = now.weekday()  # 0=월요일, 6=일요일
-        
-        if weekday >= 5:  # 주말
-            days_until_monday = 7 - weekday
-            next_run_date = now.date() + timedelta(days=days_until_monday)
-        elif now.time() >= today_schedule_time:  # 오늘 실행 시간 이후
-            if weekday == 4:  # 금요일이면 다음 월요일
-                next_run_date = now.date() + timedelta(days=3)
-            else:  # 다음 날
-                next_run_date = now.date() + timedelta(days=1)
-        else:  # 오늘 실행 시간 이전
-            next_run_date = now.date()
-            
-        next_run_datetime = datetime.combine(next_run_date, today_schedule_time)
-        next_run_datetime = self.timezone.localize(next_run_datetime)
-        
-        return next_run_datetime 
\ No newline at end of file
+        return self._localize(self.cron.next_after(self._now()))
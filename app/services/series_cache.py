@@ -0,0 +1,139 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+import numpy as np
+
+from app.core.config import SERIES_CACHE_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+# 캐시 키 종류
+SERIES = "series"        # (SERIES, 종목코드) -> 종목 전체 일봉
+CROSS_SECTION = "xsection"  # (CROSS_SECTION, 거래일) -> 해당 일자 전 종목 일봉
+
+
+def _sizeof(value: Any) -> int:
+    """캐시 항목 크기(바이트) 추정"""
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if hasattr(value, "memory_usage"):  # pandas DataFrame
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return 64
+
+
+class SeriesCache:
+    """디코딩된 종목 시계열/일자별 단면 LRU 캐시
+
+    항목 수가 아니라 바이트 기준으로 용량을 제한하며, 바 저장소에 새 데이터가
+    쓰이면 해당 종목과 거래일 항목만 정확히 무효화합니다.
+    다른 프로세스(수집 워커)의 쓰기는 항목마다 저장한 버전(종목 파일 식별자/거래일 세대 번호)을
+    조회 시 비교해 감지합니다.
+    """
+
+    def __init__(self, max_bytes: int = SERIES_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, version: Hashable = None) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and version is not None and entry[2] != version:
+                # 다른 프로세스에서 바뀐 항목
+                del self._entries[key]
+                self.current_bytes -= entry[1]
+                self.invalidations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, nbytes: Optional[int] = None, version: Hashable = None):
+        nbytes = _sizeof(value) if nbytes is None else nbytes
+        if nbytes > self.max_bytes:
+            logger.debug(f"캐시 용량보다 큰 항목은 저장하지 않음: {key} ({nbytes}바이트)")
+            return
+
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._entries[key] = (value, nbytes, version)
+            self.current_bytes += nbytes
+
+            while self.current_bytes > self.max_bytes and self._entries:
+                _, (_, evicted_bytes, _) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_bytes
+                self.evictions += 1
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], version: Any = None) -> Any:
+        """캐시 조회 후 없거나 버전이 다르면 loader로 적재
+
+        version이 함수면 적재 전후로 불러, 적재하는 동안 다른 쓰기로 버전이 바뀐 경우에는 결과를 돌려주기만 하고
+        캐시에 넣지 않습니다 (바뀌기 전에 읽은 값이 새 버전으로 남지 않도록).
+        """
+        current = version() if callable(version) else version
+        value = self.get(key, current)
+        if value is None:
+            value = loader()
+            if callable(version) and version() != current:
+                logger.debug(f"적재 중 버전이 바뀌어 캐시에 저장하지 않음: {key}")
+                return value
+            self.put(key, value, version=current)
+        return value
+
+    def invalidate(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return False
+            self.current_bytes -= entry[1]
+            self.invalidations += 1
+            return True
+
+    def invalidate_symbol(self, stock_code: str) -> bool:
+        """종목 시계열 항목 무효화"""
+        return self.invalidate((SERIES, stock_code))
+
+    def invalidate_dates(self, dates: Iterable) -> int:
+        """거래일 단면 항목 무효화"""
+        return sum(self.invalidate((CROSS_SECTION, int(date))) for date in set(int(d) for d in dates))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계 (적중률, 제거 횟수, 사용량)"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "current_bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+# 프로세스 전역 캐시
+series_cache = SeriesCache()
@@ -0,0 +1,436 @@
+"""분산 수집 코디네이터
+
+종목 × 기간 작업 공간을 샤드(기간 구간 하나 × 종목 버킷 하나)로 나누고, 살아 있는 워커로 만든 일관성 해시 링으로
+샤드를 배정합니다. 워커는 여러 호스트에서 HTTP로 하트비트를 보내며 배정된 샤드를 시작/완료 보고하고, 파티션 파일은
+워커가 직접 씁니다. 하트비트가 `SHARD_WORKER_TIMEOUT_SECONDS` 동안 없는 워커는 링에서 빠지고, 실행 중이던 샤드는
+대기로 돌아가 남은 워커에 재배정됩니다 (링에서 빠진 워커의 샤드만 옮겨짐). 모든 샤드가 끝나면 매니페스트를 기록합니다.
+
+상태는 작업 큐와 같은 SQLite(WAL) 파일에 두므로 코디네이터를 다시 시작해도 이어서 진행합니다.
+"""
+import bisect
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.core.config import (
+    SHARD_DB_PATH,
+    SHARD_OUTPUT_PATH,
+    SHARD_RING_REPLICAS,
+    SHARD_WORKER_TIMEOUT_SECONDS,
+    SHARD_MAX_ATTEMPTS,
+)
+from app.services.job_queue import PENDING, RUNNING, SUCCEEDED, FAILED
+
+logger = logging.getLogger(__name__)
+
+# 실행/워커 상태 (샤드 상태는 작업과 같음)
+COMMITTED = "committed"
+ALIVE = "alive"
+DEAD = "dead"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS shard_runs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    params TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    finished_at TEXT,
+    manifest_path TEXT
+);
+CREATE TABLE IF NOT EXISTS shards (
+    run_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    spec TEXT NOT NULL,
+    status TEXT NOT NULL,
+    owner TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    started_at TEXT,
+    finished_at TEXT,
+    result TEXT,
+    error TEXT,
+    PRIMARY KEY (run_id, id)
+);
+CREATE INDEX IF NOT EXISTS shards_status ON shards (run_id, status);
+CREATE TABLE IF NOT EXISTS shard_workers (
+    id TEXT PRIMARY KEY,
+    host TEXT,
+    status TEXT NOT NULL,
+    last_seen REAL NOT NULL,
+    joined_at TEXT NOT NULL
+);
+"""
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+
+class HashRing:
+    """일관성 해시 링 (워커마다 가상 노드 `replicas`개)
+
+    워커가 들어오거나 빠져도 그 워커의 구간에 있던 키만 다른 워커로 옮겨집니다.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = SHARD_RING_REPLICAS):
+        self.replicas = replicas
+        self.nodes = set()
+        self._keys: List[int] = []
+        self._owners: List[str] = []
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: str):
+        if node in self.nodes:
+            return
+        self.nodes.add(node)
+        for replica in range(self.replicas):
+            point = _hash(f"{node}#{replica}")
+            index = bisect.bisect(self._keys, point)
+            self._keys.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove(self, node: str):
+        if node not in self.nodes:
+            return
+        self.nodes.discard(node)
+        kept = [(key, owner) for key, owner in zip(self._keys, self._owners) if owner != node]
+        self._keys = [key for key, _ in kept]
+        self._owners = [owner for _, owner in kept]
+
+    def node_for(self, key: str) -> Optional[str]:
+        """키를 맡는 워커 (링이 비어 있으면 None)"""
+        if not self._keys:
+            return None
+        index = bisect.bisect(self._keys, _hash(key)) % len(self._keys)
+        return self._owners[index]
+
+
+def symbol_bucket(stock_code: str, buckets: int) -> int:
+    """종목 버킷 (프로세스/호스트와 무관하게 같은 값)"""
+    return _hash(str(stock_code).zfill(6)) % buckets
+
+
+def date_windows(from_date: str, to_date: str, window_days: int) -> List[tuple]:
+    """기간을 window_days일 구간으로 나눈 (시작일, 종료일) 목록"""
+    start = datetime.strptime(from_date, "%Y%m%d")
+    end = datetime.strptime(to_date, "%Y%m%d")
+    if start > end:
+        raise ValueError(f"시작일이 종료일보다 늦습니다: {from_date} ~ {to_date}")
+    windows = []
+    while start <= end:
+        window_end = min(start + timedelta(days=window_days - 1), end)
+        windows.append((start.strftime("%Y%m%d"), window_end.strftime("%Y%m%d")))
+        start = window_end + timedelta(days=1)
+    return windows
+
+
+def partition_work(items: Dict[str, List[dict]], from_date: str, to_date: str,
+                   window_days: int, buckets: int) -> List[Dict[str, Any]]:
+    """종목 × 기간 작업 공간을 샤드 목록으로 분할 (종목이 없는 버킷은 제외)
+
+    Args:
+        items: 시장별 종목 목록 (stock_code, stock_name, market)
+    """
+    grouped: List[Dict[str, List[dict]]] = [{} for _ in range(buckets)]
+    for market, market_items in items.items():
+        for item in market_items:
+            grouped[symbol_bucket(item["stock_code"], buckets)].setdefault(market, []).append({
+                "stock_code": str(item["stock_code"]).zfill(6),
+                "stock_name": item.get("stock_name", ""),
+                "market": market,
+            })
+
+    shards = []
+    for window_from, window_to in date_windows(from_date, to_date, window_days):
+        for bucket, bucket_items in enumerate(grouped):
+            if bucket_items:
+                shards.append({
+                    "id": f"{window_from}_{window_to}.{bucket:03d}",
+                    "from_date": window_from,
+                    "to_date": window_to,
+                    "bucket": bucket,
+                    "items": bucket_items,
+                })
+    return shards
+
+
+class ShardCoordinator:
+    """샤드 배정/완료 기록 (SQLite 기반, 코디네이터 프로세스 하나가 사용)"""
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        output_path: Optional[Path] = None,
+        worker_timeout: float = SHARD_WORKER_TIMEOUT_SECONDS,
+        max_attempts: int = SHARD_MAX_ATTEMPTS,
+    ):
+        self.db_path = Path(db_path) if db_path else Path(SHARD_DB_PATH)
+        self.output_path = Path(output_path) if output_path else Path(SHARD_OUTPUT_PATH)
+        self.worker_timeout = worker_timeout
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """스레드별 연결"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    conn.executescript(SCHEMA)
+                    self._initialized = True
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def create_run(self, shards: List[Dict[str, Any]], params: Optional[Dict[str, Any]] = None) -> str:
+        """분산 수집 실행 등록"""
+        if not shards:
+            raise ValueError("수집할 샤드가 없습니다.")
+        run_id = uuid.uuid4().hex
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO shard_runs (id, status, params, created_at) VALUES (?, ?, ?, ?)",
+                (run_id, RUNNING, json.dumps(params or {}, ensure_ascii=False), _now()),
+            )
+            conn.executemany(
+                "INSERT INTO shards (run_id, id, spec, status) VALUES (?, ?, ?, ?)",
+                [(run_id, shard["id"], json.dumps(shard, ensure_ascii=False), PENDING) for shard in shards],
+            )
+        logger.info(f"분산 수집 실행 등록: {run_id} (샤드 {len(shards)}개)")
+        return run_id
+
+    def _active_run(self, conn: sqlite3.Connection, run_id: Optional[str] = None) -> Optional[str]:
+        """진행 중인 실행 (run_id를 지정하면 그 실행이 진행 중일 때만, 아니면 가장 오래된 실행)"""
+        if run_id is not None:
+            row = conn.execute("SELECT id FROM shard_runs WHERE id = ? AND status = ?", (run_id, RUNNING)).fetchone()
+        else:
+            row = conn.execute(
+                "SELECT id FROM shard_runs WHERE status = ? ORDER BY created_at LIMIT 1", (RUNNING,)
+            ).fetchone()
+        return row["id"] if row else None
+
+    def _reap(self, conn: sqlite3.Connection, now: float):
+        """하트비트가 끊긴 워커를 링에서 빼고, 실행 중이던 샤드를 대기로 되돌림"""
+        dead = conn.execute(
+            "SELECT id FROM shard_workers WHERE status = ? AND last_seen < ?", (ALIVE, now - self.worker_timeout)
+        ).fetchall()
+        for row in dead:
+            conn.execute("UPDATE shard_workers SET status = ? WHERE id = ?", (DEAD, row["id"]))
+            cursor = conn.execute(
+                "UPDATE shards SET status = ?, owner = NULL, error = ? WHERE status = ? AND owner = ?",
+                (PENDING, f"워커 응답 없음: {row['id']}", RUNNING, row["id"]),
+            )
+            logger.warning(f"워커 응답 없음, 샤드 재배정: {row['id']} (실행 중이던 샤드 {cursor.rowcount}개)")
+
+    def reap(self):
+        """응답 없는 워커 정리 (워커 요청이 없을 때 코디네이터가 주기적으로 호출)"""
+        with self._transaction() as conn:
+            self._reap(conn, time.time())
+
+    def _ring(self, conn: sqlite3.Connection) -> HashRing:
+        return HashRing(row["id"] for row in conn.execute("SELECT id FROM shard_workers WHERE status = ?", (ALIVE,)))
+
+    def heartbeat(self, worker_id: str, host: Optional[str] = None, run_id: Optional[str] = None) -> Dict[str, Any]:
+        """워커 생존 기록 후 이 워커에 배정된 샤드 목록 (진행 중 실행이 없으면 run은 None)
+
+        run_id를 지정하면 그 실행의 샤드만 배정합니다. 같은 DB를 쓰는 코디네이터가 여럿이어도 각 코디네이터는
+        자기 실행만 내주도록 HTTP API는 항상 자기 실행 ID로 호출합니다.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT status FROM shard_workers WHERE id = ?", (worker_id,)).fetchone()
+            if row is None:
+                conn.execute(
+                    "INSERT INTO shard_workers (id, host, status, last_seen, joined_at) VALUES (?, ?, ?, ?, ?)",
+                    (worker_id, host, ALIVE, now, _now()),
+                )
+                logger.info(f"워커 참여: {worker_id} ({host})")
+            else:
+                if row["status"] != ALIVE:
+                    logger.info(f"워커 복귀: {worker_id} ({host})")
+                conn.execute(
+                    "UPDATE shard_workers SET host = ?, status = ?, last_seen = ? WHERE id = ?",
+                    (host, ALIVE, now, worker_id),
+                )
+            self._reap(conn, now)
+
+            run_id = self._active_run(conn, run_id)
+            if run_id is None:
+                return {"run": None, "shards": []}
+            ring = self._ring(conn)
+            shards = [
+                row["id"] for row in conn.execute(
+                    "SELECT id, status, owner FROM shards WHERE run_id = ? AND status IN (?, ?) ORDER BY id",
+                    (run_id, PENDING, RUNNING),
+                )
+                if row["owner"] == worker_id
+                or (row["status"] == PENDING and ring.node_for(f"{run_id}:{row['id']}") == worker_id)
+            ]
+        return {"run": run_id, "shards": shards}
+
+    def start(self, run_id: str, shard_id: str, worker_id: str) -> Optional[Dict[str, Any]]:
+        """샤드 실행 시작 (이 워커에 배정된 대기 샤드만, 샤드 정의 반환, 배정이 바뀌었으면 None)"""
+        now = time.time()
+        with self._transaction() as conn:
+            self._reap(conn, now)
+            row = conn.execute("SELECT * FROM shards WHERE run_id = ? AND id = ?", (run_id, shard_id)).fetchone()
+            if row is None:
+                return None
+            if row["status"] == RUNNING and row["owner"] == worker_id:
+                return json.loads(row["spec"])
+            if row["status"] != PENDING or self._ring(conn).node_for(f"{run_id}:{shard_id}") != worker_id:
+                return None
+            conn.execute(
+                "UPDATE shards SET status = ?, owner = ?, attempts = attempts + 1, started_at = ?, error = NULL "
+                "WHERE run_id = ? AND id = ?",
+                (RUNNING, worker_id, _now(), run_id, shard_id),
+            )
+            conn.execute("UPDATE shard_workers SET last_seen = ? WHERE id = ?", (now, worker_id))
+        return json.loads(row["spec"])
+
+    def complete(self, run_id: str, shard_id: str, worker_id: str, result: Dict[str, Any]) -> bool:
+        """샤드 완료 기록 (파티션 경로, 행 수, 체크섬), 마지막 샤드면 매니페스트 기록. 재배정된 샤드면 False"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE shards SET status = ?, result = ?, finished_at = ? "
+                "WHERE run_id = ? AND id = ? AND owner = ? AND status = ?",
+                (SUCCEEDED, json.dumps(result, ensure_ascii=False), _now(), run_id, shard_id, worker_id, RUNNING),
+            )
+            if cursor.rowcount != 1:
+                logger.warning(f"재배정된 샤드의 완료 보고는 무시합니다: {shard_id} (워커: {worker_id})")
+                return False
+            self._finish_if_done(conn, run_id)
+        return True
+
+    def fail(self, run_id: str, shard_id: str, worker_id: str, error: str) -> bool:
+        """샤드 실패 기록 (최대 시도 횟수 전이면 대기로 되돌려 다시 배정)"""
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT attempts FROM shards WHERE run_id = ? AND id = ? AND owner = ? AND status = ?",
+                (run_id, shard_id, worker_id, RUNNING),
+            ).fetchone()
+            if row is None:
+                return False
+            status = FAILED if row["attempts"] >= self.max_attempts else PENDING
+            conn.execute(
+                "UPDATE shards SET status = ?, owner = ?, error = ?, finished_at = ? WHERE run_id = ? AND id = ?",
+                (status, worker_id if status == FAILED else None, error, _now() if status == FAILED else None,
+                 run_id, shard_id),
+            )
+            logger.warning(f"샤드 실패: {shard_id} (워커: {worker_id}, 시도: {row['attempts']}/{self.max_attempts}): {error}")
+            self._finish_if_done(conn, run_id)
+        return True
+
+    def _finish_if_done(self, conn: sqlite3.Connection, run_id: str):
+        """남은 샤드가 없으면 실행 종료 (모두 성공이면 매니페스트 기록 후 committed)"""
+        counts = {
+            row["status"]: row["count"] for row in conn.execute(
+                "SELECT status, COUNT(*) AS count FROM shards WHERE run_id = ? GROUP BY status", (run_id,)
+            )
+        }
+        if counts.get(PENDING) or counts.get(RUNNING):
+            return
+        if counts.get(FAILED):
+            conn.execute("UPDATE shard_runs SET status = ?, finished_at = ? WHERE id = ?", (FAILED, _now(), run_id))
+            logger.error(f"분산 수집 실패: {run_id} (실패 샤드 {counts[FAILED]}개)")
+            return
+
+        manifest_path = self._write_manifest(conn, run_id)
+        conn.execute(
+            "UPDATE shard_runs SET status = ?, finished_at = ?, manifest_path = ? WHERE id = ?",
+            (COMMITTED, _now(), str(manifest_path), run_id),
+        )
+        logger.info(f"분산 수집 완료, 매니페스트 기록: {manifest_path}")
+
+    def _write_manifest(self, conn: sqlite3.Connection, run_id: str) -> Path:
+        run = conn.execute("SELECT * FROM shard_runs WHERE id = ?", (run_id,)).fetchone()
+        partitions = []
+        for row in conn.execute("SELECT * FROM shards WHERE run_id = ? ORDER BY id", (run_id,)):
+            spec = json.loads(row["spec"])
+            partitions.append({
+                "shard": row["id"],
+                "from_date": spec["from_date"],
+                "to_date": spec["to_date"],
+                "symbols": sum(len(items) for items in spec["items"].values()),
+                "worker": row["owner"],
+                "attempts": row["attempts"],
+                **json.loads(row["result"]),
+            })
+        manifest = {
+            "run_id": run_id,
+            "params": json.loads(run["params"]),
+            "created_at": run["created_at"],
+            "committed_at": _now(),
+            "shards": len(partitions),
+            "rows": sum(partition.get("rows", 0) for partition in partitions),
+            "partitions": partitions,
+        }
+        path = self.output_path / run_id / "manifest.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp_path, path)
+        return path
+
+    def status(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """실행 상태 (샤드 상태별 수, 워커별 진행, 매니페스트 경로)"""
+        conn = self._connection()
+        run = conn.execute("SELECT * FROM shard_runs WHERE id = ?", (run_id,)).fetchone()
+        if run is None:
+            return None
+        shards = conn.execute(
+            "SELECT id, status, owner, attempts, error FROM shards WHERE run_id = ? ORDER BY id", (run_id,)
+        ).fetchall()
+        counts: Dict[str, int] = {}
+        for row in shards:
+            counts[row["status"]] = counts.get(row["status"], 0) + 1
+        workers = [
+            {"id": row["id"], "host": row["host"], "status": row["status"],
+             "seconds_since_seen": round(time.time() - row["last_seen"], 1)}
+            for row in conn.execute("SELECT * FROM shard_workers ORDER BY id")
+        ]
+        return {
+            "run_id": run_id,
+            "status": run["status"],
+            "created_at": run["created_at"],
+            "finished_at": run["finished_at"],
+            "manifest_path": run["manifest_path"],
+            "counts": counts,
+            "workers": workers,
+            "failed": [
+                {"shard": row["id"], "attempts": row["attempts"], "error": row["error"]}
+                for row in shards if row["status"] == FAILED
+            ],
+        }
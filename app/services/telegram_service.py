@@ -1,54 +1,272 @@
 import asyncio
+import atexit
+import html
 import logging
-from telegram import Bot
-from app.core.config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
+import os
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import (
+    TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, TELEGRAM_COALESCE_SECONDS,
+    TELEGRAM_MIN_INTERVAL_SECONDS, TELEGRAM_MAX_RETRIES, TELEGRAM_MAX_PENDING
+)
 
 logger = logging.getLogger(__name__)
 
+# 요약 메시지에 나열할 오류 종류 수와 오류 메시지 최대 길이 (텔레그램 메시지는 4096자 제한)
+DIGEST_ERROR_SAMPLES = 5
+DIGEST_ERROR_LENGTH = 300
+
+@dataclass
+class Notification:
+    """전송 대기 알림 (kind: collection 또는 error)"""
+    kind: str
+    text: str = ""
+    market: Optional[str] = None
+    count: int = 0
+    file_path: Optional[str] = None
+
+def _collection_message(market, data_count, file_path=None):
+    message = f"""
+<b>📊 주식 데이터 수집 완료</b>
+
+- 시장: <b>{market}</b>
+- 수집 데이터 수: <b>{data_count:,}개</b>
+"""
+    if file_path:
+        message += f"- 저장 경로: <code>{html.escape(str(file_path))}</code>"
+    return message
+
+def _error_message(error_message):
+    return f"""
+<b>❌ 주식 데이터 수집 오류</b>
+
+<code>{html.escape(str(error_message))}</code>
+"""
+
+def build_digest(notifications: List[Notification], dropped: int = 0) -> str:
+    """알림 여러 건을 메시지 하나로 요약 (한 건이면 기존 알림 형식 그대로)
+
+    수집 완료는 시장별 합계로, 오류는 같은 메시지끼리 건수로 묶습니다.
+    """
+    if len(notifications) == 1 and not dropped:
+        item = notifications[0]
+        if item.kind == "collection":
+            return _collection_message(item.market, item.count, item.file_path)
+        return _error_message(item.text)
+
+    parts = []
+    markets: Dict[str, List[int]] = {}
+    for item in notifications:
+        if item.kind == "collection":
+            total = markets.setdefault(item.market, [0, 0])
+            total[0] += item.count
+            total[1] += 1
+    if markets:
+        lines = [
+            f"- {market}: <b>{count:,}개</b>" + (f" ({runs}회)" if runs > 1 else "")
+            for market, (count, runs) in markets.items()
+        ]
+        parts.append("<b>📊 주식 데이터 수집 완료</b>\n\n" + "\n".join(lines))
+
+    errors = Counter(item.text for item in notifications if item.kind == "error")
+    if errors:
+        lines = []
+        for text, count in errors.most_common(DIGEST_ERROR_SAMPLES):
+            if len(text) > DIGEST_ERROR_LENGTH:
+                text = text[:DIGEST_ERROR_LENGTH] + "…"
+            lines.append(f"<code>{html.escape(text)}</code>" + (f" ×{count}" if count > 1 else ""))
+        if len(errors) > DIGEST_ERROR_SAMPLES:
+            lines.append(f"외 {len(errors) - DIGEST_ERROR_SAMPLES}종")
+        parts.append(f"<b>❌ 주식 데이터 수집 오류 {sum(errors.values()):,}건</b>\n\n" + "\n".join(lines))
+
+    if dropped:
+        parts.append(f"(대기 중인 알림이 많아 {dropped:,}건 생략)")
+    return "\n" + "\n\n".join(parts) + "\n"
+
+class NotificationDispatcher:
+    """텔레그램 알림 큐와 전송 스레드
+
+    알림은 큐에 넣기만 하고 바로 돌아오므로 수집 작업은 전송을 기다리지 않습니다. 전송 스레드는 첫 알림부터
+    `window`초 동안 들어온 알림을 요약 메시지 하나로 묶고, 메시지 사이에 `min_interval`초 이상 간격을 둡니다.
+    텔레그램이 RetryAfter(전송 제한)로 응답하면 안내된 시간만큼 기다렸다가 다시 보냅니다.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str], Awaitable],
+        window: float = TELEGRAM_COALESCE_SECONDS,
+        min_interval: float = TELEGRAM_MIN_INTERVAL_SECONDS,
+        max_retries: int = TELEGRAM_MAX_RETRIES,
+        max_pending: int = TELEGRAM_MAX_PENDING,
+    ):
+        self.send = send
+        self.window = window
+        self.min_interval = min_interval
+        self.max_retries = max_retries
+        self.max_pending = max_pending
+        self.sent = 0
+        self.failed = 0
+        self._pending: List[Notification] = []
+        self._dropped = 0
+        self._last_sent = None
+        self._lock = threading.Lock()
+        self._has_pending = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._atexit_registered = False
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def submit(self, notification: Notification) -> bool:
+        """알림을 큐에 넣음 (대기 알림이 가득 차면 건수만 세고 False)"""
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                self._dropped += 1
+                return False
+            self._pending.append(notification)
+            if self._thread is None or not self._thread.is_alive():
+                self._start()
+        self._has_pending.set()
+        return True
+
+    def _start(self):
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="telegram-dispatcher", daemon=True)
+        self._thread.start()
+        if not self._atexit_registered:
+            atexit.register(self.stop)
+            self._atexit_registered = True
+
+    def stop(self, timeout: float = 30):
+        """남은 알림을 바로 묶어 보내고 전송 스레드 종료"""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._stopping.set()
+        self._has_pending.set()
+        thread.join(timeout)
+
+    def _reset_after_fork(self):
+        """fork된 자식 프로세스는 부모의 대기 알림을 보내지 않음 (전송 스레드는 다음 알림에서 시작)"""
+        self._lock = threading.Lock()
+        self._pending = []
+        self._dropped = 0
+        self._thread = None
+
+    def _run(self):
+        # 전송 스레드 전용 이벤트 루프 (텔레그램 Bot의 HTTP 연결은 루프에 묶이므로 계속 같은 루프 사용)
+        loop = asyncio.new_event_loop()
+        try:
+            while True:
+                self._has_pending.wait()
+                self._stopping.wait(self.window)
+                with self._lock:
+                    batch, self._pending = self._pending, []
+                    dropped, self._dropped = self._dropped, 0
+                    self._has_pending.clear()
+                if batch or dropped:
+                    self._deliver(loop, build_digest(batch, dropped), len(batch))
+                if self._stopping.is_set():
+                    with self._lock:
+                        if not self._pending:
+                            return
+        finally:
+            loop.close()
+
+    def _deliver(self, loop, message: str, count: int):
+        if self._last_sent is not None:
+            wait = self.min_interval - (time.monotonic() - self._last_sent)
+            if wait > 0:
+                time.sleep(wait)
+
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                loop.run_until_complete(self.send(message))
+                self.sent += 1
+                logger.info(f"텔레그램 알림 전송 성공: 알림 {count}건")
+                return
+            except Exception as e:
+                retry_after = getattr(e, "retry_after", None)
+                delay = getattr(retry_after, "total_seconds", lambda: retry_after)() if retry_after is not None else 2 ** attempt
+                logger.warning(f"텔레그램 알림 전송 실패 ({attempt}/{self.max_retries}): {str(e)}")
+                if attempt < self.max_retries:
+                    time.sleep(float(delay))
+            finally:
+                self._last_sent = time.monotonic()
+
+        self.failed += 1
+        logger.error(f"텔레그램 알림 전송 포기: 알림 {count}건")
+
 class TelegramService:
     """텔레그램 알림 서비스"""
     
-    def __init__(self):
+    def __init__(self, dispatcher: Optional[NotificationDispatcher] = None):
         self.token = TELEGRAM_BOT_TOKEN
         self.chat_id = TELEGRAM_CHAT_ID
-        self.bot = Bot(token=self.token) if self.token else None
+        self._bot = None
+        self._dispatcher = dispatcher
+        
+    @property
+    def bot(self):
+        """텔레그램 Bot (python-telegram-bot은 첫 전송 시 불러옴)"""
+        if self._bot is None and self.token:
+            from telegram import Bot
+            self._bot = Bot(token=self.token)
+        return self._bot
         
+    @property
+    def dispatcher(self) -> NotificationDispatcher:
+        """알림 큐 (지정하지 않으면 프로세스 공용 큐)"""
+        return self._dispatcher or dispatcher
+
+    async def deliver(self, message):
+        """텔레그램으로 메시지 전송 (실패하면 예외)"""
+        await self.bot.send_message(
+            chat_id=self.chat_id,
+            text=message,
+            parse_mode="HTML"
+        )
+
     async def send_message(self, message):
         """텔레그램으로 메시지 전송"""
-        if not self.bot or not self.chat_id:
+        if not self.token or not self.chat_id:
             logger.warning("텔레그램 설정이 완료되지 않았습니다.")
             return False
             
         try:
-            await self.bot.send_message(
-                chat_id=self.chat_id,
-                text=message,
-                parse_mode="HTML"
-            )
+            await self.deliver(message)
             logger.info(f"텔레그램 알림 전송 성공: {message[:50]}...")
             return True
         except Exception as e:
             logger.error(f"텔레그램 알림 전송 실패: {str(e)}")
             return False
             
+    def notify(self, notification: Notification) -> bool:
+        """알림을 전송 큐에 넣고 바로 반환 (전송 스레드가 묶어서 전송)"""
+        if not self.token or not self.chat_id:
+            logger.warning("텔레그램 설정이 완료되지 않았습니다.")
+            return False
+        return self.dispatcher.submit(notification)
+
+    def notify_collection(self, market, data_count, file_path=None):
+        """데이터 수집 완료 알림 (전송을 기다리지 않음)"""
+        return self.notify(Notification("collection", market=market, count=data_count, file_path=file_path))
+
+    def notify_error(self, error_message):
+        """오류 알림 (전송을 기다리지 않음, 짧은 시간에 몰린 오류는 건수로 묶음)"""
+        return self.notify(Notification("error", text=str(error_message)))
+
     async def send_data_collection_notification(self, market, data_count, file_path=None):
         """데이터 수집 완료 알림 전송"""
-        message = f"""
-<b>📊 주식 데이터 수집 완료</b>
-
-- 시장: <b>{market}</b>
-- 수집 데이터 수: <b>{data_count:,}개</b>
-"""
-        if file_path:
-            message += f"- 저장 경로: <code>{file_path}</code>"
-            
-        return await self.send_message(message)
+        return await self.send_message(_collection_message(market, data_count, file_path))
         
     async def send_error_notification(self, error_message):
         """오류 알림 전송"""
-        message = f"""
-<b>❌ 주식 데이터 수집 오류</b>
+        return await self.send_message(_error_message(error_message))
 
-<code>{error_message}</code>
-"""
-        return await self.send_message(message) 
\ No newline at end of file
+# 프로세스 공용 알림 큐 (전송은 기본 설정의 TelegramService)
+dispatcher = NotificationDispatcher(TelegramService().deliver)
\ No newline at end of file
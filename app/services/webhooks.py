@@ -0,0 +1,146 @@
+import hashlib
+import hmac
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+
+from app.core.config import WEBHOOK_SECRET, WEBHOOK_TIMEOUT_SECONDS, WEBHOOK_POLL_SECONDS
+from app.services.job_queue import JobQueue, DELIVERED, PENDING
+from app.utils.metrics import WEBHOOK_DELIVERIES
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "X-Webhook-Signature"
+TIMESTAMP_HEADER = "X-Webhook-Timestamp"
+EVENT_HEADER = "X-Webhook-Event"
+DELIVERY_HEADER = "X-Webhook-Id"
+
+# 다시 보내도 결과가 달라질 수 있는 응답 (그 밖의 4xx는 요청 자체가 잘못된 것이므로 재시도하지 않음)
+RETRY_STATUS_CODES = {408, 425, 429}
+
+
+def sign(secret: str, timestamp: str, body: bytes) -> str:
+    """웹훅 서명 (`sha256=` + HMAC-SHA256(비밀키, "{timestamp}.{본문}") 16진수)"""
+    digest = hmac.new(secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+def verify(secret: str, timestamp: str, body: bytes, signature: str, tolerance: float = 300) -> bool:
+    """받는 쪽 서명 확인 (시각 차이가 tolerance초를 넘으면 재전송 공격으로 보고 거부)"""
+    try:
+        if abs(time.time() - int(timestamp)) > tolerance:
+            return False
+    except (TypeError, ValueError):
+        return False
+    return hmac.compare_digest(sign(secret, timestamp, body), signature or "")
+
+
+def webhook_headers(webhook: Dict, secret: str = WEBHOOK_SECRET) -> Dict[str, str]:
+    timestamp = str(int(time.time()))
+    headers = {
+        "Content-Type": "application/json",
+        EVENT_HEADER: webhook["event"],
+        DELIVERY_HEADER: webhook["id"],
+        TIMESTAMP_HEADER: timestamp,
+    }
+    if secret:
+        headers[SIGNATURE_HEADER] = sign(secret, timestamp, webhook["payload"])
+    return headers
+
+
+class WebhookDispatcher:
+    """작업 완료 웹훅 전송 스레드
+
+    작업 큐의 웹훅 전송 건을 임대해 POST로 보내고 결과를 기록합니다. 연결 실패, 5xx, 408/429 응답은
+    지수 백오프로 재시도하고(Retry-After 헤더가 있으면 그 이상 대기), 그 밖의 4xx는 바로 실패 처리합니다.
+    작업이 끝나면 `wake()`로 바로 전송하고, 재시도 대기 건은 `poll`초마다 확인합니다.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        secret: str = WEBHOOK_SECRET,
+        timeout: float = WEBHOOK_TIMEOUT_SECONDS,
+        poll: float = WEBHOOK_POLL_SECONDS,
+    ):
+        self.queue = queue
+        self.secret = secret
+        self.timeout = timeout
+        self.poll = poll
+        self._session = requests.Session()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="webhook-dispatcher", daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        """작업이 끝났으니 바로 전송 확인"""
+        self._wake.set()
+
+    def stop(self, timeout: float = 30):
+        """전송 가능한 웹훅을 마저 보내고 종료 (재시도 대기 건은 다음 실행 때 전송)"""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._stopping.set()
+        self._wake.set()
+        thread.join(timeout)
+
+    def _run(self):
+        while True:
+            try:
+                while self.deliver_next():
+                    pass
+            except Exception as e:
+                logger.error(f"웹훅 전송 처리 오류: {str(e)}")
+            if self._stopping.is_set():
+                return
+            self._wake.wait(self.poll)
+            self._wake.clear()
+
+    def deliver_next(self) -> bool:
+        """전송할 웹훅 하나 처리 (없으면 False)"""
+        webhook = self.queue.claim_webhook()
+        if webhook is None:
+            return False
+
+        status_code, error, retry, retry_after = None, None, True, None
+        try:
+            response = self._session.post(
+                webhook["url"], data=webhook["payload"], headers=webhook_headers(webhook, self.secret),
+                timeout=self.timeout,
+            )
+            status_code = response.status_code
+            if status_code >= 300:
+                error = f"HTTP {status_code}: {response.text[:200]}"
+                retry = status_code >= 500 or status_code in RETRY_STATUS_CODES
+                retry_after = _retry_after(response)
+        except requests.RequestException as e:
+            error = str(e)
+
+        state = self.queue.finish_webhook(webhook["id"], status_code, error, retry, retry_after)
+        WEBHOOK_DELIVERIES.labels(state).inc()
+        if state == DELIVERED:
+            logger.info(f"웹훅 전송 완료: {webhook['event']} (작업: {webhook['job_id']}, 시도: {webhook['attempts']})")
+        elif state == PENDING:
+            logger.warning(f"웹훅 전송 실패, 재시도 예정: {webhook['event']} (작업: {webhook['job_id']}, 시도: {webhook['attempts']}): {error}")
+        else:
+            logger.error(f"웹훅 전송 포기: {webhook['event']} (작업: {webhook['job_id']}, 시도: {webhook['attempts']}): {error}")
+        return True
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
@@ -0,0 +1,170 @@
+import gzip
+import logging
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import COMPRESSION_CACHE_ENTRIES, COMPRESSION_MIN_BYTES
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# 압축 대상 Content-Type 접두사
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+def supported_encodings() -> List[str]:
+    """서버가 지원하는 압축 방식 (선호 순서)"""
+    return (["zstd"] if zstandard is not None else []) + ["gzip"]
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Accept-Encoding 헤더에서 사용할 압축 방식 선택 (q값 우선, 같으면 zstd > gzip)"""
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for item in accept_encoding.split(","):
+        parts = [part.strip() for part in item.split(";")]
+        name = parts[0].lower()
+        q = 1.0
+        for param in parts[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if name:
+            weights[name] = q
+
+    candidates = []
+    for rank, encoding in enumerate(supported_encodings()):
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > 0:
+            candidates.append((-q, rank, encoding))
+    return min(candidates)[2] if candidates else None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+
+def weak_etag(etag: str) -> str:
+    """강한 ETag를 약한 ETag로 (이미 약하면 그대로)"""
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+class CompressionMiddleware:
+    """응답 압축 미들웨어 (gzip/zstd 협상, 최소 크기 이상 단일 본문만)
+
+    스트리밍 응답(내보내기 등)과 이미 Content-Encoding이 지정된 응답은 그대로 전달합니다.
+    압축한 응답의 ETag는 약한 ETag로 바꾸고(바이트가 원본과 다르므로), 강한 ETag가 있는 응답의 압축 결과는
+    (경로, 쿼리, ETag, 압축 방식)별로 최근 `cache_size`개까지 재사용합니다 (미리 직렬화된 종목 목록 등).
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_BYTES, cache_size: int = COMPRESSION_CACHE_ENTRIES):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple, Tuple[int, bytes]]" = OrderedDict()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        encoding = negotiate_encoding(headers.get("accept-encoding"))
+        responder = _CompressionResponder(self, scope, send, encoding, headers.get("if-none-match"))
+        await self.app(scope, receive, responder)
+
+    def compress(self, key: Optional[Tuple], body: bytes, encoding: str) -> bytes:
+        """압축 (key가 있으면 같은 본문의 압축 결과 재사용)"""
+        if key is None or self.cache_size <= 0:
+            return compress(body, encoding)
+
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == len(body):
+            self._cache.move_to_end(key)
+            return cached[1]
+
+        compressed = compress(body, encoding)
+        self._cache[key] = (len(body), compressed)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return compressed
+
+
+class _CompressionResponder:
+    """응답 시작 메시지를 첫 본문까지 보류했다가 압축 여부를 결정"""
+
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, send: Send,
+                 encoding: Optional[str], if_none_match: Optional[str]):
+        self.middleware = middleware
+        self.scope = scope
+        self.send = send
+        self.encoding = encoding
+        self.if_none_match = if_none_match
+        self.start_message: Optional[Message] = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        self.passthrough = True
+        start_message = self.start_message
+        headers = MutableHeaders(scope=start_message)
+        body = message.get("body", b"")
+        etag = headers.get("etag")
+
+        if start_message["status"] == 304:
+            # 클라이언트가 압축 응답의 약한 ETag로 물었다면 같은 형태로 응답
+            if etag and self.if_none_match and weak_etag(etag) in self.if_none_match:
+                headers["ETag"] = weak_etag(etag)
+            headers.add_vary_header("Accept-Encoding")
+            await self.send(start_message)
+            await self.send(message)
+            return
+
+        if (
+            message.get("more_body", False)
+            or "content-encoding" in headers
+            or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+        ):
+            await self.send(start_message)
+            await self.send(message)
+            return
+
+        # 압축 여부가 Accept-Encoding에 따라 달라지는 응답이므로 압축하지 않을 때도 표시
+        headers.add_vary_header("Accept-Encoding")
+        if self.encoding is None or len(body) < self.middleware.minimum_size:
+            await self.send(start_message)
+            await self.send(message)
+            return
+
+        key = None
+        if etag and not etag.startswith("W/"):
+            key = (self.scope["path"], self.scope.get("query_string", b""), etag, self.encoding)
+        compressed = self.middleware.compress(key, body, self.encoding)
+        headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(compressed))
+        if etag:
+            headers["ETag"] = weak_etag(etag)
+
+        await self.send(start_message)
+        await self.send({"type": "http.response.body", "body": compressed, "more_body": False})
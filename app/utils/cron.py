@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta
+from typing import Iterator, List, Set
+
+# 필드별 허용 범위 (분, 시, 일, 월, 요일)
+FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+MONTH_NAMES = {name: i for i, name in enumerate(
+    ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"], start=1)}
+DAY_NAMES = {name: i for i, name in enumerate(["SUN", "MON", "TUE", "WED", "THU", "FRI", "SAT"])}
+
+MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+# 다음 실행 시각 탐색 한도 (일)
+MAX_SEARCH_DAYS = 366 * 5
+
+
+class CronExpression:
+    """cron 표현식 (분 시 일 월 요일)
+
+    `*`, 목록(`1,15`), 범위(`1-5`), 간격(`*/10`, `9-18/3`), 월/요일 이름(`JAN`, `MON-FRI`)과
+    `@daily` 같은 단축 표현을 지원합니다. 일과 요일이 모두 지정되면 둘 중 하나만 맞아도 실행합니다(표준 cron 동작).
+    시각은 시간대 정보가 없는 현지 시각으로 다룹니다.
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression.strip()
+        fields = MACROS.get(self.expression.lower(), self.expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"cron 표현식은 5개 필드(분 시 일 월 요일)여야 합니다: {expression}")
+
+        self.minutes = self._parse(fields[0], 0)
+        self.hours = self._parse(fields[1], 1)
+        self.days = self._parse(fields[2], 2)
+        self.months = self._parse(fields[3], 3, MONTH_NAMES)
+        weekdays = self._parse(fields[4], 4, DAY_NAMES)
+        self.weekdays = {0 if day == 7 else day for day in weekdays}
+
+        self.day_restricted = fields[2] != "*"
+        self.weekday_restricted = fields[4] != "*"
+        self._sorted_minutes: List[int] = sorted(self.minutes)
+
+    @staticmethod
+    def _parse(field: str, position: int, names=None) -> Set[int]:
+        low, high = FIELD_RANGES[position]
+        values = set()
+
+        def to_int(token: str) -> int:
+            token = token.upper()
+            if names and token in names:
+                return names[token]
+            if not token.isdigit():
+                raise ValueError(f"잘못된 cron 값입니다: {token}")
+            return int(token)
+
+        for part in field.split(","):
+            step = 1
+            if "/" in part:
+                part, step_text = part.split("/", 1)
+                step = to_int(step_text)
+                if step <= 0:
+                    raise ValueError(f"cron 간격은 1 이상이어야 합니다: {field}")
+
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start_text, end_text = part.split("-", 1)
+                start, end = to_int(start_text), to_int(end_text)
+            else:
+                start = to_int(part)
+                end = high if step > 1 else start
+
+            if not (low <= start <= high and low <= end <= high and start <= end):
+                raise ValueError(f"cron 값이 허용 범위({low}-{high})를 벗어났습니다: {field}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, t: datetime) -> bool:
+        day_ok = t.day in self.days
+        weekday_ok = (t.weekday() + 1) % 7 in self.weekdays
+        if self.day_restricted and self.weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, after: datetime) -> datetime:
+        """after 이후(after 제외) 첫 실행 시각"""
+        t = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = after + timedelta(days=MAX_SEARCH_DAYS)
+
+        while t <= limit:
+            if t.month not in self.months:
+                t = (t.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+                continue
+            if not self._day_matches(t):
+                t = t.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if t.hour not in self.hours:
+                t = t.replace(minute=0) + timedelta(hours=1)
+                continue
+            minute = next((m for m in self._sorted_minutes if m >= t.minute), None)
+            if minute is None:
+                t = t.replace(minute=0) + timedelta(hours=1)
+                continue
+            return t.replace(minute=minute)
+
+        raise ValueError(f"실행 시각을 찾을 수 없는 cron 표현식입니다: {self.expression}")
+
+    def iter_between(self, start: datetime, end: datetime) -> Iterator[datetime]:
+        """start 이후부터 end까지(end 포함)의 실행 시각"""
+        t = self.next_after(start)
+        while t <= end:
+            yield t
+            t = self.next_after(t)
+
+    def __repr__(self):
+        return f"CronExpression({self.expression!r})"
@@ -0,0 +1,23 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+# numpy 스칼라/배열과 정수 키 딕셔너리도 그대로 직렬화
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(content: Any) -> bytes:
+    """JSON 직렬화 (UTF-8 바이트, 한글은 이스케이프하지 않음)"""
+    return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson 기반 JSON 응답 (앱 기본 응답 클래스)
+
+    라우트에서 이 응답을 직접 반환하면 FastAPI의 jsonable_encoder 변환도 거치지 않으므로
+    일봉/종목 목록처럼 큰 응답은 직접 반환합니다.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,42 @@
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+def is_not_modified(request: Request, etag: str, modified_at: Optional[float] = None) -> bool:
+    """조건부 요청(If-None-Match / If-Modified-Since) 충족 여부"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        # 약한 비교: W/ 접두사는 무시
+        return "*" in candidates or etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and modified_at is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(modified_at) <= since
+
+    return False
+
+
+def conditional_response(
+    request: Request,
+    body: bytes,
+    etag: str,
+    last_modified: str,
+    modified_at: Optional[float] = None,
+    media_type: str = "application/json",
+) -> Response:
+    """미리 직렬화된 본문을 ETag/Last-Modified와 함께 반환 (변경 없으면 304)"""
+    headers = {
+        "ETag": etag,
+        "Last-Modified": last_modified,
+        "Cache-Control": "no-cache",
+    }
+    if is_not_modified(request, etag, modified_at):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
@@ -1,17 +1,48 @@
+import atexit
 import logging
 import logging.config
+import logging.handlers
 import json
 import os
+import queue
+import threading
+import time
 from datetime import datetime
 import traceback
 from pathlib import Path
+from typing import List, Tuple
+
+import orjson
+
+from app.core.config import LOG_SAMPLE_WINDOW_SECONDS, LOG_SAMPLE_BURST
+
+# LogRecord 기본 속성 (이 외의 속성은 extra로 넘긴 값)
+_RECORD_ATTRS = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime"}
+
+# 실행 중인 (큐 핸들러, 기록 스레드) 목록과 반복 로그 필터 (setup_logging이 다시 호출되거나 프로세스가 끝날 때 정리)
+_listeners: List[Tuple["_QueueHandler", logging.handlers.QueueListener]] = []
+_sample_filters: List["RepeatedLogFilter"] = []
 
 class StructuredJsonFormatter(logging.Formatter):
-    """구조화된 JSON 형식으로 로그를 출력하는 포매터"""
+    """구조화된 JSON 형식으로 로그를 출력하는 포매터
+
+    기록 스레드에서 실행됩니다. extra로 넘긴 속성만 골라 담고, 시각 문자열은 같은 초 안에서 재사용합니다.
+    """
     
     def __init__(self, fmt=None, datefmt=None, style='%', include_stack_info=False):
         super().__init__(fmt, datefmt, style)
         self.include_stack_info = include_stack_info
+        self._time_cache = (None, None)
+
+    def formatTime(self, record, datefmt=None):
+        if not datefmt:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, cached = self._time_cache
+        if second != cached_second:
+            cached = super().formatTime(record, datefmt)
+            self._time_cache = (second, cached)
+        return cached
         
     def format(self, record):
         log_data = {
@@ -36,19 +67,164 @@ class StructuredJsonFormatter(logging.Formatter):
         if self.include_stack_info and record.stack_info:
             log_data["stack_info"] = record.stack_info
             
-        # 추가 속성 처리
-        for key, value in record.__dict__.items():
-            if key not in ["args", "asctime", "created", "exc_info", "exc_text", 
-                          "filename", "funcName", "id", "levelname", "levelno", 
-                          "lineno", "module", "msecs", "message", "msg", "name", 
-                          "pathname", "process", "processName", "relativeCreated", 
-                          "stack_info", "thread", "threadName"]:
-                log_data[key] = value
+        # 추가 속성 처리 (extra로 넘긴 값만)
+        for key in record.__dict__.keys() - _RECORD_ATTRS:
+            log_data[key] = record.__dict__[key]
                 
-        return json.dumps(log_data)
+        try:
+            return orjson.dumps(log_data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # orjson이 처리하지 못하는 값 (64비트를 넘는 정수 등)
+            return json.dumps(log_data, default=str, ensure_ascii=False)
+
+class RepeatedLogFilter(logging.Filter):
+    """같은 위치(파일:줄)의 INFO 이하 로그를 구간마다 `burst`건까지만 통과 (종목별 로그 폭주 방지)
+
+    WARNING 이상은 제한하지 않습니다. 생략한 건수는 다음 구간에서 같은 위치의 첫 로그 메시지 뒤에 붙이고,
+    구간이 끝날 때까지 같은 위치의 로그가 더 없으면 정리 스레드가 생략 건수만 따로 기록합니다.
+    """
+
+    def __init__(self, window=LOG_SAMPLE_WINDOW_SECONDS, burst=LOG_SAMPLE_BURST):
+        super().__init__()
+        self.window = window
+        self.burst = burst
+        self._sites = {}  # (경로, 줄) -> [구간 시작, 통과 수, 생략 수, 마지막 생략 레코드]
+        self._lock = threading.Lock()
+        self._flusher = None
+
+    def filter(self, record):
+        if self.burst <= 0 or record.levelno >= logging.WARNING or "suppressed" in record.__dict__:
+            return True
+
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            site = self._sites.get(key)
+            if site is not None and record.created - site[0] < self.window:
+                if site[1] >= self.burst:
+                    site[2] += 1
+                    site[3] = record
+                    if self._flusher is None or not self._flusher.is_alive():
+                        self._flusher = threading.Thread(target=self._flush_loop, name="log-sample-flusher", daemon=True)
+                        self._flusher.start()
+                    return False
+                site[1] += 1
+                return True
+            suppressed = site[2] if site is not None else 0
+            self._sites[key] = [record.created, 1, 0, None]
+
+        if suppressed:
+            record.msg = f"{record.getMessage()} (같은 위치의 로그 {suppressed}건 생략)"
+            record.args = None
+        return True
+
+    def flush(self, now=None):
+        """구간이 끝난 위치의 생략 건수를 별도 로그로 기록 (now가 inf면 모든 위치)"""
+        now = time.time() if now is None else now
+        expired = []
+        with self._lock:
+            for key, site in list(self._sites.items()):
+                if now - site[0] >= self.window:
+                    del self._sites[key]
+                    if site[2]:
+                        expired.append((site[3], site[2]))
+
+        for last, suppressed in expired:
+            summary = logging.makeLogRecord({
+                "name": last.name, "levelno": last.levelno, "levelname": last.levelname,
+                "pathname": last.pathname, "lineno": last.lineno, "funcName": last.funcName, "module": last.module,
+                "msg": f"같은 위치의 로그 {suppressed}건 생략 (마지막: {last.getMessage()})",
+                "suppressed": suppressed,
+            })
+            logging.getLogger(last.name).handle(summary)
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.window)
+            self.flush()
+            with self._lock:
+                if not any(site[2] for site in self._sites.values()):
+                    self._flusher = None
+                    return
+
+    def _after_fork(self):
+        # 부모의 생략 건수는 부모가 기록하므로 자식은 빈 상태로 시작
+        self._lock = threading.Lock()
+        self._sites = {}
+        self._flusher = None
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """호출 스레드에서는 메시지 문자열만 만들어 큐에 넣는 핸들러 (서식 적용과 파일 기록은 기록 스레드)"""
+
+    def prepare(self, record):
+        # 같은 프로세스 안의 큐이므로 예외 정보는 그대로 넘김 (JSON 포매터가 사용)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+def _use_queue(logger_names):
+    """로거의 핸들러를 큐 핸들러로 바꾸고, 실제 핸들러는 기록 스레드에서 실행
+
+    핸들러 구성이 같은 로거끼리 큐와 기록 스레드를 하나씩 공유합니다.
+    """
+    sample_filter = RepeatedLogFilter()
+    _sample_filters.append(sample_filter)
+    queue_handlers = {}
+    for name in logger_names:
+        target = logging.getLogger(name or None)
+        handlers = tuple(target.handlers)
+        if not handlers:
+            continue
+
+        key = tuple(id(handler) for handler in handlers)
+        queue_handler = queue_handlers.get(key)
+        if queue_handler is None:
+            log_queue = queue.SimpleQueue()
+            queue_handler = _QueueHandler(log_queue)
+            queue_handler.addFilter(sample_filter)
+            listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+            listener.start()
+            _listeners.append((queue_handler, listener))
+            queue_handlers[key] = queue_handler
+
+        for handler in handlers:
+            target.removeHandler(handler)
+        target.addHandler(queue_handler)
+
+def stop_logging():
+    """생략 건수와 대기 중인 로그를 모두 기록하고 기록 스레드 종료"""
+    while _sample_filters:
+        _sample_filters.pop().flush(now=float("inf"))
+    while _listeners:
+        _listeners.pop()[1].stop()
+
+def _restart_listeners():
+    """fork된 자식 프로세스에는 기록 스레드가 없으므로 새 큐와 기록 스레드를 만들어 교체
+
+    부모의 큐와 QueueListener는 fork 시점의 상태(다른 스레드가 잡은 잠금, 시작된 스레드 정보)를
+    그대로 물려받으므로 재사용하지 않습니다.
+    """
+    for sample_filter in _sample_filters:
+        sample_filter._after_fork()
+    for index, (queue_handler, listener) in enumerate(_listeners):
+        log_queue = queue.SimpleQueue()
+        restarted = logging.handlers.QueueListener(
+            log_queue, *listener.handlers, respect_handler_level=listener.respect_handler_level
+        )
+        queue_handler.queue = log_queue
+        restarted.start()
+        _listeners[index] = (queue_handler, restarted)
+
+atexit.register(stop_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_listeners)
+
+def setup_logging(log_level=logging.INFO, log_dir="logs", console_stream="ext://sys.stdout"):
+    """로깅 설정 함수
 
-def setup_logging(log_level=logging.INFO, log_dir="logs"):
-    """로깅 설정 함수"""
+    콘솔/파일 핸들러는 기록 스레드에서 실행되고, 로그를 남기는 쪽(이벤트 루프, 수집 스레드)은 큐에 넣기만 합니다.
+    명령줄 도구처럼 표준 출력에 결과를 쓰는 경우 console_stream을 "ext://sys.stderr"로 지정합니다.
+    """
     # 로그 디렉토리 생성
     log_path = Path(log_dir)
     log_path.mkdir(exist_ok=True, parents=True)
@@ -79,7 +255,7 @@ def setup_logging(log_level=logging.INFO, log_dir="logs"):
                 "class": "logging.StreamHandler",
                 "level": "INFO",
                 "formatter": "simple",
-                "stream": "ext://sys.stdout"
+                "stream": console_stream
             },
             "file": {
                 "class": "logging.handlers.RotatingFileHandler",
@@ -119,8 +295,10 @@ def setup_logging(log_level=logging.INFO, log_dir="logs"):
         }
     }
     
-    # 로깅 설정 적용
+    # 로깅 설정 적용 (이전 기록 스레드를 먼저 멈춰야 기존 파일 핸들러를 닫을 때 남은 로그가 유실되지 않음)
+    stop_logging()
     logging.config.dictConfig(config)
+    _use_queue(config["loggers"])
     
     logging.info(f"로깅 시스템 초기화 완료 (레벨: {logging.getLevelName(log_level)})")
     return logging.getLogger("app") 
\ No newline at end of file
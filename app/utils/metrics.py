@@ -0,0 +1,665 @@
+"""Prometheus 텍스트 형식 지표 (카운터, 게이지, 히스토그램)
+
+값은 프로세스 메모리에서 갱신하고(잠금 한 번), `start()`를 호출한 프로세스는 `METRICS_FLUSH_SECONDS`마다
+`METRICS_PATH/{pid}-{token}.json`에 스냅숏을 기록합니다 (token은 프로세스마다 새로 만들어 PID가 재사용돼도
+이전 프로세스 파일을 덮어쓰지 않음). `/metrics`는 자기 프로세스의 현재 값과 다른 프로세스
+(gunicorn 워커, 수집 워커)의 스냅숏을 합쳐 내보냅니다.
+
+- 카운터/히스토그램: 모든 프로세스 값을 합산 (종료된 프로세스의 마지막 값은 `retired.json` 하나로 합친 뒤
+  프로세스 파일을 지우므로, 조회 때 읽는 파일 수는 살아 있는 프로세스 수로 유지)
+- 게이지: 살아 있는 프로세스 값만 `mode`(sum/max/min/all)에 따라 결합, all은 pid 레이블 추가,
+  local은 `/metrics`를 처리하는 프로세스 값만 사용 (조회 시점에 공유 저장소에서 읽어 설정하는 값)
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.core.config import METRICS_PATH, METRICS_FLUSH_SECONDS
+
+try:
+    import fcntl
+except ImportError:  # Windows 환경에서는 프로세스 간 파일 잠금 미지원
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+GAUGE_MODES = ("sum", "max", "min", "all", "local")
+
+INF = float("inf")
+
+# 종료된 프로세스의 카운터/히스토그램 합계와 그 파일을 고칠 때 쓰는 잠금 파일
+RETIRED_FILE = "retired.json"
+LOCK_FILE = ".lock"
+
+
+class _CounterChild:
+    __slots__ = ("_lock", "value")
+
+    def __init__(self, lock):
+        self._lock = lock
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        if amount < 0:
+            raise ValueError("카운터는 감소할 수 없습니다.")
+        with self._lock:
+            self.value += amount
+
+    def _dump(self):
+        return self.value
+
+
+class _GaugeChild:
+    __slots__ = ("_lock", "value")
+
+    def __init__(self, lock):
+        self._lock = lock
+        self.value = 0.0
+
+    def set(self, value: float):
+        with self._lock:
+            self.value = float(value)
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+    @contextmanager
+    def track_inprogress(self):
+        """블록 실행 중 1 증가"""
+        self.inc()
+        try:
+            yield
+        finally:
+            self.dec()
+
+    def _dump(self):
+        return self.value
+
+
+class _HistogramChild:
+    __slots__ = ("_lock", "_bounds", "counts", "sum")
+
+    def __init__(self, lock, bounds):
+        self._lock = lock
+        self._bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        index = bisect_left(self._bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self):
+        """블록 실행 시간(초) 기록"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def _dump(self):
+        return {"counts": list(self.counts), "sum": self.sum}
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = registry._lock
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._default = None if self.labelnames else self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values, **labels):
+        """레이블 값별 하위 지표 (자주 쓰는 조합은 변수에 보관해 재사용)"""
+        if labels:
+            values = tuple(str(labels[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(value) for value in values)
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} 레이블은 {self.labelnames}입니다: {values}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _require_default(self):
+        if self._default is None:
+            raise ValueError(f"{self.name}은 레이블이 있는 지표입니다. labels()를 사용하세요.")
+        return self._default
+
+    def _reset(self):
+        self._children.clear()
+        self._default = None if self.labelnames else self.labels()
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"type": self.kind, "help": self.documentation, "labels": list(self.labelnames)}
+
+    def _dump(self) -> Dict[str, Any]:
+        family = self._describe()
+        family["samples"] = [[list(values), child._dump()] for values, child in list(self._children.items())]
+        return family
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild(self._lock)
+
+    def inc(self, amount: float = 1.0):
+        self._require_default().inc(amount)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, registry, name, documentation, labelnames=(), mode: str = "sum"):
+        if mode not in GAUGE_MODES:
+            raise ValueError(f"게이지 결합 방식은 {GAUGE_MODES} 중 하나여야 합니다: {mode}")
+        self.mode = mode
+        super().__init__(registry, name, documentation, labelnames)
+
+    def _new_child(self):
+        return _GaugeChild(self._lock)
+
+    def _describe(self):
+        family = super()._describe()
+        family["mode"] = self.mode
+        return family
+
+    def set(self, value: float):
+        self._require_default().set(value)
+
+    def inc(self, amount: float = 1.0):
+        self._require_default().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._require_default().dec(amount)
+
+    def track_inprogress(self):
+        return self._require_default().track_inprogress()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets: Iterable[float] = DEFAULT_BUCKETS):
+        bounds = sorted(float(bound) for bound in buckets)
+        if not bounds or bounds[-1] != INF:
+            bounds.append(INF)
+        self.bounds = tuple(bounds)
+        super().__init__(registry, name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self._lock, self.bounds)
+
+    def _describe(self):
+        family = super()._describe()
+        family["buckets"] = [bound for bound in self.bounds if bound != INF]
+        return family
+
+    def observe(self, value: float):
+        self._require_default().observe(value)
+
+    def time(self):
+        return self._require_default().time()
+
+
+class MetricsRegistry:
+    """지표 모음 (프로세스별 값, 디렉터리를 지정하면 프로세스 간 합산)"""
+
+    def __init__(self, directory: Optional[Path] = None, flush_interval: float = METRICS_FLUSH_SECONDS):
+        self.directory = Path(directory) if directory else None
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+        self._flusher: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._started = False
+        self._token = uuid.uuid4().hex[:12]
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"이미 등록된 지표입니다: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(self, name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (), mode: str = "sum") -> Gauge:
+        return self._register(Gauge(self, name, documentation, labelnames, mode))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(self, name, documentation, labelnames, buckets))
+
+    # 프로세스 간 공유
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 프로세스의 지표 값"""
+        with self._lock:
+            metrics = {name: metric._dump() for name, metric in self._metrics.items()}
+        return {"pid": os.getpid(), "token": self._token, "written_at": time.time(), "metrics": metrics}
+
+    def _snapshot_path(self) -> Path:
+        return self.directory / f"{os.getpid()}-{self._token}.json"
+
+    def flush(self):
+        """스냅숏 파일 기록 (임시 파일 작성 후 교체, 읽는 쪽은 항상 완전한 파일을 봄)"""
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._snapshot_path()
+        _write_json(path, self.snapshot())
+
+    def start(self):
+        """주기적 스냅숏 기록 시작 (API/워커 프로세스 시작 시 한 번 호출)"""
+        if self.directory is None or self._started:
+            return
+        self._started = True
+        self._stopped.clear()
+        self._flusher = threading.Thread(target=self._flush_loop, name="metrics-flusher", daemon=True)
+        self._flusher.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """기록 중단 후 마지막 스냅숏 기록"""
+        if not self._started:
+            return
+        self._started = False
+        self._stopped.set()
+        try:
+            self.flush()
+        except Exception as e:
+            logger.warning(f"지표 스냅숏 기록 실패: {str(e)}")
+
+    def _flush_loop(self):
+        while not self._stopped.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"지표 스냅숏 기록 실패: {str(e)}")
+
+    def _after_fork(self):
+        # 부모 프로세스 값은 부모 파일에 이미 집계되므로 자식은 0부터 시작
+        self._lock = threading.Lock()
+        for metric in self._metrics.values():
+            metric._lock = self._lock
+            metric._reset()
+        was_started, self._started = self._started, False
+        self._stopped = threading.Event()
+        self._token = uuid.uuid4().hex[:12]
+        if was_started:
+            self.start()
+
+    def _load_snapshots(self) -> List[Tuple[Dict[str, Any], bool]]:
+        """(스냅숏, 프로세스 생존 여부) 목록 (현재 프로세스는 메모리 값 사용)
+
+        종료된 프로세스의 파일은 먼저 retired.json에 합치고 지운 뒤, 공유 잠금 아래에서
+        살아 있는 프로세스 파일과 retired.json을 함께 읽어 합계가 한 번만 반영되게 합니다.
+        """
+        snapshots = [(self.snapshot(), True)]
+        if self.directory is None or not self.directory.exists():
+            return snapshots
+
+        live, dead = self._scan_snapshot_files()
+        if dead:
+            self._retire(dead)
+
+        with _locked(self.directory / LOCK_FILE, exclusive=False):
+            for path in live:
+                snapshot = _read_json(path)
+                if snapshot is not None:
+                    snapshots.append((snapshot, True))
+            retired = _read_json(self.directory / RETIRED_FILE)
+            if retired is not None:
+                snapshots.append((retired, False))
+        return snapshots
+
+    def _scan_snapshot_files(self) -> Tuple[List[Path], List[Path]]:
+        """다른 프로세스 스냅숏 파일을 (살아 있는 프로세스, 종료된 프로세스)로 구분
+
+        PID가 재사용된 경우 같은 PID의 파일 중 가장 최근에 기록된 것만 살아 있는 것으로 봅니다.
+        """
+        own_path = self._snapshot_path()
+        by_pid: Dict[int, List[Path]] = {}
+        for path in self.directory.glob("*.json"):
+            try:
+                pid = int(path.stem.split("-", 1)[0])
+            except ValueError:
+                continue
+            if path != own_path:
+                by_pid.setdefault(pid, []).append(path)
+
+        own_pid = os.getpid()
+        live: List[Path] = []
+        dead: List[Path] = []
+        for pid, paths in by_pid.items():
+            if pid != own_pid and _pid_alive(pid):
+                paths.sort(key=_mtime)
+                live.append(paths.pop())
+            dead.extend(paths)
+        return live, dead
+
+    def _retire(self, paths: Iterable[Path]):
+        """종료된 프로세스의 카운터/히스토그램을 retired.json에 더하고 프로세스 파일 삭제 (게이지는 버림)"""
+        retired_path = self.directory / RETIRED_FILE
+        with _locked(self.directory / LOCK_FILE, exclusive=True):
+            retired = _read_json(retired_path) or {"pid": "retired", "metrics": {}, "sources": []}
+            # 직전 정리가 합계 기록 후 파일 삭제 전에 중단됐다면 이미 합친 파일이므로 지우기만 함
+            done = set(retired.get("sources", []))
+            sources = []
+            for path in paths:
+                if path.name in done:
+                    continue
+                snapshot = _read_json(path)
+                if snapshot is None:
+                    continue
+                _accumulate(retired["metrics"], snapshot.get("metrics", {}))
+                sources.append(path.name)
+            retired["sources"] = sources
+            retired["written_at"] = time.time()
+            _write_json(retired_path, retired)
+            for path in paths:
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+
+    # 내보내기
+
+    def render(self) -> str:
+        """모든 프로세스 값을 합친 Prometheus 텍스트 형식"""
+        families: Dict[str, Dict[str, Any]] = {}
+        for index, (snapshot, alive) in enumerate(self._load_snapshots()):
+            pid = str(snapshot.get("pid", ""))
+            for name, family in snapshot.get("metrics", {}).items():
+                merged = families.setdefault(name, {**family, "samples": {}})
+                if family["type"] == "gauge":
+                    if not alive or (family.get("mode") == "local" and index > 0):
+                        continue
+                    _merge_gauge(merged, family, pid)
+                elif family["type"] == "histogram":
+                    _merge_histogram(merged, family)
+                else:
+                    for values, value in family["samples"]:
+                        key = tuple(values)
+                        merged["samples"][key] = merged["samples"].get(key, 0.0) + value
+
+        lines: List[str] = []
+        for name in sorted(families):
+            family = families[name]
+            lines.append(f"# HELP {name} {_escape_help(family['help'])}")
+            lines.append(f"# TYPE {name} {family['type']}")
+            labelnames = list(family["labels"])
+            if family["type"] == "gauge" and family.get("mode") == "all":
+                labelnames.append("pid")
+
+            for key in sorted(family["samples"]):
+                value = family["samples"][key]
+                if family["type"] == "histogram":
+                    cumulative = 0
+                    bounds = list(family["buckets"]) + [INF]
+                    for bound, count in zip(bounds, value["counts"]):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_labels(labelnames + ['le'], key + (_format(bound),))} {cumulative}")
+                    lines.append(f"{name}_sum{_labels(labelnames, key)} {_format(value['sum'])}")
+                    lines.append(f"{name}_count{_labels(labelnames, key)} {cumulative}")
+                else:
+                    lines.append(f"{name}{_labels(labelnames, key)} {_format(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _merge_gauge(merged: Dict[str, Any], family: Dict[str, Any], pid: str):
+    mode = family.get("mode", "sum")
+    for values, value in family["samples"]:
+        key = tuple(values) + ((pid,) if mode == "all" else ())
+        if key not in merged["samples"] or mode == "all":
+            merged["samples"][key] = value
+        elif mode == "sum":
+            merged["samples"][key] += value
+        elif mode == "max":
+            merged["samples"][key] = max(merged["samples"][key], value)
+        elif mode == "min":
+            merged["samples"][key] = min(merged["samples"][key], value)
+
+
+def _merge_histogram(merged: Dict[str, Any], family: Dict[str, Any]):
+    for values, value in family["samples"]:
+        key = tuple(values)
+        current = merged["samples"].get(key)
+        if current is None:
+            merged["samples"][key] = {"counts": list(value["counts"]), "sum": value["sum"]}
+        elif len(current["counts"]) == len(value["counts"]):
+            current["counts"] = [a + b for a, b in zip(current["counts"], value["counts"])]
+            current["sum"] += value["sum"]
+
+
+def _accumulate(retired: Dict[str, Any], metrics: Dict[str, Any]):
+    """스냅숏 형식의 카운터/히스토그램 값을 retired에 더함"""
+    for name, family in metrics.items():
+        if family["type"] == "gauge":
+            continue
+        merged = retired.setdefault(name, {**family, "samples": []})
+        samples = {"samples": {tuple(values): value for values, value in merged["samples"]}}
+        if family["type"] == "histogram":
+            _merge_histogram(samples, family)
+        else:
+            for values, value in family["samples"]:
+                key = tuple(values)
+                samples["samples"][key] = samples["samples"].get(key, 0.0) + value
+        merged["samples"] = [[list(key), value] for key, value in samples["samples"].items()]
+
+
+@contextmanager
+def _locked(path: Path, exclusive: bool):
+    """프로세스 간 잠금 (fcntl 미지원 환경에서는 아무 동작도 하지 않음)"""
+    if fcntl is None:
+        yield
+        return
+    fd = os.open(path, os.O_CREAT | os.O_RDWR, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield
+    finally:
+        os.close(fd)
+
+
+def _read_json(path: Path) -> Optional[Dict[str, Any]]:
+    """스냅숏 파일 읽기 (이미 정리된 파일은 None)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"지표 스냅숏을 읽지 못했습니다: {path} ({str(e)})")
+        return None
+
+
+def _write_json(path: Path, data: Dict[str, Any]):
+    """임시 파일 작성 후 교체 (읽는 쪽은 항상 완전한 파일을 봄)"""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _mtime(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return 0.0
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _format(value: float) -> str:
+    if value == INF:
+        return "+Inf"
+    if value == -INF:
+        return "-Inf"
+    if float(value).is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+# 전역 레지스트리와 지표 정의 (수집 코드를 불러오지 않는 API 프로세스도 전체 지표 목록을 내보내도록 한 곳에 정의)
+
+registry = MetricsRegistry(METRICS_PATH)
+
+KIS_REQUESTS = registry.counter(
+    "kis_requests_total", "한국투자증권 API 호출 수", ["endpoint", "result"])
+KIS_REQUEST_SECONDS = registry.histogram(
+    "kis_request_seconds", "한국투자증권 API 응답 시간 (초)", ["endpoint"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0))
+KIS_RATE_LIMITED = registry.counter(
+    "kis_rate_limited_total", "한국투자증권 API 호출 제한(초당 거래건수 초과) 응답 수", ["endpoint"])
+KIS_TOKEN_REFRESHES = registry.counter(
+    "kis_token_refreshes_total", "접근 토큰 발급 요청 수", ["result"])
+
+COLLECTOR_ROWS = registry.counter(
+    "collector_rows_total", "수집 행 수 (stage: collected=수집, quarantined=격리, stored=신규/변경 저장)", ["market", "stage"])
+COLLECTOR_JOBS = registry.counter(
+    "collector_jobs_total", "수집 워커 작업 실행 수", ["kind", "result"])
+COLLECTOR_JOB_SECONDS = registry.histogram(
+    "collector_job_seconds", "수집 워커 작업 실행 시간 (초)", ["kind"],
+    buckets=(1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0))
+COLLECTOR_JOBS_IN_PROGRESS = registry.gauge(
+    "collector_jobs_in_progress", "실행 중인 수집 워커 작업 수", mode="sum")
+COLLECTOR_MERGE_SECONDS = registry.histogram(
+    "collector_merge_seconds", "수집 데이터 병합 시간 (초)",
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0))
+
+SCHEDULER_RUNS = registry.counter(
+    "scheduler_runs_total", "스케줄러가 등록한 수집 작업 수 (trigger: schedule=예정 실행, catch_up=놓친 실행 보충, intraday=장중 분봉)", ["trigger"])
+SCHEDULER_IS_LEADER = registry.gauge(
+    "scheduler_is_leader", "스케줄러 리더 여부 (프로세스별)", mode="all")
+SCHEDULER_LAST_RUN = registry.gauge(
+    "scheduler_last_run_timestamp_seconds", "마지막 예정 실행 시각 (유닉스 시간, /metrics 조회 시 갱신)", mode="local")
+
+WEBHOOK_DELIVERIES = registry.counter(
+    "webhook_deliveries_total", "작업 완료 웹훅 전송 시도 수 (result: delivered=완료, pending=재시도 예정, failed=포기)", ["result"])
+
+REALTIME_TICKS = registry.counter(
+    "realtime_ticks_total", "실시간 체결 수신 건수 (result: applied=집계 반영, late=이미 닫힌 분봉이라 무시)", ["result"])
+REALTIME_RECONNECTS = registry.counter(
+    "realtime_reconnects_total", "실시간 시세 웹소켓 재연결 수")
+REALTIME_BARS_FLUSHED = registry.counter(
+    "realtime_bars_flushed_total", "실시간 집계 바 저장 수", ["interval"])
+REALTIME_BARS_DROPPED = registry.counter(
+    "realtime_bars_dropped_total", "저장 전에 대기 버퍼가 가득 차 버려진 완료 분봉 수")
+
+JOB_QUEUE_JOBS = registry.gauge(
+    "job_queue_jobs", "상태별 작업 큐 작업 수 (/metrics 조회 시 갱신)", ["status"], mode="local")
+
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "API 요청 수", ["method", "route", "status"])
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_seconds", "API 응답 시간 (초)", ["method", "route"])
+
+
+class MetricsMiddleware:
+    """API 요청 수/응답 시간 기록 (순수 ASGI, 경로 대신 라우트 템플릿을 레이블로 사용)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = [500]
+        root_path = scope.get("root_path", "")
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            template = _route_template(scope, root_path)
+            method = scope.get("method", "")
+            HTTP_REQUESTS.labels(method, template, status[0]).inc()
+            HTTP_REQUEST_SECONDS.labels(method, template).observe(time.perf_counter() - start)
+
+
+def _route_template(scope, root_path: str) -> str:
+    """요청 경로에 대응하는 전체 라우트 템플릿 (예: /api/bars/{stock_code})
+
+    include_router(prefix=...)로 등록한 라우트는 FastAPI 버전에 따라 route.path에 접두사가 빠져 있으므로,
+    템플릿의 경로 조각 수만큼을 요청 경로 끝에서 대응시키고 그 앞부분(라우터 접두사)을 붙입니다.
+    """
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if not path:
+        return "unmatched"
+
+    request_path = scope.get("path", "")
+    if root_path and request_path.startswith(root_path):
+        request_path = request_path[len(root_path):]
+    if ":path}" in path:
+        return path
+
+    segments = [segment for segment in request_path.split("/") if segment]
+    depth = len([segment for segment in path.split("/") if segment])
+    if depth > len(segments):
+        return path
+    prefix = segments[:len(segments) - depth]
+    return "".join("/" + segment for segment in prefix) + path
@@ -0,0 +1,228 @@
+"""작업 단위 프로파일링 (cProfile, 샘플링, tracemalloc)
+
+`JobProfiler`는 작업 하나를 실행하는 동안만 프로파일러를 켜고, 결과를 `PROFILE_PATH/{작업 ID}/`에
+파일로 남깁니다. 결과 파일은 `/api/jobs/{job_id}/artifacts`에서 내려받을 수 있습니다.
+
+- cprofile: 작업 스레드와 작업 중 시작된 스레드(수집 스레드 풀)의 함수별 호출 통계 (`profile.pstats`, `profile.txt`)
+- sampling: 모든 스레드 스택을 주기적으로 수집한 접힌 스택 (`profile.folded`, speedscope/flamegraph.pl 입력)
+- memory: tracemalloc 최대 사용량과 할당 위치 상위 목록 (`memory.txt`, `memory.tracemalloc`)
+"""
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.core.config import PROFILE_PATH, PROFILE_SAMPLE_INTERVAL_MS, TRACEMALLOC_FRAMES
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cprofile", "sampling")
+
+# 결과 파일 (이 목록에 있는 파일만 내려받을 수 있음)
+ARTIFACT_TYPES = {
+    "trace.json": "application/json",
+    "profile.pstats": "application/octet-stream",
+    "profile.txt": "text/plain; charset=utf-8",
+    "profile.folded": "text/plain; charset=utf-8",
+    "memory.txt": "text/plain; charset=utf-8",
+    "memory.tracemalloc": "application/octet-stream",
+}
+
+
+class ThreadedCProfile:
+    """작업 스레드와 이후 시작된 스레드의 cProfile 통계 합산
+
+    cProfile은 켠 스레드만 측정하므로, `threading.setprofile` 훅으로 새 스레드가 첫 이벤트를 받을 때
+    그 스레드 전용 프로파일러를 켭니다. 프로파일러는 켠 스레드에서만 끌 수 있으므로, 작업이 끝난 뒤에도
+    살아 있는 스레드(실행기 스레드 풀 등)는 스레드 프로파일러의 시계 함수가 다음 이벤트에서 스스로 끕니다.
+    """
+
+    def __init__(self):
+        self._main = cProfile.Profile()
+        self._threads: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._stopped = False
+
+    def _thread_timer(self, owner: int):
+        def timer() -> float:
+            # 통계를 모을 때(다른 스레드에서 create_stats)도 불리므로 켠 스레드에서만 끔
+            if self._stopped and threading.get_ident() == owner:
+                sys.setprofile(None)
+            return time.perf_counter()
+        return timer
+
+    def _thread_hook(self, frame, event, arg):
+        if self._stopped:
+            sys.setprofile(None)
+            return
+        profile = cProfile.Profile(self._thread_timer(threading.get_ident()))
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+: cProfile이 sys.monitoring 기반이라 작업 스레드 프로파일러가 모든 스레드를 측정
+            threading.setprofile(None)
+            sys.setprofile(None)
+            return
+        with self._lock:
+            self._threads.append(profile)
+
+    def start(self):
+        threading.setprofile(self._thread_hook)
+        self._main.enable()
+
+    def stop(self) -> pstats.Stats:
+        try:
+            self._main.disable()
+        finally:
+            self._stopped = True
+            threading.setprofile(None)
+        stats = pstats.Stats(self._main)
+        # 스레드 프로파일러 목록은 비우지 않음 (시계 함수가 sys.setprofile(None)으로 끌 때 객체가 해제되면
+        # 해제 처리 중에 다시 프로파일 함수를 바꾸려다 실패하므로, 이 객체가 참조를 유지)
+        with self._lock:
+            profiles = list(self._threads)
+        for profile in profiles:
+            try:
+                stats.add(profile)
+            except (TypeError, ValueError):
+                # 호출 기록이 없는 스레드
+                continue
+        return stats
+
+
+class SamplingProfiler(threading.Thread):
+    """모든 스레드 스택을 일정 간격으로 수집 (대상 코드 수정 없음, 측정 부하는 간격으로 조절)"""
+
+    def __init__(self, interval: float = PROFILE_SAMPLE_INTERVAL_MS / 1000):
+        super().__init__(name="sampling-profiler", daemon=True)
+        self.interval = interval
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self._stopped = threading.Event()
+
+    def run(self):
+        own = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self):
+        self._stopped.set()
+        self.join(timeout=5)
+
+    def write_folded(self, path: Path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class JobProfiler:
+    """작업 하나에 대한 프로파일러 실행과 결과 파일 기록"""
+
+    def __init__(self, job_id: str, mode: Optional[str] = None, memory: bool = False, directory: Optional[Path] = None):
+        if mode is not None and mode not in PROFILE_MODES:
+            raise ValueError(f"프로파일링 방식은 {', '.join(PROFILE_MODES)} 중 하나여야 합니다: {mode}")
+        self.job_id = job_id
+        self.mode = mode
+        self.memory = memory
+        self.directory = artifact_dir(job_id, directory)
+        self._cprofile: Optional[ThreadedCProfile] = None
+        self._sampler: Optional[SamplingProfiler] = None
+        self._owns_tracemalloc = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode is not None or self.memory
+
+    def start(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._owns_tracemalloc = True
+        if self.mode == "cprofile":
+            self._cprofile = ThreadedCProfile()
+            self._cprofile.start()
+        elif self.mode == "sampling":
+            self._sampler = SamplingProfiler()
+            self._sampler.start()
+
+    def stop(self) -> Dict[str, Any]:
+        """프로파일러를 끄고 결과 파일 기록 (작업 결과에 넣을 요약 반환)"""
+        summary: Dict[str, Any] = {}
+        if not self.enabled:
+            return summary
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        if self._cprofile is not None:
+            stats = self._cprofile.stop()
+            stats.dump_stats(str(self.directory / "profile.pstats"))
+            text = io.StringIO()
+            stats.stream = text
+            stats.sort_stats("cumulative").print_stats(50)
+            (self.directory / "profile.txt").write_text(text.getvalue(), encoding="utf-8")
+            summary["profile"] = {"mode": "cprofile", "total_calls": stats.total_calls}
+
+        if self._sampler is not None:
+            self._sampler.stop()
+            self._sampler.write_folded(self.directory / "profile.folded")
+            summary["profile"] = {
+                "mode": "sampling",
+                "samples": self._sampler.samples,
+                "interval_ms": round(self._sampler.interval * 1000, 3),
+            }
+
+        if self.memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            if self._owns_tracemalloc:
+                tracemalloc.stop()
+            snapshot.dump(str(self.directory / "memory.tracemalloc"))
+            top = snapshot.statistics("lineno")[:30]
+            lines = [f"current={current:,}B peak={peak:,}B"] + [str(stat) for stat in top]
+            (self.directory / "memory.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+            summary["memory"] = {
+                "current_bytes": current,
+                "peak_bytes": peak,
+                "top": [{"location": str(stat.traceback), "bytes": stat.size, "count": stat.count} for stat in top[:10]],
+            }
+
+        return summary
+
+
+def artifact_dir(job_id: str, directory: Optional[Path] = None) -> Path:
+    return Path(directory or PROFILE_PATH) / job_id
+
+
+def list_artifacts(job_id: str, directory: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """작업의 결과 파일 목록"""
+    path = artifact_dir(job_id, directory)
+    if not path.is_dir():
+        return []
+    return [
+        {"name": name, "size": (path / name).stat().st_size, "media_type": media_type}
+        for name, media_type in ARTIFACT_TYPES.items()
+        if (path / name).is_file()
+    ]
+
+
+def artifact_path(job_id: str, name: str, directory: Optional[Path] = None) -> Optional[Path]:
+    """내려받을 결과 파일 경로 (알 수 없는 이름이거나 파일이 없으면 None)"""
+    if name not in ARTIFACT_TYPES:
+        return None
+    path = artifact_dir(job_id, directory) / name
+    return path if path.is_file() else None
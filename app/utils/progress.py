@@ -0,0 +1,122 @@
+"""수집 작업 진행 상황 카운터
+
+수집 코드는 종목 배치/API 호출 단위로 카운터만 올리고(행 단위 갱신 없음), 수집 워커의 게시 스레드가
+`PROGRESS_PUBLISH_SECONDS`마다 스냅숏을 작업 큐에 기록합니다. 추적(`app.utils.tracing`)과 같이
+ContextVar로 전달되므로 executor 스레드에서는 `in_context()`로 감싼 함수에서만 기록됩니다.
+"""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+_current_progress: contextvars.ContextVar[Optional["JobProgress"]] = contextvars.ContextVar("job_progress", default=None)
+
+
+class JobCancelled(Exception):
+    """작업을 더 진행하면 안 되는 경우 (작업 임대를 잃어 다른 워커가 넘겨받은 경우 등)"""
+
+
+class JobProgress:
+    """작업 하나의 진행 카운터 (여러 스레드에서 갱신)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.symbols_total = 0
+        self.symbols_done = 0
+        self.rows = 0
+        self.calls = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self.stages: Dict[str, Dict[str, Any]] = {}  # 파이프라인 단계별 상태
+        self._stage_updates = 0
+        self.cancelled: Optional[str] = None  # 중단 사유
+        self._lock = threading.Lock()
+
+    def add_total(self, symbols: int):
+        """수집할 종목 수 추가 (시장별로 호출)"""
+        with self._lock:
+            self.symbols_total += symbols
+
+    def add_done(self, symbols: int, rows: int):
+        """종목 배치 완료"""
+        with self._lock:
+            self.symbols_done += symbols
+            self.rows += rows
+
+    def record_call(self, error: Optional[str] = None):
+        """API 호출 한 번 (실패하면 오류 메시지)"""
+        with self._lock:
+            self.calls += 1
+            if error:
+                self.errors += 1
+                self.last_error = error
+
+    def set_stage(self, name: str, state: Dict[str, Any]):
+        """파이프라인 단계 상태 기록"""
+        with self._lock:
+            self.stages[name] = dict(state)
+            self._stage_updates += 1
+
+    def cancel(self, reason: str):
+        """작업 중단 요청 (수집 코드가 다음 배치/단계 경계에서 JobCancelled로 중단)"""
+        with self._lock:
+            self.cancelled = reason
+
+    def check_cancelled(self):
+        if self.cancelled is not None:
+            raise JobCancelled(self.cancelled)
+
+    @property
+    def version(self):
+        """값이 바뀌었는지 비교하기 위한 값"""
+        return (self.symbols_total, self.symbols_done, self.rows, self.calls, self.errors, self._stage_updates)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """진행률, 초당 호출 수, 남은 시간 추정"""
+        with self._lock:
+            total, done, rows, calls, errors, last_error = (
+                self.symbols_total, self.symbols_done, self.rows, self.calls, self.errors, self.last_error
+            )
+            stages = {name: dict(state) for name, state in self.stages.items()}
+        elapsed = time.perf_counter() - self.started
+        rate = done / elapsed if elapsed > 0 else 0.0
+        snapshot = {
+            "symbols_done": done,
+            "symbols_total": total,
+            "percent": round(done / total * 100, 1) if total else None,
+            "rows": rows,
+            "calls": calls,
+            "calls_per_sec": round(calls / elapsed, 2) if elapsed > 0 else None,
+            "errors": errors,
+            "last_error": last_error,
+            "elapsed_seconds": round(elapsed, 1),
+            "eta_seconds": round((total - done) / rate, 1) if rate > 0 and total >= done else None,
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        if stages:
+            snapshot["stages"] = stages
+        return snapshot
+
+
+def current_progress() -> Optional[JobProgress]:
+    return _current_progress.get()
+
+
+def raise_if_cancelled():
+    """현재 작업에 중단 요청이 있으면 JobCancelled (작업 밖에서는 아무 동작도 하지 않음)"""
+    progress = _current_progress.get()
+    if progress is not None:
+        progress.check_cancelled()
+
+
+@contextmanager
+def track_progress() -> Iterator[JobProgress]:
+    """블록 안(이어지는 asyncio 작업 포함)의 진행 상황을 새 카운터에 기록"""
+    progress = JobProgress()
+    token = _current_progress.set(progress)
+    try:
+        yield progress
+    finally:
+        _current_progress.reset(token)
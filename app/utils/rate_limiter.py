@@ -0,0 +1,32 @@
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """토큰 버킷 호출 제한 (스레드 안전)
+
+    초당 `rate`개씩 토큰이 채워지고 최대 `capacity`개까지 모입니다. 토큰이 없으면 호출 순서대로
+    자리를 예약하고 채워질 때까지 기다리므로, 여러 스레드가 동시에 호출해도 평균 호출 속도는 rate를 넘지 않습니다.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError(f"초당 호출 한도는 0보다 커야 합니다: {rate}")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1) -> float:
+        """토큰 사용 (부족하면 대기, 기다린 시간(초) 반환)"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
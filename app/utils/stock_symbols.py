@@ -1,11 +1,14 @@
 import os
+import threading
 import pandas as pd
 import logging
-import FinanceDataReader as fdr
 from pathlib import Path
 from datetime import datetime
 
-from app.core.config import DATA_STORAGE_PATH
+from app.core.config import DATA_STORAGE_PATH, MARKETS
+from app.utils.symbol_snapshots import (
+    compute_symbol_diff, latest_version, load_symbol_snapshot, save_symbol_snapshot, summarize_diff,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +16,13 @@ logger = logging.getLogger(__name__)
 STOCK_SYMBOLS_PATH = Path(DATA_STORAGE_PATH) / "stock_symbols"
 KOSPI_SYMBOLS_FILE = STOCK_SYMBOLS_PATH / "kospi_symbols.csv"
 KOSDAQ_SYMBOLS_FILE = STOCK_SYMBOLS_PATH / "kosdaq_symbols.csv"
+SYMBOL_FILES = {
+    "KOSPI": KOSPI_SYMBOLS_FILE,
+    "KOSDAQ": KOSDAQ_SYMBOLS_FILE,
+}
+
+# 종목 파일 쓰기와 스냅샷 기록을 한 번에 하나씩 (파일과 최신 스냅샷이 어긋나지 않도록)
+_publish_lock = threading.Lock()
 
 def get_stock_symbols(market, force_update=False):
     """
@@ -28,7 +38,7 @@ def get_stock_symbols(market, force_update=False):
     # 디렉토리 생성
     STOCK_SYMBOLS_PATH.mkdir(parents=True, exist_ok=True)
     
-    file_path = KOSPI_SYMBOLS_FILE if market == "KOSPI" else KOSDAQ_SYMBOLS_FILE
+    file_path = SYMBOL_FILES[market]
     
     # 파일이 존재하고, 강제 업데이트가 아니면 파일에서 로드
     if file_path.exists() and not force_update:
@@ -42,96 +52,9 @@ def get_stock_symbols(market, force_update=False):
             return pd.read_csv(file_path, dtype={'stock_code': str})
     
     # 파일이 없거나 강제 업데이트면 FinanceDataReader에서 종목 정보 가져오기
-    logger.info(f"{market} 종목 코드를 FinanceDataReader에서 가져옵니다.")
     try:
-        # 최신 버전 FinanceDataReader는 다른 포맷 사용 ('KRX' 또는 'KOSPI'/'KOSDAQ')
-        try:
-            # 방법 1: 최신 버전 형식 시도
-            if market == "KOSPI":
-                df = fdr.StockListing('KOSPI')
-            else:  # KOSDAQ
-                df = fdr.StockListing('KOSDAQ')
-                
-            if df.empty:
-                raise ValueError(f"{market} 데이터 비어있음")
-                
-        except Exception as inner_e:
-            logger.warning(f"최신 형식으로 {market} 종목 코드 가져오기 실패: {str(inner_e)}")
-            
-            try:
-                # 방법 2: 'KRX' 사용 후 필터링
-                df = fdr.StockListing('KRX')
-                
-                # KRX 내에서 해당 시장만 필터링
-                if market == "KOSPI":
-                    df = df[df['Market'].str.contains('KOSPI', na=False)]
-                else:  # KOSDAQ
-                    df = df[df['Market'].str.contains('KOSDAQ', na=False)]
-                
-                if df.empty:
-                    raise ValueError(f"KRX 필터링 후 {market} 데이터 비어있음")
-                    
-            except Exception as krx_e:
-                logger.warning(f"KRX 목록에서 {market} 필터링 실패: {str(krx_e)}")
-                raise ValueError(f"모든 종목 가져오기 방법 실패: {str(inner_e)}, KRX 시도: {str(krx_e)}")
-        
-        # 필요한 컬럼 확인 및 선택
-        required_columns = {'Code', 'Name', 'Market'}
-        if not all(col in df.columns for col in required_columns):
-            logger.warning(f"필요한 컬럼이 없습니다. 현재 컬럼: {df.columns.tolist()}")
-            
-            # 컬럼명 매핑 (다양한 버전 지원)
-            col_mapping = {}
-            for col in df.columns:
-                lower_col = col.lower()
-                if 'code' in lower_col or 'symbol' in lower_col:
-                    col_mapping['Code'] = col
-                elif 'name' in lower_col or '종목명' in lower_col:
-                    col_mapping['Name'] = col
-                elif 'market' in lower_col or '시장' in lower_col:
-                    col_mapping['Market'] = col
-                    
-            # 필요한 컬럼 없으면 오류
-            for req_col in required_columns:
-                if req_col not in col_mapping:
-                    logger.error(f"매핑할 수 없는 필수 컬럼: {req_col}")
-                    raise ValueError(f"필수 컬럼 '{req_col}'을 찾을 수 없습니다")
-                    
-            # 컬럼 이름 변경
-            df = df.rename(columns=col_mapping)
-        
-        # 최소 필요 컬럼 선택
-        df = df[['Code', 'Name', 'Market']]
-        
-        # 컬럼명 변경
-        df = df.rename(columns={
-            'Code': 'stock_code',
-            'Name': 'stock_name',
-            'Market': 'market_detail',
-        })
-        
-        # 종목코드 형식 확인 및 수정 (앞에 A가 붙는 경우 등 처리)
-        if df['stock_code'].dtype != 'object':
-            df['stock_code'] = df['stock_code'].astype(str)
-            
-        # 숫자가 아닌 문자가 포함된 경우 (ex: 'A005930') 처리 및 6자리 맞추기
-        logger.info("종목코드 형식 수정 중 (숫자만 추출 후 6자리로 변환)")
-        
-        def format_stock_code(code):
-            # 숫자만 추출
-            digits = ''.join(c for c in str(code) if c.isdigit())
-            # 6자리로 맞추기 (앞에 0 채우기)
-            return digits.zfill(6)
-            
-        df['stock_code'] = df['stock_code'].apply(format_stock_code)
-        
-        # 시장 정보 추가
-        df['market'] = market
-        
-        # 파일로 저장 - 종목코드를 문자열로 명시적 지정
-        df.to_csv(file_path, index=False, encoding='utf-8-sig', quoting=1)  # quoting=1은 모든 비숫자 필드를 따옴표로 묶음
-        logger.info(f"{market} 종목 코드를 파일에 저장했습니다: {file_path} (총 {len(df)}개 종목)")
-        
+        df = _download_stock_symbols(market)
+        publish_stock_symbols({market: df})
         return df
         
     except Exception as e:
@@ -147,20 +70,178 @@ def get_stock_symbols(market, force_update=False):
         logger.warning(f"빈 {market} 종목 코드 목록을 반환합니다.")
         return pd.DataFrame(columns=['stock_code', 'stock_name', 'market', 'market_detail'])
 
-def update_stock_symbols():
-    """모든 시장의 종목 코드를 업데이트합니다."""
-    logger.info("모든 시장의 종목 코드 업데이트를 시작합니다.")
+def _download_stock_symbols(market):
+    """FinanceDataReader에서 시장의 종목 목록 조회 (파일에 쓰지 않음, 실패하면 예외)"""
+    logger.info(f"{market} 종목 코드를 FinanceDataReader에서 가져옵니다.")
+    # FinanceDataReader는 가져오는 데 오래 걸려 실제로 목록을 갱신할 때만 불러옴
+    import FinanceDataReader as fdr
     
-    kospi_df = get_stock_symbols("KOSPI", force_update=True)
-    kosdaq_df = get_stock_symbols("KOSDAQ", force_update=True)
+    # 최신 버전 FinanceDataReader는 다른 포맷 사용 ('KRX' 또는 'KOSPI'/'KOSDAQ')
+    try:
+        # 방법 1: 최신 버전 형식 시도
+        if market == "KOSPI":
+            df = fdr.StockListing('KOSPI')
+        else:  # KOSDAQ
+            df = fdr.StockListing('KOSDAQ')
+            
+        if df.empty:
+            raise ValueError(f"{market} 데이터 비어있음")
+            
+    except Exception as inner_e:
+        logger.warning(f"최신 형식으로 {market} 종목 코드 가져오기 실패: {str(inner_e)}")
+        
+        try:
+            # 방법 2: 'KRX' 사용 후 필터링
+            df = fdr.StockListing('KRX')
+            
+            # KRX 내에서 해당 시장만 필터링
+            if market == "KOSPI":
+                df = df[df['Market'].str.contains('KOSPI', na=False)]
+            else:  # KOSDAQ
+                df = df[df['Market'].str.contains('KOSDAQ', na=False)]
+            
+            if df.empty:
+                raise ValueError(f"KRX 필터링 후 {market} 데이터 비어있음")
+                
+        except Exception as krx_e:
+            logger.warning(f"KRX 목록에서 {market} 필터링 실패: {str(krx_e)}")
+            raise ValueError(f"모든 종목 가져오기 방법 실패: {str(inner_e)}, KRX 시도: {str(krx_e)}")
+    
+    # 필요한 컬럼 확인 및 선택
+    required_columns = {'Code', 'Name', 'Market'}
+    if not all(col in df.columns for col in required_columns):
+        logger.warning(f"필요한 컬럼이 없습니다. 현재 컬럼: {df.columns.tolist()}")
+        
+        # 컬럼명 매핑 (다양한 버전 지원)
+        col_mapping = {}
+        for col in df.columns:
+            lower_col = col.lower()
+            if 'code' in lower_col or 'symbol' in lower_col:
+                col_mapping['Code'] = col
+            elif 'name' in lower_col or '종목명' in lower_col:
+                col_mapping['Name'] = col
+            elif 'market' in lower_col or '시장' in lower_col:
+                col_mapping['Market'] = col
+                
+        # 필요한 컬럼 없으면 오류
+        for req_col in required_columns:
+            if req_col not in col_mapping:
+                logger.error(f"매핑할 수 없는 필수 컬럼: {req_col}")
+                raise ValueError(f"필수 컬럼 '{req_col}'을 찾을 수 없습니다")
+                
+        # 컬럼 이름 변경
+        df = df.rename(columns=col_mapping)
+    
+    # 최소 필요 컬럼 선택
+    df = df[['Code', 'Name', 'Market']]
+    
+    # 컬럼명 변경
+    df = df.rename(columns={
+        'Code': 'stock_code',
+        'Name': 'stock_name',
+        'Market': 'market_detail',
+    })
     
-    logger.info(f"종목 코드 업데이트 완료: KOSPI {len(kospi_df)}개, KOSDAQ {len(kosdaq_df)}개")
+    # 종목코드 형식 확인 및 수정 (앞에 A가 붙는 경우 등 처리)
+    if df['stock_code'].dtype != 'object':
+        df['stock_code'] = df['stock_code'].astype(str)
+        
+    # 숫자가 아닌 문자가 포함된 경우 (ex: 'A005930') 처리 및 6자리 맞추기
+    logger.info("종목코드 형식 수정 중 (숫자만 추출 후 6자리로 변환)")
+    
+    def format_stock_code(code):
+        # 숫자만 추출
+        digits = ''.join(c for c in str(code) if c.isdigit())
+        # 6자리로 맞추기 (앞에 0 채우기)
+        return digits.zfill(6)
+        
+    df['stock_code'] = df['stock_code'].apply(format_stock_code)
+    
+    # 시장 정보 추가
+    df['market'] = market
+    
+    return df
+
+def _load_saved_symbols(market=None):
+    """저장된 종목 파일 로드 (market이 없으면 모든 시장)"""
+    frames = [
+        pd.read_csv(SYMBOL_FILES[m], dtype={'stock_code': str}, encoding='utf-8-sig')
+        for m in ([market] if market else MARKETS)
+        if SYMBOL_FILES[m].exists()
+    ]
+    if not frames:
+        return pd.DataFrame(columns=['stock_code', 'stock_name', 'market', 'market_detail'])
+    return pd.concat(frames, ignore_index=True)
+
+def publish_stock_symbols(frames):
+    """시장별 새 종목 목록을 종목 파일에 쓰고, 최신 스냅샷과의 차이를 새 스냅샷으로 기록
+    
+    종목 파일은 이 함수로만 쓰므로 파일 내용과 최신 스냅샷이 어긋나지 않습니다. 일부 시장만 주면
+    나머지 시장은 저장된 파일 그대로 스냅샷에 포함합니다.
+    
+    Args:
+        frames (dict): 시장 -> 종목 목록 DataFrame
+        
+    Returns:
+        dict: 시장별 종목 수, 스냅샷 버전, 변경 요약(changes), 변경 내역(diff)
+    """
+    with _publish_lock:
+        # 스냅샷이 아직 없으면(이전 버전에서 쓴 파일만 있는 경우) 저장된 파일과 비교
+        previous_df = load_symbol_snapshot()
+        if previous_df is None:
+            previous_df = _load_saved_symbols()
+        
+        STOCK_SYMBOLS_PATH.mkdir(parents=True, exist_ok=True)
+        for market, df in frames.items():
+            file_path = SYMBOL_FILES[market]
+            tmp_path = file_path.with_name(file_path.name + ".tmp")
+            # 종목코드를 문자열로 명시적 지정 (quoting=1은 모든 비숫자 필드를 따옴표로 묶음)
+            df.to_csv(tmp_path, index=False, encoding='utf-8-sig', quoting=1)
+            os.replace(tmp_path, file_path)
+            logger.info(f"{market} 종목 코드를 파일에 저장했습니다: {file_path} (총 {len(df)}개 종목)")
+        
+        current = {market: frames[market] if market in frames else _load_saved_symbols(market) for market in MARKETS}
+        current_df = pd.concat([current[market] for market in MARKETS], ignore_index=True)
+        diff = compute_symbol_diff(previous_df, current_df)
+        snapshot = save_symbol_snapshot(current_df, diff)
     
     return {
-        "KOSPI": len(kospi_df),
-        "KOSDAQ": len(kosdaq_df)
+        **{market: len(current[market]) for market in MARKETS},
+        "version": snapshot["version"],
+        "changes": snapshot["changes"],
+        "diff": diff
     }
 
+def update_stock_symbols(markets=None):
+    """시장의 종목 코드를 업데이트하고 이전 목록과의 차이를 스냅샷으로 저장합니다.
+    
+    조회에 실패한 시장은 기존 파일을 그대로 두므로 상장 폐지로 기록되지 않습니다.
+    """
+    markets = markets or MARKETS
+    logger.info(f"종목 코드 업데이트를 시작합니다: {', '.join(markets)}")
+    
+    frames = {}
+    for market in markets:
+        try:
+            frames[market] = _download_stock_symbols(market)
+        except Exception as e:
+            logger.error(f"{market} 종목 코드를 가져오는 중 오류 발생: {str(e)}")
+    
+    if not frames:
+        # 새로 받은 목록이 없으면 스냅샷도 만들지 않음
+        logger.warning("모든 시장의 종목 코드 조회에 실패해 기존 목록을 유지합니다.")
+        diff = {"listed": [], "delisted": [], "renamed": [], "market_moved": []}
+        return {
+            **{market: len(_load_saved_symbols(market)) for market in MARKETS},
+            "version": latest_version(),
+            "changes": summarize_diff(diff),
+            "diff": diff
+        }
+    
+    results = publish_stock_symbols(frames)
+    logger.info(f"종목 코드 업데이트 완료: {', '.join(f'{m} {results[m]}개' for m in MARKETS)}")
+    return results
+
 def get_all_stock_symbols():
     """모든 시장의 종목 코드를 가져옵니다."""
     kospi_df = get_stock_symbols("KOSPI")
@@ -0,0 +1,196 @@
+import os
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from email.utils import formatdate
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import MARKETS
+from app.utils.fast_json import dumps
+from app.utils.stock_symbols import SYMBOL_FILES, update_stock_symbols
+
+logger = logging.getLogger(__name__)
+
+SYMBOL_COLUMNS = ['stock_code', 'stock_name', 'market', 'market_detail']
+
+
+class SymbolSnapshot:
+    """종목 마스터의 한 버전 (불변, 응답 본문 미리 직렬화)"""
+
+    def __init__(self, frames: Dict[str, pd.DataFrame], version: str, modified_at: float):
+        self.frames = frames
+        self.version = version
+        self.etag = f'"{version}"'
+        self.modified_at = modified_at
+        self.last_modified = formatdate(modified_at, usegmt=True)
+        self.all = pd.concat([frames[m] for m in MARKETS], ignore_index=True)
+        self.payloads = {None: self._serialize(self.all)}
+        for market, df in frames.items():
+            self.payloads[market] = self._serialize(df, market)
+
+        # 목록 조회(페이지/필드/필터)용 종목코드 정렬 컬럼 배열
+        ordered = self.all.sort_values('stock_code', kind='stable')
+        self.columns = {
+            column: ordered[column].astype(object).where(pd.notna(ordered[column]), None).to_numpy()
+            for column in SYMBOL_COLUMNS if column in ordered.columns
+        }
+        self.codes = ordered['stock_code'].astype(str).to_numpy(dtype='U6')
+
+    @staticmethod
+    def _serialize(df: pd.DataFrame, market: Optional[str] = None) -> bytes:
+        records = df.astype(object).where(pd.notna(df), None).to_dict('records')
+        body = {"status": "success"}
+        if market:
+            body["market"] = market
+        body["count"] = len(records)
+        body["symbols"] = records
+        return dumps(body)
+
+    def get(self, market: Optional[str] = None) -> pd.DataFrame:
+        return self.all if market is None else self.frames[market]
+
+    def query(
+        self,
+        market: Optional[str] = None,
+        market_detail: Optional[str] = None,
+        code_prefix: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """필터/필드 선택/커서 페이지 조회 (종목코드 오름차순, cursor는 직전 페이지 마지막 종목코드)"""
+        fields = fields or SYMBOL_COLUMNS
+        unknown = [field for field in fields if field not in self.columns]
+        if unknown:
+            raise ValueError(f"알 수 없는 필드입니다: {', '.join(unknown)} (사용 가능: {', '.join(SYMBOL_COLUMNS)})")
+
+        mask = np.ones(len(self.codes), dtype=bool)
+        if market:
+            mask &= self.columns['market'] == market
+        if market_detail:
+            mask &= self.columns['market_detail'] == market_detail
+        if code_prefix:
+            mask &= np.char.startswith(self.codes, code_prefix)
+
+        total = int(mask.sum())
+        start = int(np.searchsorted(self.codes, cursor, side='right')) if cursor else 0
+        selected = np.flatnonzero(mask[start:]) + start
+        page = selected[:limit] if limit else selected
+
+        next_cursor = str(self.codes[page[-1]]) if limit and len(selected) > limit else None
+        values = [self.columns[field][page] for field in fields]
+        records = [dict(zip(fields, row)) for row in zip(*values)]
+
+        return {"total": total, "next_cursor": next_cursor, "records": records}
+
+
+class SymbolMaster:
+    """프로세스 전역 종목 마스터 캐시
+
+    종목 파일을 한 번 읽어 보관하고, 파일이 바뀐 경우(수정 시각/크기 변경)에만 다시 읽습니다.
+    파일이 오늘 갱신되지 않았으면 하루에 한 번 `update_stock_symbols`로 갱신을 시도합니다 (변경 내역은 스냅샷에 기록,
+    기존 파일이 있으면 백그라운드에서 갱신).
+    """
+
+    def __init__(self):
+        self._snapshot: Optional[SymbolSnapshot] = None
+        self._signature = None
+        self._refresh_attempted_on = None
+        self._refresher: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _file_signature(self):
+        signature = []
+        for market in MARKETS:
+            try:
+                stat = os.stat(SYMBOL_FILES[market])
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def snapshot(self) -> SymbolSnapshot:
+        """현재 버전 조회 (파일이 바뀌었으면 다시 로드)"""
+        self._refresh_if_stale()
+        signature = self._file_signature()
+        if self._snapshot is None or signature != self._signature:
+            with self._lock:
+                if self._snapshot is None or signature != self._signature:
+                    self._load(signature)
+        return self._snapshot
+
+    def get(self, market: Optional[str] = None) -> pd.DataFrame:
+        return self.snapshot().get(market)
+
+    def reload(self) -> SymbolSnapshot:
+        """강제로 다시 로드 (종목 코드 업데이트 직후 호출)"""
+        with self._lock:
+            self._load(self._file_signature())
+        return self._snapshot
+
+    def _refresh_if_stale(self):
+        """종목 파일이 오늘 갱신되지 않았으면 하루 한 번 갱신 시도
+
+        FinanceDataReader 조회는 수십 초가 걸릴 수 있어, 기존 파일이 있으면 백그라운드 스레드에서 갱신하고
+        그동안은 기존 목록을 그대로 씁니다 (이벤트 루프에서 불려도 막히지 않도록). 갱신이 끝나면 파일이 바뀌므로
+        다음 조회 때 다시 로드됩니다. 보여 줄 파일이 없는 시장이 있을 때만 기다려서 받습니다.
+        """
+        today = datetime.now().date()
+        if self._refresh_attempted_on == today:
+            return
+
+        with self._lock:
+            if self._refresh_attempted_on == today:
+                return
+            self._refresh_attempted_on = today
+            stale = [
+                market for market in MARKETS
+                if not SYMBOL_FILES[market].exists()
+                or datetime.fromtimestamp(os.path.getmtime(SYMBOL_FILES[market])).date() != today
+            ]
+            if not stale:
+                return
+            if all(SYMBOL_FILES[market].exists() for market in stale):
+                self._refresher = threading.Thread(
+                    target=self._refresh, args=(stale,), name="symbol-master-refresh", daemon=True
+                )
+                self._refresher.start()
+                return
+            self._refresh(stale)
+
+    def _refresh(self, markets: List[str]):
+        try:
+            update_stock_symbols(markets)
+        except Exception as e:
+            logger.error(f"종목 코드 갱신 실패 (기존 파일 사용): {str(e)}")
+
+    def _load(self, signature):
+        frames = {}
+        digest = hashlib.sha1()
+        modified_at = 0.0
+
+        for market in MARKETS:
+            file_path = SYMBOL_FILES[market]
+            if file_path.exists():
+                with open(file_path, 'rb') as f:
+                    digest.update(f.read())
+                df = pd.read_csv(file_path, dtype={'stock_code': str}, encoding='utf-8-sig')
+                modified_at = max(modified_at, os.path.getmtime(file_path))
+            else:
+                df = pd.DataFrame(columns=SYMBOL_COLUMNS)
+            frames[market] = df
+
+        self._snapshot = SymbolSnapshot(frames, digest.hexdigest()[:16], modified_at or datetime.now().timestamp())
+        self._signature = signature
+        logger.info(
+            f"종목 마스터 로드: 버전 {self._snapshot.version} "
+            f"({', '.join(f'{m} {len(frames[m])}개' for m in MARKETS)})"
+        )
+
+
+# 프로세스 전역 종목 마스터
+symbol_master = SymbolMaster()
@@ -0,0 +1,127 @@
+import logging
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from app.utils.symbol_master import symbol_master
+
+logger = logging.getLogger(__name__)
+
+# 한글 초성 목록 (유니코드 한글 음절 순서)
+CHOSUNG = [
+    "ㄱ", "ㄲ", "ㄴ", "ㄷ", "ㄸ", "ㄹ", "ㅁ", "ㅂ", "ㅃ", "ㅅ",
+    "ㅆ", "ㅇ", "ㅈ", "ㅉ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ",
+]
+CHOSUNG_SET = set(CHOSUNG)
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+JUNGSUNG_JONGSUNG_COUNT = 21 * 28
+
+# 일치 유형별 순위 점수
+SCORE_CODE_EXACT = 100
+SCORE_NAME_EXACT = 90
+SCORE_CODE_PREFIX = 80
+SCORE_NAME_PREFIX = 70
+SCORE_CHOSUNG_PREFIX = 60
+SCORE_NAME_CONTAINS = 40
+
+
+def normalize(text: str) -> str:
+    """검색용 정규화 (소문자, 공백 제거)"""
+    return "".join(str(text).lower().split())
+
+
+def to_chosung(text: str) -> str:
+    """한글 음절을 초성으로 변환 (한글 외 문자는 그대로)"""
+    result = []
+    for ch in normalize(text):
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            result.append(CHOSUNG[(code - HANGUL_BASE) // JUNGSUNG_JONGSUNG_COUNT])
+        else:
+            result.append(ch)
+    return "".join(result)
+
+
+class SymbolSearchIndex:
+    """종목 검색 인덱스 (코드/종목명/초성 정렬 배열에 대한 이진 탐색)"""
+
+    def __init__(self, df: pd.DataFrame, version: Optional[str] = None):
+        self.version = version
+        self.records = df.astype(object).where(pd.notna(df), None).to_dict('records')
+        self.names = [normalize(r["stock_name"] or "") for r in self.records]
+
+        self._codes = sorted((str(r["stock_code"]), i) for i, r in enumerate(self.records))
+        self._names = sorted((name, i) for i, name in enumerate(self.names))
+        self._chosungs = sorted((to_chosung(r["stock_name"] or ""), i) for i, r in enumerate(self.records))
+
+        self._code_keys = [key for key, _ in self._codes]
+        self._name_keys = [key for key, _ in self._names]
+        self._chosung_keys = [key for key, _ in self._chosungs]
+
+    @staticmethod
+    def _prefix_matches(keys: List[str], entries: List[tuple], prefix: str):
+        start = bisect_left(keys, prefix)
+        for pos in range(start, len(keys)):
+            if not keys[pos].startswith(prefix):
+                break
+            yield keys[pos], entries[pos][1]
+
+    def search(self, query: str, limit: int = 10, market: Optional[str] = None) -> List[Dict[str, Any]]:
+        """종목 검색 (점수 내림차순, 같은 점수는 짧은 종목명/코드 순)"""
+        q = normalize(query)
+        if not q:
+            return []
+
+        scores: Dict[int, tuple] = {}
+
+        def add(i, score, match):
+            if market and self.records[i]["market"] != market:
+                return
+            if i not in scores or scores[i][0] < score:
+                scores[i] = (score, match)
+
+        if q.isdigit():
+            for key, i in self._prefix_matches(self._code_keys, self._codes, q):
+                add(i, SCORE_CODE_EXACT if key == q else SCORE_CODE_PREFIX, "code")
+
+        for key, i in self._prefix_matches(self._name_keys, self._names, q):
+            add(i, SCORE_NAME_EXACT if key == q else SCORE_NAME_PREFIX, "name")
+
+        if all(ch in CHOSUNG_SET for ch in q):
+            for _, i in self._prefix_matches(self._chosung_keys, self._chosungs, q):
+                add(i, SCORE_CHOSUNG_PREFIX, "chosung")
+
+        # 앞부분 일치가 부족하면 종목명 부분 일치로 보충
+        if len(scores) < limit and not q.isdigit():
+            for i, name in enumerate(self.names):
+                if q in name:
+                    add(i, SCORE_NAME_CONTAINS, "contains")
+
+        ranked = sorted(
+            scores.items(),
+            key=lambda item: (-item[1][0], len(self.names[item[0]]), str(self.records[item[0]]["stock_code"])),
+        )[:limit]
+
+        return [
+            {**self.records[i], "match": match, "score": score}
+            for i, (score, match) in ranked
+        ]
+
+
+_index: Optional[SymbolSearchIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_search_index() -> SymbolSearchIndex:
+    """종목 마스터 버전에 맞는 검색 인덱스 (종목 갱신 시 다시 생성)"""
+    global _index
+    snapshot = symbol_master.snapshot()
+    if _index is None or _index.version != snapshot.version:
+        with _index_lock:
+            if _index is None or _index.version != snapshot.version:
+                _index = SymbolSearchIndex(snapshot.all, snapshot.version)
+                logger.info(f"종목 검색 인덱스 생성: 버전 {snapshot.version} ({len(_index.records)}개 종목)")
+    return _index
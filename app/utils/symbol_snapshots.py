@@ -0,0 +1,137 @@
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from app.core.config import DATA_STORAGE_PATH
+
+logger = logging.getLogger(__name__)
+
+# 종목 스냅샷 저장 경로
+SNAPSHOT_PATH = Path(DATA_STORAGE_PATH) / "stock_symbols" / "snapshots"
+CHANGES_FILE = SNAPSHOT_PATH / "changes.jsonl"
+
+_changes_lock = threading.Lock()
+
+
+def compute_symbol_diff(old_df: pd.DataFrame, new_df: pd.DataFrame) -> Dict[str, List[Dict[str, Any]]]:
+    """두 종목 목록의 차이 계산 (신규 상장, 상장 폐지, 종목명 변경, 시장 이동)"""
+    columns = ['stock_code', 'stock_name', 'market']
+    old = old_df[columns].drop_duplicates('stock_code', keep='last') if not old_df.empty else pd.DataFrame(columns=columns)
+    new = new_df[columns].drop_duplicates('stock_code', keep='last') if not new_df.empty else pd.DataFrame(columns=columns)
+
+    merged = old.merge(new, on='stock_code', how='outer', suffixes=('_old', '_new'), indicator=True)
+    both = merged[merged['_merge'] == 'both']
+
+    listed = merged[merged['_merge'] == 'right_only']
+    delisted = merged[merged['_merge'] == 'left_only']
+    renamed = both[both['stock_name_old'] != both['stock_name_new']]
+    moved = both[both['market_old'] != both['market_new']]
+
+    return {
+        "listed": [
+            {"stock_code": row.stock_code, "stock_name": row.stock_name_new, "market": row.market_new}
+            for row in listed.itertuples()
+        ],
+        "delisted": [
+            {"stock_code": row.stock_code, "stock_name": row.stock_name_old, "market": row.market_old}
+            for row in delisted.itertuples()
+        ],
+        "renamed": [
+            {"stock_code": row.stock_code, "old_name": row.stock_name_old, "new_name": row.stock_name_new}
+            for row in renamed.itertuples()
+        ],
+        "market_moved": [
+            {"stock_code": row.stock_code, "old_market": row.market_old, "new_market": row.market_new}
+            for row in moved.itertuples()
+        ],
+    }
+
+
+def summarize_diff(diff: Dict[str, List[Dict[str, Any]]]) -> Dict[str, int]:
+    return {kind: len(items) for kind, items in diff.items()}
+
+
+def changed_codes(diff: Dict[str, List[Dict[str, Any]]]) -> List[str]:
+    """변경된 모든 종목 코드"""
+    return sorted({item["stock_code"] for items in diff.values() for item in items})
+
+
+def latest_version() -> Optional[str]:
+    """가장 최근 스냅샷 버전"""
+    snapshots = sorted(SNAPSHOT_PATH.glob("symbols_*.csv"))
+    return snapshots[-1].stem.replace("symbols_", "") if snapshots else None
+
+
+def load_symbol_snapshot(version: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """스냅샷 종목 목록 (version이 없으면 최신, 스냅샷이 없으면 None)"""
+    version = version or latest_version()
+    if version is None:
+        return None
+    return pd.read_csv(SNAPSHOT_PATH / f"symbols_{version}.csv", dtype={'stock_code': str}, encoding='utf-8-sig')
+
+
+def save_symbol_snapshot(df: pd.DataFrame, diff: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """종목 목록 스냅샷과 변경 내역 저장
+
+    변경이 없고 기존 스냅샷이 있으면 새 버전을 만들지 않습니다.
+
+    Returns:
+        dict: 버전 정보 (version, created_at, count, changes)
+    """
+    summary = summarize_diff(diff)
+    previous = latest_version()
+    if previous and not any(summary.values()):
+        logger.info(f"종목 목록 변경 없음 (현재 버전: {previous})")
+        return {"version": previous, "created": False, "count": len(df), "changes": summary}
+
+    SNAPSHOT_PATH.mkdir(parents=True, exist_ok=True)
+    now = datetime.now()
+    version = now.strftime("%Y%m%d%H%M%S")
+    if previous and version <= previous:
+        # 같은 초에 두 번 갱신해도 버전이 겹쳐 이전 스냅샷을 덮어쓰지 않도록
+        version = (datetime.strptime(previous, "%Y%m%d%H%M%S") + timedelta(seconds=1)).strftime("%Y%m%d%H%M%S")
+
+    df.to_csv(SNAPSHOT_PATH / f"symbols_{version}.csv", index=False, encoding='utf-8-sig', quoting=1)
+
+    record = {
+        "version": version,
+        "previous_version": previous,
+        "created_at": now.isoformat(timespec="seconds"),
+        "count": len(df),
+        "summary": summary,
+        "changes": diff,
+    }
+    with _changes_lock, open(CHANGES_FILE, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    logger.info(f"종목 스냅샷 저장: 버전 {version} (이전: {previous or '없음'}, 변경: {summary})")
+    return {"version": version, "created": True, "count": len(df), "changes": summary}
+
+
+def get_changes_since(since: Optional[str] = None) -> List[Dict[str, Any]]:
+    """since 이후 버전의 변경 내역
+
+    Args:
+        since: 버전(YYYYMMDDHHMMSS, 해당 버전 제외) 또는 날짜(YYYYMMDD, 해당 일자 버전 포함)
+    """
+    if not CHANGES_FILE.exists():
+        return []
+
+    records = []
+    with open(CHANGES_FILE, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if since is None:
+                records.append(record)
+            elif len(since) == 8 and record["version"][:8] >= since:
+                records.append(record)
+            elif len(since) != 8 and record["version"] > since:
+                records.append(record)
+    return records
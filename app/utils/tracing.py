@@ -0,0 +1,170 @@
+"""수집 작업 단계별 구간(span) 추적
+
+작업마다 `start_trace()`로 추적을 시작하면, 수집 코드의 `with span("kis.request"):` 구간 시간이
+단계별로 합산됩니다(횟수, 합계, 최대). 추적 중이 아니면 `span()`은 아무 일도 하지 않는 공용 객체를
+돌려주므로 평소 비용은 ContextVar 조회 한 번입니다.
+
+추적 상태는 ContextVar로 전달되어 asyncio 작업에는 자동으로 이어지지만, `run_in_executor`로 넘기는
+함수는 `in_context()`로 감싸야 스레드에서도 같은 추적에 기록됩니다.
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import TRACE_MAX_SPANS
+
+_current_trace: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar("trace", default=None)
+
+
+class Trace:
+    """작업 하나의 단계별 소요 시간 (여러 스레드에서 기록)"""
+
+    def __init__(self, name: str, record_spans: bool = False, max_spans: int = TRACE_MAX_SPANS):
+        self.name = name
+        self.max_spans = max_spans
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+        self.finished: Optional[float] = None
+        self.dropped_spans = 0
+        self._stages: Dict[str, List[float]] = {}
+        self._spans: Optional[List[Tuple[str, float, float, int]]] = [] if record_spans else None
+        self._lock = threading.Lock()
+
+    def add(self, name: str, start: float, duration: float):
+        """구간 기록 (start는 perf_counter 기준)"""
+        with self._lock:
+            stage = self._stages.get(name)
+            if stage is None:
+                self._stages[name] = [1, duration, duration]
+            else:
+                stage[0] += 1
+                stage[1] += duration
+                if duration > stage[2]:
+                    stage[2] = duration
+
+            if self._spans is not None:
+                if len(self._spans) < self.max_spans:
+                    self._spans.append((name, start, duration, threading.get_ident()))
+                else:
+                    self.dropped_spans += 1
+
+    def finish(self):
+        if self.finished is None:
+            self.finished = time.perf_counter()
+
+    @property
+    def wall_seconds(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def summary(self) -> Dict[str, Any]:
+        """단계별 소요 시간 (합계 내림차순, share는 작업 전체 시간 대비 비율)
+
+        스레드에서 동시에 실행된 구간과 중첩된 구간은 각각 합산되므로 share 합이 1을 넘을 수 있습니다.
+        """
+        wall = self.wall_seconds
+        with self._lock:
+            stages = sorted(self._stages.items(), key=lambda item: -item[1][1])
+        return {
+            "wall_seconds": round(wall, 3),
+            "stages": {
+                name: {
+                    "count": int(count),
+                    "total_seconds": round(total, 4),
+                    "max_seconds": round(longest, 4),
+                    "share": round(total / wall, 4) if wall > 0 else None,
+                }
+                for name, (count, total, longest) in stages
+            },
+        }
+
+    def export_chrome(self, path: Path) -> Optional[Path]:
+        """구간 목록을 Chrome trace 형식(JSON, chrome://tracing/Perfetto에서 열기)으로 저장"""
+        if self._spans is None:
+            return None
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self._spans)
+        events = [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": round((start - self.started) * 1e6, 1),
+                "dur": round(duration * 1e6, 1),
+                "pid": pid,
+                "tid": tid,
+            }
+            for name, start, duration, tid in spans
+        ]
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "traceEvents": events,
+                "displayTimeUnit": "ms",
+                "otherData": {"trace": self.name, "started_at": self.started_at, "dropped_spans": self.dropped_spans},
+            }, f)
+        return path
+
+
+class _Span:
+    __slots__ = ("trace", "name", "start")
+
+    def __init__(self, trace: Trace, name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.trace.add(self.name, self.start, time.perf_counter() - self.start)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str):
+    """현재 추적에 구간 기록 (추적 중이 아니면 아무 일도 하지 않음)"""
+    trace = _current_trace.get()
+    if trace is None:
+        return _NOOP_SPAN
+    return _Span(trace, name)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def start_trace(name: str, record_spans: bool = False) -> Iterator[Trace]:
+    """블록 안(이어지는 asyncio 작업 포함)의 구간을 새 추적에 기록"""
+    trace = Trace(name, record_spans=record_spans)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        trace.finish()
+        _current_trace.reset(token)
+
+
+def in_context(func: Callable) -> Callable:
+    """현재 컨텍스트(추적 포함)에서 실행되도록 감싼 함수 (executor에 넘길 때마다 새로 감쌈)"""
+    return partial(contextvars.copy_context().run, func)
@@ -0,0 +1,271 @@
+"""수집 워커 프로세스
+
+작업 큐(SQLite)에서 수집/병합 작업을 임대해 실행합니다. API 서버와 별도 프로세스로 실행하며,
+처리량이 부족하면 워커 수를 늘립니다.
+
+실행: python -m app.workers.collector_worker --workers 2
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+import traceback
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from app.core.config import COLLECTOR_WORKERS, KIS_RATE_LIMIT_PER_SECOND, PROGRESS_PUBLISH_SECONDS
+from app.services.job_queue import JobQueue, job_queue
+from app.services.telegram_service import dispatcher as notifications
+from app.services.webhooks import WebhookDispatcher
+from app.utils.logging_config import setup_logging
+from app.utils.profiling import JobProfiler, artifact_dir, list_artifacts
+from app.utils.tracing import start_trace
+from app.utils.progress import JobProgress, track_progress
+from app.utils.metrics import COLLECTOR_JOBS, COLLECTOR_JOB_SECONDS, COLLECTOR_JOBS_IN_PROGRESS, registry as metrics_registry
+
+logger = logging.getLogger("app.workers.collector_worker")
+
+# 대기 작업이 없을 때 큐 확인 간격 (초)
+POLL_INTERVAL = 2.0
+
+
+class _Heartbeat(threading.Thread):
+    """작업 실행 중 임대 연장 (수집 코드가 이벤트 루프를 막아도 동작하도록 별도 스레드)
+
+    임대를 잃으면(만료 후 다른 워커가 넘겨받은 경우) 작업 진행 카운터에 중단을 요청해
+    수집 코드가 다음 배치/단계 경계에서 멈추도록 합니다.
+    """
+
+    def __init__(self, queue: JobQueue, job_id: str, worker_id: str):
+        super().__init__(daemon=True)
+        self.queue = queue
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.interval = max(queue.lease_seconds / 3, 1.0)
+        self.stopped = threading.Event()
+        self.lost = False
+        self.progress: Optional[JobProgress] = None
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                if not self.queue.heartbeat(self.job_id, self.worker_id):
+                    self.lost = True
+                    logger.warning(f"작업 임대를 잃었습니다 (작업: {self.job_id}, 워커: {self.worker_id})")
+                    if self.progress is not None:
+                        self.progress.cancel("작업 임대를 잃었습니다")
+                    return
+            except Exception as e:
+                logger.error(f"하트비트 기록 실패 (작업: {self.job_id}): {str(e)}")
+
+    def stop(self):
+        self.stopped.set()
+        self.join(timeout=5)
+
+
+class _ProgressPublisher(threading.Thread):
+    """작업 진행 상황을 주기적으로 작업 큐에 기록 (값이 바뀐 경우만)"""
+
+    def __init__(self, queue: JobQueue, job_id: str, worker_id: str, progress: JobProgress,
+                 interval: float = PROGRESS_PUBLISH_SECONDS):
+        super().__init__(daemon=True)
+        self.queue = queue
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.progress = progress
+        self.interval = interval
+        self.stopped = threading.Event()
+        self._published = None
+
+    def publish(self):
+        version = self.progress.version
+        if version == self._published:
+            return
+        try:
+            self.queue.update_progress(self.job_id, self.worker_id, self.progress.snapshot())
+            self._published = version
+        except Exception as e:
+            logger.error(f"진행 상황 기록 실패 (작업: {self.job_id}): {str(e)}")
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.publish()
+
+    def stop(self):
+        """게시를 멈추고 마지막 값 기록 (작업 완료 기록 전에 호출)"""
+        self.stopped.set()
+        self.join(timeout=5)
+        self.publish()
+
+
+class CollectorWorker:
+    """작업 큐 소비 워커 (한 번에 작업 하나씩 실행)"""
+
+    def __init__(self, queue: Optional[JobQueue] = None, worker_id: Optional[str] = None, collector=None,
+                 webhooks: Optional[WebhookDispatcher] = None):
+        self.queue = queue or job_queue
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.collector = collector
+        self.webhooks = webhooks
+        self._stopping = False
+
+    def stop(self):
+        """현재 작업을 마친 뒤 종료"""
+        self._stopping = True
+
+    def _get_collector(self):
+        if self.collector is None:
+            from app.services.data_collector import DataCollector
+            self.collector = DataCollector()
+        return self.collector
+
+    async def run_once(self) -> bool:
+        """작업 하나 실행 (실행할 작업이 없으면 False)"""
+        job = self.queue.claim(self.worker_id)
+        if job is None:
+            return False
+
+        logger.info(f"작업 실행 시작: {job['kind']} (작업: {job['id']}, 시도: {job['attempts']}/{job['max_attempts']}, 워커: {self.worker_id})")
+        heartbeat = _Heartbeat(self.queue, job["id"], self.worker_id)
+        heartbeat.start()
+        started = time.perf_counter()
+        options = job["params"].get("diagnostics") or {}
+        try:
+            profiler = JobProfiler(job["id"], options.get("profile"), bool(options.get("memory")))
+            with COLLECTOR_JOBS_IN_PROGRESS.track_inprogress(), track_progress() as progress, \
+                    start_trace(job["kind"], record_spans=bool(options.get("trace"))) as trace:
+                heartbeat.progress = progress
+                if heartbeat.lost:
+                    progress.cancel("작업 임대를 잃었습니다")
+                publisher = _ProgressPublisher(self.queue, job["id"], self.worker_id, progress)
+                publisher.start()
+                profiler.start()
+                try:
+                    result = await self._get_collector().run_job(job["kind"], job["params"])
+                finally:
+                    publisher.stop()
+                    diagnostics = self._finish_diagnostics(job, trace, profiler)
+        except Exception as e:
+            heartbeat.stop()
+            if heartbeat.lost:
+                # 넘겨받은 워커가 작업을 다시 실행하므로 실패로 기록하지 않음
+                COLLECTOR_JOBS.labels(job["kind"], "lost").inc()
+                logger.warning(f"작업 임대를 잃어 실행을 중단했습니다: {job['kind']} (작업: {job['id']}): {str(e)}")
+                return True
+            COLLECTOR_JOBS.labels(job["kind"], "failure").inc()
+            COLLECTOR_JOB_SECONDS.labels(job["kind"]).observe(time.perf_counter() - started)
+            logger.error(f"작업 실행 실패: {job['kind']} (작업: {job['id']}): {str(e)}\n{traceback.format_exc()}")
+            self.queue.fail(job["id"], self.worker_id, str(e))
+            self._wake_webhooks()
+            return True
+
+        heartbeat.stop()
+        if heartbeat.lost:
+            COLLECTOR_JOBS.labels(job["kind"], "lost").inc()
+            logger.warning(f"작업 임대를 잃어 결과를 기록하지 않습니다: {job['kind']} (작업: {job['id']})")
+            return True
+        if isinstance(result, dict):
+            result = {**result, "diagnostics": diagnostics}
+        COLLECTOR_JOBS.labels(job["kind"], "success").inc()
+        COLLECTOR_JOB_SECONDS.labels(job["kind"]).observe(time.perf_counter() - started)
+        if self.queue.complete(job["id"], self.worker_id, result):
+            logger.info(f"작업 실행 완료: {job['kind']} (작업: {job['id']})")
+            self._wake_webhooks()
+        else:
+            logger.warning(f"임대가 만료되어 결과를 기록하지 못했습니다 (작업: {job['id']})")
+        return True
+
+    def _wake_webhooks(self):
+        """끝난 작업의 콜백을 바로 전송 (다음 작업을 기다리지 않도록 전송 스레드에서)"""
+        if self.webhooks is not None:
+            self.webhooks.wake()
+
+    def _finish_diagnostics(self, job, trace, profiler) -> dict:
+        """단계별 소요 시간 요약과 추적/프로파일링 결과 파일 기록"""
+        trace.finish()
+        diagnostics = trace.summary()
+        try:
+            if trace.export_chrome(artifact_dir(job["id"]) / "trace.json"):
+                diagnostics["dropped_spans"] = trace.dropped_spans
+            diagnostics.update(profiler.stop())
+            diagnostics["artifacts"] = [item["name"] for item in list_artifacts(job["id"])]
+        except Exception as e:
+            logger.error(f"작업 프로파일링 결과 기록 실패 (작업: {job['id']}): {str(e)}")
+
+        top = ", ".join(
+            f"{name} {stage['total_seconds']:.2f}s"
+            for name, stage in list(diagnostics["stages"].items())[:5]
+        )
+        logger.info(f"작업 단계별 소요 시간: {job['kind']} (작업: {job['id']}, 전체 {diagnostics['wall_seconds']:.2f}s) {top}")
+        return diagnostics
+
+    async def run(self):
+        """종료 요청이 있을 때까지 작업 처리"""
+        logger.info(f"수집 워커 시작: {self.worker_id} (작업 큐: {self.queue.db_path})")
+        while not self._stopping:
+            try:
+                ran = await self.run_once()
+            except Exception as e:
+                logger.error(f"작업 큐 처리 오류: {str(e)}")
+                ran = False
+            if not ran:
+                await asyncio.sleep(POLL_INTERVAL)
+        logger.info(f"수집 워커 종료: {self.worker_id}")
+
+
+def _worker_main(processes: int = 1):
+    """워커 프로세스 진입점 (초당 API 호출 한도는 워커 프로세스 수로 나눔)"""
+    from app.services.korea_investment_api import set_rate_limit
+
+    load_dotenv()
+    setup_logging()
+    set_rate_limit(KIS_RATE_LIMIT_PER_SECOND / max(processes, 1))
+    metrics_registry.start()
+    webhooks = WebhookDispatcher(job_queue)
+    webhooks.start()
+    worker = CollectorWorker(webhooks=webhooks)
+
+    signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+    signal.signal(signal.SIGINT, lambda *_: worker.stop())
+    asyncio.run(worker.run())
+    webhooks.stop()
+    notifications.stop()
+    metrics_registry.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="수집 워커 실행")
+    parser.add_argument("--workers", type=int, default=COLLECTOR_WORKERS, help="워커 프로세스 수")
+    args = parser.parse_args()
+
+    if args.workers <= 1:
+        _worker_main()
+        return
+
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_worker_main, args=(args.workers,), name=f"collector-worker-{i}")
+        for i in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+
+    def _forward(signum, _frame):
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signum)
+
+    signal.signal(signal.SIGTERM, _forward)
+    signal.signal(signal.SIGINT, _forward)
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
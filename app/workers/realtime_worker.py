@@ -0,0 +1,177 @@
+"""실시간 체결 수신 워커 프로세스
+
+한국투자증권 실시간 체결 웹소켓을 구독해 1분봉/일봉을 메모리에서 집계합니다. 완료된 분봉은
+`REALTIME_FLUSH_SECONDS`마다 분봉 저장소에 모아 쓰고, 장 마감(`INTRADAY_END`) 후 잠정 일봉을, 시간외 거래가 끝난
+`REALTIME_DAILY_CLOSE` 후 확정 일봉을 품질 검사(`DataValidator`)를 거쳐 일봉 저장소에 씁니다.
+진행 중인 바는 `REALTIME_SNAPSHOT_SECONDS`마다 스냅숏 파일로 기록해 API(`/api/realtime/{code}`)가 조회합니다.
+한국투자증권 접속키 하나당 웹소켓 연결은 하나이므로 배포당 하나만 실행합니다.
+
+실행: python -m app.workers.realtime_worker --symbols 005930,000660
+"""
+import argparse
+import asyncio
+import logging
+import signal
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+import pytz
+from dotenv import load_dotenv
+
+from app.core.config import (
+    TIMEZONE, INTRADAY_END, REALTIME_DAILY_CLOSE, REALTIME_SYMBOLS, REALTIME_FLUSH_SECONDS, REALTIME_SNAPSHOT_SECONDS,
+    REALTIME_SNAPSHOT_PATH
+)
+from app.services.bar_store import BarStore, bars_to_frame
+from app.services.data_validator import DataValidator
+from app.services.minute_bar_store import MinuteBarStore
+from app.services.realtime_bars import BarAggregator, write_snapshot
+from app.services.realtime_subscriber import RealtimeSubscriber
+from app.utils.logging_config import setup_logging
+from app.utils.metrics import REALTIME_BARS_FLUSHED, registry as metrics_registry
+
+logger = logging.getLogger("app.workers.realtime_worker")
+
+# 거래소 체결 시각과 서버 시계 차이를 감안해, 분이 바뀐 뒤 이 시간(초)이 지나서 진행 중 분봉을 닫음
+ROLL_GRACE_SECONDS = 2
+
+
+class RealtimeWorker:
+    """실시간 구독, 진행 중 바 스냅숏 기록, 완료 바 저장을 한 이벤트 루프에서 실행"""
+
+    def __init__(
+        self,
+        symbols=None,
+        subscriber: Optional[RealtimeSubscriber] = None,
+        minute_store: Optional[MinuteBarStore] = None,
+        bar_store: Optional[BarStore] = None,
+        snapshot_path: Path = REALTIME_SNAPSHOT_PATH,
+        validator: Optional[DataValidator] = None,
+    ):
+        self.aggregator = subscriber.aggregator if subscriber else BarAggregator()
+        self.subscriber = subscriber or RealtimeSubscriber(self.aggregator, REALTIME_SYMBOLS if symbols is None else symbols)
+        self.minute_store = minute_store or MinuteBarStore()
+        self.bar_store = bar_store or BarStore()
+        self.validator = validator or DataValidator(bar_store=self.bar_store)
+        self.snapshot_path = snapshot_path
+        self.timezone = pytz.timezone(TIMEZONE)
+        self._session_closed_date = None  # 잠정 일봉을 쓴 거래일
+        self._closed_date = None  # 확정 일봉을 쓴 거래일
+        self._stopping = asyncio.Event()
+
+    def stop(self):
+        self._stopping.set()
+        self.subscriber.stop()
+
+    async def run(self):
+        """종료 요청이 있을 때까지 실행 (종료 시 남은 완료 분봉 저장)"""
+        logger.info(f"실시간 워커 시작: {len(self.subscriber.symbols)}종목")
+        subscriber = asyncio.ensure_future(self.subscriber.run())
+        last_flush = time.monotonic()
+        try:
+            while not self._stopping.is_set():
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=REALTIME_SNAPSHOT_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                flush = time.monotonic() - last_flush >= REALTIME_FLUSH_SECONDS
+                if flush:
+                    last_flush = time.monotonic()
+                try:
+                    await self.tick(datetime.now(self.timezone), flush=flush)
+                except Exception as e:
+                    logger.error(f"실시간 바 기록 오류: {str(e)}")
+        finally:
+            self.subscriber.stop()
+            await subscriber
+            await self.flush()
+            now = datetime.now(self.timezone)
+            if now.strftime("%H%M") >= INTRADAY_END and self._closed_date != now.strftime("%Y%m%d"):
+                # 확정 전에 종료하면 그때까지의 시간외 체결을 반영한 잠정 일봉을 남김
+                await asyncio.to_thread(self._write_daily, self.aggregator.daily_bars(), now.strftime("%Y%m%d"))
+            await asyncio.to_thread(write_snapshot, self.aggregator.snapshot(), self.snapshot_path)
+        logger.info("실시간 워커 종료")
+
+    async def tick(self, now: datetime, flush: bool = True):
+        """주기 작업: 지난 분봉 닫기, 스냅숏 기록, 완료 분봉 저장, 장 마감 후 잠정 일봉/시간외 거래 후 확정 일봉 저장"""
+        self.aggregator.roll(int((now - timedelta(seconds=ROLL_GRACE_SECONDS)).strftime("%Y%m%d%H%M")))
+        await asyncio.to_thread(write_snapshot, self.aggregator.snapshot(), self.snapshot_path)
+
+        trade_date = now.strftime("%Y%m%d")
+        hhmm = now.strftime("%H%M")
+        if hhmm >= REALTIME_DAILY_CLOSE and self._closed_date != trade_date:
+            self._closed_date = self._session_closed_date = trade_date
+            await asyncio.to_thread(self._write_daily, self.aggregator.close_day(), trade_date)
+            flush = True
+        elif hhmm >= INTRADAY_END and self._session_closed_date != trade_date:
+            # 시간외 체결은 계속 일봉에 반영하고 확정 시각에 다시 씀
+            self._session_closed_date = trade_date
+            await asyncio.to_thread(self._write_daily, self.aggregator.daily_bars(), trade_date)
+            flush = True
+        if flush:
+            await self.flush()
+
+    async def flush(self) -> int:
+        """완료 분봉을 종목별로 모아 분봉 저장소에 기록 (기록한 분봉 수 반환)"""
+        pending = self.aggregator.drain()
+        if not pending:
+            return 0
+        return await asyncio.to_thread(self._write_minutes, pending)
+
+    def _write_minutes(self, pending: Dict[str, np.ndarray]) -> int:
+        written = 0
+        for code, bars in pending.items():
+            try:
+                self.minute_store.upsert(code, bars)
+                written += len(bars)
+            except Exception as e:
+                logger.error(f"실시간 분봉 저장 실패 (종목: {code}): {str(e)}")
+        REALTIME_BARS_FLUSHED.labels("minute").inc(written)
+        logger.debug("실시간 분봉 %d개 저장 (%d종목)", written, len(pending))
+        return written
+
+    def _write_daily(self, daily: Dict[str, np.ndarray], trade_date: str):
+        """당일 일봉을 품질 검사 후 일봉 저장소에 기록 (격리 대상은 저장하지 않음)"""
+        if not daily:
+            return
+        df = pd.concat([bars_to_frame(bars, code) for code, bars in daily.items()], ignore_index=True)
+        clean, report = self.validator.validate(df, market="REALTIME", run_label=f"realtime_{trade_date}")
+        try:
+            self.bar_store.upsert_frame(clean)
+        except Exception as e:
+            logger.error(f"실시간 일봉 저장 실패: {str(e)}")
+            return
+        REALTIME_BARS_FLUSHED.labels("daily").inc(len(clean))
+        logger.info(f"실시간 일봉 저장: {len(clean)}종목 (격리 {report['quarantined']}종목)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="실시간 체결 수신 워커 실행")
+    parser.add_argument("--symbols", default=None, help="구독 종목 (쉼표 구분, 기본값 REALTIME_SYMBOLS)")
+    args = parser.parse_args()
+
+    load_dotenv()
+    setup_logging()
+    metrics_registry.start()
+    symbols = [code.strip() for code in args.symbols.split(",") if code.strip()] if args.symbols else None
+
+    async def run():
+        worker = RealtimeWorker(symbols)
+        if not worker.subscriber.symbols:
+            logger.error("실시간 구독 종목이 없습니다. (REALTIME_SYMBOLS 또는 --symbols)")
+            return
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, worker.stop)
+        await worker.run()
+
+    asyncio.run(run())
+    metrics_registry.stop()
+
+
+if __name__ == "__main__":
+    main()
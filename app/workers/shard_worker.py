@@ -0,0 +1,236 @@
+"""분산 수집 워커 프로세스
+
+코디네이터(`python -m app.cli coordinate`)에 하트비트를 보내 일관성 해시로 배정된 샤드(기간 구간 × 종목 버킷)를
+받아 수집하고, 품질 검사를 통과한 일봉을 샤드·워커별 파티션 CSV(`SHARD_OUTPUT_PATH/{실행}/{샤드}.{워커}.csv`)로 쓴 뒤
+완료를 보고합니다. 여러 호스트에서 같은 코디네이터에 붙여 실행할 수 있습니다.
+
+실행: python -m app.workers.shard_worker --coordinator http://coordinator:8765 --rate 5
+"""
+import argparse
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import signal
+import socket
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import requests
+from dotenv import load_dotenv
+
+from app.core.config import SHARD_OUTPUT_PATH, SHARD_POLL_SECONDS, KIS_RATE_LIMIT_PER_SECOND
+from app.services.telegram_service import dispatcher as notifications
+from app.utils.logging_config import setup_logging
+
+logger = logging.getLogger("app.workers.shard_worker")
+
+# 파티션 CSV 컬럼 (수집 CSV와 동일)
+PARTITION_COLUMNS = ["거래일", "종목코드", "종목명", "시장구분", "시가", "고가", "저가", "종가", "거래량"]
+
+
+def partition_name(shard_id: str, worker_id: str) -> str:
+    """파티션 파일 이름 (워커별로 따로 써서, 재배정 뒤 늦게 끝난 워커가 커밋된 파티션을 덮어쓰지 않게 함)"""
+    return f"{shard_id}.{re.sub(r'[^A-Za-z0-9._-]', '_', worker_id)}.csv"
+
+
+class CoordinatorClient:
+    """코디네이터 HTTP API 클라이언트"""
+
+    def __init__(self, url: str, worker_id: str, timeout: float = 10):
+        self.url = url.rstrip("/")
+        self.worker_id = worker_id
+        self.timeout = timeout
+        self.host = socket.gethostname()
+        self._session = requests.Session()
+        self._lock = threading.Lock()  # 하트비트 스레드와 세션 공유
+
+    def _post(self, path: str, params: Optional[Dict[str, Any]] = None, body: Any = None) -> requests.Response:
+        with self._lock:
+            return self._session.post(f"{self.url}{path}", params=params, json=body, timeout=self.timeout)
+
+    def heartbeat(self) -> Dict[str, Any]:
+        response = self._post(f"/workers/{self.worker_id}/heartbeat", {"host": self.host})
+        response.raise_for_status()
+        return response.json()
+
+    def start(self, run_id: str, shard_id: str) -> Optional[Dict[str, Any]]:
+        """샤드 정의 (다른 워커에 배정됐으면 None)"""
+        response = self._post(f"/runs/{run_id}/shards/{shard_id}/start", {"worker_id": self.worker_id})
+        if response.status_code == 409:
+            return None
+        response.raise_for_status()
+        return response.json()
+
+    def complete(self, run_id: str, shard_id: str, result: Dict[str, Any]) -> bool:
+        response = self._post(f"/runs/{run_id}/shards/{shard_id}/complete", {"worker_id": self.worker_id}, result)
+        if response.status_code == 409:
+            return False
+        response.raise_for_status()
+        return True
+
+    def fail(self, run_id: str, shard_id: str, error: str) -> bool:
+        response = self._post(
+            f"/runs/{run_id}/shards/{shard_id}/fail", {"worker_id": self.worker_id, "error": error[:500]}
+        )
+        return response.status_code == 200
+
+
+class _Heartbeat(threading.Thread):
+    """샤드 수집 중에도 코디네이터에 생존 알림 (수집 코드가 이벤트 루프를 막아도 동작하도록 별도 스레드)"""
+
+    def __init__(self, client: CoordinatorClient, interval: float):
+        super().__init__(daemon=True)
+        self.client = client
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                self.client.heartbeat()
+            except Exception as e:
+                logger.warning(f"코디네이터 하트비트 실패: {str(e)}")
+
+    def stop(self):
+        self.stopped.set()
+        self.join(timeout=5)
+
+
+class ShardWorker:
+    """배정된 샤드를 하나씩 수집해 파티션 파일로 기록"""
+
+    def __init__(self, client: CoordinatorClient, output_path: Optional[Path] = None, collector=None,
+                 poll: float = SHARD_POLL_SECONDS):
+        self.client = client
+        self.output_path = Path(output_path) if output_path else Path(SHARD_OUTPUT_PATH)
+        self.collector = collector
+        self.poll = poll
+        self._stopping = False
+
+    def stop(self):
+        """현재 샤드를 마친 뒤 종료"""
+        self._stopping = True
+
+    def _get_collector(self):
+        if self.collector is None:
+            from app.services.data_collector import DataCollector
+            self.collector = DataCollector()
+        return self.collector
+
+    async def run_once(self) -> Optional[bool]:
+        """배정된 샤드 처리 (진행 중 실행이 없으면 None, 배정된 샤드가 없으면 False)"""
+        assignment = await asyncio.to_thread(self.client.heartbeat)
+        run_id = assignment["run"]
+        if run_id is None:
+            return None
+
+        ran = False
+        for shard_id in assignment["shards"]:
+            if self._stopping:
+                break
+            spec = await asyncio.to_thread(self.client.start, run_id, shard_id)
+            if spec is None:
+                continue
+            ran = True
+            started = time.perf_counter()
+            try:
+                result = await self.run_shard(run_id, spec)
+            except Exception as e:
+                logger.error(f"샤드 수집 실패: {shard_id} (실행: {run_id}): {str(e)}\n{traceback.format_exc()}")
+                await asyncio.to_thread(self.client.fail, run_id, shard_id, str(e) or type(e).__name__)
+                continue
+            result["seconds"] = round(time.perf_counter() - started, 2)
+            if await asyncio.to_thread(self.client.complete, run_id, shard_id, result):
+                logger.info(f"샤드 완료: {shard_id} ({result['rows']}행, {result['seconds']}s)")
+            else:
+                logger.warning(f"재배정된 샤드라 완료 보고가 거부되었습니다: {shard_id}")
+        return ran
+
+    async def run_shard(self, run_id: str, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """샤드 하나 수집 → 품질 검사 → 파티션 CSV 기록 (같은 워커가 같은 샤드를 다시 실행하면 덮어씀, 조회에 실패한 종목이 있으면 예외)"""
+        import pandas as pd
+
+        collector = self._get_collector()
+        frames = []
+        failed: Dict[str, str] = {}
+        for market, items in spec["items"].items():
+            df = await collector.collect_frame(market, items, spec["from_date"], spec["to_date"], failed)
+            if not df.empty:
+                frames.append(df[PARTITION_COLUMNS])
+        if failed:
+            # 일부 종목이 빠진 파티션을 완료로 보고하면 그 종목·기간은 다시 수집되지 않으므로 샤드를 실패시켜 재시도
+            sample = ", ".join(sorted(failed)[:5])
+            raise RuntimeError(f"{len(failed)}개 종목 조회 실패: {sample}")
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=PARTITION_COLUMNS)
+
+        path = self.output_path / run_id / partition_name(spec["id"], self.client.worker_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + f".{os.getpid()}.tmp")
+        await asyncio.to_thread(df.to_csv, tmp_path, index=False, encoding="utf-8-sig")
+        os.replace(tmp_path, path)
+
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        return {
+            "path": str(path.resolve()),
+            "host": self.client.host,
+            "rows": len(df),
+            "bytes": path.stat().st_size,
+            "sha256": digest,
+        }
+
+    async def run(self, exit_when_done: bool = False):
+        """종료 요청이 있을 때까지 샤드 처리 (exit_when_done이면 진행 중 실행이 없을 때 종료)"""
+        logger.info(f"분산 수집 워커 시작: {self.client.worker_id} (코디네이터: {self.client.url})")
+        heartbeat = _Heartbeat(self.client, self.poll)
+        heartbeat.start()
+        try:
+            while not self._stopping:
+                try:
+                    ran = await self.run_once()
+                except Exception as e:
+                    logger.error(f"코디네이터 통신 오류: {str(e)}")
+                    ran = False
+                if ran is None and exit_when_done:
+                    break
+                if not ran:
+                    await asyncio.sleep(self.poll)
+        finally:
+            heartbeat.stop()
+        logger.info(f"분산 수집 워커 종료: {self.client.worker_id}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="분산 수집 워커 실행")
+    parser.add_argument("--coordinator", required=True, help="코디네이터 주소 (예: http://127.0.0.1:8765)")
+    parser.add_argument("--worker-id", default=None, help="워커 ID (기본값 호스트:PID)")
+    parser.add_argument("--output", type=Path, default=SHARD_OUTPUT_PATH, help="파티션 파일 경로")
+    parser.add_argument("--rate", type=float, default=KIS_RATE_LIMIT_PER_SECOND, help="이 워커의 초당 API 호출 한도")
+    parser.add_argument("--concurrency", type=int, default=3, help="종목 조회 동시 스레드 수")
+    parser.add_argument("--exit-when-done", action="store_true", help="진행 중인 실행이 없으면 종료")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    setup_logging()
+
+    from app.services.data_collector import DataCollector
+    from app.services.korea_investment_api import set_rate_limit
+
+    set_rate_limit(args.rate)
+    collector = DataCollector()
+    collector.fetch_workers = args.concurrency
+    client = CoordinatorClient(args.coordinator, args.worker_id or f"{socket.gethostname()}:{os.getpid()}")
+    worker = ShardWorker(client, args.output, collector)
+
+    signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+    signal.signal(signal.SIGINT, lambda *_: worker.stop())
+    asyncio.run(worker.run(args.exit_when_done))
+    notifications.stop()
+
+
+if __name__ == "__main__":
+    main()
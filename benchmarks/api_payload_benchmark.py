@@ -0,0 +1,181 @@
+"""API 응답 직렬화/압축 벤치마크
+
+종목 목록, 종목 일봉, 일자별 전 종목 일봉 응답을 두 가지 구성으로 비교합니다.
+
+- baseline: `response_model=Dict[str, Any]` + FastAPI 기본 JSONResponse, 압축 없음
+- optimized: FastJSONResponse(orjson) 직접 반환 + CompressionMiddleware(gzip/zstd)
+
+render는 서버 측 비용(직렬화 + 압축)만, request는 TestClient 왕복 시간(클라이언트 압축 해제 포함)입니다.
+baseline render는 jsonable_encoder + json.dumps 경로(FastAPI 0.10x 기본 동작)로 측정합니다.
+
+실행: python benchmarks/api_payload_benchmark.py --repeat 30
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+sys.path.append(os.path.abspath("."))
+
+from app.services.bar_query import CROSS_SECTION_DTYPE, bars_to_records
+from app.services.bar_store import BAR_DTYPE
+from app.utils.compression import CompressionMiddleware, compress, supported_encodings
+from app.utils.fast_json import FastJSONResponse
+
+ENDPOINTS = ["/symbols", "/bars/005930", "/bars/date/20250303"]
+
+
+def make_payloads(symbol_count: int, days: int) -> Dict[str, Dict[str, Any]]:
+    """실제 응답과 같은 구조의 합성 데이터"""
+    rng = np.random.default_rng(0)
+    codes = [f"{i:06d}" for i in range(symbol_count)]
+
+    symbols = pd.DataFrame({
+        "stock_code": codes,
+        "stock_name": [f"종목{i}" for i in range(symbol_count)],
+        "market": ["KOSPI" if i % 2 else "KOSDAQ" for i in range(symbol_count)],
+        "market_detail": ["KOSPI" if i % 2 else "KOSDAQ GLOBAL" for i in range(symbol_count)],
+    })
+
+    series = np.zeros(days, dtype=BAR_DTYPE)
+    series["date"] = pd.bdate_range("2005-01-03", periods=days).strftime("%Y%m%d").astype(int)
+    close = (50000 + rng.normal(0, 500, days).cumsum()).astype(np.int64)
+    series["open"] = close - 100
+    series["high"] = close + 300
+    series["low"] = close - 300
+    series["close"] = close
+    series["volume"] = rng.integers(100000, 5000000, days)
+
+    cross_section = np.zeros(symbol_count, dtype=CROSS_SECTION_DTYPE)
+    cross_section["stock_code"] = codes
+    cross_section["date"] = 20250303
+    for field in ("open", "high", "low", "close"):
+        cross_section[field] = rng.integers(1000, 500000, symbol_count)
+    cross_section["volume"] = rng.integers(1000, 10000000, symbol_count)
+
+    return {
+        "/symbols": {
+            "status": "success",
+            "count": symbol_count,
+            "symbols": symbols.to_dict("records"),
+        },
+        "/bars/005930": {
+            "status": "success",
+            "stock_code": "005930",
+            "count": days,
+            "bars": bars_to_records(series),
+        },
+        "/bars/date/20250303": {
+            "status": "success",
+            "date": "20250303",
+            "count": symbol_count,
+            "bars": bars_to_records(cross_section),
+        },
+    }
+
+
+def build_baseline_app(payloads) -> FastAPI:
+    app = FastAPI()
+    for path, payload in payloads.items():
+        def endpoint(payload=payload):
+            return payload
+        app.add_api_route(path, endpoint, response_model=Dict[str, Any])
+    return app
+
+
+def build_optimized_app(payloads) -> FastAPI:
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(CompressionMiddleware)
+    for path, payload in payloads.items():
+        def endpoint(payload=payload):
+            return FastJSONResponse(payload)
+        app.add_api_route(path, endpoint)
+    return app
+
+
+def timed(func, repeat: int):
+    """반복 실행 시간 (p50, p95 밀리초)과 마지막 결과"""
+    func()  # 워밍업
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[min(len(timings) - 1, int(len(timings) * 0.95))], result
+
+
+def render_baseline(payload):
+    return JSONResponse(jsonable_encoder(payload)).body
+
+
+def render_optimized(payload, encoding: str):
+    body = FastJSONResponse(payload).body
+    return body if encoding == "identity" else compress(body, encoding)
+
+
+def run(repeat: int = 20, symbol_count: int = 2700, days: int = 5000):
+    payloads = make_payloads(symbol_count, days)
+    variants = [
+        ("baseline", TestClient(build_baseline_app(payloads)), ["identity"]),
+        ("optimized", TestClient(build_optimized_app(payloads)), ["identity"] + supported_encodings()),
+    ]
+
+    rows = []
+    for path in ENDPOINTS:
+        payload = payloads[path]
+        for name, client, encodings in variants:
+            for encoding in encodings:
+                if name == "baseline":
+                    render = lambda: render_baseline(payload)
+                else:
+                    render = lambda: render_optimized(payload, encoding)
+                render_p50, _, body = timed(render, repeat)
+
+                headers = {"Accept-Encoding": encoding}
+                request_p50, request_p95, response = timed(lambda: client.get(path, headers=headers), repeat)
+                assert int(response.headers["content-length"]) == len(body)
+
+                rows.append({
+                    "endpoint": path,
+                    "variant": name,
+                    "encoding": encoding,
+                    "bytes": len(body),
+                    "render_ms": render_p50,
+                    "request_p50_ms": request_p50,
+                    "request_p95_ms": request_p95,
+                })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API 응답 직렬화/압축 벤치마크")
+    parser.add_argument("--repeat", type=int, default=20, help="엔드포인트별 반복 횟수")
+    parser.add_argument("--symbols", type=int, default=2700, help="종목 수")
+    parser.add_argument("--days", type=int, default=5000, help="종목 일봉 거래일 수")
+    args = parser.parse_args()
+
+    rows = run(args.repeat, args.symbols, args.days)
+
+    print(
+        f"{'endpoint':<22}{'variant':<11}{'encoding':<10}{'bytes':>12}"
+        f"{'render ms':>11}{'req p50 ms':>12}{'req p95 ms':>12}"
+    )
+    for row in rows:
+        print(
+            f"{row['endpoint']:<22}{row['variant']:<11}{row['encoding']:<10}{row['bytes']:>12,}"
+            f"{row['render_ms']:>11.2f}{row['request_p50_ms']:>12.2f}{row['request_p95_ms']:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""API 프로세스 시작(import) 시간 측정
+
+새 인터프리터에서 모듈을 가져오는 시간을 반복 측정하고, `python -X importtime` 결과에서
+누적 시간이 큰 모듈과 무거운 의존성(pandas, numpy, FinanceDataReader 등)의 로드 여부를 보여줍니다.
+
+실행: python benchmarks/import_time.py --module app.main --repeat 5 --top 15
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# API 프로세스 시작 시 불러오지 않아야 하는 모듈 (첫 요청 또는 워커 프로세스에서 로드)
+HEAVY_MODULES = [
+    "pandas", "numpy", "pyarrow", "FinanceDataReader", "telegram",
+    "tenacity", "httpx", "requests", "uvicorn",
+]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+sys.stdout.write(json.dumps({{"seconds": elapsed, "modules": [m for m in {heavy!r} if m in sys.modules]}}) + "\\n")
+"""
+
+
+def measure_import(module: str = "app.main") -> Dict:
+    """새 인터프리터에서 모듈 import 시간(초)과 로드된 무거운 모듈 목록"""
+    code = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    # 로깅 기록 스레드의 콘솔 출력이 결과 앞뒤에 섞일 수 있으므로 결과 줄만 찾음 (결과는 한 번에 write)
+    return json.loads(next(line for line in reversed(output.splitlines()) if line.startswith('{"seconds"')))
+
+
+def import_profile(module: str = "app.main") -> List[Tuple[str, int, int]]:
+    """`-X importtime` 결과 (모듈, 자체 μs, 누적 μs)"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stderr
+
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            rows.append((name.strip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API 프로세스 시작 시간 측정")
+    parser.add_argument("--module", default="app.main", help="측정할 모듈")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수")
+    parser.add_argument("--top", type=int, default=15, help="누적 시간 상위 모듈 수")
+    args = parser.parse_args()
+
+    samples = [measure_import(args.module) for _ in range(args.repeat)]
+    seconds = [sample["seconds"] for sample in samples]
+    print(f"import {args.module}: median {statistics.median(seconds) * 1000:.1f} ms, "
+          f"min {min(seconds) * 1000:.1f} ms, max {max(seconds) * 1000:.1f} ms ({args.repeat}회)")
+    print(f"로드된 무거운 모듈: {', '.join(samples[-1]['modules']) or '없음'}")
+
+    print(f"\n{'module':<50}{'self ms':>10}{'cumulative ms':>16}")
+    for name, self_us, cumulative_us in sorted(import_profile(args.module), key=lambda row: -row[2])[:args.top]:
+        print(f"{name:<50}{self_us / 1000:>10.1f}{cumulative_us / 1000:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
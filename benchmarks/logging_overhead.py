@@ -0,0 +1,95 @@
+"""로깅 비용 벤치마크
+
+로그를 남기는 스레드가 쓰는 시간(레코드당)을 두 가지 구성으로 비교합니다.
+
+- sync: 파일 핸들러 + JSON 포매터를 로거에 직접 연결 (이전 구성, 호출 스레드에서 서식 적용과 파일 기록)
+- queued: setup_logging 구성 (호출 스레드는 큐에 넣기만 하고 기록 스레드가 서식 적용과 파일 기록)
+
+휴장일 수집처럼 종목마다 경고가 나오는 경우의 로그 건수도 종목별/배치 요약 방식으로 비교합니다.
+
+실행: python benchmarks/logging_overhead.py --records 20000 --threads 3
+"""
+import argparse
+import logging
+import logging.handlers
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict
+
+sys.path.append(os.path.abspath("."))
+
+from app.utils import logging_config
+from app.utils.logging_config import StructuredJsonFormatter, setup_logging, stop_logging
+
+# 수집 배치 크기 (data_collector._collect_market_data)
+BATCH_SIZE = 50
+
+
+def _emit(logger: logging.Logger, records: int, threads: int) -> float:
+    """스레드 여러 개에서 경고를 남기고 호출 스레드 기준 레코드당 시간(마이크로초) 반환"""
+    per_thread = records // threads
+    elapsed = [0.0] * threads
+
+    def run(index):
+        started = time.perf_counter()
+        for i in range(per_thread):
+            logger.warning(f"종목 {i:06d} 데이터 없음", extra={"batch": index})
+        elapsed[index] = time.perf_counter() - started
+
+    workers = [threading.Thread(target=run, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return sum(elapsed) / (per_thread * threads) * 1e6
+
+
+def measure(records: int, threads: int) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as log_dir:
+        logger = logging.getLogger("benchmark.sync")
+        logger.propagate = False
+        handler = logging.handlers.RotatingFileHandler(
+            os.path.join(log_dir, "sync.log"), maxBytes=10485760, backupCount=10, encoding="utf8"
+        )
+        handler.setFormatter(StructuredJsonFormatter(datefmt="%Y-%m-%d %H:%M:%S"))
+        logger.addHandler(handler)
+        sync_us = _emit(logger, records, threads)
+        logger.removeHandler(handler)
+        handler.close()
+
+        # 반복 제한을 끄고, sync와 같게 파일 핸들러만 남겨 측정
+        setup_logging(log_dir=log_dir)
+        for handler in logging.getLogger("app").handlers:
+            for sample_filter in handler.filters:
+                sample_filter.burst = 0
+        for listener in logging_config._listeners:
+            listener.handlers = tuple(h for h in listener.handlers if isinstance(h, logging.FileHandler))
+        queued_logger = logging.getLogger("app.benchmark")
+        started = time.perf_counter()
+        queued_us = _emit(queued_logger, records, threads)
+        stop_logging()
+        drained = time.perf_counter() - started
+
+    return {"sync_us": sync_us, "queued_us": queued_us, "queued_drain_seconds": drained}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로깅 비용 벤치마크")
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=3)
+    parser.add_argument("--symbols", type=int, default=2700, help="휴장일 로그 건수 비교용 종목 수")
+    args = parser.parse_args()
+
+    result = measure(args.records, args.threads)
+    print(f"호출 스레드 레코드당 시간: sync {result['sync_us']:.1f}us, queued {result['queued_us']:.1f}us "
+          f"({result['sync_us'] / result['queued_us']:.1f}배)")
+    print(f"queued 기록 완료까지: {result['queued_drain_seconds']:.2f}s ({args.records}건)")
+    batches = -(-args.symbols // BATCH_SIZE)
+    print(f"휴장일 데이터 없음 로그: 종목별 {args.symbols * 2}건 -> 배치 요약 {batches}건")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+# 테스트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.abspath("."))
+
+from app.services.korea_investment_api import KoreaInvestmentAPI
+from tests.fake_kis_server import FakeKISServer
+
+
+@pytest.fixture
+def kis_server(tmp_path, monkeypatch):
+    """가짜 한국투자증권 서버에 붙은 KoreaInvestmentAPI (토큰 캐시는 임시 경로, 발급된 토큰 없이 시작)"""
+    with FakeKISServer() as server:
+        monkeypatch.setattr(KoreaInvestmentAPI, "BASE_URL", server.url)
+        monkeypatch.setattr(KoreaInvestmentAPI, "_token_file", str(tmp_path / "token_cache.json"))
+        monkeypatch.setattr(KoreaInvestmentAPI, "_access_token", None)
+        monkeypatch.setattr(KoreaInvestmentAPI, "_token_expired_at", None)
+        yield server
@@ -0,0 +1,176 @@
+import asyncio
+import json
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytz
+from websockets.asyncio.server import serve
+
+from app.core.config import TIMEZONE
+
+# 녹화한 실시간 체결 메시지 (한 줄에 하나)
+RECORDED_TICKS = Path(__file__).parent / "data" / "h0stcnt0_ticks.txt"
+
+MINUTE_PATH = "/uapi/domestic-stock/v1/quotations/inquire-time-itemchartprice"
+DAILY_PATH = "/uapi/domestic-stock/v1/quotations/inquire-daily-price"
+
+
+def minute_row(trade_date, hhmm, price):
+    return {
+        "stck_bsop_date": trade_date,
+        "stck_cntg_hour": f"{hhmm}00",
+        "stck_prpr": str(price),
+        "stck_oprc": str(price - 10),
+        "stck_hgpr": str(price + 20),
+        "stck_lwpr": str(price - 20),
+        "cntg_vol": "100",
+    }
+
+
+class FakeKISServer:
+    """테스트용 한국투자증권 API 서버 (토큰 발급, 일봉/당일 분봉 조회)
+
+    분봉은 `minutes[종목코드] = [HHMM, ...]`로 지정하고, 요청 기준 시각 이전 분봉을 최신순으로 30개까지 돌려줍니다.
+    받은 요청은 `requests`에 (경로, 쿼리) 순서대로 기록합니다. `failing`에 넣은 종목의 일봉 조회는 HTTP 500으로 응답합니다.
+    `failing_minutes[종목코드] = HHMM`이면 기준 시각이 그보다 이른 분봉 조회(중간 페이지)는 HTTP 500으로 응답합니다.
+    """
+
+    def __init__(self):
+        self.trade_date = datetime.now(pytz.timezone(TIMEZONE)).strftime("%Y%m%d")
+        self.minutes = {}
+        self.daily = {}
+        self.failing = set()
+        self.failing_minutes = {}
+        self.requests = []
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def minute_page(self, code, hour):
+        times = sorted((t for t in self.minutes.get(code, []) if t <= hour[:4]), reverse=True)[:30]
+        return [minute_row(self.trade_date, t, 70000 + int(t)) for t in times]
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, body, status=200):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                server.requests.append((self.path, {}))
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self.path == "/oauth2/tokenP":
+                    return self._reply({"access_token": "test-token", "expires_in": 86400})
+                if self.path == "/oauth2/Approval":
+                    return self._reply({"approval_key": "test-approval-key"})
+                self._reply({"rt_cd": "1", "msg1": "not found"}, 404)
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                query = {key: values[0] for key, values in parse_qs(parsed.query, keep_blank_values=True).items()}
+                server.requests.append((parsed.path, query))
+                if self.headers.get("authorization") != "Bearer test-token":
+                    return self._reply({"rt_cd": "1", "msg1": "토큰 오류"}, 401)
+                code = query.get("fid_input_iscd")
+                if parsed.path == MINUTE_PATH:
+                    if query["fid_input_hour_1"][:4] < server.failing_minutes.get(code, ""):
+                        return self._reply({"rt_cd": "1", "msg1": "서버 오류"}, 500)
+                    return self._reply({"rt_cd": "0", "output2": server.minute_page(code, query["fid_input_hour_1"])})
+                if parsed.path == DAILY_PATH:
+                    if code in server.failing:
+                        return self._reply({"rt_cd": "1", "msg1": "서버 오류"}, 500)
+                    return self._reply({"rt_cd": "0", "output": server.daily.get(code, [])})
+                self._reply({"rt_cd": "1", "msg1": "not found"}, 404)
+
+        return Handler
+
+
+class FakeKISWebSocket:
+    """테스트용 실시간 체결 웹소켓 서버 (녹화한 체결 메시지 재생)
+
+    연결마다 구독 요청을 `expected_symbols`개 받으면 응답과 PINGPONG을 보낸 뒤 녹화한 메시지를 이어서 재생합니다.
+    `drop_after`를 지정하면 첫 연결은 그만큼 재생한 뒤 끊고, 다음 연결에서 나머지를 재생합니다.
+    """
+
+    def __init__(self, expected_symbols, frames=None, drop_after=None):
+        self.expected_symbols = expected_symbols
+        self.frames = frames if frames is not None else RECORDED_TICKS.read_text().splitlines()
+        self.drop_after = drop_after
+        self.position = 0
+        self.connections = 0
+        self.subscriptions = []  # 연결별 구독 요청 (tr_type, tr_key, approval_key)
+        self.pongs = 0
+        self.replayed = asyncio.Event()
+        self._server = None
+
+    @property
+    def url(self):
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"ws://{host}:{port}"
+
+    async def __aenter__(self):
+        self._server = await serve(self._handler, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        await self._server.wait_closed()
+
+    def _record(self, subscriptions, message):
+        data = json.loads(message)
+        header = data["header"]
+        if header.get("tr_id") == "PINGPONG":
+            self.pongs += 1
+            return None
+        tr_key = data["body"]["input"]["tr_key"]
+        subscriptions.append((header["tr_type"], tr_key, header["approval_key"]))
+        return data["body"]["input"]
+
+    async def _handler(self, ws):
+        self.connections += 1
+        subscriptions = []
+        self.subscriptions.append(subscriptions)
+
+        while len(subscriptions) < self.expected_symbols:
+            request = self._record(subscriptions, await ws.recv())
+            if request:
+                await ws.send(json.dumps({
+                    "header": {"tr_id": request["tr_id"], "tr_key": request["tr_key"], "encrypt": "N"},
+                    "body": {"rt_cd": "0", "msg_cd": "OPSP0000", "msg1": "SUBSCRIBE SUCCESS"},
+                }))
+        await ws.send(json.dumps({"header": {"tr_id": "PINGPONG", "datetime": "20261016090000"}}))
+
+        while self.position < len(self.frames):
+            if self.connections == 1 and self.drop_after is not None and self.position >= self.drop_after:
+                await ws.close()
+                return
+            await ws.send(self.frames[self.position])
+            self.position += 1
+        self.replayed.set()
+
+        async for message in ws:
+            self._record(subscriptions, message)
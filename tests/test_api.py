@@ -11,6 +11,24 @@ from app.main import app
 
 client = TestClient(app)
 
+@pytest.fixture(autouse=True)
+def isolated_state(tmp_path, monkeypatch):
+    """작업 큐 DB와 스케줄러 상태 파일을 임시 경로로 (실제 data/stock_data에 남기지 않음)"""
+    import app.api.routes as routes
+    import app.core.config as config
+    import app.main as main
+    import app.services.job_queue as job_queue_module
+    import app.services.scheduler as scheduler_module
+    from app.services.job_queue import JobQueue
+    
+    monkeypatch.setattr(config, "JOB_QUEUE_PATH", tmp_path / "jobs.db")
+    monkeypatch.setattr(config, "SCHEDULER_STATE_PATH", tmp_path / "scheduler_state.json")
+    queue = JobQueue(tmp_path / "jobs.db")
+    for module in (job_queue_module, routes, main, scheduler_module):
+        monkeypatch.setattr(module, "job_queue", queue)
+    monkeypatch.setattr(routes.scheduler, "state_path", tmp_path / "scheduler_state.json")
+    monkeypatch.setattr(routes.scheduler.election, "db_path", tmp_path / "jobs.db")
+
 def test_root_endpoint():
     """루트 엔드포인트 테스트"""
     response = client.get("/")
@@ -58,4 +76,113 @@ def test_scheduler_endpoints():
     # 중지
     stop_resp = client.post("/api/scheduler/stop")
     assert stop_resp.status_code == 200
-    assert stop_resp.json()["status"] in ["success", "warning"] 
\ No newline at end of file
+    assert stop_resp.json()["status"] in ["success", "warning"] 
+
+def test_symbols_conditional_request():
+    """종목 코드 조회 ETag/Last-Modified 조건부 요청 테스트"""
+    response = client.get("/api/symbols/KOSPI")
+    assert response.status_code == 200
+    assert response.json()["market"] == "KOSPI"
+    etag = response.headers["etag"]
+    assert response.headers["last-modified"]
+    
+    not_modified = client.get("/api/symbols/KOSPI", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+    
+    all_resp = client.get("/api/symbols", headers={"If-None-Match": '"stale"'})
+    assert all_resp.status_code == 200
+    assert all_resp.json()["count"] == len(all_resp.json()["symbols"])
+
+def test_symbol_changes_endpoint():
+    """종목 변경 내역 조회 테스트"""
+    response = client.get("/api/symbols/changes?since=20250101")
+    assert response.status_code == 200
+    assert "changes" in response.json()
+    
+    invalid = client.get("/api/symbols/changes?since=yesterday")
+    assert invalid.status_code == 400
+
+def test_symbol_search_endpoint():
+    """종목 검색 테스트 (코드, 종목명, 초성)"""
+    by_code = client.get("/api/symbols/search?q=005930")
+    assert by_code.status_code == 200
+    assert by_code.json()["results"][0]["stock_code"] == "005930"
+    
+    by_chosung = client.get("/api/symbols/search?q=ㅅㅅㅈㅈ&limit=5")
+    assert by_chosung.status_code == 200
+    assert any(r["stock_name"] == "삼성전자" for r in by_chosung.json()["results"])
+
+def test_symbols_pagination_and_fields():
+    """종목 목록 커서 페이지/필드 선택 테스트"""
+    first = client.get("/api/symbols?fields=stock_code,stock_name&limit=2")
+    assert first.status_code == 200
+    body = first.json()
+    assert body["count"] == len(body["symbols"]) <= 2
+    assert all(set(r) == {"stock_code", "stock_name"} for r in body["symbols"])
+    
+    if body["next_cursor"]:
+        second = client.get(f"/api/symbols?fields=stock_code&limit=2&cursor={body['next_cursor']}")
+        assert second.json()["symbols"][0]["stock_code"] > body["next_cursor"]
+        
+    invalid = client.get("/api/symbols/KOSPI?fields=price")
+    assert invalid.status_code == 400
+
+def test_metrics_endpoint():
+    """Prometheus 지표 엔드포인트 (라우트 템플릿별 요청 수 포함)"""
+    client.get("/api/jobs")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert '# TYPE kis_requests_total counter' in response.text
+    assert 'http_requests_total{method="GET",route="/api/jobs",status="200"}' in response.text
+    assert 'job_queue_jobs{status="pending"}' in response.text
+
+def test_job_diagnostics_options():
+    """진단 옵션은 작업 파라미터로 전달되고, 결과 파일 목록은 작업별로 조회"""
+    response = client.post("/api/merge?trace=true&profile=sampling")
+    assert response.status_code == 200
+    job_id = response.json()["job_id"]
+    job = client.get(f"/api/jobs/{job_id}").json()["job"]
+    assert job["params"]["diagnostics"] == {"trace": True, "profile": "sampling", "memory": False}
+    
+    assert client.get(f"/api/jobs/{job_id}/artifacts").json()["artifacts"] == []
+    assert client.get(f"/api/jobs/{job_id}/artifacts/trace.json").status_code == 404
+    assert client.post("/api/merge?profile=perf").status_code == 400
+
+def _finished_job(monkeypatch, tmp_path):
+    """진행 상황을 기록하고 완료한 작업 (작업 큐는 임시 DB)"""
+    import app.api.routes as routes
+    from app.services.job_queue import JobQueue
+    queue = JobQueue(tmp_path / "jobs.db")
+    monkeypatch.setattr(routes, "job_queue", queue)
+    job = queue.enqueue("collect_today")
+    queue.claim("worker-1")
+    queue.update_progress(job["id"], "worker-1", {"symbols_done": 3, "symbols_total": 3, "percent": 100.0})
+    queue.complete(job["id"], "worker-1", {"count": 3})
+    return job["id"]
+
+def test_job_events_sse(monkeypatch, tmp_path):
+    """SSE 스트림은 상태, 진행 상황, 완료 이벤트를 보내고 종료"""
+    job_id = _finished_job(monkeypatch, tmp_path)
+    response = client.get(f"/api/jobs/{job_id}/events")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [line.split(": ", 1)[1] for line in response.text.splitlines() if line.startswith("event: ")]
+    assert events == ["status", "progress", "done"]
+    assert '"percent":100.0' in response.text
+    assert client.get("/api/jobs/unknown/events").status_code == 404
+
+def test_job_events_websocket(monkeypatch, tmp_path):
+    """WebSocket은 SSE와 같은 이벤트를 JSON으로 전송"""
+    from starlette.websockets import WebSocketDisconnect
+    job_id = _finished_job(monkeypatch, tmp_path)
+    with client.websocket_connect(f"/api/jobs/{job_id}/ws") as websocket:
+        events = [websocket.receive_json() for _ in range(3)]
+    assert [event["event"] for event in events] == ["status", "progress", "done"]
+    assert events[1]["data"]["symbols_done"] == 3 and events[2]["data"]["status"] == "succeeded"
+
+    with pytest.raises(WebSocketDisconnect) as error:
+        with client.websocket_connect("/api/jobs/unknown/ws") as websocket:
+            websocket.receive_json()
+    assert error.value.code == 4404
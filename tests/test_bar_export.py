@@ -0,0 +1,85 @@
+import gzip
+import io
+import json
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# 테스트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.abspath("."))
+
+import app.services.bar_export as bar_export_module
+from app.services.bar_export import BarExporter, EXPORT_COLUMNS
+from app.services.bar_store import BarStore
+
+pa = pytest.importorskip("pyarrow")
+zstandard = pytest.importorskip("zstandard")
+
+SYMBOLS = pd.DataFrame([
+    {"stock_code": "005930", "stock_name": "삼성전자"},
+    {"stock_code": "000660", "stock_name": "SK하이닉스"},
+])
+
+
+@pytest.fixture
+def exporter(tmp_path, monkeypatch):
+    """두 종목 일봉이 저장된 임시 바 저장소 (종목 마스터는 조회하지 않음)"""
+    monkeypatch.setattr(bar_export_module.symbol_master, "get", lambda market: SYMBOLS if market == "KOSPI" else SYMBOLS[:0])
+    store = BarStore(tmp_path / "bars")
+    rows = [
+        [date, code, close - 5, close + 10, close - 10, close, 1000 + index]
+        for code, base in (("005930", 70000), ("000660", 150000))
+        for index, (date, close) in enumerate([("20250102", base), ("20250103", base + 100), ("20250106", base + 200)])
+    ]
+    store.upsert_frame(pd.DataFrame(rows, columns=["거래일", "종목코드", "시가", "고가", "저가", "종가", "거래량"]))
+    return BarExporter(store, chunk_rows=2)
+
+
+def _decompress(data, compression):
+    if compression == "gzip":
+        return gzip.decompress(data)
+    if compression == "zstd":
+        return zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data)).read()
+    return data
+
+
+def _parse(data, export_format):
+    if export_format == "csv":
+        return pd.read_csv(io.BytesIO(data), encoding="utf-8-sig", dtype={"거래일": str, "종목코드": str, "종목명": str, "시장구분": str})
+    if export_format == "ndjson":
+        rows = [json.loads(line) for line in data.decode("utf-8").splitlines()]
+        return pd.DataFrame(rows, columns=EXPORT_COLUMNS)
+    return pa.ipc.open_stream(data).read_all().to_pandas()
+
+
+@pytest.mark.parametrize("compression", [None, "gzip", "zstd"])
+@pytest.mark.parametrize("export_format", ["csv", "ndjson", "arrow"])
+def test_export_round_trip(exporter, export_format, compression):
+    """형식/압축 조합마다 내보낸 바이트를 다시 읽으면 저장된 일봉과 같음"""
+    data = _decompress(b"".join(exporter.stream(export_format, compression, market="KOSPI", from_date=20250103)), compression)
+    df = _parse(data, export_format)
+
+    assert list(df.columns) == EXPORT_COLUMNS
+    assert len(df) == 4
+    assert df["종목코드"].tolist() == ["000660", "000660", "005930", "005930"]
+    assert df["거래일"].tolist() == ["20250103", "20250106"] * 2
+    assert df["종목명"].tolist() == ["SK하이닉스", "SK하이닉스", "삼성전자", "삼성전자"]
+    assert df["종가"].astype("int64").tolist() == [150100, 150200, 70100, 70200]
+    assert df["거래량"].astype("int64").tolist() == [1001, 1002, 1001, 1002]
+
+
+@pytest.mark.parametrize("compression", [None, "gzip", "zstd"])
+@pytest.mark.parametrize("export_format", ["csv", "ndjson", "arrow"])
+def test_export_empty_result(exporter, export_format, compression):
+    """결과가 없어도 형식에 맞는 유효한 스트림 (Arrow는 데이터가 있을 때와 같은 스키마)"""
+    data = _decompress(b"".join(exporter.stream(export_format, compression, market="KOSPI", from_date=20260101)), compression)
+    df = _parse(data, export_format)
+    assert df.empty
+
+    if export_format == "arrow":
+        full = pa.ipc.open_stream(b"".join(exporter.stream("arrow", market="KOSPI"))).schema
+        empty = pa.ipc.open_stream(data).schema
+        assert empty.equals(full)
+        assert empty.field("종가").type == pa.int64() and empty.field("거래일").type == pa.string()
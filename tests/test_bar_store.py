@@ -0,0 +1,247 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# 테스트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.abspath("."))
+
+from app.services.bar_store import BarStore, BAR_DTYPE
+from app.services.bar_query import BarQueryService, bars_to_records, paginate_bars
+from app.services.series_cache import SeriesCache, series_cache, SERIES, CROSS_SECTION
+
+
+def make_bars(dates, base=1000):
+    bars = np.zeros(len(dates), dtype=BAR_DTYPE)
+    bars["date"] = dates
+    bars["open"] = base
+    bars["high"] = base + 10
+    bars["low"] = base - 10
+    bars["close"] = base + 5
+    bars["volume"] = 100
+    return bars
+
+
+def test_append_and_range_read(tmp_path):
+    """이어 쓰기 후 기간 조회는 memmap 슬라이스를 반환"""
+    store = BarStore(tmp_path)
+    store.upsert("005930", make_bars([20250303, 20250304, 20250305]))
+    store.upsert("005930", make_bars([20250306, 20250307]))
+
+    bars = store.read("005930", "20250304", "20250306")
+    assert list(bars["date"]) == [20250304, 20250305, 20250306]
+    assert isinstance(bars, np.memmap)
+    assert store.last_key("005930") == 20250307
+
+
+def test_out_of_order_upsert_replaces_existing(tmp_path):
+    """과거 날짜 재수집 시 병합되고 같은 날짜는 새 값 우선"""
+    store = BarStore(tmp_path)
+    store.upsert("000660", make_bars([20250303, 20250305]))
+    result = store.upsert("000660", make_bars([20250304, 20250305], base=2000))
+
+    bars = store.read("000660")
+    assert (result["inserted"], result["updated"]) == (1, 1)
+    assert list(bars["date"]) == [20250303, 20250304, 20250305]
+    assert list(bars["open"]) == [1000, 2000, 2000]
+
+
+def test_upsert_overwrites_in_place(tmp_path):
+    """재수집된 바는 파일을 다시 쓰지 않고 제자리에서 덮어쓰기"""
+    store = BarStore(tmp_path)
+    store.upsert("005930", make_bars([20250303, 20250304, 20250305]))
+    inode = os.stat(tmp_path / "005930.bar").st_ino
+
+    result = store.upsert("005930", make_bars([20250304, 20250305, 20250306], base=3000))
+    assert (result["inserted"], result["updated"], result["unchanged"]) == (1, 2, 0)
+    assert os.stat(tmp_path / "005930.bar").st_ino == inode
+    assert list(store.read("005930")["open"]) == [1000, 3000, 3000, 3000]
+
+    result = store.upsert("005930", make_bars([20250306], base=3000))
+    assert result["unchanged"] == 1
+    assert len(result["changed_keys"]) == 0
+
+
+def test_upsert_frame_and_missing_symbol(tmp_path):
+    """수집 데이터프레임 저장 및 없는 종목 조회"""
+    store = BarStore(tmp_path)
+    df = pd.DataFrame([
+        {"거래일": "20250319", "종목코드": 20, "종목명": "동화약품", "시장구분": "KOSPI",
+         "시가": 6230, "고가": 6240, "저가": 6050, "종가": 6170, "거래량": 36616},
+    ])
+    assert list(store.upsert_frame(df)) == [True]
+    assert list(store.upsert_frame(df)) == [False]
+    assert store.list_symbols() == ["000020"]
+    assert store.read("000020")["close"][0] == 6170
+    assert len(store.read("999999")) == 0
+
+
+def test_series_cache_write_through_invalidation(tmp_path):
+    """바 저장 시 해당 종목/거래일 캐시 항목만 무효화"""
+    series_cache.clear()
+    store = BarStore(tmp_path)
+    query = BarQueryService(store=store, cache=series_cache)
+    store.upsert("005930", make_bars([20250303, 20250304]))
+    store.upsert("000660", make_bars([20250303]))
+
+    assert len(query.get_series("005930")) == 2
+    assert len(query.get_series("000660")) == 1
+    assert len(query.get_cross_section("20250304")) == 1
+    assert len(query.get_series("005930", "20250304")) == 1
+    assert series_cache.hits == 1
+
+    store.upsert("005930", make_bars([20250305]))
+    assert (SERIES, "005930") not in series_cache._entries
+    assert (SERIES, "000660") in series_cache._entries
+    assert (CROSS_SECTION, 20250304) in series_cache._entries
+    assert list(query.get_series("005930")["date"]) == [20250303, 20250304, 20250305]
+
+
+def test_series_cache_evicts_by_bytes():
+    """항목 수가 아닌 바이트 기준으로 오래된 항목 제거"""
+    cache = SeriesCache(max_bytes=BAR_DTYPE.itemsize * 5)
+    cache.put("a", make_bars([1, 2, 3]))
+    cache.put("b", make_bars([1, 2]))
+    cache.get("a")
+    cache.put("c", make_bars([1, 2]))
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert stats["current_bytes"] <= stats["max_bytes"]
+
+
+def test_paginate_bars_with_cursor_and_fields(tmp_path):
+    """거래일 커서 페이지와 필드 선택"""
+    store = BarStore(tmp_path)
+    store.upsert("005930", make_bars([20250303, 20250304, 20250305, 20250306, 20250307]))
+    bars = BarQueryService(store, SeriesCache(1 << 20)).get_series("005930")
+
+    first = paginate_bars(bars, "date", limit=2)
+    assert first["total"] == 5 and first["next_cursor"] == 20250304
+    second = paginate_bars(bars, "date", cursor=str(first["next_cursor"]), limit=2)
+    assert list(second["bars"]["date"]) == [20250305, 20250306]
+    last = paginate_bars(bars, "date", cursor=second["next_cursor"], limit=2)
+    assert list(last["bars"]["date"]) == [20250307] and last["next_cursor"] is None
+
+    assert bars_to_records(last["bars"], ["date", "close"]) == [{"date": 20250307, "close": 1005}]
+    assert paginate_bars(bars[:0], "date", cursor="20250101", limit=2)["bars"].size == 0
+
+
+def test_cache_detects_writes_from_other_process(tmp_path):
+    """다른 프로세스의 쓰기(캐시 무효화 훅 없음)는 파일 식별자/세대 번호로 감지"""
+    store = BarStore(tmp_path)
+    query = BarQueryService(store, SeriesCache(1 << 20))
+    store.upsert("005930", make_bars([20250303, 20250304]))
+    assert len(query.get_series("005930")) == 2
+    assert len(query.get_cross_section(20250304)) == 1
+
+    other = BarStore(tmp_path)
+    other._on_write = lambda stock_code, keys: other._bump_generation(keys)  # 다른 프로세스: 캐시 훅 없음
+    other.upsert("005930", make_bars([20250305]))
+    other.upsert("000660", make_bars([20250304]))
+
+    assert len(query.get_series("005930")) == 3
+    assert len(query.get_cross_section(20250304)) == 2
+
+
+def test_cross_section_cache_is_versioned_per_date(tmp_path):
+    """다른 거래일에 대한 쓰기는 단면 캐시를 무효화하지 않고, 적재 중에 바뀐 단면은 캐시에 넣지 않음"""
+    store = BarStore(tmp_path)
+    cache = SeriesCache(1 << 20)
+    query = BarQueryService(store, cache)
+    store.upsert("005930", make_bars([20250303, 20250304]))
+    query.get_cross_section(20250303)
+
+    other = BarStore(tmp_path)
+    other._on_write = lambda stock_code, keys: other._bump_generation(keys)  # 다른 프로세스: 캐시 훅 없음
+    other.upsert("005930", make_bars([20250305]))
+    hits = cache.hits
+    assert len(query.get_cross_section(20250303)) == 1 and cache.hits == hits + 1
+    assert store.date_generation(20250303) == 1 and store.date_generation(20250305) == 1
+    assert store.date_generation(20250306) == 0
+
+    # 단면을 읽는 도중 같은 거래일에 다른 종목이 쓰이면 읽은 값은 돌려주되 캐시에는 남기지 않음
+    load = query._load_cross_section
+
+    def load_during_write(trade_date):
+        result = load(trade_date)
+        other.upsert("000660", make_bars([trade_date]))
+        return result
+
+    query._load_cross_section = load_during_write
+    assert len(query.get_cross_section(20250304)) == 1
+    assert cache.get((CROSS_SECTION, 20250304)) is None
+    query._load_cross_section = load
+    assert len(query.get_cross_section(20250304)) == 2
+
+
+def test_many_symbols_under_low_fd_limit(tmp_path):
+    """열린 파일 한도를 낮춰도 종목 1,024개 이상을 쓰고 조회/내보내기 가능 (매핑 수는 max_open 이하)"""
+    resource = pytest.importorskip("resource")
+    from app.services.bar_export import BarExporter
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    limit = 256 if hard == resource.RLIM_INFINITY else min(256, hard)
+    codes = [f"{index:06d}" for index in range(1100)]
+    store = BarStore(tmp_path, max_open=64)
+
+    resource.setrlimit(resource.RLIMIT_NOFILE, (limit, hard))
+    try:
+        for code in codes:
+            store.upsert(code, make_bars([20250303, 20250304]))
+        for code in codes:
+            assert store.read(code, 20250304)["date"][0] == 20250304
+            assert list(store.scan(code, 20250304)["date"]) == [20250304]
+        assert store.open_count() <= 64
+
+        cross_section = BarQueryService(store, SeriesCache(1 << 20))._load_cross_section(20250303)
+        assert len(cross_section) == len(codes)
+        symbols = [{"stock_code": code, "stock_name": "", "market": ""} for code in codes]
+        assert sum(len(frame) for frame in BarExporter(store).iter_frames(symbols)) == 2 * len(codes)
+    finally:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+
+
+def test_bar_routes_read_outside_event_loop(tmp_path):
+    """일봉 조회 API는 저장소 읽기를 이벤트 루프가 아닌 스레드 풀에서 실행"""
+    import threading
+
+    from fastapi.testclient import TestClient
+
+    import app.api.routes as routes
+    from app.main import app
+
+    query = BarQueryService(BarStore(tmp_path), SeriesCache())
+    query.store.upsert("005930", make_bars([20250303, 20250304]))
+    threads = {}
+    load_cross_section = query._load_cross_section
+    scan = query.store.scan
+
+    def recording_load(trade_date):
+        threads["cross_section"] = threading.get_ident()
+        return load_cross_section(trade_date)
+
+    def recording_scan(*args, **kwargs):
+        threads.setdefault("series", threading.get_ident())
+        return scan(*args, **kwargs)
+
+    async def override():
+        threads.setdefault("loop", []).append(threading.get_ident())
+        return query
+
+    query._load_cross_section = recording_load
+    app.dependency_overrides[routes.get_bar_query] = override
+    try:
+        client = TestClient(app)
+        assert client.get("/api/bars/date/20250304").json()["count"] == 1
+        query.store.scan = recording_scan
+        assert client.get("/api/bars/005930").json()["count"] == 2
+    finally:
+        app.dependency_overrides.clear()
+    # 요청마다 이벤트 루프 스레드가 다를 수 있으므로 같은 요청의 루프 스레드와 비교
+    assert threads["cross_section"] != threads["loop"][0]
+    assert threads["series"] != threads["loop"][1]
@@ -0,0 +1,143 @@
+import json
+import os
+import sys
+
+import pytest
+
+# 테스트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.abspath("."))
+
+import app.services.bar_store as bar_store_module
+import app.services.data_validator as data_validator_module
+import app.services.korea_investment_api as kis_module
+from app.cli import Checkpoint, build_parser
+from app.services.bar_store import BarStore
+from app.services.korea_investment_api import KoreaInvestmentAPI
+
+STOCK_ITEMS = {
+    "KOSPI": [
+        {"stock_code": "005930", "stock_name": "삼성전자", "market": "KOSPI"},
+        {"stock_code": "000660", "stock_name": "SK하이닉스", "market": "KOSPI"},
+    ],
+    "KOSDAQ": [{"stock_code": "035720", "stock_name": "카카오", "market": "KOSDAQ"}],
+}
+
+
+def _daily_row(trade_date, close):
+    return {
+        "stck_bsop_date": trade_date, "stck_oprc": str(close - 5), "stck_hgpr": str(close + 10),
+        "stck_lwpr": str(close - 10), "stck_clpr": str(close), "acml_vol": "1000",
+    }
+
+
+@pytest.fixture
+def server(kis_server, tmp_path, monkeypatch):
+    """가짜 한국투자증권 서버와 임시 바 저장소 (종목 목록은 STOCK_ITEMS)"""
+    monkeypatch.setattr(kis_module, "rate_limiter", kis_module.rate_limiter)
+    monkeypatch.setattr(bar_store_module, "BAR_STORE_PATH", tmp_path / "bars")
+    monkeypatch.setattr(data_validator_module, "QUARANTINE_PATH", tmp_path / "quarantine")
+
+    async def stock_items(market):
+        return STOCK_ITEMS[market]
+
+    monkeypatch.setattr(KoreaInvestmentAPI(), "get_stock_item_list", stock_items)
+    for items in STOCK_ITEMS.values():
+        for index, item in enumerate(items):
+            kis_server.daily[item["stock_code"]] = [_daily_row(kis_server.trade_date, 1000 * (index + 1))]
+    return kis_server
+
+
+def _run(argv, capsys):
+    args = build_parser().parse_args(argv)
+    args.log_level = 20
+    code = args.func(args)
+    return code, capsys.readouterr().out
+
+
+def test_checkpoint_merges_shards(tmp_path):
+    """재개할 때는 모든 샤드의 완료 종목을 합치고, clear는 같은 이름만 삭제"""
+    Checkpoint("daily_a", 0, tmp_path).add(["005930"])
+    Checkpoint("daily_a", 1, tmp_path).add(["000660", "035720"])
+    Checkpoint("daily_b", 0, tmp_path).add(["111111"])
+
+    assert Checkpoint.completed("daily_a", tmp_path) == {"005930", "000660", "035720"}
+    assert Checkpoint("daily_a", 1, tmp_path).done == {"000660", "035720"}
+    Checkpoint.clear("daily_a", tmp_path)
+    assert Checkpoint.completed("daily_a", tmp_path) == set()
+    assert Checkpoint.completed("daily_b", tmp_path) == {"111111"}
+
+
+def test_backfill_into_store_and_resume(server, tmp_path, capsys):
+    """백필은 바 저장소에만 반영하고, --resume은 체크포인트에 기록된 종목을 건너뜀"""
+    checkpoints = tmp_path / "checkpoints"
+    argv = ["backfill", "--from", server.trade_date, "--to", server.trade_date,
+            "--checkpoint-dir", str(checkpoints), "--rate", "100"]
+
+    code, out = _run(argv + ["--codes", "005930,035720"], capsys)
+    result = json.loads(out)
+    assert code == 0
+    assert result["symbols"] == 2 and result["rows"] == 2 and result["stored"] == 2
+    assert result["skipped"] == 0 and result["failed_symbols"] == 0
+    assert BarStore(tmp_path / "bars").list_symbols() == ["005930", "035720"]
+    assert Checkpoint.completed(f"daily_{server.trade_date}_{server.trade_date}", checkpoints) == {"005930", "035720"}
+
+    code, out = _run(argv + ["--resume"], capsys)
+    result = json.loads(out)
+    assert code == 0 and result["skipped"] == 2 and result["symbols"] == 1
+    assert BarStore(tmp_path / "bars").list_symbols() == ["000660", "005930", "035720"]
+
+    # --resume 없이 다시 실행하면 체크포인트를 지우고 전체 수집
+    code, out = _run(argv, capsys)
+    assert json.loads(out)["symbols"] == 3
+
+
+def test_failed_symbols_are_not_checkpointed(server, tmp_path, capsys):
+    """조회에 실패한 종목은 실패로 집계(종료 코드 1)하고 체크포인트에 남기지 않아 --resume 때 다시 수집"""
+    checkpoints = tmp_path / "checkpoints"
+    argv = ["collect", "--date", server.trade_date, "--checkpoint-dir", str(checkpoints), "--rate", "100"]
+    server.failing.add("000660")
+
+    code, out = _run(argv, capsys)
+    result = json.loads(out)
+    assert code == 1
+    assert result["symbols"] == 2 and result["failed_symbols"] == 1 and result["errors"] >= 1
+    assert Checkpoint.completed(f"daily_{server.trade_date}_{server.trade_date}", checkpoints) == {"005930", "035720"}
+    assert BarStore(tmp_path / "bars").list_symbols() == ["005930", "035720"]
+
+    server.failing.clear()
+    code, out = _run(argv + ["--resume"], capsys)
+    result = json.loads(out)
+    assert code == 0 and result["skipped"] == 2 and result["symbols"] == 1 and result["failed_symbols"] == 0
+    assert BarStore(tmp_path / "bars").list_symbols() == ["000660", "005930", "035720"]
+
+
+def test_collect_exports_collected_range(server, tmp_path, capsys):
+    """--format을 주면 수집 후 수집 기간·종목의 일봉을 파일로 내보냄"""
+    import pandas as pd
+
+    output = tmp_path / "daily.csv"
+    code, out = _run(["collect", "--date", server.trade_date, "--codes", "005930,035720", "--rate", "100",
+                      "--checkpoint-dir", str(tmp_path / "checkpoints"), "--format", "csv", "--output", str(output)], capsys)
+    result = json.loads(out)
+    assert code == 0 and result["file_path"] == str(output) and result["bytes"] == output.stat().st_size
+    exported = pd.read_csv(output, dtype={"종목코드": str})
+    assert exported["종목코드"].tolist() == ["005930", "035720"]
+
+    code, _ = _run(["collect", "--format", "csv", "--output", "-"], capsys)
+    assert code == 2
+
+
+def test_merge_and_benchmark(server, tmp_path, capsys):
+    """merge는 바 저장소를 파일로 내보내고, benchmark는 저장 없이 처리량만 출력"""
+    code, out = _run(["benchmark", "--market", "KOSPI", "--date", server.trade_date, "--rate", "100"], capsys)
+    result = json.loads(out)
+    assert code == 0 and result["symbols"] == 2 and result["rows"] == 2 and result["calls"] >= 2
+    assert BarStore(tmp_path / "bars").list_symbols() == []
+
+    _run(["collect", "--date", server.trade_date, "--rate", "100", "--checkpoint-dir", str(tmp_path / "cp")], capsys)
+    output = tmp_path / "out" / "merged.ndjson"
+    code, out = _run(["merge", "--format", "ndjson", "--codes", "035720", "--output", str(output)], capsys)
+    assert code == 0 and json.loads(out)["file_path"] == str(output)
+    rows = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert [row["종목코드"] for row in rows] == ["035720"]
+
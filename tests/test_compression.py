@@ -0,0 +1,97 @@
+import gzip
+import os
+import sys
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+# 테스트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.abspath("."))
+
+import app.utils.compression as compression_module
+from app.utils.compression import CompressionMiddleware, negotiate_encoding, supported_encodings
+from app.utils.fast_json import FastJSONResponse, dumps
+from app.utils.http_cache import conditional_response
+
+app = FastAPI(default_response_class=FastJSONResponse)
+app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+
+@app.get("/large")
+async def large():
+    return {"symbols": [{"stock_code": f"{i:06d}", "stock_name": "삼성전자"} for i in range(100)]}
+
+
+@app.get("/small")
+async def small():
+    return {"status": "success"}
+
+
+@app.get("/cached")
+async def cached(request: Request):
+    body = dumps({"symbols": [{"stock_code": f"{i:06d}"} for i in range(100)]})
+    return conditional_response(request, body, '"v1"', "Mon, 19 Oct 2026 00:00:00 GMT")
+
+
+@app.get("/stream")
+async def stream():
+    return StreamingResponse(iter([b"a" * 1000, b"b" * 1000]), media_type="text/csv")
+
+
+client = TestClient(app)
+
+
+def test_negotiate_encoding():
+    """Accept-Encoding 협상 (q값, 와일드카드, 미지원 방식)"""
+    preferred = supported_encodings()[0]
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("br") is None
+    assert negotiate_encoding("gzip, zstd") == preferred
+    assert negotiate_encoding("gzip;q=1.0, zstd;q=0.5") == "gzip"
+    assert negotiate_encoding("gzip;q=0") is None
+    assert negotiate_encoding("*") == preferred
+
+
+def test_compresses_large_json_only():
+    """최소 크기 이상 JSON만 압축하고 스트리밍 응답은 그대로 전달"""
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.json()["symbols"][0]["stock_name"] == "삼성전자"
+
+    identity = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert int(response.headers["content-length"]) == len(gzip.compress(identity.content, compresslevel=6, mtime=0))
+
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/large", headers={"Accept-Encoding": "identity"}).headers
+
+    streamed = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in streamed.headers
+    assert len(streamed.content) == 2000
+
+
+def test_etag_and_vary_follow_representation(monkeypatch):
+    """압축 응답은 약한 ETag, 압축하지 않은 응답에도 Vary 표시, 약한 ETag로 물으면 304도 같은 형태"""
+    calls = []
+    original = compression_module.compress
+    monkeypatch.setattr(compression_module, "compress", lambda body, encoding: calls.append(encoding) or original(body, encoding))
+
+    identity = client.get("/cached", headers={"Accept-Encoding": "identity"})
+    assert identity.headers["etag"] == '"v1"'
+    assert "Accept-Encoding" in identity.headers["vary"]
+    assert "Accept-Encoding" in client.get("/small", headers={"Accept-Encoding": "identity"}).headers["vary"]
+
+    compressed = client.get("/cached", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["etag"] == 'W/"v1"'
+    assert compressed.content == identity.content
+
+    # 같은 ETag의 본문은 압축 결과를 재사용
+    again = client.get("/cached", headers={"Accept-Encoding": "gzip"})
+    assert again.content == identity.content and calls == ["gzip"]
+
+    not_modified = client.get("/cached", headers={"Accept-Encoding": "gzip", "If-None-Match": 'W/"v1"'})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == 'W/"v1"'
+    assert "Accept-Encoding" in not_modified.headers["vary"]
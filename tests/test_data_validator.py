@@ -0,0 +1,127 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# 테스트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.abspath("."))
+
+from app.services.bar_store import BarStore
+from app.services.data_validator import (
+    DataValidator, REFERENCE_PRICE_COLUMN, RULE_HIGH_BELOW_LOW, RULE_PRICE_JUMP, RULE_ZERO_VOLUME,
+)
+
+
+def make_frame(rows):
+    columns = ["거래일", "종목코드", "시가", "고가", "저가", "종가", "거래량"]
+    return pd.DataFrame(rows, columns=columns)
+
+
+def test_validator_flags_and_quarantines(tmp_path):
+    """범위 위반/급변 행은 격리, 거래량 0은 표시만"""
+    df = make_frame([
+        ["20250317", "005930", 100, 110, 90, 105, 1000],
+        ["20250318", "005930", 100, 90, 110, 100, 1000],    # 고가 < 저가
+        ["20250319", "005930", 1000, 1100, 990, 1050, 1000],  # 전일 대비 10배
+        ["20250319", "000660", 200, 210, 190, 200, 0],      # 거래량 0
+    ])
+    validator = DataValidator(quarantine_path=tmp_path)
+
+    flags = validator.check(df)
+    assert flags[1] & RULE_HIGH_BELOW_LOW
+    assert flags[2] & RULE_PRICE_JUMP
+    assert flags[3] == RULE_ZERO_VOLUME
+
+    clean, report = validator.validate(df, "KOSPI", "20250319")
+    assert list(clean.index) == [0, 3]
+    assert report["quarantined"] == 2
+    assert report["tagged"] == 1
+    assert report["rules"]["zero_volume"] == 1
+    quarantined = pd.read_csv(report["quarantine_file"], encoding="utf-8-sig")
+    assert "품질검사" in quarantined.columns
+
+
+def test_split_is_not_quarantined(tmp_path):
+    """액면분할 뒤에도 기준가와 비교하므로 격리되지 않고, 다음 날부터는 저장된 분할 후 종가와 비교"""
+    store = BarStore(tmp_path / "bars")
+    store.upsert_frame(make_frame([["20180427", "005930", 2650000, 2660000, 2600000, 2650000, 1000]]))
+    validator = DataValidator(quarantine_path=tmp_path / "quarantine", bar_store=store)
+
+    # 50:1 분할 첫날 (기준가 53000), 기준가가 없으면 저장소의 분할 전 종가와 비교해 격리
+    split_day = make_frame([["20180504", "005930", 53000, 53900, 51800, 51900, 50000]])
+    assert validator.check(split_day)[0] & RULE_PRICE_JUMP
+    split_day[REFERENCE_PRICE_COLUMN] = 53000
+    clean, report = validator.validate(split_day, "KOSPI")
+    assert report["quarantined"] == 0 and REFERENCE_PRICE_COLUMN not in clean.columns
+    store.upsert_frame(clean)
+
+    next_day = make_frame([["20180508", "005930", 52600, 53200, 51900, 52600, 40000]])
+    assert validator.check(next_day)[0] == 0
+
+
+def test_one_day_glitch_does_not_quarantine_next_row(tmp_path):
+    """하루짜리 오류 다음 행은 직전 정상 종가와 비교"""
+    df = make_frame([
+        ["20250317", "005930", 100, 110, 90, 100, 1000],
+        ["20250318", "005930", 1000, 1100, 990, 1000, 1000],  # 오류
+        ["20250319", "005930", 100, 110, 90, 101, 1000],
+        ["20250320", "005930", 1000, 1100, 990, 1010, 1000],  # 다시 오류
+    ])
+    flags = DataValidator(quarantine_path=tmp_path).check(df)
+    assert [bool(f & RULE_PRICE_JUMP) for f in flags] == [False, True, False, True]
+
+
+def test_validator_is_vectorized(tmp_path):
+    """백만 행 배치도 빠르게 검사 (종목 첫 행은 바 저장소의 직전 종가와 비교)"""
+    n = 1_000_000
+    rng = np.random.default_rng(0)
+    low = rng.integers(1000, 100000, n)
+    df = pd.DataFrame({
+        "거래일": np.tile(np.arange(20250101, 20250101 + 250), n // 250 + 1)[:n],
+        "종목코드": pd.Series(np.repeat(np.arange(n // 250 + 1), 250)[:n]).astype(str).str.zfill(6),
+        "시가": low + 5,
+        "고가": low + 10,
+        "저가": low,
+        "종가": low + 5,
+        "거래량": 100,
+    })
+    # 종목 첫 행이 저장된 직전 종가와 10배 차이 나도록 저장소 준비
+    store = BarStore(tmp_path / "bars")
+    first = df.groupby("종목코드").head(1)
+    store.upsert_frame(first.assign(거래일=20241231, 시가=first["종가"] * 10, 고가=first["종가"] * 10,
+                                    저가=first["종가"] * 10, 종가=first["종가"] * 10))
+
+    clean, report = DataValidator(quarantine_path=tmp_path, bar_store=store).validate(df, "KOSPI")
+    assert report["rows"] == n
+    assert report["rules"]["price_jump"] >= len(first)
+    # 부하가 걸린 CI에서도 흔들리지 않도록 행 단위 루프(수만 행/초)와 구분되는 수준만 확인
+    assert report["rows_per_sec"] > 200_000
+
+
+def test_stored_prev_close_reads_each_symbol_once(tmp_path):
+    """저장소 직전 종가는 행마다가 아니라 종목별로 묶어 읽고, 거래일마다 그 이전 마지막 종가를 찾음"""
+    store = BarStore(tmp_path / "bars")
+    store.upsert_frame(make_frame([
+        ["20250314", "005930", 100, 110, 90, 100, 1000],
+        ["20250317", "005930", 100, 110, 90, 101, 1000],
+        ["20250318", "005930", 100, 110, 90, 102, 1000],
+        ["20250317", "000660", 200, 210, 190, 200, 1000],
+    ]))
+    calls = []
+    scan = store.scan
+
+    def counting_scan(code, *args, **kwargs):
+        calls.append(code)
+        return scan(code, *args, **kwargs)
+
+    store.scan = counting_scan
+    validator = DataValidator(quarantine_path=tmp_path, bar_store=store)
+    codes = np.array(["005930", "000660", "005930", "005930", "035720"])
+    dates = np.array([20250317, 20250318, 20250319, 20250314, 20250319])
+
+    prev = validator._stored_prev_close(codes, dates)
+    assert prev[:3].tolist() == [100, 200, 102]
+    assert np.isnan(prev[3]) and np.isnan(prev[4])
+    assert sorted(set(calls)) == ["000660", "005930", "035720"]
+    assert calls.count("000660") == 1 and calls.count("035720") == 1 and calls.count("005930") == 2
@@ -0,0 +1,173 @@
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+import pytz
+
+# 테스트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.abspath("."))
+
+import app.services.scheduler as scheduler_module
+from app.core.config import TIMEZONE
+from app.services.data_collector import DataCollector
+from app.services.job_queue import JobQueue
+from app.services.korea_investment_api import KoreaInvestmentAPI, KoreaInvestmentAPIError
+from app.services.leader_election import LeaderElection
+from app.services.minute_bar_store import MINUTE_BAR_DTYPE, MinuteBarStore, minute_rows_to_bars
+from app.services.scheduler import StockDataScheduler
+from app.utils.rate_limiter import TokenBucket
+from tests.fake_kis_server import MINUTE_PATH
+
+# 09:00 ~ 10:34 분봉 95개
+SESSION = [f"{minute // 60:02d}{minute % 60:02d}" for minute in range(9 * 60, 9 * 60 + 95)]
+
+
+@pytest.fixture
+def kis(kis_server):
+    kis_server.minutes["005930"] = SESSION
+    return kis_server
+
+
+def _minute_calls(server):
+    return [query for path, query in server.requests if path == MINUTE_PATH]
+
+
+def test_token_bucket_limits_rate():
+    """버킷이 비면 초당 rate개 속도로 대기"""
+    bucket = TokenBucket(rate=50, capacity=5)
+    started = time.monotonic()
+    waits = [bucket.acquire() for _ in range(15)]
+    elapsed = time.monotonic() - started
+
+    assert waits[:5] == [0.0] * 5
+    assert elapsed >= 10 / 50 * 0.9
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_minute_bar_store_partitions_by_date(tmp_path):
+    """분봉은 거래일별 파티션에 저장되고, 같은 분은 덮어쓰기"""
+    store = MinuteBarStore(tmp_path)
+    rows = [
+        {"stck_bsop_date": date, "stck_cntg_hour": hour, "stck_oprc": "100", "stck_hgpr": "110",
+         "stck_lwpr": "90", "stck_prpr": "105", "cntg_vol": "7"}
+        for date, hour in [("20261016", "153000"), ("20261019", "090000"), ("20261019", "090100")]
+    ]
+    rows.append({"stck_bsop_date": "20261019", "stck_cntg_hour": "090200", "stck_prpr": "-"})
+    bars = minute_rows_to_bars(rows)
+    assert len(bars) == 3
+
+    assert store.upsert("005930", bars) == {"inserted": 3, "updated": 0, "unchanged": 0}
+    assert store.list_dates() == ["20261016", "20261019"]
+    assert store.last_time("005930", "20261019") == 202610190901
+    assert store.last_time("005930", "20261020") is None
+
+    bars["close"][-1] = 106
+    assert store.upsert("005930", bars[-1:])["updated"] == 1
+    read = store.read("005930", ["20261016", "20261019"], from_time=202610160000, to_time=202610190900)
+    assert read["time"].tolist() == [202610161530, 202610190900]
+    assert store.read("005930", ["20261019"])["close"].tolist() == [105, 106]
+
+
+def test_minute_bar_store_keeps_latest_and_recent_partitions(tmp_path):
+    """가장 최근 거래일 파티션은 유지하고, 지난 거래일 파티션은 최근 조회한 max_partitions개만 열어 둠"""
+    store = MinuteBarStore(tmp_path, max_partitions=2)
+    dates = ["20261013", "20261014", "20261015", "20261016", "20261019"]
+    for trade_date in dates:
+        bars = np.zeros(1, dtype=MINUTE_BAR_DTYPE)
+        bars["time"] = int(trade_date + "0900")
+        store.upsert("005930", bars)
+    assert store.open_dates() == ["20261015", "20261016", "20261019"]
+
+    assert len(store.read("005930", ["20261013"])) == 1
+    assert store.open_dates() == ["20261013", "20261016", "20261019"]
+    assert len(store.read("005930", dates)) == 5
+    assert store.open_dates() == ["20261015", "20261016", "20261019"]
+
+
+def test_minute_bars_paging(kis):
+    """기준 시각을 당겨 가며 장 시작까지 조회하고, 이후 조회는 마지막 분봉부터만"""
+    api = KoreaInvestmentAPI()
+    rows = api.get_minute_bars("005930", until="153000")
+
+    assert [row["stck_cntg_hour"][:4] for row in rows] == SESSION
+    calls = _minute_calls(kis)
+    assert [call["fid_input_hour_1"] for call in calls] == ["153000", "100400", "093400", "090400"]
+    assert any(path == "/oauth2/tokenP" for path, _ in kis.requests)
+
+    kis.requests.clear()
+    since = int(kis.trade_date + "1030")
+    rows = api.get_minute_bars("005930", since=since, until="153000")
+    assert [row["stck_cntg_hour"][:4] for row in rows] == ["1030", "1031", "1032", "1033", "1034"]
+    assert len(_minute_calls(kis)) == 1
+
+
+def test_collect_intraday_data(kis, tmp_path):
+    """분봉 수집은 종목별로 마지막 저장 분봉 이후만 받아 추가"""
+    collector = DataCollector()
+    collector._minute_store = MinuteBarStore(tmp_path / "minute_bars")
+
+    result = asyncio.run(collector.collect_intraday_data(["005930", "000660"], until="153000"))
+    assert result == {"symbols": 2, "inserted": 95, "updated": 0, "failed": 0}
+
+    bars = collector.minute_store.read("005930", [kis.trade_date])
+    assert len(bars) == 95 and bars["close"][0] == 70900
+    assert np.all(np.diff(bars["time"]) > 0)
+
+    # 다음 주기: 새 분봉 1개 + 마지막 분봉 재조회
+    kis.requests.clear()
+    kis.minutes["005930"] = SESSION + ["1035"]
+    result = asyncio.run(collector.collect_intraday_data(["005930"], until="153000"))
+    assert result["inserted"] == 1
+    assert len(_minute_calls(kis)) == 1
+
+
+def test_collect_intraday_retries_after_failed_page(kis, tmp_path):
+    """중간 페이지 조회가 실패하면 받은 최신 분봉도 저장하지 않고 실패로 집계해, 다음 주기에 전체를 다시 조회"""
+    collector = DataCollector()
+    collector._minute_store = MinuteBarStore(tmp_path / "minute_bars")
+    kis.failing_minutes["005930"] = "1000"
+
+    with pytest.raises(KoreaInvestmentAPIError):
+        KoreaInvestmentAPI().get_minute_bars("005930", until="153000")
+
+    result = asyncio.run(collector.collect_intraday_data(["005930"], until="153000"))
+    assert result == {"symbols": 1, "inserted": 0, "updated": 0, "failed": 1}
+    assert collector.minute_store.last_time("005930", kis.trade_date) is None
+
+    del kis.failing_minutes["005930"]
+    result = asyncio.run(collector.collect_intraday_data(["005930"], until="153000"))
+    assert result == {"symbols": 1, "inserted": 95, "updated": 0, "failed": 0}
+
+
+def test_scheduler_enqueues_intraday_jobs(tmp_path, monkeypatch):
+    """장중에는 주기마다 분봉 작업을 등록하고, 이전 작업이 남아 있으면 건너뜀"""
+    queue = JobQueue(tmp_path / "jobs.db")
+    monkeypatch.setattr(scheduler_module, "job_queue", queue)
+    scheduler = StockDataScheduler(
+        tmp_path / "scheduler_state.json",
+        LeaderElection("scheduler", tmp_path / "jobs.db"),
+        intraday_symbols=["005930"],
+    )
+    monday = pytz.timezone(TIMEZONE).localize(datetime(2026, 10, 19, 10, 0))
+
+    job = scheduler._run_intraday_job(monday)
+    assert job["kind"] == "collect_intraday" and job["max_attempts"] == 1
+    assert scheduler._run_intraday_job(monday + timedelta(seconds=10)) is None
+
+    later = monday + timedelta(minutes=2)
+    assert scheduler._run_intraday_job(later) is None
+    assert len(queue.list()) == 1
+
+    claimed = queue.claim("worker-1")
+    queue.complete(claimed["id"], "worker-1")
+    assert scheduler._run_intraday_job(later + timedelta(minutes=2)) is not None
+
+    # 장 마감 후와 주말에는 등록하지 않음
+    assert scheduler._run_intraday_job(monday.replace(hour=16)) is None
+    assert scheduler._run_intraday_job(monday + timedelta(days=5)) is None
+    assert len(queue.list()) == 2
@@ -0,0 +1,221 @@
+import asyncio
+import os
+import sqlite3
+import sys
+import time
+
+# 테스트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.abspath("."))
+
+from app.services.job_queue import JobQueue, PENDING, RUNNING, SUCCEEDED, FAILED
+from app.utils.progress import JobProgress, current_progress, raise_if_cancelled
+from app.workers.collector_worker import CollectorWorker
+
+
+class EchoCollector:
+    """작업 파라미터를 그대로 돌려주는 수집기 (fail=True면 예외)"""
+
+    async def run_job(self, kind, params=None):
+        if params.get("fail"):
+            raise RuntimeError("수집 실패")
+        return {"kind": kind, "params": params}
+
+
+class CountingCollector:
+    """진행 카운터만 올리는 수집기"""
+
+    async def run_job(self, kind, params=None):
+        progress = current_progress()
+        progress.add_total(4)
+        progress.record_call()
+        progress.record_call("000020: 조회 실패")
+        progress.add_done(2, 30)
+        return {"kind": kind}
+
+
+def test_enqueue_claim_complete(tmp_path):
+    """등록 → 임대 → 하트비트 → 완료"""
+    queue = JobQueue(tmp_path / "jobs.db")
+    job = queue.enqueue("collect_historical", {"from_date": "20250101"})
+    assert job["status"] == PENDING and job["params"] == {"from_date": "20250101"}
+
+    claimed = queue.claim("worker-1")
+    assert claimed["id"] == job["id"] and claimed["status"] == RUNNING and claimed["attempts"] == 1
+    assert queue.claim("worker-2") is None
+
+    assert queue.heartbeat(job["id"], "worker-1")
+    assert not queue.heartbeat(job["id"], "worker-2")
+    assert queue.complete(job["id"], "worker-1", {"count": 3})
+
+    done = queue.get(job["id"])
+    assert done["status"] == SUCCEEDED and done["result"] == {"count": 3}
+    assert queue.stats()[SUCCEEDED] == 1
+
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    """워커가 죽어 임대가 만료되면 다른 워커가 가져가고, 이전 워커의 결과는 무시"""
+    queue = JobQueue(tmp_path / "jobs.db", lease_seconds=0.05, max_attempts=2)
+    job = queue.enqueue("collect_today")
+    queue.claim("dead-worker")
+
+    time.sleep(0.1)
+    reclaimed = queue.claim("worker-2")
+    assert reclaimed["id"] == job["id"] and reclaimed["lease_owner"] == "worker-2" and reclaimed["attempts"] == 2
+    assert not queue.complete(job["id"], "dead-worker", {})
+
+    time.sleep(0.1)
+    assert queue.claim("worker-3") is None
+    assert queue.get(job["id"])["status"] == FAILED
+
+
+def test_worker_retries_then_fails(tmp_path):
+    """실패한 작업은 지연 후 재시도하고 최대 시도 횟수를 넘으면 실패"""
+    queue = JobQueue(tmp_path / "jobs.db", max_attempts=2, retry_delay=0)
+    worker = CollectorWorker(queue, "worker-1", collector=EchoCollector())
+    ok = queue.enqueue("merge", {"pattern": "*.csv"})
+    bad = queue.enqueue("merge", {"fail": True})
+
+    assert asyncio.run(worker.run_once())
+    result = queue.get(ok["id"])["result"]
+    assert result["kind"] == "merge" and result["params"] == {"pattern": "*.csv"}
+    assert "stages" in result["diagnostics"]
+
+    assert asyncio.run(worker.run_once())
+    retried = queue.get(bad["id"])
+    assert retried["status"] == PENDING and retried["error"] == "수집 실패"
+
+    assert asyncio.run(worker.run_once())
+    assert queue.get(bad["id"])["status"] == FAILED
+    assert not asyncio.run(worker.run_once())
+
+
+def test_progress_is_recorded_by_lease_owner(tmp_path):
+    """진행 상황은 임대를 가진 워커만 기록하고, 다시 임대하면 초기화"""
+    queue = JobQueue(tmp_path / "jobs.db", lease_seconds=0.05)
+    job = queue.enqueue("collect_today")
+    queue.claim("worker-1")
+
+    assert queue.update_progress(job["id"], "worker-1", {"symbols_done": 10})
+    assert not queue.update_progress(job["id"], "worker-2", {"symbols_done": 99})
+    assert queue.get(job["id"])["progress"] == {"symbols_done": 10}
+
+    time.sleep(0.1)
+    queue.claim("worker-2")
+    assert queue.get(job["id"])["progress"] is None
+
+
+def test_progress_column_is_added_to_existing_db(tmp_path):
+    """이전 버전 DB에는 progress 컬럼을 추가"""
+    path = tmp_path / "jobs.db"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE jobs (id TEXT PRIMARY KEY, kind TEXT NOT NULL, params TEXT, status TEXT NOT NULL, "
+        "attempts INTEGER NOT NULL DEFAULT 0, max_attempts INTEGER NOT NULL, available_at REAL NOT NULL, "
+        "lease_owner TEXT, lease_expires_at REAL, heartbeat_at TEXT, created_at TEXT NOT NULL, "
+        "started_at TEXT, finished_at TEXT, result TEXT, error TEXT)"
+    )
+    conn.commit()
+    conn.close()
+
+    job = JobQueue(path).enqueue("merge")
+    assert job["progress"] is None
+
+
+def test_progress_snapshot():
+    """진행률과 남은 시간은 완료한 종목 수 기준"""
+    progress = JobProgress()
+    assert progress.snapshot()["percent"] is None and progress.snapshot()["eta_seconds"] is None
+
+    progress.add_total(100)
+    progress.add_done(25, 500)
+    progress.record_call()
+    progress.record_call("005930: HTTP 500")
+    snapshot = progress.snapshot()
+    assert snapshot["percent"] == 25.0 and snapshot["rows"] == 500
+    assert snapshot["calls"] == 2 and snapshot["errors"] == 1 and snapshot["last_error"] == "005930: HTTP 500"
+    assert snapshot["eta_seconds"] is not None and snapshot["eta_seconds"] >= 0
+
+
+def test_worker_publishes_final_progress(tmp_path):
+    """작업이 끝나면 마지막 진행 상황을 기록한 뒤 완료"""
+    queue = JobQueue(tmp_path / "jobs.db")
+    worker = CollectorWorker(queue, "worker-1", collector=CountingCollector())
+    job = queue.enqueue("collect_today")
+
+    assert asyncio.run(worker.run_once())
+    done = queue.get(job["id"])
+    assert done["status"] == SUCCEEDED
+    assert done["progress"]["symbols_done"] == 2 and done["progress"]["symbols_total"] == 4
+    assert done["progress"]["calls"] == 2 and done["progress"]["errors"] == 1
+
+
+class SlowCollector:
+    """배치마다 중단 요청을 확인하며 수집하는 척하는 수집기"""
+
+    def __init__(self, batches=40, check=True):
+        self.batches = batches
+        self.check = check
+        self.done = 0
+
+    async def run_job(self, kind, params=None):
+        for _ in range(self.batches):
+            if self.check:
+                raise_if_cancelled()
+            await asyncio.sleep(0.05)
+            self.done += 1
+        return {"kind": kind}
+
+
+def test_worker_aborts_when_lease_is_lost(tmp_path, monkeypatch):
+    """임대를 잃으면 다음 배치 경계에서 중단하고, 실패/완료 어느 쪽도 기록하지 않음"""
+    queue = JobQueue(tmp_path / "jobs.db", lease_seconds=1)
+    monkeypatch.setattr(queue, "heartbeat", lambda job_id, worker_id: False)
+    collector = SlowCollector()
+    worker = CollectorWorker(queue, "worker-1", collector=collector)
+    job = queue.enqueue("collect_today")
+
+    assert asyncio.run(worker.run_once())
+    assert 0 < collector.done < collector.batches
+    assert queue.get(job["id"])["status"] == RUNNING
+
+    # 중단 확인 없이 끝까지 실행한 작업도 결과를 기록하지 않음 (넘겨받은 워커가 다시 실행)
+    collector = SlowCollector(batches=30, check=False)
+    worker = CollectorWorker(queue, "worker-2", collector=collector)
+    time.sleep(1.1)
+    assert asyncio.run(worker.run_once())
+    assert collector.done == collector.batches
+    job = queue.get(job["id"])
+    assert job["status"] == RUNNING and job["result"] is None
+
+
+def test_worker_process_splits_rate_limit(monkeypatch):
+    """워커 프로세스는 초당 API 호출 한도를 워커 프로세스 수로 나눠 씀"""
+    import app.services.korea_investment_api as kis_module
+    import app.workers.collector_worker as worker_module
+
+    class IdleWorker:
+        def __init__(self, **kwargs):
+            pass
+
+        def stop(self):
+            pass
+
+        async def run(self):
+            pass
+
+    class IdleDispatcher:
+        def __init__(self, queue):
+            pass
+
+        start = stop = lambda self: None
+
+    monkeypatch.setattr(worker_module, "CollectorWorker", IdleWorker)
+    monkeypatch.setattr(worker_module, "WebhookDispatcher", IdleDispatcher)
+    monkeypatch.setattr(worker_module, "setup_logging", lambda: None)
+    monkeypatch.setattr(worker_module.metrics_registry, "start", lambda: None)
+    monkeypatch.setattr(worker_module.metrics_registry, "stop", lambda: None)
+    monkeypatch.setattr(kis_module, "rate_limiter", kis_module.rate_limiter)
+    monkeypatch.setattr(worker_module.signal, "signal", lambda *args: None)
+
+    worker_module._worker_main(4)
+    assert kis_module.rate_limiter.rate == worker_module.KIS_RATE_LIMIT_PER_SECOND / 4
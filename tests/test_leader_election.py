@@ -0,0 +1,65 @@
+import asyncio
+import os
+import sys
+import time
+
+# 테스트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.abspath("."))
+
+import app.services.scheduler as scheduler_module
+from app.services.job_queue import JobQueue
+from app.services.leader_election import LeaderElection
+from app.services.scheduler import StockDataScheduler
+
+
+def test_single_leader_and_failover(tmp_path):
+    """임대는 한 프로세스만 보유하고, 만료되면 다른 프로세스가 이어받음"""
+    db_path = tmp_path / "jobs.db"
+    first = LeaderElection("scheduler", db_path, lease_seconds=0.2)
+    second = LeaderElection("scheduler", db_path, lease_seconds=0.2)
+    second._owner, second.pid = "other-process", os.getpid()
+
+    assert first.try_acquire()
+    assert not second.try_acquire()
+    assert first.try_acquire()  # 연장
+    assert second.current()["owner"] == first.owner
+
+    time.sleep(0.3)  # 리더 프로세스 중단
+    assert second.try_acquire()
+    assert not first.try_acquire() and not first.is_leader
+
+    assert second.release()
+    assert first.current() is None
+
+
+def test_scheduler_runs_only_on_leader(tmp_path, monkeypatch):
+    """여러 워커의 스케줄러 중 리더만 작업을 등록하고, 같은 예정 실행을 중복 등록하지 않음"""
+    queue = JobQueue(tmp_path / "jobs.db")
+    monkeypatch.setattr(scheduler_module, "job_queue", queue)
+
+    state_path = tmp_path / "scheduler_state.json"
+    workers = []
+    for owner in ("worker-a", "worker-b"):
+        election = LeaderElection("scheduler", tmp_path / "jobs.db", lease_seconds=30)
+        election._owner, election.pid = owner, os.getpid()
+        workers.append(StockDataScheduler(state_path, election, cron="* * * * *"))
+    a, b = workers
+
+    async def scenario():
+        assert a.start()
+        assert b.is_running and not b.start()
+        await a._tick()
+        await b._tick()
+        assert a.is_leader and not b.is_leader
+        assert b.get_leader()["owner"] == "worker-a"
+
+        slot = a._next_run
+        assert a._run_collect_job(slot) is not None
+        assert b._run_collect_job(slot) is None
+        assert len(queue.list()) == 1
+
+        assert b.stop()
+        await a._tick()
+        assert not a.is_leader and a.get_leader() is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,121 @@
+import json
+import logging
+import os
+import sys
+
+import pytest
+
+# 테스트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.abspath("."))
+
+from app.utils.logging_config import RepeatedLogFilter, setup_logging, stop_logging
+from app.services.data_collector import _code_sample
+
+
+def _record(created, msg="종목 %s 데이터 없음", level=logging.INFO):
+    record = logging.makeLogRecord({
+        "msg": msg, "args": ("005930",), "levelno": level, "levelname": logging.getLevelName(level),
+        "pathname": "collector.py", "lineno": 10,
+    })
+    record.created = created
+    return record
+
+
+def _restore_logging(tmp_path):
+    """이후 테스트의 로그는 임시 디렉토리에 기록 (콘솔은 pytest가 닫는 캡처 스트림 대신 원래 표준 출력)"""
+    setup_logging(log_dir=tmp_path, console_stream="ext://sys.__stdout__")
+
+
+def test_queued_logging_writes_json(tmp_path):
+    """로그는 기록 스레드가 JSON으로 기록 (extra 값, 예외 정보 포함)"""
+    try:
+        logger = setup_logging(log_dir=tmp_path)
+        assert all(isinstance(handler, logging.handlers.QueueHandler) for handler in logger.handlers)
+
+        logger.info("배치 처리 완료: %d개", 3, extra={"market": "KOSPI"})
+        try:
+            raise ValueError("변환 실패")
+        except ValueError:
+            logger.error("종목 데이터 변환 오류", exc_info=True)
+        stop_logging()
+
+        lines = [json.loads(line) for line in next(tmp_path.glob("stock_api_2*.log")).read_text(encoding="utf-8").splitlines()]
+        info = next(line for line in lines if line["message"] == "배치 처리 완료: 3개")
+        assert info["market"] == "KOSPI" and info["logger"] == "app"
+        error = next(line for line in lines if line["message"] == "종목 데이터 변환 오류")
+        assert error["exception"]["type"] == "ValueError"
+
+        errors = next(tmp_path.glob("stock_api_error_*.log")).read_text(encoding="utf-8").splitlines()
+        assert len(errors) == 1
+    finally:
+        _restore_logging(tmp_path)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork 미지원 환경")
+def test_forked_child_gets_new_listener(tmp_path):
+    """fork된 자식은 새 큐와 기록 스레드로 로그를 기록"""
+    try:
+        logger = setup_logging(log_dir=tmp_path)
+        pid = os.fork()
+        if pid == 0:
+            logger.info("자식 프로세스 로그")
+            stop_logging()
+            os._exit(0)
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0
+        logger.info("부모 프로세스 로그")
+        stop_logging()
+
+        messages = [json.loads(line)["message"] for line in next(tmp_path.glob("stock_api_2*.log")).read_text(encoding="utf-8").splitlines()]
+        assert "자식 프로세스 로그" in messages and "부모 프로세스 로그" in messages
+    finally:
+        _restore_logging(tmp_path)
+
+
+def test_repeated_log_filter():
+    """같은 위치의 로그는 구간마다 제한하고 생략 건수는 다음 구간 첫 로그에 표시"""
+    sample_filter = RepeatedLogFilter(window=60, burst=2)
+    passed = [sample_filter.filter(_record(1000 + i)) for i in range(5)]
+    assert passed == [True, True, False, False, False]
+    assert sample_filter.filter(_record(1000, level=logging.WARNING))
+    assert sample_filter.filter(_record(1000, level=logging.ERROR))
+
+    record = _record(1061)
+    assert sample_filter.filter(record)
+    assert record.getMessage() == "종목 005930 데이터 없음 (같은 위치의 로그 3건 생략)"
+
+
+def test_repeated_log_filter_flushes_expired_window():
+    """구간이 끝날 때까지 같은 위치의 로그가 없으면 생략 건수를 따로 기록"""
+    records = []
+
+    class ListHandler(logging.Handler):
+        def emit(self, record):
+            records.append(record)
+
+    logger = logging.getLogger("tests.sample_filter")
+    handler = ListHandler()
+    sample_filter = RepeatedLogFilter(window=60, burst=1)
+    handler.addFilter(sample_filter)
+    logger.addHandler(handler)
+    try:
+        for i in range(4):
+            record = _record(1000 + i)
+            record.name = logger.name
+            logger.handle(record)
+        assert len(records) == 1
+
+        sample_filter.flush(now=1030)
+        assert len(records) == 1
+        sample_filter.flush(now=1060)
+        assert len(records) == 2
+        assert records[1].getMessage() == "같은 위치의 로그 3건 생략 (마지막: 종목 005930 데이터 없음)"
+        assert records[1].suppressed == 3 and records[1].levelno == logging.INFO
+    finally:
+        logger.removeHandler(handler)
+
+
+def test_code_sample():
+    """요약 로그에는 종목 코드 일부만 나열"""
+    assert _code_sample(["000020", "000040"]) == "000020, 000040"
+    assert _code_sample([f"{i:06d}" for i in range(25)]).endswith("000009 외 15개")
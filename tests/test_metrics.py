@@ -0,0 +1,126 @@
+import json
+import os
+import subprocess
+import sys
+
+# 테스트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.abspath("."))
+
+from app.utils.metrics import MetricsRegistry
+
+
+def _define(registry):
+    requests = registry.counter("kis_requests_total", "API 호출 수", ["endpoint", "result"])
+    latency = registry.histogram("kis_request_seconds", "응답 시간", buckets=(0.1, 1.0))
+    in_progress = registry.gauge("jobs_in_progress", "실행 중인 작업 수")
+    return requests, latency, in_progress
+
+
+def test_render_text_format():
+    """카운터/히스토그램/게이지를 Prometheus 텍스트 형식으로 출력 (히스토그램 버킷은 누적)"""
+    registry = MetricsRegistry()
+    requests, latency, in_progress = _define(registry)
+
+    requests.labels("daily_price", "ok").inc()
+    requests.labels(endpoint="daily_price", result="ok").inc(2)
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value)
+    in_progress.inc()
+
+    text = registry.render()
+    assert "# TYPE kis_requests_total counter" in text
+    assert 'kis_requests_total{endpoint="daily_price",result="ok"} 3' in text
+    assert 'kis_request_seconds_bucket{le="0.1"} 1' in text
+    assert 'kis_request_seconds_bucket{le="1"} 2' in text
+    assert 'kis_request_seconds_bucket{le="+Inf"} 3' in text
+    assert "kis_request_seconds_count 3" in text
+    assert "jobs_in_progress 1" in text
+
+
+def test_merge_across_processes(tmp_path):
+    """다른 프로세스 스냅숏과 합산 (종료된 프로세스의 게이지는 제외, 카운터는 유지)"""
+    worker = MetricsRegistry(tmp_path)
+    requests, latency, in_progress = _define(worker)
+    requests.labels("daily_price", "ok").inc(5)
+    latency.observe(0.5)
+    in_progress.inc()
+
+    # 종료된 워커 프로세스의 스냅숏으로 기록
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    snapshot = worker.snapshot()
+    snapshot["pid"] = dead.pid
+    (tmp_path / f"{dead.pid}.json").write_text(json.dumps(snapshot), encoding="utf-8")
+
+    api = MetricsRegistry(tmp_path)
+    requests, latency, in_progress = _define(api)
+    requests.labels("daily_price", "ok").inc(2)
+    latency.observe(0.05)
+    in_progress.inc()
+
+    text = api.render()
+    assert 'kis_requests_total{endpoint="daily_price",result="ok"} 7' in text
+    assert 'kis_request_seconds_bucket{le="0.1"} 1' in text
+    assert "kis_request_seconds_count 2" in text
+    assert "jobs_in_progress 1" in text
+
+
+def test_flush_writes_snapshot(tmp_path):
+    """flush는 프로세스별 스냅숏 파일을 원자적으로 교체"""
+    registry = MetricsRegistry(tmp_path)
+    requests, _, _ = _define(registry)
+    requests.labels("token", "ok").inc()
+    registry.flush()
+
+    paths = list(tmp_path.glob(f"{os.getpid()}-*.json"))
+    assert len(paths) == 1
+    data = json.loads(paths[0].read_text(encoding="utf-8"))
+    assert data["metrics"]["kis_requests_total"]["samples"] == [[["token", "ok"], 1.0]]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def _dead_pid():
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    return dead.pid
+
+
+def test_dead_snapshots_are_retired(tmp_path):
+    """종료된 프로세스 파일은 retired.json 하나로 합친 뒤 삭제하고, 다음 조회에도 합계는 그대로"""
+    for _ in range(3):
+        worker = MetricsRegistry(tmp_path)
+        requests, latency, in_progress = _define(worker)
+        requests.labels("daily_price", "ok").inc(2)
+        latency.observe(0.5)
+        in_progress.inc()
+        snapshot = worker.snapshot()
+        snapshot["pid"] = _dead_pid()
+        (tmp_path / f"{snapshot['pid']}-{snapshot['token']}.json").write_text(json.dumps(snapshot), encoding="utf-8")
+
+    api = MetricsRegistry(tmp_path)
+    _define(api)
+    for _ in range(2):
+        text = api.render()
+        assert 'kis_requests_total{endpoint="daily_price",result="ok"} 6' in text
+        assert "kis_request_seconds_count 3" in text
+        assert "jobs_in_progress 0" in text
+    assert sorted(path.name for path in tmp_path.glob("*.json")) == ["retired.json"]
+
+
+def test_reused_pid_keeps_previous_counters(tmp_path):
+    """PID가 재사용돼도 새 프로세스는 다른 파일에 기록하고, 이전 프로세스 값은 합계에 남음"""
+    previous = MetricsRegistry(tmp_path)
+    requests, _, _ = _define(previous)
+    requests.labels("token", "ok").inc(3)
+    previous.flush()
+
+    # 같은 PID로 시작한 새 프로세스 (fork 후처럼 토큰만 다름)
+    current = MetricsRegistry(tmp_path)
+    requests, _, _ = _define(current)
+    requests.labels("token", "ok").inc()
+    current.flush()
+    assert len(list(tmp_path.glob(f"{os.getpid()}-*.json"))) == 2
+
+    text = current.render()
+    assert 'kis_requests_total{endpoint="token",result="ok"} 4' in text
+    assert [path.name for path in tmp_path.glob(f"{os.getpid()}-*.json")] == [current._snapshot_path().name]
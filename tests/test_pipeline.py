@@ -0,0 +1,266 @@
+import asyncio
+import os
+import sys
+import time
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+# 테스트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.abspath("."))
+
+import app.api.routes as routes
+import app.services.data_collector as data_collector_module
+import app.utils.stock_symbols as stock_symbols
+from app.main import app
+from app.services.bar_store import BarStore
+from app.services.data_collector import DataCollector
+from app.services.data_validator import DataValidator
+from app.services.job_queue import JobQueue
+from app.services.pipeline import Pipeline, PipelineError, Stage, SKIPPED
+from app.utils.progress import JobCancelled, current_progress, track_progress
+from app.utils.symbol_master import symbol_master
+
+STOCK_ITEMS = {
+    "KOSPI": [
+        {"stock_code": "005930", "stock_name": "삼성전자", "market": "KOSPI"},
+        {"stock_code": "000660", "stock_name": "SK하이닉스", "market": "KOSPI"},
+    ],
+    "KOSDAQ": [{"stock_code": "035720", "stock_name": "카카오", "market": "KOSDAQ"}],
+}
+
+
+def _daily_row(trade_date, close):
+    return {
+        "stck_bsop_date": trade_date, "stck_oprc": str(close - 5), "stck_hgpr": str(close + 10),
+        "stck_lwpr": str(close - 10), "stck_clpr": str(close), "acml_vol": "1000",
+    }
+
+
+@pytest.fixture
+def collector(kis_server, tmp_path, monkeypatch):
+    """가짜 한국투자증권 서버와 임시 저장소를 쓰는 수집기 (종목 코드 갱신은 건너뜀)"""
+    monkeypatch.setattr(data_collector_module, "DATA_STORAGE_PATH", str(tmp_path / "stock_data"))
+    monkeypatch.setattr(stock_symbols, "update_stock_symbols", lambda: {
+        "KOSPI": 2, "KOSDAQ": 1, "version": "20261019180000", "changes": 0,
+        "diff": {"listed": [], "delisted": [], "renamed": [], "market_moved": []},
+    })
+    monkeypatch.setattr(symbol_master, "reload", lambda: None)
+    for items in STOCK_ITEMS.values():
+        for index, item in enumerate(items):
+            kis_server.daily[item["stock_code"]] = [_daily_row(kis_server.trade_date, 1000 * (index + 1))]
+
+    collector = DataCollector()
+    collector.bar_store = BarStore(tmp_path / "bars")
+    collector.validator = DataValidator(quarantine_path=tmp_path / "quarantine", bar_store=collector.bar_store)
+    notified = []
+
+    async def stock_items(market):
+        return STOCK_ITEMS[market]
+
+    monkeypatch.setattr(collector.korea_api, "get_stock_item_list", stock_items)
+    monkeypatch.setattr(collector, "_today", lambda: kis_server.trade_date)
+    monkeypatch.setattr(collector.telegram, "notify_collection", lambda **kwargs: notified.append(kwargs))
+    monkeypatch.setattr(collector.telegram, "notify_error", lambda message: notified.append({"error": message}))
+    collector.notified = notified
+    return collector
+
+
+def test_pipeline_runs_independent_branches_concurrently():
+    """선행 단계가 끝난 분기는 동시에 실행되고, 결과는 다음 단계에 메모리로 전달"""
+    async def branch(value, inputs):
+        await asyncio.sleep(0.2)
+        return inputs["start"] + value
+
+    async def join(inputs):
+        return inputs["a"] + inputs["b"]
+
+    async def start(inputs):
+        return 1
+
+    pipeline = Pipeline("test", [
+        Stage("start", start),
+        Stage("a", lambda inputs: branch(10, inputs), ("start",)),
+        Stage("b", lambda inputs: branch(100, inputs), ("start",)),
+        Stage("join", join, ("a", "b"), summary=lambda value: value),
+    ])
+    started = time.perf_counter()
+    with track_progress() as progress:
+        run = asyncio.run(pipeline.run())
+    assert time.perf_counter() - started < 0.35
+    assert run["outputs"]["join"] == 112
+    assert run["stages"]["join"]["summary"] == 112
+    assert {name: state["status"] for name, state in progress.snapshot()["stages"].items()} == {
+        "start": "succeeded", "a": "succeeded", "b": "succeeded", "join": "succeeded",
+    }
+
+
+def test_pipeline_stops_when_job_is_cancelled():
+    """작업 중단 요청이 있으면 실행 중인 분기를 취소하고 다음 단계는 시작하지 않음"""
+    ran = []
+
+    async def cancel(inputs):
+        current_progress().cancel("작업 임대를 잃었습니다")
+        ran.append("cancel")
+
+    async def slow(inputs):
+        await asyncio.sleep(5)
+        ran.append("slow")
+
+    async def after(inputs):
+        ran.append("after")
+
+    pipeline = Pipeline("test", [
+        Stage("cancel", cancel),
+        Stage("slow", slow),
+        Stage("after", after, ("cancel",)),
+    ])
+    started = time.perf_counter()
+    with track_progress():
+        with pytest.raises(JobCancelled):
+            asyncio.run(pipeline.run())
+    assert ran == ["cancel"]
+    assert time.perf_counter() - started < 1
+
+
+def test_pipeline_rejects_invalid_graph():
+    async def noop(inputs):
+        return None
+
+    with pytest.raises(ValueError):
+        Pipeline("test", [Stage("a", noop, ("missing",))])
+    with pytest.raises(ValueError):
+        Pipeline("test", [Stage("a", noop, ("b",)), Stage("b", noop, ("a",))])
+
+
+def test_daily_pipeline_without_intermediate_csv(collector, tmp_path):
+    """일일 파이프라인: 시장별 수집 결과를 메모리로 검사/저장하고, 병합 파일만 기록"""
+    with track_progress() as progress:
+        result = asyncio.run(collector.run_job("pipeline", {"pipeline": "daily"}))
+
+    assert {state["status"] for state in result["stages"].values()} == {"succeeded"}
+    assert result["stages"]["collect.KOSPI"]["summary"] == 2
+    assert result["results"] == {"KOSPI": 2, "KOSDAQ": 1}
+    assert result["quality"]["KOSPI"]["rows"] == 2
+    assert collector.bar_store.list_symbols() == ["000660", "005930", "035720"]
+
+    files = sorted(path.name for path in (tmp_path / "stock_data").iterdir())
+    assert len(files) == 1 and files[0].startswith("merged_stock_data_")
+    assert result["file_path"].endswith(files[0])
+    assert sorted((call["market"], call["data_count"]) for call in collector.notified) == [("KOSDAQ", 1), ("KOSPI", 2)]
+    assert progress.snapshot()["stages"]["notify"]["status"] == "succeeded"
+
+
+def test_store_merge_order_and_range(collector):
+    """바 저장소 병합은 CSV 병합처럼 종목코드 오름차순/거래일 내림차순이고, 기간을 주면 그 구간만 기록"""
+    rows = [
+        [date, code, 995, 1010, 990, 1000, 1000]
+        for code in ("005930", "000660")
+        for date in ("20250102", "20250103", "20250106")
+    ]
+    collector.bar_store.upsert_frame(pd.DataFrame(rows, columns=["거래일", "종목코드", "시가", "고가", "저가", "종가", "거래량"]))
+
+    result = asyncio.run(collector.run_job("merge", {"from_date": "20250103", "to_date": "20250106"}))
+    merged = pd.read_csv(result["file_path"], encoding="utf-8-sig", dtype={"거래일": str, "종목코드": str})
+    assert list(zip(merged["종목코드"], merged["거래일"])) == [
+        ("000660", "20250106"), ("000660", "20250103"), ("005930", "20250106"), ("005930", "20250103"),
+    ]
+
+    result = asyncio.run(collector.run_job("merge"))
+    merged = pd.read_csv(result["file_path"], encoding="utf-8-sig", dtype={"거래일": str, "종목코드": str})
+    assert merged["거래일"].tolist() == ["20250106", "20250103", "20250102"] * 2
+
+
+def test_store_failure_is_not_counted_or_written(collector, tmp_path, monkeypatch):
+    """바 저장소 반영이 실패하면 저장 행 수를 세지 않고 CSV도 쓰지 않은 채 수집을 실패시킴"""
+    from app.utils.metrics import COLLECTOR_ROWS
+
+    def broken(df):
+        raise OSError("디스크 가득 참")
+
+    monkeypatch.setattr(collector.bar_store, "upsert_frame", broken)
+    stored = COLLECTOR_ROWS.labels("KOSPI", "stored").value
+    with pytest.raises(OSError):
+        asyncio.run(collector.collect_symbols_data(["005930"], collector._today()))
+    assert COLLECTOR_ROWS.labels("KOSPI", "stored").value == stored
+    assert not (tmp_path / "stock_data").exists() or not list((tmp_path / "stock_data").iterdir())
+
+
+def test_daily_pipeline_failed_branch_skips_dependents(collector, monkeypatch):
+    """실패한 시장 분기의 후속 단계와 병합은 건너뛰고, 다른 시장 분기는 끝까지 실행"""
+    async def stock_items(market):
+        if market == "KOSDAQ":
+            raise RuntimeError("종목 목록 조회 실패")
+        return STOCK_ITEMS[market]
+
+    monkeypatch.setattr(collector.korea_api, "get_stock_item_list", stock_items)
+    with pytest.raises(PipelineError) as error:
+        asyncio.run(collector.run_pipeline("daily"))
+
+    stages = error.value.stages
+    assert stages["collect.KOSDAQ"]["status"] == "failed"
+    assert stages["collect.KOSDAQ"]["error"] == "종목 목록 조회 실패"
+    assert stages["index.KOSPI"]["status"] == "succeeded"
+    assert [stages[name]["status"] for name in ("validate.KOSDAQ", "index.KOSDAQ", "merge", "notify")] == [SKIPPED] * 4
+    assert collector.bar_store.list_symbols() == ["000660", "005930"]
+
+    # 실패 알림 단계는 실패가 있어도 항상 실행
+    assert stages["notify_error"]["status"] == "succeeded" and stages["notify_error"]["summary"] == 1
+    assert collector.notified == [{"error": "일일 파이프라인 단계 실패\ncollect.KOSDAQ: 종목 목록 조회 실패"}]
+
+
+def test_daily_pipeline_collects_with_existing_master_when_symbols_fail(collector, monkeypatch):
+    """종목 코드 갱신이 실패해도 기존 종목 마스터로 수집은 진행하고, 실패는 알림"""
+    def fail():
+        raise RuntimeError("FinanceDataReader 조회 실패")
+
+    monkeypatch.setattr(stock_symbols, "update_stock_symbols", fail)
+    with pytest.raises(PipelineError) as error:
+        asyncio.run(collector.run_pipeline("daily"))
+
+    stages = error.value.stages
+    assert stages["symbols"]["status"] == "failed"
+    assert {stages[name]["status"] for name in stages if name != "symbols"} == {"succeeded"}
+    assert collector.bar_store.list_symbols() == ["000660", "005930", "035720"]
+    assert collector.notified[-1] == {"error": "일일 파이프라인 단계 실패\nsymbols: FinanceDataReader 조회 실패"}
+
+
+def test_pipeline_soft_dependency_receives_failure():
+    """soft 선행 단계가 실패하면 결과 대신 StageFailure를 받고, 일반 선행 단계였다면 건너뜀"""
+    async def broken(inputs):
+        raise RuntimeError("boom")
+
+    async def echo(inputs):
+        return inputs["broken"]
+
+    pipeline = Pipeline("test", [
+        Stage("broken", broken),
+        Stage("soft", echo, ("broken",), soft=("broken",)),
+        Stage("hard", echo, ("broken",)),
+    ])
+    with pytest.raises(PipelineError) as error:
+        asyncio.run(pipeline.run())
+    assert error.value.stages["soft"]["status"] == "succeeded"
+    assert error.value.stages["hard"]["status"] == SKIPPED
+    with pytest.raises(ValueError):
+        Pipeline("test", [Stage("a", echo), Stage("b", echo, soft=("a",))])
+
+
+def test_pipeline_api(tmp_path, monkeypatch):
+    """파이프라인 실행은 작업 하나로 등록되고, 단계별 상태는 진행 상황에서 조회"""
+    queue = JobQueue(tmp_path / "jobs.db")
+    monkeypatch.setattr(routes, "job_queue", queue)
+    client = TestClient(app)
+
+    assert [item["name"] for item in client.get("/api/pipelines").json()["pipelines"]] == ["daily"]
+    assert client.post("/api/pipelines/unknown").status_code == 404
+
+    job_id = client.post("/api/pipelines/daily").json()["job_id"]
+    job = queue.claim("worker-1")
+    assert job["kind"] == "pipeline" and job["params"] == {"pipeline": "daily"}
+    queue.update_progress(job_id, "worker-1", {"stages": {"symbols": {"status": "running", "after": []}}})
+
+    run = client.get(f"/api/pipelines/runs/{job_id}").json()
+    assert run["job_status"] == "running" and run["stages"]["symbols"]["status"] == "running"
+    assert client.get("/api/pipelines/runs/unknown").status_code == 404
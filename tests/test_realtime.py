@@ -0,0 +1,190 @@
+import asyncio
+import os
+import sys
+from datetime import datetime
+
+import pandas as pd
+import pytz
+from fastapi.testclient import TestClient
+
+# 테스트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.abspath("."))
+
+import app.api.routes as routes
+from app.core.config import TIMEZONE
+from app.main import app
+from app.services.bar_store import BarStore
+from app.services.data_validator import DataValidator
+from app.services.minute_bar_store import MinuteBarStore
+from app.services.realtime_bars import BarAggregator, SnapshotReader
+from app.services.realtime_subscriber import RealtimeSubscriber, parse_tick_frame
+from app.workers.realtime_worker import RealtimeWorker
+from tests.fake_kis_server import RECORDED_TICKS, FakeKISWebSocket
+
+
+def _replay(aggregator):
+    for frame in RECORDED_TICKS.read_text().splitlines():
+        for tick in parse_tick_frame(frame):
+            aggregator.on_tick(*tick)
+
+
+def test_parse_tick_frame():
+    """한 메시지에 이어 붙은 체결 레코드를 모두 변환"""
+    frames = RECORDED_TICKS.read_text().splitlines()
+    ticks = parse_tick_frame(frames[1])
+    assert [tick[:5] for tick in ticks] == [
+        ("005930", 20261016, "090015", 71200, 5),
+        ("000660", 20261016, "090015", 185000, 3),
+    ]
+    assert parse_tick_frame('{"header": {"tr_id": "PINGPONG"}}') == []
+    assert parse_tick_frame("1|H0STCNI0|001|암호문") == []
+
+
+def test_bar_aggregator_minutes_and_daily():
+    """분이 바뀌면 분봉을 닫아 저장 대기, 닫힌 분봉의 체결은 무시, 일봉은 거래소 누적값 사용"""
+    aggregator = BarAggregator(ring_size=16)
+    _replay(aggregator)
+
+    pending = aggregator.drain()
+    assert sorted(pending) == ["000660", "005930"]
+    assert pending["005930"].tolist() == [
+        (202610160900, 71000, 71200, 70900, 70900, 22),
+        (202610160901, 71100, 71300, 71100, 71300, 8),
+    ]
+    assert pending["000660"].tolist() == [(202610160900, 185000, 185000, 185000, 185000, 3)]
+    assert aggregator.drain() == {}
+
+    snapshot = aggregator.snapshot()["symbols"]
+    assert snapshot["005930"]["minute"]["time"] == 202610160902
+    assert snapshot["005930"]["daily"] == {
+        "date": 20261016, "open": 70950, "high": 71300, "low": 70800, "close": 71250, "volume": 1000033,
+    }
+
+    # 지난 분의 체결은 반영하지 않음
+    assert not aggregator.on_tick("005930", 20261016, "090159", 99999, 1)
+
+    # 체결이 끊긴 종목도 시각이 지나면 닫힘
+    assert aggregator.roll(202610160903) == 2
+    assert not aggregator.on_tick("005930", 20261016, "090210", 71000, 1)
+    assert aggregator.snapshot()["symbols"]["000660"]["minute"] is None
+    assert {code: len(bars) for code, bars in aggregator.drain().items()} == {"000660": 1, "005930": 1}
+
+    daily = aggregator.close_day()
+    assert daily["000660"]["close"].tolist() == [184900]
+    assert aggregator.snapshot()["symbols"]["000660"]["daily"] is None
+
+
+def test_bar_aggregator_ring_overflow():
+    """저장이 밀려 링 버퍼가 가득 차면 가장 오래된 분봉부터 버림"""
+    aggregator = BarAggregator(ring_size=4)
+    for minute in range(7):
+        aggregator.on_tick("005930", 20261016, f"09{minute:02d}00", 70000 + minute, 1)
+    assert aggregator.pending == 4 and aggregator.dropped == 2
+    assert aggregator.drain()["005930"]["time"].tolist() == [202610160902, 202610160903, 202610160904, 202610160905]
+
+
+def test_subscriber_reconnects_and_resubscribes():
+    """연결이 끊기면 다시 연결해 모든 종목을 재구독하고, 녹화한 체결을 끝까지 집계"""
+    aggregator = BarAggregator()
+
+    async def scenario():
+        async with FakeKISWebSocket(expected_symbols=2, drop_after=3) as server:
+            subscriber = RealtimeSubscriber(
+                aggregator, ["005930", "660"], url=server.url,
+                approval_key=lambda: "test-approval-key", reconnect_delay=0.05,
+            )
+            task = asyncio.ensure_future(subscriber.run())
+            await asyncio.wait_for(server.replayed.wait(), timeout=10)
+            await asyncio.sleep(0.1)
+            subscriber.stop()
+            await asyncio.wait_for(task, timeout=5)
+            return server, subscriber
+
+    server, subscriber = asyncio.run(scenario())
+    assert server.connections == 2 and subscriber.reconnects == 1
+    for subscriptions in server.subscriptions:
+        assert sorted(subscriptions) == [("1", "000660", "test-approval-key"), ("1", "005930", "test-approval-key")]
+    assert server.pongs >= 1
+
+    expected = BarAggregator()
+    _replay(expected)
+    assert aggregator.snapshot()["symbols"] == expected.snapshot()["symbols"]
+
+
+def test_subscriber_limits_subscriptions():
+    subscriber = RealtimeSubscriber(BarAggregator(), ["005930", "000660", "035420"], max_subscriptions=2)
+    assert subscriber.symbols == {"005930", "000660"}
+
+
+def test_realtime_worker_flushes_and_serves_partial_bars(tmp_path, monkeypatch):
+    """완료 분봉은 분봉 저장소로, 장 마감 후 일봉은 일봉 저장소로, 진행 중 바는 API로 조회"""
+    snapshot_path = tmp_path / "realtime_bars.json"
+    subscriber = RealtimeSubscriber(BarAggregator(), ["005930", "000660"])
+    worker = RealtimeWorker(
+        subscriber=subscriber,
+        minute_store=MinuteBarStore(tmp_path / "minute_bars"),
+        bar_store=BarStore(tmp_path / "bars"),
+        snapshot_path=snapshot_path,
+    )
+    _replay(worker.aggregator)
+    monkeypatch.setattr(routes, "realtime_snapshot", SnapshotReader(snapshot_path))
+    client = TestClient(app)
+
+    assert client.get("/api/realtime/005930").status_code == 503
+
+    # 장중 (2026-10-16 09:02:30): 지난 분봉 저장, 진행 중 분봉은 스냅숏으로
+    session = pytz.timezone(TIMEZONE).localize(datetime(2026, 10, 16, 9, 2, 30))
+    asyncio.run(worker.tick(session))
+    assert worker.minute_store.read("005930", ["20261016"])["time"].tolist() == [202610160900, 202610160901]
+    assert worker.minute_store.read("000660", ["20261016"])["time"].tolist() == [202610160900, 202610160901]
+
+    response = client.get("/api/realtime/005930")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["minute"] == {"time": 202610160902, "open": 71250, "high": 71250, "low": 71250, "close": 71250, "volume": 3}
+    assert body["daily"]["close"] == 71250
+    assert client.get("/api/realtime/035420").status_code == 404
+
+    # 장 마감 후: 남은 분봉과 당일 일봉 저장
+    asyncio.run(worker.tick(session.replace(hour=15, minute=40)))
+    assert len(worker.minute_store.read("005930", ["20261016"])) == 3
+    assert worker.bar_store.read("005930")["volume"].tolist() == [1000033]
+    assert client.get("/api/realtime/005930").json()["minute"] is None
+
+
+def test_realtime_daily_includes_after_hours_and_is_validated(tmp_path):
+    """장 마감 때 잠정 일봉, 시간외 체결까지 반영해 확정 시각에 다시 저장, 급변 일봉은 격리"""
+    bar_store = BarStore(tmp_path / "bars")
+    # 000660은 직전 종가가 10배 넘게 차이 나도록 기록해 둠 (급변으로 격리)
+    bar_store.upsert_frame(pd.DataFrame(
+        [["20261015", "005930", 70000, 70500, 69500, 70000, 100], ["20261015", "000660", 18000, 18100, 17900, 18000, 100]],
+        columns=["거래일", "종목코드", "시가", "고가", "저가", "종가", "거래량"],
+    ))
+    worker = RealtimeWorker(
+        subscriber=RealtimeSubscriber(BarAggregator(), ["005930", "000660"]),
+        minute_store=MinuteBarStore(tmp_path / "minute_bars"),
+        bar_store=bar_store,
+        snapshot_path=tmp_path / "realtime_bars.json",
+        validator=DataValidator(quarantine_path=tmp_path / "quarantine", bar_store=bar_store),
+    )
+    _replay(worker.aggregator)
+    session = pytz.timezone(TIMEZONE).localize(datetime(2026, 10, 16, 15, 40))
+
+    asyncio.run(worker.tick(session))
+    assert bar_store.read("005930")["close"].tolist() == [70000, 71250]
+    assert bar_store.read("000660")["date"].tolist() == [20261015]
+    assert len(list((tmp_path / "quarantine").glob("REALTIME_realtime_20261016_*.csv"))) == 1
+
+    # 시간외 체결은 일봉에 반영되고 확정 시각에 다시 저장
+    worker.aggregator.on_tick("005930", 20261016, "163000", 71500, 10)
+    asyncio.run(worker.tick(session.replace(hour=17)))
+    assert bar_store.read("005930")["close"].tolist() == [70000, 71250]
+    asyncio.run(worker.tick(session.replace(hour=18, minute=5)))
+    daily = bar_store.read("005930")
+    assert daily["close"].tolist() == [70000, 71500] and daily["high"][-1] == 71500
+
+    # 확정 후 늦게 온 체결은 일봉을 새로 만들지 않음
+    worker.aggregator.on_tick("005930", 20261016, "181000", 60000, 1)
+    assert worker.aggregator.daily_bars() == {}
+    asyncio.run(worker.tick(session.replace(hour=18, minute=30)))
+    assert bar_store.read("005930")["close"].tolist() == [70000, 71500]
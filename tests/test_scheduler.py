@@ -0,0 +1,90 @@
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+# 테스트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.abspath("."))
+
+import app.services.scheduler as scheduler_module
+from app.services.job_queue import JobQueue
+from app.services.leader_election import LeaderElection
+from app.services.scheduler import StockDataScheduler
+from app.utils.cron import CronExpression
+
+
+def test_cron_next_after():
+    """cron 다음 실행 시각 (평일, 목록/간격, 일·요일 OR 규칙)"""
+    weekdays = CronExpression("0 18 * * MON-FRI")
+    assert weekdays.next_after(datetime(2025, 3, 7, 17, 59, 30)) == datetime(2025, 3, 7, 18, 0)  # 금
+    assert weekdays.next_after(datetime(2025, 3, 7, 18, 0)) == datetime(2025, 3, 10, 18, 0)  # 다음 월
+
+    every = CronExpression("*/15 9-10 * * *")
+    assert list(every.iter_between(datetime(2025, 3, 3, 9, 50), datetime(2025, 3, 3, 11, 0))) == [
+        datetime(2025, 3, 3, 10, 0), datetime(2025, 3, 3, 10, 15),
+        datetime(2025, 3, 3, 10, 30), datetime(2025, 3, 3, 10, 45),
+    ]
+
+    first_or_sunday = CronExpression("0 0 1 * SUN")
+    assert first_or_sunday.next_after(datetime(2025, 3, 1, 12, 0)) == datetime(2025, 3, 2, 0, 0)
+    assert CronExpression("@monthly").next_after(datetime(2025, 12, 15)) == datetime(2026, 1, 1)
+
+    with pytest.raises(ValueError):
+        CronExpression("0 25 * * *")
+    with pytest.raises(ValueError):
+        CronExpression("0 18 * *")
+
+
+def test_scheduler_catches_up_missed_runs(tmp_path, monkeypatch):
+    """리더가 되면 마지막 실행 이후 놓친 실행을 기간 수집 작업 하나로 보충"""
+    queue = JobQueue(tmp_path / "jobs.db")
+    monkeypatch.setattr(scheduler_module, "job_queue", queue)
+    scheduler = StockDataScheduler(
+        tmp_path / "scheduler_state.json",
+        LeaderElection("scheduler", tmp_path / "jobs.db"),
+        cron="0 0 * * *",
+    )
+
+    now = scheduler._now()
+    scheduler._save_state(enabled=True, last_run=(now - timedelta(days=3)).isoformat())
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    asyncio.run(scheduler._tick())
+    jobs = queue.list()
+    assert len(jobs) == 1 and jobs[0]["kind"] == "collect_historical"
+    assert jobs[0]["params"] == {
+        "from_date": f"{today - timedelta(days=2):%Y%m%d}",
+        "to_date": f"{today:%Y%m%d}",
+    }
+    assert scheduler._last_run() == today
+    assert scheduler._next_run == today + timedelta(days=1)
+
+    # 같은 실행은 다시 보충하지 않음
+    scheduler.election.is_leader = False
+    asyncio.run(scheduler._tick())
+    assert len(queue.list()) == 1
+
+
+def test_scheduler_fires_on_event_loop(tmp_path, monkeypatch):
+    """앱 이벤트 루프에서 예정 시각에 바로 작업 등록"""
+    queue = JobQueue(tmp_path / "jobs.db")
+    monkeypatch.setattr(scheduler_module, "job_queue", queue)
+    scheduler = StockDataScheduler(tmp_path / "scheduler_state.json", LeaderElection("scheduler", tmp_path / "jobs.db"))
+
+    async def scenario():
+        scheduler.ensure_loop()
+        assert scheduler.start()
+        await asyncio.sleep(0.1)
+        assert scheduler.is_leader and queue.list() == []
+
+        # 다음 실행 시각을 지금으로 당겨 루프가 바로 실행하는지 확인
+        scheduler._next_run = scheduler._now()
+        scheduler._wakeup()
+        await asyncio.sleep(0.1)
+        await scheduler.shutdown()
+
+    asyncio.run(scenario())
+    assert [job["kind"] for job in queue.list()] == ["collect_today"]
+    assert not scheduler.election.is_leader
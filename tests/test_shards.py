@@ -0,0 +1,288 @@
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+# 테스트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.abspath("."))
+
+import app.services.bar_store as bar_store_module
+import app.services.data_validator as data_validator_module
+from app.cli import build_parser
+from app.services.bar_store import BarStore
+from app.services.korea_investment_api import KoreaInvestmentAPI
+from app.services.shard_coordinator import COMMITTED, HashRing, ShardCoordinator, date_windows, partition_work
+from tests.fake_kis_server import FakeKISServer
+
+STOCK_ITEMS = {
+    "KOSPI": [
+        {"stock_code": "005930", "stock_name": "삼성전자", "market": "KOSPI"},
+        {"stock_code": "000660", "stock_name": "SK하이닉스", "market": "KOSPI"},
+        {"stock_code": "005380", "stock_name": "현대차", "market": "KOSPI"},
+    ],
+    "KOSDAQ": [{"stock_code": "035720", "stock_name": "카카오", "market": "KOSDAQ"}],
+}
+
+
+def _daily_row(trade_date, close):
+    return {
+        "stck_bsop_date": trade_date, "stck_oprc": str(close - 5), "stck_hgpr": str(close + 10),
+        "stck_lwpr": str(close - 10), "stck_clpr": str(close), "acml_vol": "1000",
+    }
+
+
+def test_hash_ring_moves_only_affected_keys():
+    """워커가 빠지면 그 워커의 키만, 들어오면 새 워커가 맡는 키만 옮겨짐"""
+    keys = [f"run:{index}" for index in range(2000)]
+    ring = HashRing(["w1", "w2", "w3"])
+    before = {key: ring.node_for(key) for key in keys}
+    assert set(before.values()) == {"w1", "w2", "w3"}
+
+    ring.remove("w2")
+    after = {key: ring.node_for(key) for key in keys}
+    assert all(after[key] == before[key] for key in keys if before[key] != "w2")
+    assert "w2" not in after.values()
+
+    ring.add("w4")
+    joined = {key: ring.node_for(key) for key in keys}
+    assert all(joined[key] in (after[key], "w4") for key in keys)
+    assert 0 < sum(owner == "w4" for owner in joined.values()) < len(keys)
+    assert HashRing().node_for("run:0") is None
+
+
+def test_partition_covers_each_symbol_window_once():
+    assert date_windows("20250101", "20250110", 4) == [
+        ("20250101", "20250104"), ("20250105", "20250108"), ("20250109", "20250110"),
+    ]
+    shards = partition_work(STOCK_ITEMS, "20250101", "20250110", 4, 3)
+    covered = [
+        (shard["from_date"], item["stock_code"])
+        for shard in shards for items in shard["items"].values() for item in items
+    ]
+    assert len(covered) == len(set(covered)) == 3 * 4
+    assert len({shard["id"] for shard in shards}) == len(shards)
+    # 버킷은 호스트와 무관하게 같은 값이므로 같은 종목은 모든 기간에서 같은 버킷
+    buckets = {(item["stock_code"], shard["bucket"]) for shard in shards for items in shard["items"].values() for item in items}
+    assert len(buckets) == 4
+
+
+def test_dead_worker_shards_reassigned_and_manifest_committed(tmp_path):
+    """하트비트가 끊긴 워커의 실행 중 샤드는 다른 워커에 재배정되고, 모두 끝나면 매니페스트 기록"""
+    coordinator = ShardCoordinator(tmp_path / "shards.db", tmp_path / "out", worker_timeout=0.3)
+    shards = partition_work(STOCK_ITEMS, "20250101", "20250110", 2, 4)
+    run_id = coordinator.create_run(shards, {"from_date": "20250101"})
+
+    first = coordinator.heartbeat("w1")["shards"]
+    assert sorted(first) == sorted(shard["id"] for shard in shards)
+    coordinator.heartbeat("w2")
+    assigned = {"w1": coordinator.heartbeat("w1")["shards"], "w2": coordinator.heartbeat("w2")["shards"]}
+    assert assigned["w1"] and assigned["w2"] and not set(assigned["w1"]) & set(assigned["w2"])
+
+    started = assigned["w1"][0]
+    assert coordinator.start(run_id, started, "w1")["id"] == started
+    assert coordinator.start(run_id, assigned["w1"][1], "w2") is None  # 다른 워커 몫
+
+    time.sleep(0.4)  # w1 응답 없음
+    remaining = coordinator.heartbeat("w2")["shards"]
+    assert sorted(remaining) == sorted(shard["id"] for shard in shards)
+    assert not coordinator.complete(run_id, started, "w1", {"rows": 1})
+
+    for shard_id in remaining:
+        assert coordinator.start(run_id, shard_id, "w2") is not None
+        assert coordinator.complete(run_id, shard_id, "w2", {"path": f"/tmp/{shard_id}.csv", "rows": 2})
+
+    status = coordinator.status(run_id)
+    assert status["status"] == COMMITTED and status["counts"] == {"succeeded": len(shards)}
+    assert {worker["id"]: worker["status"] for worker in status["workers"]} == {"w1": "dead", "w2": "alive"}
+    manifest = json.loads(open(status["manifest_path"], encoding="utf-8").read())
+    assert manifest["rows"] == 2 * len(shards) and manifest["shards"] == len(shards)
+    assert {partition["worker"] for partition in manifest["partitions"]} == {"w2"}
+    assert coordinator.heartbeat("w2") == {"run": None, "shards": []}
+
+
+def test_coordinator_api_serves_only_its_own_run(tmp_path):
+    """같은 DB에 진행 중인 이전 실행이 남아 있어도 코디네이터 API는 자기 실행만 배정"""
+    from fastapi.testclient import TestClient
+    from app.api.coordinator import create_app
+
+    coordinator = ShardCoordinator(tmp_path / "shards.db", tmp_path / "out")
+    stale = coordinator.create_run(partition_work(STOCK_ITEMS, "20250101", "20250101", 1, 2))
+    run_id = coordinator.create_run(partition_work(STOCK_ITEMS, "20250102", "20250102", 1, 2))
+    client = TestClient(create_app(coordinator, run_id))
+
+    assignment = client.post("/workers/w1/heartbeat", params={"host": "h1"}).json()
+    assert assignment["run"] == run_id and assignment["shards"]
+    assert all(shard.startswith("20250102") for shard in assignment["shards"])
+    assert client.post(f"/runs/{stale}/shards/20250101_20250101.000/start", params={"worker_id": "w1"}).status_code == 404
+    assert client.post(f"/runs/{run_id}/shards/{assignment['shards'][0]}/start", params={"worker_id": "w1"}).status_code == 200
+
+
+def test_local_workers_collect_against_fake_server(tmp_path, monkeypatch, capsys):
+    """로컬 워커 프로세스 2개가 가짜 서버에서 수집, 응답 없는 워커의 샤드를 넘겨받아 끝까지 수집"""
+    repo = os.path.abspath(".")
+    with FakeKISServer() as server:
+        trade_date = server.trade_date
+        for items in STOCK_ITEMS.values():
+            for index, item in enumerate(items):
+                server.daily[item["stock_code"]] = [_daily_row(trade_date, 1000 * (index + 1))]
+
+        # 워커 프로세스 환경 (가짜 서버, 임시 저장소, 짧은 하트비트 간격)
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("PYTHONPATH", repo)
+        monkeypatch.setenv("KIS_BASE_URL", server.url)
+        monkeypatch.setenv("KIS_TOKEN_CACHE_PATH", str(tmp_path / "token_cache.json"))
+        monkeypatch.setenv("DATA_STORAGE_PATH", str(tmp_path / "worker_data"))
+        monkeypatch.setenv("SHARD_POLL_SECONDS", "0.2")
+        monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "")
+
+        async def stock_items(market):
+            return STOCK_ITEMS[market]
+
+        monkeypatch.setattr(KoreaInvestmentAPI(), "get_stock_item_list", stock_items)
+        monkeypatch.setattr(bar_store_module, "BAR_STORE_PATH", tmp_path / "bars")
+        monkeypatch.setattr(data_validator_module, "QUARANTINE_PATH", tmp_path / "quarantine")
+
+        # 실행 등록 직후 참여했다가 샤드 하나를 시작한 채 응답이 끊기는 워커
+        create_run = ShardCoordinator.create_run
+
+        def create_run_with_ghost(self, shards, params=None):
+            run_id = create_run(self, shards, params)
+            ghost = self.heartbeat("ghost")["shards"]
+            assert self.start(run_id, ghost[0], "ghost") is not None
+            return run_id
+
+        monkeypatch.setattr(ShardCoordinator, "create_run", create_run_with_ghost)
+
+        from_date = (datetime.strptime(trade_date, "%Y%m%d") - timedelta(days=2)).strftime("%Y%m%d")
+        args = build_parser().parse_args([
+            "coordinate", "--from", from_date, "--to", trade_date, "--window-days", "1", "--buckets", "4",
+            "--listen", "127.0.0.1:0", "--local-workers", "2", "--worker-timeout", "1", "--poll", "0.2",
+            "--db", str(tmp_path / "shards.db"), "--output", str(tmp_path / "out"), "--rate", "100", "--ingest",
+        ])
+        args.log_level = 20
+        code = args.func(args)
+
+    result = json.loads(capsys.readouterr().out)
+    assert code == 0 and result["status"] == COMMITTED
+    assert result["rows"] == 4 and result["stored"] == 4
+    assert sorted(result["workers"]) == sorted(["ghost", f"{os.uname().nodename}:local-0", f"{os.uname().nodename}:local-1"])
+
+    manifest = json.loads(open(result["manifest_path"], encoding="utf-8").read())
+    assert {partition["worker"] for partition in manifest["partitions"]} <= {
+        f"{os.uname().nodename}:local-0", f"{os.uname().nodename}:local-1",
+    }
+    for partition in manifest["partitions"]:
+        assert os.path.exists(partition["path"])
+        assert os.path.basename(partition["path"]) == f"{partition['shard']}.{partition['worker'].replace(':', '_')}.csv"
+    assert BarStore(tmp_path / "bars").list_symbols() == ["000660", "005380", "005930", "035720"]
+
+
+def test_ingest_refuses_missing_or_corrupt_partitions(tmp_path, monkeypatch):
+    """파티션이 없거나 체크섬이 다르면 하나도 반영하지 않고 실패"""
+    import hashlib
+
+    import pytest
+    from app.cli import IngestError, _ingest
+    from app.services.data_collector import DataCollector
+
+    monkeypatch.setattr(bar_store_module, "BAR_STORE_PATH", tmp_path / "bars")
+    good = tmp_path / "good.csv"
+    good.write_text(
+        "거래일,종목코드,종목명,시장구분,시가,고가,저가,종가,거래량\n20250102,005930,삼성전자,KOSPI,995,1010,990,1000,1000\n",
+        encoding="utf-8-sig",
+    )
+    partition = {"path": str(good), "host": "h1", "rows": 1, "sha256": hashlib.sha256(good.read_bytes()).hexdigest()}
+    collector = DataCollector()
+
+    for broken in (
+        {**partition, "path": str(tmp_path / "missing.csv")},
+        {**partition, "sha256": "0" * 64},
+    ):
+        with pytest.raises(IngestError):
+            _ingest(collector, {"partitions": [partition, broken]})
+        assert BarStore(tmp_path / "bars").list_symbols() == []
+
+    assert _ingest(collector, {"partitions": [partition, {**partition, "path": "/nonexistent", "rows": 0}]}) == 1
+    assert BarStore(tmp_path / "bars").list_symbols() == ["005930"]
+
+
+def test_shard_with_failed_symbols_is_retried(tmp_path):
+    """조회에 실패한 종목이 있으면 파티션을 쓰지 않고 샤드를 실패로 보고해 다시 배정"""
+    import asyncio
+
+    import pandas as pd
+    from app.workers.shard_worker import PARTITION_COLUMNS, ShardWorker
+
+    class FlakyCollector:
+        def __init__(self):
+            self.calls = 0
+
+        async def collect_frame(self, market, items, from_date, to_date, failed=None):
+            self.calls += 1
+            if self.calls == 1:
+                failed[items[0]["stock_code"]] = "HTTP 500"
+            return pd.DataFrame(columns=PARTITION_COLUMNS)
+
+    class LocalClient:
+        host = "h1"
+
+        def __init__(self, coordinator, worker_id):
+            self.coordinator = coordinator
+            self.worker_id = worker_id
+
+        def heartbeat(self):
+            return self.coordinator.heartbeat(self.worker_id, self.host)
+
+        def start(self, run_id, shard_id):
+            return self.coordinator.start(run_id, shard_id, self.worker_id)
+
+        def complete(self, run_id, shard_id, result):
+            return self.coordinator.complete(run_id, shard_id, self.worker_id, result)
+
+        def fail(self, run_id, shard_id, error):
+            return self.coordinator.fail(run_id, shard_id, self.worker_id, error)
+
+    coordinator = ShardCoordinator(tmp_path / "shards.db", tmp_path / "out")
+    items = {"KOSPI": STOCK_ITEMS["KOSPI"][:1]}
+    run_id = coordinator.create_run(partition_work(items, "20250102", "20250102", 1, 1))
+    worker = ShardWorker(LocalClient(coordinator, "w1"), tmp_path / "out", FlakyCollector())
+
+    assert asyncio.run(worker.run_once()) is True
+    status = coordinator.status(run_id)
+    assert status["counts"] == {"pending": 1} and not list((tmp_path / "out").glob("**/*.csv"))
+
+    assert asyncio.run(worker.run_once()) is True
+    assert coordinator.status(run_id)["status"] == COMMITTED
+
+
+def test_late_worker_does_not_overwrite_committed_partition(tmp_path):
+    """재배정된 샤드를 늦게 끝낸 워커는 자기 이름의 파티션에 쓰므로 커밋된 파티션의 체크섬이 유지됨"""
+    import asyncio
+    import hashlib
+
+    import pandas as pd
+    from app.workers.shard_worker import PARTITION_COLUMNS, ShardWorker
+
+    class FixedCollector:
+        def __init__(self, close):
+            self.close = close
+
+        async def collect_frame(self, market, items, from_date, to_date, failed=None):
+            return pd.DataFrame([["20250102", "005930", "삼성전자", market, 995, 1010, 990, self.close, 1000]],
+                                columns=PARTITION_COLUMNS)
+
+    class Client:
+        host = "h1"
+
+        def __init__(self, worker_id):
+            self.worker_id = worker_id
+
+    spec = partition_work({"KOSPI": STOCK_ITEMS["KOSPI"][:1]}, "20250102", "20250102", 1, 1)[0]
+    committed = asyncio.run(ShardWorker(Client("h1:local-0"), tmp_path / "out", FixedCollector(1000)).run_shard("r1", spec))
+    late = asyncio.run(ShardWorker(Client("h1:local-1"), tmp_path / "out", FixedCollector(1001)).run_shard("r1", spec))
+
+    assert os.path.basename(committed["path"]) == f"{spec['id']}.h1_local-0.csv"
+    assert late["path"] != committed["path"]
+    with open(committed["path"], "rb") as f:
+        assert hashlib.sha256(f.read()).hexdigest() == committed["sha256"]
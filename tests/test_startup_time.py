@@ -0,0 +1,22 @@
+import os
+import sys
+
+# 테스트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.abspath("."))
+
+from benchmarks.import_time import measure_import
+
+# app.main import 시간 한도 (초, 느린 환경에서는 STARTUP_BUDGET_SECONDS로 조정)
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "1.5"))
+
+
+def test_api_startup_skips_heavy_modules():
+    """API 프로세스 시작 시 데이터/알림 의존성을 불러오지 않음"""
+    result = measure_import("app.main")
+    assert result["modules"] == []
+
+
+def test_api_startup_within_budget():
+    """app.main import 시간이 한도 이내 (3회 중 최솟값 기준)"""
+    best = min(measure_import("app.main")["seconds"] for _ in range(3))
+    assert best < STARTUP_BUDGET_SECONDS, f"app.main import {best:.2f}s > {STARTUP_BUDGET_SECONDS}s"
@@ -0,0 +1,156 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# 테스트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.abspath("."))
+
+import app.utils.stock_symbols as stock_symbols
+import app.utils.symbol_snapshots as symbol_snapshots
+from app.utils.symbol_snapshots import compute_symbol_diff, changed_codes, get_changes_since
+from app.utils.symbol_search import SymbolSearchIndex, to_chosung
+import app.utils.symbol_master as symbol_master_module
+from app.utils.symbol_master import SymbolMaster, SymbolSnapshot
+
+
+def make_symbols(rows):
+    return pd.DataFrame(rows, columns=["stock_code", "stock_name", "market", "market_detail"])
+
+
+def test_compute_symbol_diff():
+    """신규 상장/상장 폐지/종목명 변경/시장 이동 계산"""
+    old = make_symbols([
+        ["005930", "삼성전자", "KOSPI", "KOSPI"],
+        ["000001", "폐지종목", "KOSDAQ", "KOSDAQ"],
+        ["000002", "옛이름", "KOSPI", "KOSPI"],
+        ["000003", "이전상장", "KOSDAQ", "KOSDAQ"],
+    ])
+    new = make_symbols([
+        ["005930", "삼성전자", "KOSPI", "KOSPI"],
+        ["000002", "새이름", "KOSPI", "KOSPI"],
+        ["000003", "이전상장", "KOSPI", "KOSPI"],
+        ["000004", "신규상장", "KOSDAQ", "KOSDAQ GLOBAL"],
+    ])
+
+    diff = compute_symbol_diff(old, new)
+    assert [item["stock_code"] for item in diff["listed"]] == ["000004"]
+    assert [item["stock_code"] for item in diff["delisted"]] == ["000001"]
+    assert diff["renamed"] == [{"stock_code": "000002", "old_name": "옛이름", "new_name": "새이름"}]
+    assert diff["market_moved"] == [{"stock_code": "000003", "old_market": "KOSDAQ", "new_market": "KOSPI"}]
+    assert changed_codes(diff) == ["000001", "000002", "000003", "000004"]
+
+
+def test_symbol_search_index_ranking():
+    """코드/종목명/초성 검색 및 순위"""
+    index = SymbolSearchIndex(make_symbols([
+        ["005930", "삼성전자", "KOSPI", "KOSPI"],
+        ["005935", "삼성전자우", "KOSPI", "KOSPI"],
+        ["009150", "삼성전기", "KOSPI", "KOSPI"],
+        ["247540", "에코프로비엠", "KOSDAQ", "KOSDAQ GLOBAL"],
+    ]))
+
+    assert to_chosung("삼성 전자") == "ㅅㅅㅈㅈ"
+    assert [r["stock_code"] for r in index.search("00593")] == ["005930", "005935"]
+    assert index.search("삼성전자")[0]["match"] == "name"
+    assert [r["stock_code"] for r in index.search("ㅅㅅㅈ", limit=2)] == ["005930", "009150"]
+    assert index.search("프로")[0]["stock_code"] == "247540"
+    assert index.search("삼성", market="KOSDAQ") == []
+
+
+def test_symbol_snapshot_query_pages_and_projects():
+    """종목 목록 필터/필드 선택/커서 페이지"""
+    snapshot = SymbolSnapshot({
+        "KOSPI": make_symbols([
+            ["005930", "삼성전자", "KOSPI", "KOSPI"],
+            ["000660", "SK하이닉스", "KOSPI", "KOSPI"],
+            ["005380", "현대차", "KOSPI", "KOSPI"],
+        ]),
+        "KOSDAQ": make_symbols([
+            ["247540", "에코프로비엠", "KOSDAQ", "KOSDAQ GLOBAL"],
+            ["091990", "셀트리온헬스케어", "KOSDAQ", "KOSDAQ"],
+        ]),
+    }, "test", 0.0)
+
+    first = snapshot.query(fields=["stock_code"], limit=2)
+    assert first == {"total": 5, "next_cursor": "005380", "records": [{"stock_code": "000660"}, {"stock_code": "005380"}]}
+    second = snapshot.query(fields=["stock_code"], cursor=first["next_cursor"], limit=2)
+    assert [r["stock_code"] for r in second["records"]] == ["005930", "091990"]
+    last = snapshot.query(fields=["stock_code"], cursor=second["next_cursor"], limit=2)
+    assert last["records"] == [{"stock_code": "247540"}] and last["next_cursor"] is None
+
+    assert snapshot.query(market="KOSPI", code_prefix="005")["total"] == 2
+    assert snapshot.query(market_detail="KOSDAQ GLOBAL")["records"][0]["stock_name"] == "에코프로비엠"
+    with pytest.raises(ValueError):
+        snapshot.query(fields=["price"])
+
+
+def test_every_symbol_file_write_records_a_snapshot(tmp_path, monkeypatch):
+    """하루 한 번 갱신(get_stock_symbols)으로 쓴 변경도 스냅샷에 남고, 조회에 실패한 시장은 폐지로 기록되지 않음"""
+    monkeypatch.setattr(stock_symbols, "STOCK_SYMBOLS_PATH", tmp_path)
+    monkeypatch.setattr(stock_symbols, "SYMBOL_FILES", {"KOSPI": tmp_path / "kospi.csv", "KOSDAQ": tmp_path / "kosdaq.csv"})
+    monkeypatch.setattr(symbol_snapshots, "SNAPSHOT_PATH", tmp_path / "snapshots")
+    monkeypatch.setattr(symbol_snapshots, "CHANGES_FILE", tmp_path / "snapshots" / "changes.jsonl")
+    listings = {
+        "KOSPI": make_symbols([["005930", "삼성전자", "KOSPI", "KOSPI"]]),
+        "KOSDAQ": make_symbols([["247540", "에코프로비엠", "KOSDAQ", "KOSDAQ GLOBAL"]]),
+    }
+
+    def download(market):
+        if market not in listings:
+            raise ValueError("조회 실패")
+        return listings[market].copy()
+
+    monkeypatch.setattr(stock_symbols, "_download_stock_symbols", download)
+    assert stock_symbols.update_stock_symbols(["NYSE"])["version"] is None  # 받은 목록이 없으면 스냅샷 없음
+
+    first = stock_symbols.update_stock_symbols()
+    assert first["KOSPI"] == 1 and first["KOSDAQ"] == 1 and len(first["diff"]["listed"]) == 2
+
+    # 하루 한 번 갱신에서 신규 상장 발견 → 이후 전체 업데이트에서도 사라지지 않도록 그 시점에 기록
+    listings["KOSPI"] = make_symbols([["005930", "삼성전자", "KOSPI", "KOSPI"], ["000660", "SK하이닉스", "KOSPI", "KOSPI"]])
+    assert len(stock_symbols.get_stock_symbols("KOSPI", force_update=True)) == 2
+    changes = get_changes_since(first["version"])
+    assert [item["stock_code"] for change in changes for item in change["changes"]["listed"]] == ["000660"]
+
+    del listings["KOSDAQ"]
+    result = stock_symbols.update_stock_symbols()
+    assert result["KOSDAQ"] == 1 and not any(result["changes"].values())
+    assert sorted(symbol_snapshots.load_symbol_snapshot()["stock_code"]) == ["000660", "005930", "247540"]
+
+
+def test_symbol_master_refreshes_in_background(tmp_path, monkeypatch):
+    """오래된 종목 파일은 백그라운드에서 갱신하고, 그동안 조회는 기다리지 않고 기존 목록을 돌려줌"""
+    import threading
+    import time
+
+    files = {"KOSPI": tmp_path / "kospi.csv", "KOSDAQ": tmp_path / "kosdaq.csv"}
+    make_symbols([["005930", "삼성전자", "KOSPI", "KOSPI"]]).to_csv(files["KOSPI"], index=False)
+    make_symbols([["247540", "에코프로비엠", "KOSDAQ", "KOSDAQ GLOBAL"]]).to_csv(files["KOSDAQ"], index=False)
+    yesterday = time.time() - 86400 * 2
+    for path in files.values():
+        os.utime(path, (yesterday, yesterday))
+
+    release = threading.Event()
+    refreshed = []
+
+    def update(markets):
+        release.wait(5)
+        make_symbols([["005930", "삼성전자", "KOSPI", "KOSPI"], ["000660", "SK하이닉스", "KOSPI", "KOSPI"]]).to_csv(
+            files["KOSPI"], index=False
+        )
+        refreshed.append(markets)
+
+    monkeypatch.setattr(symbol_master_module, "SYMBOL_FILES", files)
+    monkeypatch.setattr(symbol_master_module, "update_stock_symbols", update)
+    master = SymbolMaster()
+
+    started = time.perf_counter()
+    assert master.get("KOSPI")["stock_code"].tolist() == ["005930"]
+    assert time.perf_counter() - started < 1
+
+    release.set()
+    master._refresher.join(5)
+    assert refreshed == [["KOSPI", "KOSDAQ"]]
+    assert master.get("KOSPI")["stock_code"].tolist() == ["005930", "000660"]
@@ -0,0 +1,97 @@
+import asyncio
+import os
+import sys
+import time
+
+# 테스트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.abspath("."))
+
+from app.services.telegram_service import Notification, NotificationDispatcher, TelegramService, build_digest
+
+
+class RetryAfter(Exception):
+    """텔레그램 전송 제한 응답 (python-telegram-bot의 RetryAfter와 같은 속성)"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Flood control exceeded. Retry in {retry_after} seconds")
+        self.retry_after = retry_after
+
+
+class FakeSender:
+    """보낸 메시지를 기록하는 전송 함수 (처음 failures번은 RetryAfter, delay초 지연)"""
+
+    def __init__(self, failures=0, delay=0.0):
+        self.messages = []
+        self.attempts = 0
+        self.failures = failures
+        self.delay = delay
+
+    async def __call__(self, message):
+        self.attempts += 1
+        await asyncio.sleep(self.delay)
+        if self.attempts <= self.failures:
+            raise RetryAfter(0.01)
+        self.messages.append(message)
+
+
+def test_single_notification_keeps_format():
+    """알림이 한 건이면 기존 형식 그대로"""
+    message = build_digest([Notification("collection", market="KOSPI", count=1234, file_path="a.csv")])
+    assert "주식 데이터 수집 완료" in message and "<b>1,234개</b>" in message and "<code>a.csv</code>" in message
+    assert "<code>&lt;html&gt;</code>" in build_digest([Notification("error", text="<html>")])
+
+
+def test_digest_coalesces_markets_and_errors():
+    """시장별 합계와 같은 오류 건수로 요약"""
+    notifications = [
+        Notification("collection", market="KOSPI", count=900),
+        Notification("collection", market="KOSDAQ", count=1500),
+    ] + [Notification("error", text="KOSPI 시장 데이터 수집 실패: timeout")] * 40 + [
+        Notification("error", text=f"오류 {i}") for i in range(7)
+    ]
+    message = build_digest(notifications, dropped=3)
+    assert "- KOSPI: <b>900개</b>" in message and "- KOSDAQ: <b>1,500개</b>" in message
+    assert "오류 47건" in message and "timeout</code> ×40" in message
+    assert "외 3종" in message and "3건 생략" in message
+
+
+def test_dispatcher_coalesces_without_blocking():
+    """알림은 바로 반환하고, 구간 안의 알림은 메시지 하나로 전송"""
+    sender = FakeSender(delay=0.2)
+    dispatcher = NotificationDispatcher(sender, window=0.1, min_interval=0)
+
+    started = time.perf_counter()
+    for i in range(30):
+        assert dispatcher.submit(Notification("error", text="KIS 토큰 발급 실패"))
+    assert time.perf_counter() - started < 0.1
+
+    dispatcher.stop()
+    assert len(sender.messages) == 1 and "오류 30건" in sender.messages[0]
+    assert dispatcher.sent == 1
+
+
+def test_dispatcher_retries_after_rate_limit():
+    """RetryAfter 응답은 안내된 시간 뒤 다시 전송"""
+    sender = FakeSender(failures=1)
+    dispatcher = NotificationDispatcher(sender, window=0, min_interval=0)
+    dispatcher.submit(Notification("collection", market="KOSPI", count=10))
+    dispatcher.stop()
+    assert sender.attempts == 2 and len(sender.messages) == 1 and dispatcher.failed == 0
+
+
+def test_dispatcher_drops_when_full():
+    """대기 알림이 가득 차면 건수만 세어 요약에 표시"""
+    sender = FakeSender()
+    dispatcher = NotificationDispatcher(sender, window=0.1, min_interval=0, max_pending=2)
+    results = [dispatcher.submit(Notification("error", text="실패")) for _ in range(5)]
+    dispatcher.stop()
+    assert results == [True, True, False, False, False]
+    assert "3건 생략" in sender.messages[0]
+
+
+def test_notify_without_settings():
+    """텔레그램 설정이 없으면 큐에 넣지 않음"""
+    sender = FakeSender()
+    service = TelegramService(NotificationDispatcher(sender, window=0, min_interval=0))
+    service.token = None
+    assert service.notify_error("오류") is False
@@ -0,0 +1,119 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 테스트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.abspath("."))
+
+import app.utils.profiling as profiling
+from app.services.job_queue import JobQueue
+from app.utils.profiling import JobProfiler
+from app.utils.tracing import current_trace, in_context, span, start_trace
+from app.workers.collector_worker import CollectorWorker
+
+
+def _convert(rows):
+    with span("rows.convert"):
+        return [row * 2 for row in rows]
+
+
+def test_span_is_noop_without_trace():
+    """추적 중이 아니면 구간을 기록하지 않음"""
+    assert current_trace() is None
+    with span("kis.request"):
+        pass
+    assert current_trace() is None
+
+
+def test_stage_breakdown_across_threads(tmp_path):
+    """asyncio 작업과 executor 스레드(in_context)의 구간이 같은 추적에 합산"""
+
+    async def job():
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            tasks = [loop.run_in_executor(executor, in_context(_convert), list(range(100))) for _ in range(4)]
+            await asyncio.gather(*tasks)
+        with span("rate_limit.wait"):
+            await asyncio.sleep(0.01)
+        # 추적 없이 넘긴 함수는 기록되지 않음
+        await loop.run_in_executor(None, _convert, [1])
+
+    with start_trace("collect_today", record_spans=True) as trace:
+        asyncio.run(job())
+
+    summary = trace.summary()
+    assert summary["stages"]["rows.convert"]["count"] == 4
+    assert summary["stages"]["rate_limit.wait"]["total_seconds"] >= 0.01
+    assert list(summary["stages"])[0] == "rate_limit.wait"
+
+    path = trace.export_chrome(tmp_path / "trace.json")
+    events = json.loads(path.read_text(encoding="utf-8"))["traceEvents"]
+    assert len(events) == 5 and {event["ph"] for event in events} == {"X"}
+
+
+def test_cprofile_includes_worker_threads(tmp_path):
+    """cProfile은 작업 중 시작된 스레드의 호출도 포함"""
+    profiler = JobProfiler("job-1", "cprofile", memory=True, directory=tmp_path)
+    profiler.start()
+    thread = threading.Thread(target=_convert, args=(list(range(1000)),))
+    thread.start()
+    thread.join()
+    summary = profiler.stop()
+
+    assert summary["profile"]["mode"] == "cprofile"
+    assert "_convert" in (tmp_path / "job-1" / "profile.txt").read_text(encoding="utf-8")
+    assert summary["memory"]["peak_bytes"] > 0
+    assert (tmp_path / "job-1" / "memory.tracemalloc").exists()
+
+
+def test_cprofile_turns_off_thread_profilers(tmp_path):
+    """작업이 끝나면 새 스레드 훅을 해제하고, 계속 살아 있는 풀 스레드의 프로파일러도 꺼짐"""
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        profiler = JobProfiler("job-2", "cprofile", directory=tmp_path)
+        profiler.start()
+        executor.submit(_convert, list(range(1000))).result()
+        assert executor.submit(sys.getprofile).result() is not None
+        profiler.stop()
+
+        assert threading.getprofile() is None
+        assert executor.submit(sys.getprofile).result() is None
+    assert "_convert" in (tmp_path / "job-2" / "profile.txt").read_text(encoding="utf-8")
+
+
+def test_sampling_profile():
+    """샘플링 프로파일러는 실행 중인 스레드 스택을 접힌 스택으로 수집"""
+    profiler = profiling.SamplingProfiler(interval=0.001)
+    profiler.start()
+    deadline = time.perf_counter() + 0.1
+    while time.perf_counter() < deadline:
+        _convert(list(range(100)))
+    profiler.stop()
+    assert profiler.samples > 0
+    assert any("test_sampling_profile" in stack for stack in profiler.stacks)
+
+
+class TracedCollector:
+    async def run_job(self, kind, params=None):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, in_context(_convert), [1, 2, 3])
+        return {"kind": kind}
+
+
+def test_worker_records_diagnostics(tmp_path, monkeypatch):
+    """작업 결과에 단계별 소요 시간을 넣고, 요청한 추적/프로파일 파일을 작업별로 기록"""
+    monkeypatch.setattr(profiling, "PROFILE_PATH", tmp_path / "profiles")
+    queue = JobQueue(tmp_path / "jobs.db")
+    worker = CollectorWorker(queue, "worker-1", collector=TracedCollector())
+    job = queue.enqueue("merge", {"diagnostics": {"trace": True, "profile": "sampling", "memory": False}})
+
+    assert asyncio.run(worker.run_once())
+    diagnostics = queue.get(job["id"])["result"]["diagnostics"]
+    assert diagnostics["stages"]["rows.convert"]["count"] == 1
+    assert diagnostics["profile"]["mode"] == "sampling"
+    assert set(diagnostics["artifacts"]) == {"trace.json", "profile.folded"}
+    assert profiling.artifact_path(job["id"], "profile.folded") is not None
+    assert profiling.artifact_path(job["id"], "../jobs.db") is None
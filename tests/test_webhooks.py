@@ -0,0 +1,149 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from fastapi.testclient import TestClient
+
+# 테스트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.abspath("."))
+
+import app.api.routes as routes
+import app.services.job_queue as job_queue_module
+from app.main import app
+from app.services.job_queue import JobQueue, DELIVERED, FAILED, PENDING
+from app.services.webhooks import SIGNATURE_HEADER, TIMESTAMP_HEADER, WebhookDispatcher, sign, verify
+from app.workers.collector_worker import CollectorWorker
+
+SECRET = "test-secret"
+
+
+class EchoCollector:
+    """작업 파라미터를 그대로 돌려주는 수집기 (fail=True면 예외)"""
+
+    async def run_job(self, kind, params=None):
+        if params.get("fail"):
+            raise RuntimeError("수집 실패")
+        return {"kind": kind, "count": 3}
+
+
+class WebhookReceiver:
+    """테스트용 웹훅 수신 서버 (`statuses` 순서대로 응답하고, 다 쓰면 200)"""
+
+    def __init__(self, statuses=()):
+        self.statuses = list(statuses)
+        self.received = []  # (헤더, 본문)
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/hook"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                receiver.received.append((dict(self.headers), body))
+                status = receiver.statuses.pop(0) if receiver.statuses else 200
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+        return Handler
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_queue_module, "WEBHOOK_RETRY_DELAY_SECONDS", 0)
+    return JobQueue(tmp_path / "jobs.db")
+
+
+def _run_job(queue, params):
+    job = queue.enqueue("collect_today", params)
+    worker = CollectorWorker(queue, "worker-1", collector=EchoCollector())
+    assert asyncio.run(worker.run_once())
+    return job["id"]
+
+
+def test_outbox_written_when_job_finishes(queue):
+    """콜백이 있는 작업만 완료/최종 실패 시 웹훅 전송 건 기록 (결과, 통계 포함)"""
+    callback = {"url": "http://127.0.0.1:9/hook", "event": "collect.done"}
+    done = _run_job(queue, {"callback": callback, "stock_codes": ["005930"]})
+    webhook = queue.claim_webhook()
+    payload = json.loads(webhook["payload"])
+    assert webhook["job_id"] == done and webhook["event"] == "collect.done"
+    assert payload["status"] == "succeeded" and payload["result"]["count"] == 3
+    assert payload["params"] == {"stock_codes": ["005930"]} and "stats" in payload
+
+    failed = queue.enqueue("merge", {"fail": True, "callback": {"url": callback["url"]}}, max_attempts=1)
+    assert asyncio.run(CollectorWorker(queue, "worker-1", collector=EchoCollector()).run_once())
+    assert [w["event"] for w in queue.list_webhooks(failed["id"])] == ["job.failed"]
+
+    assert queue.list_webhooks(_run_job(queue, {})) == []
+
+
+def test_dispatcher_signs_and_retries(queue):
+    """5xx 응답은 재시도 후 전송 완료, 본문은 HMAC 서명으로 확인"""
+    with WebhookReceiver(statuses=[500]) as receiver:
+        job_id = _run_job(queue, {"callback": {"url": receiver.url, "event": "collect.done"}})
+        dispatcher = WebhookDispatcher(queue, secret=SECRET, timeout=5)
+        assert dispatcher.deliver_next()
+        assert queue.list_webhooks(job_id)[0]["status"] == PENDING
+        assert dispatcher.deliver_next()
+        assert not dispatcher.deliver_next()
+
+    webhook = queue.list_webhooks(job_id)[0]
+    assert webhook["status"] == DELIVERED and webhook["attempts"] == 2 and webhook["last_status_code"] == 200
+    headers, body = receiver.received[-1]
+    assert headers["X-Webhook-Event"] == "collect.done"
+    assert verify(SECRET, headers[TIMESTAMP_HEADER], body, headers[SIGNATURE_HEADER])
+    assert not verify("wrong-secret", headers[TIMESTAMP_HEADER], body, headers[SIGNATURE_HEADER])
+    assert not verify(SECRET, "0", body, sign(SECRET, "0", body))
+    assert json.loads(body)["job_id"] == job_id
+
+
+def test_dispatcher_gives_up_on_client_error(queue):
+    """4xx(408/429 제외) 응답은 재시도하지 않고 실패 처리"""
+    with WebhookReceiver(statuses=[404]) as receiver:
+        job_id = _run_job(queue, {"callback": {"url": receiver.url}})
+        dispatcher = WebhookDispatcher(queue, secret=SECRET, timeout=5)
+        dispatcher.start()
+        dispatcher.wake()
+        dispatcher.stop()
+
+    webhook = queue.list_webhooks(job_id)[0]
+    assert webhook["status"] == FAILED and webhook["attempts"] == 1 and webhook["last_status_code"] == 404
+    assert len(receiver.received) == 1
+
+
+def test_callback_params_from_api(queue, monkeypatch):
+    """API의 callback_url/callback_event는 작업 파라미터로 저장되고, 작업 조회에 전송 상태 포함"""
+    monkeypatch.setattr(routes, "job_queue", queue)
+    client = TestClient(app)
+
+    response = client.post("/api/merge?callback_url=http://n8n:5678/webhook/merge-done&callback_event=merge.done")
+    assert response.status_code == 200
+    job_id = response.json()["job_id"]
+    assert queue.get(job_id)["params"]["callback"] == {"url": "http://n8n:5678/webhook/merge-done", "event": "merge.done"}
+    assert client.get(f"/api/jobs/{job_id}").json()["webhooks"] == []
+
+    assert client.post("/api/merge?callback_url=ftp://example.com/hook").status_code == 400
+    assert client.post("/api/merge?callback_event=merge.done").status_code == 400